@@ -13,6 +13,8 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 import json
 
+from utils.regulation_snapshot import regulation_snapshots
+
 @dataclass
 class ActionStep:
     """액션 스텝 정보"""
@@ -44,8 +46,20 @@ class ActionPlan:
 class ActionPlanGenerator:
     """액션 플랜 생성기"""
     
-    def __init__(self):
-        self.regulatory_actions = {
+    @property
+    def regulatory_actions(self) -> Dict:
+        """국가/제품/위반 유형별 대응 단계 (규제 스냅샷 'regulatory_actions', 읽기 전용)"""
+        return regulation_snapshots.source('regulatory_actions')
+    
+    @property
+    def customs_rejection_actions(self) -> Dict:
+        """통관 거부 유형별 대응 단계 (규제 스냅샷 'customs_rejection_actions', 읽기 전용)"""
+        return regulation_snapshots.source('customs_rejection_actions')
+    
+    @staticmethod
+    def _load_regulatory_actions() -> Dict:
+        """규제 위반 대응 단계 원본 (스냅샷 로더)"""
+        return {
             "중국": {
                 "라면": {
                     "라벨링_위반": {
@@ -281,8 +295,11 @@ class ActionPlanGenerator:
                 }
             }
         }
-        
-        self.customs_rejection_actions = {
+    
+    @staticmethod
+    def _load_customs_rejection_actions() -> Dict:
+        """통관 거부 대응 단계 원본 (스냅샷 로더)"""
+        return {
             "서류_불완전": {
                 "긴급도": "높음",
                 "예상_처리기간": "1-2주",
@@ -553,6 +570,11 @@ class ActionPlanGenerator:
         
         return "\n".join(output)
 
+regulation_snapshots.register('regulatory_actions', ActionPlanGenerator._load_regulatory_actions,
+                              levels=('country', 'product', 'category'))
+regulation_snapshots.register('customs_rejection_actions', ActionPlanGenerator._load_customs_rejection_actions,
+                              levels=('category',))
+
 def main():
     """테스트 함수"""
     generator = ActionPlanGenerator()
@@ -10,12 +10,146 @@
 
 import os
 import qrcode
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 from datetime import datetime, timedelta
 import json
 import requests
 from typing import Dict, List, Optional, Tuple
 import base64
+from functools import lru_cache
+
+from utils.font_registry import get_font_registry
+from utils.label_layout import Advance, Field, LabelTemplate, Picture, Rows, Rule, Section, Text, get_label_layouts
+
+# 중국 1+6 필수 영양성분 (표시 이름, 입력 키, 기본값, 단위)
+CHINA_NUTRIENTS = [
+    ("能量", 'calories', '400', " kcal"),
+    ("蛋白质", 'protein', '12', "g"),
+    ("脂肪", 'fat', '15', "g"),
+    ("饱和脂肪", 'saturated_fat', '5', "g"),
+    ("碳水化合物", 'carbs', '60', "g"),
+    ("糖", 'sugar', '5', "g"),
+    ("钠", 'sodium', '800', "mg")
+]
+
+# 미국 2025년 FDA 영양성분 (표시 이름, 입력 키, 기본값, 단위, %DV) - 입력 키가 없으면 고정 값
+US_NUTRIENTS = [
+    ("Total Fat", 'fat', '15', "g", "25%"),
+    ("Saturated Fat", 'saturated_fat', '5', "g", "25%"),
+    ("Trans Fat", None, '0', "g", "0%"),
+    ("Cholesterol", None, '0', "mg", "0%"),
+    ("Sodium", 'sodium', '800', "mg", "35%"),
+    ("Total Carbohydrate", 'carbs', '60', "g", "20%"),
+    ("Dietary Fiber", 'fiber', '2', "g", "8%"),
+    ("Total Sugars", 'sugar', '5', "g", ""),
+    ("Added Sugars", None, '0', "g", "0%"),
+    ("Protein", 'protein', '12', "g", ""),
+    ("Vitamin D", None, '0', "mcg", "0%"),
+    ("Calcium", None, '20', "mg", "2%"),
+    ("Iron", None, '2', "mg", "10%"),
+    ("Potassium", None, '200', "mg", "4%")
+]
+
+# 2027년 중국 GB 7718-2025 라벨 레이아웃 (정적 문구/구분선은 Text/Rule, 제품별 값은 Field/Rows/Picture)
+CHINA_2027_TEMPLATE = LabelTemplate(
+    name='china_2027', country='중국', version=1, placeholder="N/A",
+    ops=(
+        # 1~4. 제품명, 원산지, 제조사, 유통기한
+        Section(20),
+        Field(20, 'product_name', 'title', 'accent'), Advance(40),
+        Field(20, 'origin', 'body', 'text'), Advance(30),
+        Field(20, 'manufacturer', 'body', 'text'), Advance(30),
+        Field(20, 'expiry_date', 'body', 'text'), Advance(40),
+        Rule('accent', 2), Advance(20),
+        # 5. 영양성분표 (1+6 체계)
+        Text(20, "营养成分表 (每100g)", 'header', 'accent'), Advance(30),
+        Text(20, "项目", 'body', 'text'), Text(200, "含量", 'body', 'text'),
+        Text(300, "营养素参考值%", 'body', 'text'), Advance(25),
+        Rule('text', 1), Advance(10),
+        *(op for index, (name, _, _, _) in enumerate(CHINA_NUTRIENTS)
+          for op in (Text(20, name, 'body', 'text'), Field(200, f'nutrient_{index}', 'body', 'text'),
+                     Field(300, f'nrv_{index}', 'body', 'text'), Advance(20))),
+        Advance(20), Rule('accent', 1), Advance(15),
+        # 6. 성분표 (알레르기 성분 강조)
+        Text(20, "配料表", 'header', 'accent'), Advance(25),
+        Rows('ingredients', 18, ((20, 'body', 'text'),)), Advance(10),
+        Rule('accent', 1), Advance(15),
+        # 7. 알레르기 정보 (8대 알레르기)
+        Text(20, "过敏原信息", 'header', 'warning'), Advance(25),
+        Field(20, 'allergy', 'body', 'warning'), Advance(25),
+        Text(20, "※ 本产品含有过敏原成分，请过敏体质者注意。", 'small', 'warning'), Advance(20),
+        # 8. 경고 문구 (2027년 의무)
+        Text(20, "儿童及青少年应避免过量摄入钠、脂肪、糖", 'body', 'warning'), Advance(25),
+        # 9. 디지털 라벨 QR코드
+        Text(20, "数字标签", 'header', 'accent'), Advance(25),
+        Picture(20, 'qr'), Advance(90),
+        # 10. 보관 방법
+        Text(20, "储存方法", 'header', 'accent'), Advance(25),
+        Field(20, 'storage_method', 'body', 'text'), Advance(25),
+        # 11. 제조사 상세 정보
+        Field(20, 'address', 'small', 'text'), Advance(15),
+        Field(20, 'phone', 'small', 'text'), Advance(15)
+    )
+)
+
+# 2025년 미국 FDA 라벨 레이아웃
+US_2025_TEMPLATE = LabelTemplate(
+    name='us_2025', country='미국', version=1,
+    ops=(
+        # 1~4. 제품명, 원산지, 제조사, 유통기한
+        Section(20),
+        Field(20, 'product_name', 'title', 'accent'), Advance(40),
+        Field(20, 'origin', 'body', 'text'), Advance(30),
+        Field(20, 'manufacturer', 'body', 'text'), Advance(30),
+        Field(20, 'expiry_date', 'body', 'text'), Advance(40),
+        Rule('accent', 2), Advance(20),
+        # 5. 영양성분표 (2025년 FDA 규정)
+        Text(20, "Nutrition Facts", 'header', 'accent'), Advance(30),
+        Text(20, "Serving Size: 1 package (85g)", 'body', 'text'), Advance(25),
+        Field(20, 'calories', 'header', 'text'), Advance(30),
+        Rule('text', 2), Advance(10),
+        *(op for index, (name, key, default, unit, dv) in enumerate(US_NUTRIENTS)
+          for op in (Text(20, name, 'body', 'text'),
+                     Field(200, f'nutrient_{index}', 'body', 'text') if key
+                     else Text(200, f"{default}{unit}", 'body', 'text'),
+                     *((Text(300, f"{dv} DV", 'body', 'text'),) if dv else ()),
+                     Advance(18))),
+        Advance(20), Rule('accent', 1), Advance(15),
+        # 6. 성분표 (알레르기 성분 강조)
+        Text(20, "Ingredients", 'header', 'accent'), Advance(25),
+        Rows('ingredients', 18, ((20, 'body', 'text'),)), Advance(10),
+        Rule('accent', 1), Advance(15),
+        # 7. 알레르기 정보 (9대 알레르기)
+        Text(20, "Allergen Information", 'header', 'warning'), Advance(25),
+        Field(20, 'allergy', 'body', 'warning'), Advance(25),
+        Text(20, "※ This product contains allergens. Please check ingredients if you have allergies.",
+             'small', 'warning'), Advance(20),
+        # 8. FOP 라벨 (2025년 제안)
+        Text(20, "Front of Package Label", 'header', 'accent'), Advance(25),
+        Field(20, 'fop_saturated_fat', 'body', 'text'), Advance(20),
+        Field(20, 'fop_sodium', 'body', 'text'), Advance(20),
+        Field(20, 'fop_added_sugars', 'body', 'text'), Advance(20),
+        Advance(10),
+        # 9. 보관 방법
+        Text(20, "Storage Instructions", 'header', 'accent'), Advance(25),
+        Field(20, 'storage_method', 'body', 'text'), Advance(25),
+        # 10. 제조사 상세 정보
+        Field(20, 'address', 'small', 'text'), Advance(15),
+        Field(20, 'phone', 'small', 'text'), Advance(15)
+    )
+)
+
+
+@lru_cache(maxsize=256)
+def _qr_image(payload: str) -> Image.Image:
+    """QR코드 이미지 (80x80, 같은 내용이면 마스크 패턴 탐색 없이 재사용)"""
+    qr = qrcode.QRCode(version=1, box_size=3, border=2)
+    qr.add_data(payload)
+    qr.make(fit=True)
+    
+    qr_img = qr.make_image(fill_color="black", back_color="white")
+    return qr_img.resize((80, 80))
+
 
 class AdvancedLabelGenerator:
     """2027년 중국, 2025년 미국 규정을 반영한 고도화된 라벨 생성기"""
@@ -30,58 +164,14 @@ class AdvancedLabelGenerator:
         self.warning_color = (255, 0, 0)  # 빨간색
         self.allergy_color = (255, 140, 0)  # 주황색  # 주황색 (알레르기 강조)
         
-        # 폰트 설정 (다국어 지원 폰트 우선 사용)
-        try:
-            # 다국어 지원 폰트 우선 시도 (중국어, 영어, 한글 모두 지원)
-            multilingual_fonts = [
-                "C:/Windows/Fonts/msyh.ttc",      # Microsoft YaHei (중국어, 영어, 한글)
-                "C:/Windows/Fonts/simsun.ttc",    # SimSun (중국어, 영어)
-                "C:/Windows/Fonts/simhei.ttf",    # SimHei (중국어, 영어)
-                "C:/Windows/Fonts/arial.ttf",     # Arial (영어, 기본)
-                "C:/Windows/Fonts/calibri.ttf",   # Calibri (영어, 기본)
-                "C:/Windows/Fonts/tahoma.ttf",    # Tahoma (영어, 기본)
-                "msyh.ttc",                       # Microsoft YaHei
-                "simsun.ttc",                     # SimSun
-                "simhei.ttf",                     # SimHei
-                "arial.ttf",                      # Arial
-                "calibri.ttf",                    # Calibri
-                "tahoma.ttf",                     # Tahoma
-                "malgun.ttf",                     # 맑은 고딕 (한글)
-                "gulim.ttc",                      # 굴림 (한글)
-            ]
-            
-            font_found = False
-            for font_path in multilingual_fonts:
-                try:
-                    # OCR 인식도 향상을 위한 폰트 크기 증가
-                    self.title_font = ImageFont.truetype(font_path, 36)  # 제목 폰트 크기 증가
-                    self.header_font = ImageFont.truetype(font_path, 28)  # 헤더 폰트 크기 증가
-                    self.body_font = ImageFont.truetype(font_path, 22)    # 본문 폰트 크기 증가
-                    self.small_font = ImageFont.truetype(font_path, 20)   # 작은 폰트 크기 증가
-                    self.allergy_font = ImageFont.truetype(font_path, 22) # 알레르기 폰트 크기 증가
-                    print(f"✅ 다국어 폰트 로드 성공: {font_path}")
-                    font_found = True
-                    break
-                except:
-                    continue
-            
-            if not font_found:
-                # 폰트를 찾을 수 없는 경우 기본 폰트 사용
-                self.title_font = ImageFont.load_default()
-                self.header_font = ImageFont.load_default()
-                self.body_font = ImageFont.load_default()
-                self.small_font = ImageFont.load_default()
-                self.allergy_font = ImageFont.load_default()
-                print("⚠️ 다국어 폰트를 찾을 수 없어 기본 폰트를 사용합니다.")
-                
-        except Exception as e:
-            # 폰트를 찾을 수 없는 경우 기본 폰트 사용
-            self.title_font = ImageFont.load_default()
-            self.header_font = ImageFont.load_default()
-            self.body_font = ImageFont.load_default()
-            self.small_font = ImageFont.load_default()
-            self.allergy_font = ImageFont.load_default()
-            print(f"⚠️ 폰트 로드 실패: {e}")
+        # 폰트 설정 (다국어 지원 폰트 우선, 폰트 레지스트리에서 프로세스당 한 번만 탐색/로드)
+        # OCR 인식도 향상을 위해 큰 폰트 크기 사용
+        fonts = get_font_registry()
+        self.title_font = fonts.get_font('multilingual', 36)
+        self.header_font = fonts.get_font('multilingual', 28)
+        self.body_font = fonts.get_font('multilingual', 22)
+        self.small_font = fonts.get_font('multilingual', 20)
+        self.allergy_font = fonts.get_font('multilingual', 22)
         
         # 2027년 중국 알레르기 성분 (8대)
         self.china_allergens = [
@@ -104,83 +194,8 @@ class AdvancedLabelGenerator:
             # 중국어 전용 폰트 로딩 시도
             self._load_chinese_fonts()
             
-            # 이미지 생성
-            image = Image.new('RGB', (self.label_width, self.label_height), self.background_color)
-            draw = ImageDraw.Draw(image)
-            
-            y_position = 20
-            
-            # 안전한 텍스트 그리기 함수
-            def safe_draw_text(draw, position, text, font, fill):
-                try:
-                    if text is None:
-                        text = ""
-                    elif not isinstance(text, str):
-                        text = str(text)
-                    
-                    if not text.strip():
-                        text = "N/A"
-                    
-                    draw.text(position, text, fill=fill, font=font)
-                except Exception as e:
-                    print(f"⚠️ 텍스트 그리기 실패: {text} - {e}")
-                    try:
-                        draw.text(position, "N/A", fill=fill, font=font)
-                    except:
-                        pass
-            
-            # 1. 제품명 (사용자 입력 우선, 중국어 변환)
-            product_name = product_info.get("product_name", product_info.get("name", "라면"))
-            # 간단한 중국어 변환 (실제로는 번역 API 사용 권장)
-            chinese_name_map = {
-                "라면": "拉面", "김치": "泡菜", "된장": "大酱", "고추장": "辣椒酱"
-            }
-            product_name_chinese = chinese_name_map.get(product_name, f"{product_name}")
-            safe_draw_text(draw, (20, y_position), product_name_chinese, self.title_font, self.accent_color)
-            y_position += 40
-            
-            # 2. 원산지 (사용자 입력 우선)
-            origin = product_info.get("origin", "대한민국")
-            origin_chinese = "原产国：韩国" if origin == "대한민국" else f"原产国：{origin}"
-            safe_draw_text(draw, (20, y_position), origin_chinese, self.body_font, self.text_color)
-            y_position += 30
-            
-            # 3. 제조사 정보 (사용자 입력 우선)
-            manufacturer = product_info.get("manufacturer", "한국식품(주)")
-            manufacturer_chinese = "韩国食品公司" if manufacturer == "한국식품(주)" else f"{manufacturer}"
-            safe_draw_text(draw, (20, y_position), f"制造商：{manufacturer_chinese}", self.body_font, self.text_color)
-            y_position += 30
-            
-            # 4. 유통기한 (사용자 입력 우선)
-            expiry_date = product_info.get("expiry_date", "2026-12-31")
-            expiry_chinese = f"到期日：{expiry_date}"
-            safe_draw_text(draw, (20, y_position), expiry_chinese, self.body_font, self.text_color)
-            y_position += 40
-            
-            # 구분선
-            draw.line([(20, y_position), (self.label_width-20, y_position)], fill=self.accent_color, width=2)
-            y_position += 20
-            
-            # 5. 영양성분표 (1+6 체계)
-            y_position = self._draw_china_nutrition_table(draw, product_info, y_position)
-            
-            # 6. 성분표 (알레르기 성분 강조)
-            y_position = self._draw_china_ingredients(draw, product_info, y_position)
-            
-            # 7. 알레르기 정보 (8대 알레르기)
-            y_position = self._draw_china_allergy_info(draw, product_info, y_position)
-            
-            # 8. 경고 문구 (2027년 의무)
-            y_position = self._draw_china_warning(draw, y_position)
-            
-            # 9. 디지털 라벨 QR코드
-            y_position = self._draw_digital_label_qr(draw, product_info, y_position)
-            
-            # 10. 보관 방법
-            y_position = self._draw_storage_info(draw, product_info, y_position)
-            
-            # 11. 제조사 상세 정보
-            self._draw_manufacturer_details(draw, product_info, y_position)
+            # 정적 레이어는 캐시된 기본 이미지, 제품별 값만 그림
+            image = self._render_layout(CHINA_2027_TEMPLATE, self._china_2027_values(product_info))
             
             print("✅ 중국어 고급 라벨 생성 완료")
             return image
@@ -202,449 +217,163 @@ class AdvancedLabelGenerator:
                 return fallback_image
     
     def _load_chinese_fonts(self):
-        """중국어 전용 폰트 로딩"""
-        try:
-            chinese_fonts = [
-                "C:/Windows/Fonts/msyh.ttc",      # Microsoft YaHei
-                "C:/Windows/Fonts/simsun.ttc",    # SimSun
-                "C:/Windows/Fonts/simhei.ttf",    # SimHei
-                "msyh.ttc",
-                "simsun.ttc",
-                "simhei.ttf"
-            ]
-            
-            for font_path in chinese_fonts:
-                try:
-                    self.title_font = ImageFont.truetype(font_path, 36)
-                    self.header_font = ImageFont.truetype(font_path, 28)
-                    self.body_font = ImageFont.truetype(font_path, 22)
-                    self.small_font = ImageFont.truetype(font_path, 20)
-                    self.allergy_font = ImageFont.truetype(font_path, 22)
-                    print(f"✅ 중국어 폰트 로드 성공: {font_path}")
-                    return
-                except:
-                    continue
-            
-            print("⚠️ 중국어 폰트를 찾을 수 없어 기본 폰트를 사용합니다.")
-            
-        except Exception as e:
-            print(f"⚠️ 중국어 폰트 로드 실패: {e}")
+        """중국어 전용 폰트 적용 (중국어 폰트가 없으면 현재 폰트 유지)"""
+        fonts = get_font_registry()
+        if fonts.resolve('chinese') is None:
+            return
+        self.title_font = fonts.find_font('chinese', 36)
+        self.header_font = fonts.find_font('chinese', 28)
+        self.body_font = fonts.find_font('chinese', 22)
+        self.small_font = fonts.find_font('chinese', 20)
+        self.allergy_font = fonts.find_font('chinese', 22)
     
     def generate_us_2025_label(self, product_info: Dict) -> Image.Image:
         """2025년 미국 FDA 새로운 라벨링 규정 라벨 생성"""
+        return self._render_layout(US_2025_TEMPLATE, self._us_2025_values(product_info))
+    
+    def _render_layout(self, template: LabelTemplate, values: Dict) -> Image.Image:
+        """컴파일된 레이아웃으로 라벨 생성 (현재 글꼴/색상 조합마다 정적 레이어 한 번 컴파일)"""
+        fonts = {
+            'title': self.title_font, 'header': self.header_font, 'body': self.body_font,
+            'small': self.small_font, 'allergy': self.allergy_font
+        }
+        palette = {
+            'background': self.background_color, 'text': self.text_color, 'accent': self.accent_color,
+            'warning': self.warning_color, 'allergy': self.allergy_color
+        }
+        return get_label_layouts().render(template, (self.label_width, self.label_height), fonts, palette, values)
+    
+    def _china_2027_values(self, product_info: Dict) -> Dict:
+        """중국 라벨 가변 값 (제품명, 원산지, 영양성분 값, 성분, 알레르기, QR코드 등)"""
+        values = {}
         
-        # 이미지 생성
-        image = Image.new('RGB', (self.label_width, self.label_height), self.background_color)
-        draw = ImageDraw.Draw(image)
-        
-        y_position = 20
-        
-        # 1. 제품명 (사용자 입력 우선, 영어 변환)
+        # 1. 제품명 (사용자 입력 우선, 중국어 변환)
         product_name = product_info.get("product_name", product_info.get("name", "라면"))
-        # 간단한 영어 변환 (실제로는 번역 API 사용 권장)
-        english_name_map = {
-            "라면": "Korean Ramen", "김치": "Korean Kimchi", "된장": "Korean Doenjang", "고추장": "Korean Gochujang"
+        # 간단한 중국어 변환 (실제로는 번역 API 사용 권장)
+        chinese_name_map = {
+            "라면": "拉面", "김치": "泡菜", "된장": "大酱", "고추장": "辣椒酱"
         }
-        product_name_english = english_name_map.get(product_name, f"Korean {product_name}")
-        draw.text((20, y_position), product_name_english, fill=self.accent_color, font=self.title_font)
-        y_position += 40
+        values['product_name'] = chinese_name_map.get(product_name, f"{product_name}")
         
         # 2. 원산지 (사용자 입력 우선)
         origin = product_info.get("origin", "대한민국")
-        origin_english = "Republic of Korea" if origin == "대한민국" else origin
-        draw.text((20, y_position), f"Country of Origin: {origin_english}", fill=self.text_color, font=self.body_font)
-        y_position += 30
+        values['origin'] = "原产国：韩国" if origin == "대한민국" else f"原产国：{origin}"
         
         # 3. 제조사 정보 (사용자 입력 우선)
         manufacturer = product_info.get("manufacturer", "한국식품(주)")
-        manufacturer_english = "Korean Food Co., Ltd." if manufacturer == "한국식품(주)" else f"{manufacturer}"
-        draw.text((20, y_position), f"Manufacturer: {manufacturer_english}", fill=self.text_color, font=self.body_font)
-        y_position += 30
+        manufacturer_chinese = "韩国食品公司" if manufacturer == "한국식품(주)" else f"{manufacturer}"
+        values['manufacturer'] = f"制造商：{manufacturer_chinese}"
         
         # 4. 유통기한 (사용자 입력 우선)
-        expiry_date = product_info.get("expiry_date", "2026-12-31")
-        draw.text((20, y_position), f"Best Before: {expiry_date}", fill=self.text_color, font=self.body_font)
-        y_position += 40
-        
-        # 구분선
-        draw.line([(20, y_position), (self.label_width-20, y_position)], fill=self.accent_color, width=2)
-        y_position += 20
-        
-        # 5. 영양성분표 (2025년 FDA 규정)
-        y_position = self._draw_us_nutrition_table(draw, product_info, y_position)
-        
-        # 6. 성분표 (알레르기 성분 강조)
-        y_position = self._draw_us_ingredients(draw, product_info, y_position)
-        
-        # 7. 알레르기 정보 (9대 알레르기)
-        y_position = self._draw_us_allergy_info(draw, product_info, y_position)
-        
-        # 8. FOP 라벨 (2025년 제안)
-        y_position = self._draw_fop_label(draw, product_info, y_position)
+        values['expiry_date'] = f"到期日：{product_info.get('expiry_date', '2026-12-31')}"
         
-        # 9. 보관 방법
-        y_position = self._draw_storage_info_english(draw, product_info, y_position)
-        
-        # 10. 제조사 상세 정보
-        self._draw_manufacturer_details_english(draw, product_info, y_position)
-        
-        return image
-    
-    def _draw_china_nutrition_table(self, draw: ImageDraw.Draw, product_info: Dict, y_position: int) -> int:
-        """중국 1+6 영양성분표 그리기 (안전한 버전)"""
-        
-        def safe_draw_text(draw, position, text, font, fill):
-            try:
-                if text is None:
-                    text = ""
-                elif not isinstance(text, str):
-                    text = str(text)
-                
-                if not text.strip():
-                    text = "N/A"
-                
-                draw.text(position, text, fill=fill, font=font)
-            except Exception as e:
-                print(f"⚠️ 텍스트 그리기 실패: {text} - {e}")
-                try:
-                    draw.text(position, "N/A", fill=fill, font=font)
-                except:
-                    pass
-        
-        # 제목
-        safe_draw_text(draw, (20, y_position), "营养成分表 (每100g)", self.header_font, self.accent_color)
-        y_position += 30
-        
-        # 표 헤더
-        safe_draw_text(draw, (20, y_position), "项目", self.body_font, self.text_color)
-        safe_draw_text(draw, (200, y_position), "含量", self.body_font, self.text_color)
-        safe_draw_text(draw, (300, y_position), "营养素参考值%", self.body_font, self.text_color)
-        y_position += 25
-        
-        # 구분선
-        draw.line([(20, y_position), (self.label_width-20, y_position)], fill=self.text_color, width=1)
-        y_position += 10
-        
-        # 1+6 필수 영양성분 (사용자 입력 우선)
+        # 5. 1+6 필수 영양성분 (사용자 입력 우선)
         nutrition_data = product_info.get("nutrition", {})
-        china_nutrition = {
-            "能量": f"{nutrition_data.get('calories', '400')} kcal",
-            "蛋白质": f"{nutrition_data.get('protein', '12')}g",
-            "脂肪": f"{nutrition_data.get('fat', '15')}g",
-            "饱和脂肪": f"{nutrition_data.get('saturated_fat', '5')}g",
-            "碳水化合物": f"{nutrition_data.get('carbs', '60')}g",
-            "糖": f"{nutrition_data.get('sugar', '5')}g",
-            "钠": f"{nutrition_data.get('sodium', '800')}mg"
-        }
-        
-        for nutrient, value in china_nutrition.items():
-            safe_draw_text(draw, (20, y_position), nutrient, self.body_font, self.text_color)
-            safe_draw_text(draw, (200, y_position), value, self.body_font, self.text_color)
+        for index, (_, key, default, unit) in enumerate(CHINA_NUTRIENTS):
+            value = f"{nutrition_data.get(key, default)}{unit}"
+            values[f'nutrient_{index}'] = value
             
             # NRV% 계산 (예시)
             if "kcal" in value:
-                nrv = "20%"
+                values[f'nrv_{index}'] = "20%"
             elif "g" in value:
-                nrv = "15%"
+                values[f'nrv_{index}'] = "15%"
             elif "mg" in value:
-                nrv = "35%"
+                values[f'nrv_{index}'] = "35%"
             else:
-                nrv = "10%"
-            
-            safe_draw_text(draw, (300, y_position), nrv, self.body_font, self.text_color)
-            y_position += 20
-        
-        y_position += 20
-        
-        # 구분선
-        draw.line([(20, y_position), (self.label_width-20, y_position)], fill=self.accent_color, width=1)
-        y_position += 15
+                values[f'nrv_{index}'] = "10%"
         
-        return y_position
-    
-    def _draw_us_nutrition_table(self, draw: ImageDraw.Draw, product_info: Dict, y_position: int) -> int:
-        """미국 2025년 FDA 영양성분표 그리기"""
-        
-        # 제목
-        draw.text((20, y_position), "Nutrition Facts", fill=self.accent_color, font=self.header_font)
-        y_position += 30
-        
-        # 1회 제공량
-        serving_size = "1 package (85g)"
-        draw.text((20, y_position), f"Serving Size: {serving_size}", fill=self.text_color, font=self.body_font)
-        y_position += 25
-        
-        # 칼로리 (강조)
-        calories = product_info.get("nutrition", {}).get("열량", "400 kcal").split()[0]
-        draw.text((20, y_position), f"Calories: {calories}", fill=self.text_color, font=self.header_font)
-        y_position += 30
-        
-        # 구분선
-        draw.line([(20, y_position), (self.label_width-20, y_position)], fill=self.text_color, width=2)
-        y_position += 10
-        
-        # 영양성분 (13개 필수, 사용자 입력 우선)
-        nutrition_data = product_info.get("nutrition", {})
-        us_nutrition = [
-            ("Total Fat", f"{nutrition_data.get('fat', '15')}g", "25%"),
-            ("Saturated Fat", f"{nutrition_data.get('saturated_fat', '5')}g", "25%"),
-            ("Trans Fat", "0g", "0%"),
-            ("Cholesterol", "0mg", "0%"),
-            ("Sodium", f"{nutrition_data.get('sodium', '800')}mg", "35%"),
-            ("Total Carbohydrate", f"{nutrition_data.get('carbs', '60')}g", "20%"),
-            ("Dietary Fiber", f"{nutrition_data.get('fiber', '2')}g", "8%"),
-            ("Total Sugars", f"{nutrition_data.get('sugar', '5')}g", ""),
-            ("Added Sugars", "0g", "0%"),
-            ("Protein", f"{nutrition_data.get('protein', '12')}g", ""),
-            ("Vitamin D", "0mcg", "0%"),
-            ("Calcium", "20mg", "2%"),
-            ("Iron", "2mg", "10%"),
-            ("Potassium", "200mg", "4%")
-        ]
-        
-        for nutrient, value, dv in us_nutrition:
-            draw.text((20, y_position), nutrient, fill=self.text_color, font=self.body_font)
-            draw.text((200, y_position), value, fill=self.text_color, font=self.body_font)
-            if dv:
-                draw.text((300, y_position), f"{dv} DV", fill=self.text_color, font=self.body_font)
-            y_position += 18
-        
-        y_position += 20
-        
-        # 구분선
-        draw.line([(20, y_position), (self.label_width-20, y_position)], fill=self.accent_color, width=1)
-        y_position += 15
-        
-        return y_position
-    
-    def _draw_china_ingredients(self, draw: ImageDraw.Draw, product_info: Dict, y_position: int) -> int:
-        """중국 성분표 (알레르기 성분 강조) - 안전한 버전"""
-        
-        def safe_draw_text(draw, position, text, font, fill):
-            try:
-                if text is None:
-                    text = ""
-                elif not isinstance(text, str):
-                    text = str(text)
-                
-                if not text.strip():
-                    text = "N/A"
-                
-                draw.text(position, text, fill=fill, font=font)
-            except Exception as e:
-                print(f"⚠️ 텍스트 그리기 실패: {text} - {e}")
-                try:
-                    draw.text(position, "N/A", fill=fill, font=font)
-                except:
-                    pass
-        
-        # 제목
-        safe_draw_text(draw, (20, y_position), "配料表", self.header_font, self.accent_color)
-        y_position += 25
-        
-        # 성분 목록
+        # 6. 성분표 (알레르기 성분 강조)
         ingredients = product_info.get("ingredients", [
             "面条(小麦粉, 盐)", "调味粉", "脱水蔬菜", "调味料", "香料"
         ])
+        values['ingredients'] = [
+            ((f"⚠ {ingredient}", 'allergy', 'allergy'),)
+            if any(allergen in ingredient for allergen in self.china_allergens)
+            else ((f"• {ingredient}", 'body', 'text'),)
+            for ingredient in ingredients
+        ]
         
-        for ingredient in ingredients:
-            # 알레르기 성분 강조 표시
-            is_allergy = any(allergen in ingredient for allergen in self.china_allergens)
-            color = self.allergy_color if is_allergy else self.text_color
-            font = self.allergy_font if is_allergy else self.body_font
-            
-            prefix = "• " if not is_allergy else "⚠ "
-            safe_draw_text(draw, (20, y_position), f"{prefix}{ingredient}", font, color)
-            y_position += 18
-        
-        y_position += 10
-        
-        # 구분선
-        draw.line([(20, y_position), (self.label_width-20, y_position)], fill=self.accent_color, width=1)
-        y_position += 15
-        
-        return y_position
-    
-    def _draw_us_ingredients(self, draw: ImageDraw.Draw, product_info: Dict, y_position: int) -> int:
-        """미국 성분표 (알레르기 성분 강조)"""
-        
-        # 제목
-        draw.text((20, y_position), "Ingredients", fill=self.accent_color, font=self.header_font)
-        y_position += 25
-        
-        # 성분 목록
-        ingredients = product_info.get("ingredients_english", [
-            "Noodles (Wheat Flour, Salt)", "Seasoning Powder", "Dehydrated Vegetables", 
-            "Seasoning", "Spices"
-        ])
-        
-        for ingredient in ingredients:
-            # 알레르기 성분 강조 표시
-            is_allergy = any(allergen.lower() in ingredient.lower() for allergen in self.us_allergens)
-            color = self.allergy_color if is_allergy else self.text_color
-            font = self.allergy_font if is_allergy else self.body_font
-            
-            prefix = "• " if not is_allergy else "⚠ "
-            draw.text((20, y_position), f"{prefix}{ingredient}", fill=color, font=font)
-            y_position += 18
-        
-        y_position += 10
-        
-        # 구분선
-        draw.line([(20, y_position), (self.label_width-20, y_position)], fill=self.accent_color, width=1)
-        y_position += 15
-        
-        return y_position
-    
-    def _draw_china_allergy_info(self, draw: ImageDraw.Draw, product_info: Dict, y_position: int) -> int:
-        """중국 알레르기 정보 (8대 알레르기) - 안전한 버전"""
-        
-        def safe_draw_text(draw, position, text, font, fill):
-            try:
-                if text is None:
-                    text = ""
-                elif not isinstance(text, str):
-                    text = str(text)
-                
-                if not text.strip():
-                    text = "N/A"
-                
-                draw.text(position, text, fill=fill, font=font)
-            except Exception as e:
-                print(f"⚠️ 텍스트 그리기 실패: {text} - {e}")
-                try:
-                    draw.text(position, "N/A", fill=fill, font=font)
-                except:
-                    pass
-        
-        # 제목
-        safe_draw_text(draw, (20, y_position), "过敏原信息", self.header_font, self.warning_color)
-        y_position += 25
-        
-        # 사용자 입력 알레르기 정보
+        # 7. 알레르기 정보 (사용자 입력, 중국어 변환)
         allergies = product_info.get("allergies", [])
         if allergies:
-            # 알레르기 성분을 중국어로 변환
             allergy_map = {
                 "밀": "小麦", "대두": "大豆", "계란": "鸡蛋", "우유": "牛奶",
                 "땅콩": "花生", "견과류": "坚果", "조개류": "贝类", "어류": "鱼类"
             }
             allergy_ingredients = [allergy_map.get(allergy, allergy) for allergy in allergies]
-            allergy_text = "含有: " + ", ".join(allergy_ingredients)
-            safe_draw_text(draw, (20, y_position), allergy_text, self.body_font, self.warning_color)
+            values['allergy'] = "含有: " + ", ".join(allergy_ingredients)
         else:
-            safe_draw_text(draw, (20, y_position), "含有: 无", self.body_font, self.text_color)
+            values['allergy'] = ("含有: 无", 'body', 'text')
         
-        y_position += 25
+        # 9. 디지털 라벨 QR코드
+        values['qr'] = self._digital_label_qr(product_info)
         
-        # 주의사항
-        safe_draw_text(draw, (20, y_position), "※ 本产品含有过敏原成分，请过敏体质者注意。", 
-                     self.small_font, self.warning_color)
-        y_position += 20
+        # 10. 보관 방법, 11. 제조사 상세 정보
+        values['storage_method'] = product_info.get("storage_method_chinese", "常温保存，避免阳光直射")
+        values['address'] = f"地址: {product_info.get('address_chinese', '韩国首尔江南区')}"
+        values['phone'] = f"电话: {product_info.get('phone', '02-1234-5678')}"
         
-        return y_position
+        return values
     
-    def _draw_us_allergy_info(self, draw: ImageDraw.Draw, product_info: Dict, y_position: int) -> int:
-        """미국 알레르기 정보 (9대 알레르기)"""
+    def _us_2025_values(self, product_info: Dict) -> Dict:
+        """미국 라벨 가변 값 (제품명, 원산지, 칼로리/영양성분 값, 성분, 알레르기, FOP 등)"""
+        values = {}
+        
+        # 1. 제품명 (사용자 입력 우선, 영어 변환)
+        product_name = product_info.get("product_name", product_info.get("name", "라면"))
+        # 간단한 영어 변환 (실제로는 번역 API 사용 권장)
+        english_name_map = {
+            "라면": "Korean Ramen", "김치": "Korean Kimchi", "된장": "Korean Doenjang", "고추장": "Korean Gochujang"
+        }
+        values['product_name'] = english_name_map.get(product_name, f"Korean {product_name}")
+        
+        # 2. 원산지 (사용자 입력 우선)
+        origin = product_info.get("origin", "대한민국")
+        origin_english = "Republic of Korea" if origin == "대한민국" else origin
+        values['origin'] = f"Country of Origin: {origin_english}"
+        
+        # 3. 제조사 정보 (사용자 입력 우선)
+        manufacturer = product_info.get("manufacturer", "한국식품(주)")
+        manufacturer_english = "Korean Food Co., Ltd." if manufacturer == "한국식품(주)" else f"{manufacturer}"
+        values['manufacturer'] = f"Manufacturer: {manufacturer_english}"
+        
+        # 4. 유통기한 (사용자 입력 우선)
+        values['expiry_date'] = f"Best Before: {product_info.get('expiry_date', '2026-12-31')}"
+        
+        # 5. 영양성분표 (칼로리 강조, 13개 필수 중 입력 값이 있는 항목)
+        nutrition_data = product_info.get("nutrition", {})
+        calories = nutrition_data.get("열량", "400 kcal").split()[0]
+        values['calories'] = f"Calories: {calories}"
+        for index, (_, key, default, unit, _) in enumerate(US_NUTRIENTS):
+            if key:
+                values[f'nutrient_{index}'] = f"{nutrition_data.get(key, default)}{unit}"
         
-        # 제목
-        draw.text((20, y_position), "Allergen Information", fill=self.warning_color, font=self.header_font)
-        y_position += 25
+        # 6. 성분표 (알레르기 성분 강조)
+        ingredients = product_info.get("ingredients_english", [
+            "Noodles (Wheat Flour, Salt)", "Seasoning Powder", "Dehydrated Vegetables", 
+            "Seasoning", "Spices"
+        ])
+        values['ingredients'] = [
+            ((f"⚠ {ingredient}", 'allergy', 'allergy'),)
+            if any(allergen.lower() in ingredient.lower() for allergen in self.us_allergens)
+            else ((f"• {ingredient}", 'body', 'text'),)
+            for ingredient in ingredients
+        ]
         
-        # 사용자 입력 알레르기 정보
+        # 7. 알레르기 정보 (사용자 입력, 영어 변환)
         allergies = product_info.get("allergies", [])
         if allergies:
-            # 알레르기 성분을 영어로 변환
             allergy_map = {
                 "밀": "Wheat", "대두": "Soy", "계란": "Egg", "우유": "Milk",
                 "땅콩": "Peanut", "견과류": "Tree Nuts", "조개류": "Shellfish", "어류": "Fish"
             }
             allergy_ingredients = [allergy_map.get(allergy, allergy) for allergy in allergies]
-            draw.text((20, y_position), "Contains: " + ", ".join(allergy_ingredients), 
-                     fill=self.warning_color, font=self.body_font)
+            values['allergy'] = "Contains: " + ", ".join(allergy_ingredients)
         else:
-            draw.text((20, y_position), "Contains: None", fill=self.text_color, font=self.body_font)
-        
-        y_position += 25
-        
-        # 주의사항
-        draw.text((20, y_position), "※ This product contains allergens. Please check ingredients if you have allergies.", 
-                 fill=self.warning_color, font=self.small_font)
-        y_position += 20
-        
-        return y_position
-    
-    def _draw_china_warning(self, draw: ImageDraw.Draw, y_position: int) -> int:
-        """중국 2027년 의무 경고 문구 - 안전한 버전"""
-        
-        def safe_draw_text(draw, position, text, font, fill):
-            try:
-                if text is None:
-                    text = ""
-                elif not isinstance(text, str):
-                    text = str(text)
-                
-                if not text.strip():
-                    text = "N/A"
-                
-                draw.text(position, text, fill=fill, font=font)
-            except Exception as e:
-                print(f"⚠️ 텍스트 그리기 실패: {text} - {e}")
-                try:
-                    draw.text(position, "N/A", fill=fill, font=font)
-                except:
-                    pass
-        
-        # 경고 문구
-        warning_text = "儿童及青少年应避免过量摄入钠、脂肪、糖"
-        safe_draw_text(draw, (20, y_position), warning_text, self.body_font, self.warning_color)
-        y_position += 25
-        
-        return y_position
-    
-    def _draw_digital_label_qr(self, draw: ImageDraw.Draw, product_info: Dict, y_position: int) -> int:
-        """중국 디지털 라벨 QR코드"""
-        
-        # 디지털 라벨 문구
-        draw.text((20, y_position), "数字标签", fill=self.accent_color, font=self.header_font)
-        y_position += 25
-        
-        # QR코드 생성
-        qr_data = {
-            "product_name": product_info.get("product_name_chinese", "拉面"),
-            "manufacturer": product_info.get("manufacturer_chinese", "韩国食品公司"),
-            "nutrition": product_info.get("nutrition", {}),
-            "ingredients": product_info.get("ingredients", []),
-            "allergy_info": product_info.get("allergy_ingredients", []),
-            "digital_label": True
-        }
-        
-        # QR코드 이미지 생성
-        qr = qrcode.QRCode(version=1, box_size=3, border=2)
-        qr.add_data(json.dumps(qr_data, ensure_ascii=False))
-        qr.make(fit=True)
-        
-        qr_img = qr.make_image(fill_color="black", back_color="white")
-        qr_img = qr_img.resize((80, 80))
-        
-        # QR코드를 메인 이미지에 붙이기
-        image = draw._image
-        image.paste(qr_img, (20, y_position))
-        
-        y_position += 90
-        
-        return y_position
-    
-    def _draw_fop_label(self, draw: ImageDraw.Draw, product_info: Dict, y_position: int) -> int:
-        """미국 FOP 라벨 (2025년 제안)"""
-        
-        # FOP 라벨 제목
-        draw.text((20, y_position), "Front of Package Label", fill=self.accent_color, font=self.header_font)
-        y_position += 25
-        
-        # FOP 정보 박스
-        nutrition_data = product_info.get("nutrition", {})
+            values['allergy'] = ("Contains: None", 'body', 'text')
         
+        # 8. FOP 라벨 (2025년 제안)
         # 포화지방 평가
         sat_fat = float(nutrition_data.get("포화지방", "5g").replace("g", ""))
         sat_fat_level = "High" if sat_fat > 5 else "Med" if sat_fat > 2 else "Low"
@@ -657,112 +386,31 @@ class AdvancedLabelGenerator:
         added_sugar = float(nutrition_data.get("당류", "5g").replace("g", ""))
         sugar_level = "High" if added_sugar > 10 else "Med" if added_sugar > 5 else "Low"
         
-        # FOP 표시
-        fop_items = [
-            f"Saturated Fat: {sat_fat_level}",
-            f"Sodium: {sodium_level}",
-            f"Added Sugars: {sugar_level}"
-        ]
-        
-        for item in fop_items:
-            draw.text((20, y_position), item, fill=self.text_color, font=self.body_font)
-            y_position += 20
-        
-        y_position += 10
-        
-        return y_position
-    
-    def _draw_storage_info(self, draw: ImageDraw.Draw, product_info: Dict, y_position: int) -> int:
-        """보관 방법 (중국어) - 안전한 버전"""
-        
-        def safe_draw_text(draw, position, text, font, fill):
-            try:
-                if text is None:
-                    text = ""
-                elif not isinstance(text, str):
-                    text = str(text)
-                
-                if not text.strip():
-                    text = "N/A"
-                
-                draw.text(position, text, fill=fill, font=font)
-            except Exception as e:
-                print(f"⚠️ 텍스트 그리기 실패: {text} - {e}")
-                try:
-                    draw.text(position, "N/A", fill=fill, font=font)
-                except:
-                    pass
-        
-        # 제목
-        safe_draw_text(draw, (20, y_position), "储存方法", self.header_font, self.accent_color)
-        y_position += 25
-        
-        # 보관 방법
-        storage_method = product_info.get("storage_method_chinese", "常温保存，避免阳光直射")
-        safe_draw_text(draw, (20, y_position), storage_method, self.body_font, self.text_color)
-        y_position += 25
-        
-        return y_position
-    
-    def _draw_storage_info_english(self, draw: ImageDraw.Draw, product_info: Dict, y_position: int) -> int:
-        """보관 방법 (영어)"""
-        
-        # 제목
-        draw.text((20, y_position), "Storage Instructions", fill=self.accent_color, font=self.header_font)
-        y_position += 25
-        
-        # 보관 방법
-        storage_method = product_info.get("storage_method_english", "Store at room temperature, avoid direct sunlight")
-        draw.text((20, y_position), storage_method, fill=self.text_color, font=self.body_font)
-        y_position += 25
-        
-        return y_position
-    
-    def _draw_manufacturer_details(self, draw: ImageDraw.Draw, product_info: Dict, y_position: int) -> int:
-        """제조사 상세 정보 (중국어) - 안전한 버전"""
-        
-        def safe_draw_text(draw, position, text, font, fill):
-            try:
-                if text is None:
-                    text = ""
-                elif not isinstance(text, str):
-                    text = str(text)
-                
-                if not text.strip():
-                    text = "N/A"
-                
-                draw.text(position, text, fill=fill, font=font)
-            except Exception as e:
-                print(f"⚠️ 텍스트 그리기 실패: {text} - {e}")
-                try:
-                    draw.text(position, "N/A", fill=fill, font=font)
-                except:
-                    pass
-        
-        # 제조사 정보
-        address = product_info.get("address_chinese", "韩国首尔江南区")
-        phone = product_info.get("phone", "02-1234-5678")
+        values['fop_saturated_fat'] = f"Saturated Fat: {sat_fat_level}"
+        values['fop_sodium'] = f"Sodium: {sodium_level}"
+        values['fop_added_sugars'] = f"Added Sugars: {sugar_level}"
         
-        safe_draw_text(draw, (20, y_position), f"地址: {address}", self.small_font, self.text_color)
-        y_position += 15
-        safe_draw_text(draw, (20, y_position), f"电话: {phone}", self.small_font, self.text_color)
-        y_position += 15
+        # 9. 보관 방법, 10. 제조사 상세 정보
+        values['storage_method'] = product_info.get("storage_method_english", "Store at room temperature, avoid direct sunlight")
+        values['address'] = f"Address: {product_info.get('address_english', 'Seoul, South Korea')}"
+        values['phone'] = f"Phone: {product_info.get('phone', '02-1234-5678')}"
         
-        return y_position
+        return values
     
-    def _draw_manufacturer_details_english(self, draw: ImageDraw.Draw, product_info: Dict, y_position: int) -> int:
-        """제조사 상세 정보 (영어)"""
-        
-        # 제조사 정보
-        address = product_info.get("address_english", "Seoul, South Korea")
-        phone = product_info.get("phone", "02-1234-5678")
+    def _digital_label_qr(self, product_info: Dict) -> Image.Image:
+        """중국 디지털 라벨 QR코드 이미지 (80x80)"""
         
-        draw.text((20, y_position), f"Address: {address}", fill=self.text_color, font=self.small_font)
-        y_position += 15
-        draw.text((20, y_position), f"Phone: {phone}", fill=self.text_color, font=self.small_font)
-        y_position += 15
+        # QR코드 생성
+        qr_data = {
+            "product_name": product_info.get("product_name_chinese", "拉面"),
+            "manufacturer": product_info.get("manufacturer_chinese", "韩国食品公司"),
+            "nutrition": product_info.get("nutrition", {}),
+            "ingredients": product_info.get("ingredients", []),
+            "allergy_info": product_info.get("allergy_ingredients", []),
+            "digital_label": True
+        }
         
-        return y_position
+        return _qr_image(json.dumps(qr_data, ensure_ascii=False))
     
     def save_label(self, image: Image.Image, filename: str, output_dir: str = "advanced_labels"):
         """라벨 이미지 저장"""
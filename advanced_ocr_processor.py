@@ -69,6 +69,12 @@ except ImportError:
     AZURE_VISION_AVAILABLE = False
     print("⚠️ Azure Computer Vision을 사용할 수 없습니다.")
 
+from nutrition_table_parser import parse_nutrition_table
+from utils.image_preprocessing import PreprocessingPipeline, preprocessing_pipeline
+from utils.ocr_engine_pool import ocr_engine_pool
+from utils.ocr_job_queue import remove_job_upload
+from utils.ocr_result_cache import get_ocr_result_cache, hash_image
+
 @dataclass
 class OCRResult:
     """OCR 결과 데이터 클래스"""
@@ -108,8 +114,9 @@ class LayoutData:
 class AdvancedImagePreprocessor:
     """고급 이미지 전처리기 (문서별 맞춤 설정)"""
     
-    def __init__(self):
+    def __init__(self, pipeline: Optional[PreprocessingPipeline] = None):
         self.logger = logging.getLogger(__name__)
+        self.pipeline = pipeline or preprocessing_pipeline
         
         # 문서별 최적화 설정
         self.document_settings = {
@@ -150,47 +157,22 @@ class AdvancedImagePreprocessor:
         settings = self.document_settings[document_type]
         self.logger.info(f"🔧 {document_type} 전처리 시작")
         
-        processed_image = image.copy()
+        # 버퍼 재사용 단일 패스 파이프라인 (품질 측정 결과에 따라 단계 생략)
+        try:
+            processed_image, pipeline_info = self.pipeline.run(image, settings)
+        except Exception as e:
+            self.logger.warning(f"❌ 전처리 파이프라인 실패, 원본 사용: {e}")
+            processed_image = image.copy()
+            pipeline_info = {'processing_steps': [], 'skipped_steps': {}, 'final_size': image.shape,
+                             'elapsed_ms': 0.0}
         preprocessing_info = {
             'document_type': document_type,
             'original_size': image.shape,
             'applied_settings': settings,
-            'processing_steps': []
+            **pipeline_info
         }
-        
-        # 1. 해상도 향상
-        if settings['enhance_resolution']:
-            processed_image = self.enhance_resolution(processed_image, settings['scale_factor'])
-            preprocessing_info['processing_steps'].append('resolution_enhancement')
-        
-        # 2. 잡음제거
-        if settings['noise_reduction'] != 'none':
-            processed_image = self.remove_noise_optimized(processed_image, settings['noise_reduction'])
-            preprocessing_info['processing_steps'].append('noise_reduction')
-        
-        # 3. 대비 향상
-        if settings['contrast_enhancement'] != 'none':
-            processed_image = self.enhance_contrast_optimized(processed_image, settings['contrast_enhancement'])
-            preprocessing_info['processing_steps'].append('contrast_enhancement')
-        
-        # 4. 회전 보정
-        if settings['rotation_correction']:
-            processed_image, rotation_angle = self.correct_rotation(processed_image)
-            preprocessing_info['rotation_angle'] = rotation_angle
-            preprocessing_info['processing_steps'].append('rotation_correction')
-        
-        # 5. 이진화
-        if settings['binarization'] != 'none':
-            processed_image = self.binarize_optimized(processed_image, settings['binarization'])
-            preprocessing_info['processing_steps'].append('binarization')
-        
-        # 6. 모폴로지 연산
-        if settings['morphology'] != 'none':
-            processed_image = self.apply_morphology(processed_image, settings['morphology'])
-            preprocessing_info['processing_steps'].append('morphology')
-        
-        preprocessing_info['final_size'] = processed_image.shape
-        self.logger.info(f"✅ {document_type} 전처리 완료: {len(preprocessing_info['processing_steps'])}단계")
+        self.logger.info(f"✅ {document_type} 전처리 완료: {len(preprocessing_info['processing_steps'])}단계 "
+                         f"({pipeline_info['elapsed_ms']}ms, 생략: {', '.join(pipeline_info['skipped_steps']) or '없음'})")
         
         return {
             'processed_image': processed_image,
@@ -414,6 +396,63 @@ class AdvancedImagePreprocessor:
             self.logger.warning(f"❌ 문서 유형 감지 실패: {e}")
             return 'general_document'
     
+    def detect_text_regions(self, image: np.ndarray, max_side: int = 1200, min_area_ratio: float = 0.0005,
+                            padding: int = 12) -> List[Tuple[int, int, int, int]]:
+        """축소본에서 텍스트/표 영역 검출 후 원본 좌표 (x0, y0, x1, y1) 목록 반환 (위->아래 순)"""
+        try:
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
+            height, width = gray.shape[:2]
+            ratio = min(1.0, max_side / float(max(height, width)))
+            small = cv2.resize(gray, None, fx=ratio, fy=ratio, interpolation=cv2.INTER_AREA) if ratio < 1.0 else gray
+            
+            # 글자 경계 강조 -> 이진화 -> 가로로 이어 붙여 줄/블록 단위 영역 생성
+            gradient = cv2.morphologyEx(small, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+            _, binary = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            if not binary.any():
+                return []
+            kernel_w = max(9, int(small.shape[1] * 0.02))
+            connected = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (kernel_w, 5)))
+            contours, _ = cv2.findContours(connected, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            
+            min_area = small.shape[0] * small.shape[1] * min_area_ratio
+            rects = []
+            for contour in contours:
+                x, y, w, h = cv2.boundingRect(contour)
+                if w * h < min_area or h < 4:
+                    continue
+                rects.append((
+                    max(int(x / ratio) - padding, 0),
+                    max(int(y / ratio) - padding, 0),
+                    min(int((x + w) / ratio) + padding, width),
+                    min(int((y + h) / ratio) + padding, height)
+                ))
+            
+            regions = _merge_rects(rects)
+            regions.sort(key=lambda r: (r[1], r[0]))
+            self.logger.info(f"🧭 레이아웃 영역 {len(regions)}개 검출 (축소 비율 {ratio:.2f})")
+            return regions
+        except Exception as e:
+            self.logger.warning(f"❌ 레이아웃 영역 검출 실패: {e}")
+            return []
+    
+    def preprocess_tiles(self, image: np.ndarray, regions: List[Tuple[int, int, int, int]],
+                         document_type: str = 'general_document') -> List[Dict[str, Any]]:
+        """영역별로 잘라서 전처리 (해상도 향상은 영역에만 적용)"""
+        tiles = []
+        for rect in regions:
+            x0, y0, x1, y1 = rect
+            crop = image[y0:y1, x0:x1]
+            if crop.size == 0:
+                continue
+            processed = self.preprocess_for_document_type(crop, document_type)['processed_image']
+            tiles.append({
+                'rect': rect,
+                'image': processed,
+                'scale_x': processed.shape[1] / float(crop.shape[1]),
+                'scale_y': processed.shape[0] / float(crop.shape[0])
+            })
+        return tiles
+    
     def preprocess_image(self, image: np.ndarray, enhance_resolution: bool = True) -> Dict[str, Any]:
         """전체 이미지 전처리 파이프라인"""
         original = image.copy()
@@ -459,70 +498,125 @@ class AdvancedImagePreprocessor:
                 'error': str(e)
             }
 
+# 캐스케이드 모드 엔진 실행 순서 (저렴한 엔진 우선)
+CASCADE_ENGINE_ORDER = ['tesseract', 'paddleocr', 'easyocr', 'google_vision', 'azure_vision']
+
+def _bbox_rect(bbox) -> Tuple[float, float, float, float]:
+    """꼭짓점 목록 -> 축 정렬 사각형 (x0, y0, x1, y1)"""
+    xs = [float(p[0]) for p in bbox]
+    ys = [float(p[1]) for p in bbox]
+    return min(xs), min(ys), max(xs), max(ys)
+
+def _rect_iou(a: Tuple[float, float, float, float], b: Tuple[float, float, float, float]) -> float:
+    """두 사각형의 IoU"""
+    iw = min(a[2], b[2]) - max(a[0], b[0])
+    ih = min(a[3], b[3]) - max(a[1], b[1])
+    if iw <= 0 or ih <= 0:
+        return 0.0
+    inter = iw * ih
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+def _bbox_overlaps(bbox1, bbox2) -> bool:
+    """두 바운딩 박스(꼭짓점 목록)가 겹치는지"""
+    a, b = _bbox_rect(bbox1), _bbox_rect(bbox2)
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+def _merge_rects(rects: List[Tuple[int, int, int, int]]) -> List[Tuple[int, int, int, int]]:
+    """겹치는 사각형을 하나로 병합 (더 이상 겹치지 않을 때까지)"""
+    merged = list(rects)
+    changed = True
+    while changed:
+        changed = False
+        result = []
+        for rect in merged:
+            for i, other in enumerate(result):
+                if rect[0] < other[2] and other[0] < rect[2] and rect[1] < other[3] and other[1] < rect[3]:
+                    result[i] = (min(rect[0], other[0]), min(rect[1], other[1]),
+                                 max(rect[2], other[2]), max(rect[3], other[3]))
+                    changed = True
+                    break
+            else:
+                result.append(rect)
+        merged = result
+    return merged
+
+def _grid_cell_size(rects: List[Tuple[float, float, float, float]]) -> float:
+    """격자 칸 크기 (박스 크기 중앙값의 2배, 박스 하나가 보통 1~4칸에 걸치도록)"""
+    sizes = [max(r[2] - r[0], r[3] - r[1]) for r in rects]
+    return max(float(np.median(sizes)) * 2 if sizes else 0.0, 16.0)
+
+class BBoxGridIndex:
+    """균일 격자 기반 바운딩 박스 공간 인덱스 (겹칠 수 있는 후보만 조회)"""
+    
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+    
+    def _cells_for(self, rect: Tuple[float, float, float, float]):
+        size = self.cell_size
+        for cx in range(int(rect[0] // size), int(rect[2] // size) + 1):
+            for cy in range(int(rect[1] // size), int(rect[3] // size) + 1):
+                yield cx, cy
+    
+    def insert(self, item_id: int, rect: Tuple[float, float, float, float]):
+        for cell in self._cells_for(rect):
+            self._cells.setdefault(cell, []).append(item_id)
+    
+    def query(self, rect: Tuple[float, float, float, float]) -> set:
+        found = set()
+        for cell in self._cells_for(rect):
+            found.update(self._cells.get(cell, ()))
+        return found
+
 class MultiEngineOCRProcessor:
     """다중 OCR 엔진 병렬 처리 클래스"""
     
-    def __init__(self):
+    def __init__(self, result_cache=None):
         self.logger = logging.getLogger(__name__)
         self.preprocessor = AdvancedImagePreprocessor()
+        self._result_cache = result_cache
+        self.validator = OCRResultValidator()
         
-        # OCR 엔진 초기화
-        self.engines = {}
-        self._initialize_engines()
-    
-    def _initialize_engines(self):
-        """OCR 엔진 초기화"""
-        # EasyOCR
-        if EASYOCR_AVAILABLE:
-            try:
-                self.engines['easyocr'] = easyocr.Reader(['ko', 'en', 'zh'])
-                self.logger.info("✅ EasyOCR 엔진 초기화 완료")
-            except Exception as e:
-                self.logger.error(f"❌ EasyOCR 초기화 실패: {e}")
-        
-        # PaddleOCR
-        if PADDLEOCR_AVAILABLE:
-            try:
-                self.engines['paddleocr'] = PaddleOCR(use_angle_cls=True, lang='korean')
-                self.logger.info("✅ PaddleOCR 엔진 초기화 완료")
-            except Exception as e:
-                self.logger.error(f"❌ PaddleOCR 초기화 실패: {e}")
+        # 중복 제거 기준 (겹침 IoU 이상 + 텍스트 유사도 0.8 초과)
+        self.dedup_iou_threshold = 0.5
         
-        # Tesseract
-        if TESSERACT_AVAILABLE:
-            try:
-                # Tesseract 설치 확인
-                pytesseract.get_tesseract_version()
-                self.engines['tesseract'] = 'tesseract'
-                self.logger.info("✅ Tesseract 엔진 초기화 완료")
-            except Exception as e:
-                self.logger.error(f"❌ Tesseract 초기화 실패: {e}")
+        # 레이아웃 우선 모드의 타일 병렬 처리 수 (엔진별 동시 사용 수는 엔진 풀이 제한)
+        self.tile_workers = int(os.getenv('OCR_TILE_WORKERS', 2))
         
-        # Google Cloud Vision
-        if GOOGLE_VISION_AVAILABLE:
-            try:
-                self.engines['google_vision'] = vision.ImageAnnotatorClient()
-                self.logger.info("✅ Google Cloud Vision 엔진 초기화 완료")
-            except Exception as e:
-                self.logger.error(f"❌ Google Cloud Vision 초기화 실패: {e}")
+        # 캐스케이드 모드 설정
+        self.cascade_confidence = 0.6
+        self.cascade_max_regions = 20
+        self.cascade_region_padding = 8
         
-        # Azure Computer Vision
-        if AZURE_VISION_AVAILABLE:
-            try:
-                endpoint = os.getenv('AZURE_VISION_ENDPOINT')
-                key = os.getenv('AZURE_VISION_KEY')
-                if endpoint and key:
-                    self.engines['azure_vision'] = ComputerVisionClient(
-                        endpoint, CognitiveServicesCredentials(key)
-                    )
-                    self.logger.info("✅ Azure Computer Vision 엔진 초기화 완료")
-            except Exception as e:
-                self.logger.error(f"❌ Azure Computer Vision 초기화 실패: {e}")
+        # OCR 엔진은 전역 풀에서 첫 사용 시 로딩 (여기서는 사용할 엔진 목록만 결정)
+        self.engines = self._initialize_engines()
+    
+    @property
+    def result_cache(self):
+        """OCR 결과 캐시 (지정하지 않으면 전역 캐시, 처음 사용할 때 생성)"""
+        return self._result_cache if self._result_cache is not None else get_ocr_result_cache()
+    
+    def _initialize_engines(self) -> List[str]:
+        """사용할 OCR 엔진 목록 (설치된 엔진만, 로딩은 지연)"""
+        candidates = [
+            ('easyocr', EASYOCR_AVAILABLE),
+            ('paddleocr', PADDLEOCR_AVAILABLE),
+            ('tesseract', TESSERACT_AVAILABLE),
+            ('google_vision', GOOGLE_VISION_AVAILABLE),
+            ('azure_vision', AZURE_VISION_AVAILABLE and bool(os.getenv('AZURE_VISION_ENDPOINT') and os.getenv('AZURE_VISION_KEY')))
+        ]
+        engines = [name for name, available in candidates if available]
+        self.logger.info(f"✅ OCR 엔진 등록 완료 (지연 로딩): {', '.join(engines) if engines else '없음'}")
+        return engines
     
     def _process_with_easyocr(self, image: np.ndarray) -> List[OCRResult]:
         """EasyOCR로 처리"""
         try:
-            results = self.engines['easyocr'].readtext(image)
+            with ocr_engine_pool.acquire('easyocr') as reader:
+                if reader is None:
+                    return []
+                results = reader.readtext(image)
             ocr_results = []
             
             for (bbox, text, confidence) in results:
@@ -541,7 +635,10 @@ class MultiEngineOCRProcessor:
     def _process_with_paddleocr(self, image: np.ndarray) -> List[OCRResult]:
         """PaddleOCR로 처리"""
         try:
-            results = self.engines['paddleocr'].ocr(image, cls=True)
+            with ocr_engine_pool.acquire('paddleocr') as paddle:
+                if paddle is None:
+                    return []
+                results = paddle.ocr(image, cls=True)
             ocr_results = []
             
             if results and results[0]:
@@ -566,11 +663,11 @@ class MultiEngineOCRProcessor:
             # Tesseract 설정
             custom_config = r'--oem 3 --psm 6 -l kor+eng+chi_sim'
             
-            # 텍스트 추출
-            text = pytesseract.image_to_string(image, config=custom_config)
-            
-            # 바운딩 박스 추출
-            data = pytesseract.image_to_data(image, config=custom_config, output_type=pytesseract.Output.DICT)
+            with ocr_engine_pool.acquire('tesseract') as tesseract:
+                if tesseract is None:
+                    return []
+                # 바운딩 박스 추출
+                data = pytesseract.image_to_data(image, config=custom_config, output_type=pytesseract.Output.DICT)
             
             ocr_results = []
             for i in range(len(data['text'])):
@@ -599,7 +696,10 @@ class MultiEngineOCRProcessor:
             
             # Vision API 요청
             image_vision = vision.Image(content=image_bytes)
-            response = self.engines['google_vision'].text_detection(image=image_vision)
+            with ocr_engine_pool.acquire('google_vision') as client:
+                if client is None:
+                    return []
+                response = client.text_detection(image=image_vision)
             
             ocr_results = []
             if response.text_annotations:
@@ -625,17 +725,20 @@ class MultiEngineOCRProcessor:
             image_bytes = buffer.tobytes()
             
             # Azure Vision API 요청
-            response = self.engines['azure_vision'].read_in_stream(image_bytes, raw=True)
-            operation_location = response.headers["Operation-Location"]
-            operation_id = operation_location.split("/")[-1]
-            
-            # 결과 대기
             import time
-            while True:
-                read_result = self.engines['azure_vision'].get_read_result(operation_id)
-                if read_result.status not in ['notStarted', 'running']:
-                    break
-                time.sleep(1)
+            with ocr_engine_pool.acquire('azure_vision') as client:
+                if client is None:
+                    return []
+                response = client.read_in_stream(image_bytes, raw=True)
+                operation_location = response.headers["Operation-Location"]
+                operation_id = operation_location.split("/")[-1]
+                
+                # 결과 대기
+                while True:
+                    read_result = client.get_read_result(operation_id)
+                    if read_result.status not in ['notStarted', 'running']:
+                        break
+                    time.sleep(1)
             
             ocr_results = []
             if read_result.status == "succeeded":
@@ -655,67 +758,284 @@ class MultiEngineOCRProcessor:
             self.logger.error(f"Azure Computer Vision 처리 실패: {e}")
             return []
     
-    def process_image_parallel(self, image: np.ndarray, document_type: str = None) -> Dict[str, Any]:
-        """이미지를 다중 OCR 엔진으로 병렬 처리 (문서별 맞춤 전처리)"""
-        self.logger.info("🚀 다중 OCR 엔진 병렬 처리 시작")
+    def process_image_parallel(self, image: np.ndarray, document_type: str = None,
+                               progress_callback=None, mode: str = 'parallel',
+                               layout_first: bool = False) -> Dict[str, Any]:
+        """이미지를 다중 OCR 엔진으로 처리 (문서별 맞춤 전처리)
+
+        mode='parallel' 은 모든 엔진을 병렬 실행하고, mode='cascade' 는 저렴한 엔진부터
+        실행해 누락 항목/저신뢰 영역이 남을 때만 다음 엔진을 호출한다.
+        layout_first=True 이면 축소본에서 텍스트/표 영역을 먼저 찾고 그 영역만 확대/OCR 하며,
+        결과 좌표는 원본 페이지 기준이다.
+        progress_callback(progress, message) 가 주어지면 단계별 진행률(0~1)을 알린다.
+        """
+        self.logger.info(f"🚀 다중 OCR 엔진 처리 시작 ({mode})")
+        report = progress_callback or (lambda progress, message=None: None)
         
         # 문서 유형 자동 감지 (지정되지 않은 경우)
         if document_type is None:
             document_type = self.preprocessor.detect_document_type(image)
             self.logger.info(f"🔍 자동 감지된 문서 유형: {document_type}")
         
-        # 문서별 맞춤 전처리 적용
-        preprocess_result = self.preprocessor.preprocess_for_document_type(image, document_type)
-        processed_image = preprocess_result['processed_image']
+        # 동일 이미지 + 동일 전처리 설정 + 동일 엔진 구성이면 캐시된 결과 반환
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = self.result_cache.make_key(
+                hash_image(image),
+                pipeline='process_image_parallel',
+                mode=mode,
+                layout_first=layout_first,
+                document_type=document_type,
+                document_settings=self.preprocessor.document_settings.get(document_type),
+                engines=sorted(self.engines)
+            )
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                self.logger.info("⚡ OCR 결과 캐시 적중")
+                cached['cache_hit'] = True
+                report(1.0, "캐시된 결과 사용")
+                return cached
         
-        # 병렬 OCR 처리
-        results = {}
-        with ThreadPoolExecutor(max_workers=len(self.engines)) as executor:
-            future_to_engine = {}
-            
-            for engine_name in self.engines.keys():
-                if engine_name == 'easyocr':
-                    future = executor.submit(self._process_with_easyocr, processed_image)
-                elif engine_name == 'paddleocr':
-                    future = executor.submit(self._process_with_paddleocr, processed_image)
-                elif engine_name == 'tesseract':
-                    future = executor.submit(self._process_with_tesseract, processed_image)
-                elif engine_name == 'google_vision':
-                    future = executor.submit(self._process_with_google_vision, processed_image)
-                elif engine_name == 'azure_vision':
-                    future = executor.submit(self._process_with_azure_vision, processed_image)
-                
-                future_to_engine[future] = engine_name
-            
-            # 결과 수집
-            for future in as_completed(future_to_engine):
-                engine_name = future_to_engine[future]
-                try:
-                    results[engine_name] = future.result()
-                    self.logger.info(f"✅ {engine_name} 처리 완료: {len(results[engine_name])}개 결과")
-                except Exception as e:
-                    self.logger.error(f"❌ {engine_name} 처리 실패: {e}")
-                    results[engine_name] = []
+        regions = self.preprocessor.detect_text_regions(image) if layout_first else []
+        if regions:
+            # 영역 타일만 전처리 (페이지 전체를 확대하지 않음), 결과 좌표는 페이지 기준
+            tiles = self.preprocessor.preprocess_tiles(image, regions, document_type)
+            preprocess_result = {'preprocessing_info': {
+                'document_type': document_type,
+                'original_size': image.shape,
+                'applied_settings': self.preprocessor.document_settings.get(document_type),
+                'layout_first': True,
+                'regions': [list(rect) for rect in regions],
+                'tile_count': len(tiles)
+            }}
+            icon_image = image
+            run_full = lambda engine_name: self._run_engine_on_tiles(engine_name, tiles)
+            run_regions = lambda engine_name, boxes: self._run_engine_on_tiles(
+                engine_name, self.preprocessor.preprocess_tiles(
+                    image, self._regions_to_rects(boxes, image.shape), document_type))
+        else:
+            if layout_first:
+                self.logger.info("🧭 검출된 영역이 없어 전체 이미지로 처리")
+            # 문서별 맞춤 전처리 적용
+            preprocess_result = self.preprocessor.preprocess_for_document_type(image, document_type)
+            processed_image = preprocess_result['processed_image']
+            icon_image = processed_image
+            run_full = lambda engine_name: self._run_engine(engine_name, processed_image)
+            run_regions = lambda engine_name, boxes: self._run_engine_on_regions(engine_name, processed_image, boxes)
+        report(0.2, "전처리 완료")
+        
+        cascade_info = None
+        if mode == 'cascade':
+            results, cascade_info = self._run_cascade(run_full, run_regions, report)
+        else:
+            results = self._run_all_engines(run_full, report)
         
         # 결과 통합 및 신뢰도 기반 필터링
         integrated_results = self._integrate_results(results)
         
         # 테이블, 아이콘, 레이아웃 추출
         tables = self._extract_tables(integrated_results)
-        icons = self._extract_icons(processed_image, integrated_results)
+        icons = self._extract_icons(icon_image, integrated_results)
         layout = self._analyze_layout(integrated_results)
+        nutrition_table = parse_nutrition_table(integrated_results)
+        report(0.95, "결과 통합 완료")
         
-        self.logger.info(f"✅ 병렬 처리 완료: {len(integrated_results)}개 텍스트, {len(tables)}개 테이블, {len(icons)}개 아이콘")
+        self.logger.info(f"✅ OCR 처리 완료: {len(integrated_results)}개 텍스트, {len(tables)}개 테이블, {len(icons)}개 아이콘")
         
-        return {
+        result = {
             'text': [{'text': r.text, 'confidence': r.confidence, 'bbox': r.bbox, 'engine': r.engine} for r in integrated_results],
             'tables': [{'data': t.data, 'bbox': t.bbox, 'confidence': t.confidence, 'engine': t.engine} for t in tables],
             'icons': [{'type': i.type, 'bbox': i.bbox, 'confidence': i.confidence, 'engine': i.engine} for i in icons],
             'layout': {'regions': layout.regions, 'confidence': layout.confidence, 'engine': layout.engine},
+            'nutrition_table': nutrition_table.to_dict() if nutrition_table.rows else None,
             'preprocessing_info': preprocess_result['preprocessing_info'],
             'engine_performance': {name: len(results[name]) for name in results.keys()},
-            'document_type': document_type
+            'engines_run': list(results.keys()),
+            'document_type': document_type,
+            'mode': mode
+        }
+        if cascade_info is not None:
+            result['cascade'] = cascade_info
+        
+        # 엔진이 하나라도 결과를 낸 경우만 캐시 (엔진 장애 결과가 고정되지 않도록)
+        if cache_key is not None and any(results.values()):
+            self.result_cache.set(cache_key, result)
+        result['cache_hit'] = False
+        return result
+    
+    def _run_engine(self, engine_name: str, image: np.ndarray) -> List[OCRResult]:
+        """엔진 이름으로 처리 함수 호출"""
+        handlers = {
+            'easyocr': self._process_with_easyocr,
+            'paddleocr': self._process_with_paddleocr,
+            'tesseract': self._process_with_tesseract,
+            'google_vision': self._process_with_google_vision,
+            'azure_vision': self._process_with_azure_vision
         }
+        handler = handlers.get(engine_name)
+        return handler(image) if handler else []
+    
+    def _run_all_engines(self, run_full, report) -> Dict[str, List[OCRResult]]:
+        """모든 엔진 병렬 실행 (run_full(engine_name) 이 엔진 하나의 결과를 반환)"""
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, len(self.engines))) as executor:
+            future_to_engine = {
+                executor.submit(run_full, engine_name): engine_name
+                for engine_name in self.engines
+            }
+            
+            # 결과 수집
+            for future in as_completed(future_to_engine):
+                engine_name = future_to_engine[future]
+                try:
+                    engine_results = future.result()
+                    if not ocr_engine_pool.is_available(engine_name):
+                        # 로딩에 실패한 엔진은 결과에서 제외
+                        continue
+                    results[engine_name] = engine_results
+                    self.logger.info(f"✅ {engine_name} 처리 완료: {len(results[engine_name])}개 결과")
+                except Exception as e:
+                    self.logger.error(f"❌ {engine_name} 처리 실패: {e}")
+                    results[engine_name] = []
+                finished = sum(1 for f in future_to_engine if f.done())
+                report(0.2 + 0.6 * finished / len(future_to_engine), f"{engine_name} 완료")
+        return results
+    
+    def _run_cascade(self, run_full, run_regions, report) -> Tuple[Dict[str, List[OCRResult]], Dict[str, Any]]:
+        """저렴한 엔진부터 순차 실행, 누락 항목/저신뢰 영역이 있을 때만 다음 엔진 호출
+
+        - 누락 항목(OCRResultValidator 필수 요소)이 있으면 다음 엔진을 전체 이미지에 실행
+        - 누락 항목이 없고 저신뢰 영역만 있으면 해당 영역만 잘라서 다음 엔진 실행
+        - 다음 엔진도 누락 항목을 줄이지 못하면 실제로 없는 항목으로 보고 중단
+        """
+        order = [name for name in CASCADE_ENGINE_ORDER if name in self.engines]
+        order += [name for name in self.engines if name not in order]
+        
+        results: Dict[str, List[OCRResult]] = {}
+        stages = []
+        skipped = []
+        stop_reason = 'no_engines'
+        last_missing_attempt = None  # 누락 항목을 찾으려고 전체 실행하기 직전의 누락 목록
+        
+        for index, engine_name in enumerate(order):
+            merged = [r for engine_results in results.values() for r in engine_results]
+            missing = self._cascade_missing_items(merged)
+            low_regions = self._cascade_low_confidence_regions(merged)
+            
+            if index == 0:
+                scope, reason = 'full', '첫 단계 (가장 저렴한 엔진)'
+            elif missing and last_missing_attempt is not None and set(missing) >= set(last_missing_attempt):
+                stop_reason = 'missing_items_unresolved'
+                skipped.extend({'engine': name, 'reason': f"이전 엔진도 누락 항목을 찾지 못함: {', '.join(missing)}"}
+                               for name in order[index:])
+                break
+            elif missing:
+                scope, reason = 'full', f"누락 항목: {', '.join(missing)}"
+            elif low_regions:
+                scope = 'regions' if len(low_regions) <= self.cascade_max_regions else 'full'
+                reason = f"저신뢰 영역 {len(low_regions)}개 (신뢰도 < {self.cascade_confidence})"
+            else:
+                stop_reason = 'complete'
+                skipped.extend({'engine': name, 'reason': '필수 항목이 모두 고신뢰도로 인식됨'}
+                               for name in order[index:])
+                break
+            
+            started = datetime.now()
+            if scope == 'regions':
+                engine_results = run_regions(engine_name, low_regions)
+                # 다시 읽은 영역의 이전 저신뢰 결과는 새 결과로 대체
+                if engine_results:
+                    covered = [r.bbox for r in engine_results]
+                    for name in results:
+                        results[name] = [r for r in results[name]
+                                         if r.confidence >= self.cascade_confidence
+                                         or not any(_bbox_overlaps(r.bbox, bbox) for bbox in covered)]
+            else:
+                engine_results = run_full(engine_name)
+            
+            if not ocr_engine_pool.is_available(engine_name):
+                skipped.append({'engine': engine_name, 'reason': '엔진을 사용할 수 없음'})
+                continue
+            
+            results[engine_name] = engine_results
+            if index > 0 and scope == 'full' and missing:
+                last_missing_attempt = missing
+            merged = [r for rs in results.values() for r in rs]
+            stages.append({
+                'engine': engine_name,
+                'scope': scope,
+                'regions': len(low_regions) if scope == 'regions' else None,
+                'reason': reason,
+                'results': len(engine_results),
+                'missing_after': self._cascade_missing_items(merged),
+                'elapsed_seconds': round((datetime.now() - started).total_seconds(), 3)
+            })
+            self.logger.info(f"🔁 캐스케이드 {engine_name} ({scope}): {reason} -> {len(engine_results)}개 결과")
+            report(0.2 + 0.6 * (index + 1) / max(1, len(order)), f"{engine_name} 완료")
+            stop_reason = 'engines_exhausted'
+        
+        return results, {
+            'engine_order': order,
+            'stages': stages,
+            'skipped_engines': skipped,
+            'stop_reason': stop_reason
+        }
+    
+    def _cascade_missing_items(self, results: List[OCRResult]) -> List[str]:
+        """현재까지 결과 기준 필수 항목 누락 목록 (검증기와 같은 기준)"""
+        validated = [r for r in results if r.confidence >= self.cascade_confidence]
+        return self.validator._detect_missing_items(validated)
+    
+    def _cascade_low_confidence_regions(self, results: List[OCRResult]) -> List[List[Tuple[int, int]]]:
+        """다시 읽을 저신뢰 텍스트 영역"""
+        return [r.bbox for r in results if r.text.strip() and 0 < r.confidence < self.cascade_confidence]
+    
+    def _run_engine_on_regions(self, engine_name: str, image: np.ndarray,
+                               regions: List[List[Tuple[int, int]]]) -> List[OCRResult]:
+        """영역별로 잘라서 엔진 실행 후 좌표를 원본 기준으로 복원"""
+        height, width = image.shape[:2]
+        pad = self.cascade_region_padding
+        region_results = []
+        for bbox in regions:
+            xs = [int(p[0]) for p in bbox]
+            ys = [int(p[1]) for p in bbox]
+            x0, y0 = max(min(xs) - pad, 0), max(min(ys) - pad, 0)
+            x1, y1 = min(max(xs) + pad, width), min(max(ys) + pad, height)
+            if x1 <= x0 or y1 <= y0:
+                continue
+            for r in self._run_engine(engine_name, image[y0:y1, x0:x1]):
+                r.bbox = [(p[0] + x0, p[1] + y0) for p in r.bbox]
+                region_results.append(r)
+        return region_results
+    
+    def _run_engine_on_tiles(self, engine_name: str, tiles: List[Dict[str, Any]]) -> List[OCRResult]:
+        """전처리된 타일마다 엔진 실행 후 좌표를 페이지 기준으로 복원 (tile_workers > 1 이면 병렬)"""
+        def run_tile(tile):
+            x0, y0 = tile['rect'][0], tile['rect'][1]
+            tile_results = self._run_engine(engine_name, tile['image'])
+            for r in tile_results:
+                r.bbox = [(x0 + p[0] / tile['scale_x'], y0 + p[1] / tile['scale_y']) for p in r.bbox]
+            return tile_results
+        
+        if self.tile_workers > 1 and len(tiles) > 1:
+            with ThreadPoolExecutor(max_workers=self.tile_workers) as executor:
+                per_tile = list(executor.map(run_tile, tiles))
+        else:
+            per_tile = [run_tile(tile) for tile in tiles]
+        return [r for tile_results in per_tile for r in tile_results]
+    
+    def _regions_to_rects(self, boxes: List[List[Tuple[int, int]]], shape) -> List[Tuple[int, int, int, int]]:
+        """페이지 좌표 바운딩 박스 -> 여백을 둔 잘라내기 사각형"""
+        height, width = shape[:2]
+        pad = self.cascade_region_padding
+        rects = []
+        for bbox in boxes:
+            x0, y0, x1, y1 = _bbox_rect(bbox)
+            rect = (max(int(x0) - pad, 0), max(int(y0) - pad, 0),
+                    min(int(np.ceil(x1)) + pad, width), min(int(np.ceil(y1)) + pad, height))
+            if rect[2] > rect[0] and rect[3] > rect[1]:
+                rects.append(rect)
+        return rects
     
     def _integrate_results(self, engine_results: Dict[str, List[OCRResult]]) -> List[OCRResult]:
         """다중 엔진 결과 통합"""
@@ -728,32 +1048,35 @@ class MultiEngineOCRProcessor:
         # 신뢰도 기반 필터링 (0.3 이상)
         filtered_results = [r for r in all_results if r.confidence >= 0.3]
         
-        # 중복 제거 (텍스트 유사도 기반)
+        # 중복 제거 (공간 인덱스 + IoU + 텍스트 유사도)
         unique_results = self._remove_duplicates(filtered_results)
         
         return unique_results
     
     def _remove_duplicates(self, results: List[OCRResult]) -> List[OCRResult]:
-        """중복 결과 제거"""
-        unique_results = []
+        """중복 결과 제거 (겹치는 박스끼리만 IoU -> 텍스트 유사도 비교)
+
+        신뢰도가 높은 결과부터 격자 인덱스에 넣고, 새 결과는 같은 격자 칸에 있는
+        결과와만 비교하므로 토큰 수에 거의 선형으로 동작한다. 결과 순서는 입력 순서를 유지한다.
+        """
+        if len(results) < 2:
+            return list(results)
         
-        for result in results:
-            is_duplicate = False
-            for existing in unique_results:
-                # 텍스트 유사도 계산
-                similarity = self._calculate_text_similarity(result.text, existing.text)
-                if similarity > 0.8:  # 80% 이상 유사하면 중복으로 간주
-                    # 더 높은 신뢰도를 가진 결과 선택
-                    if result.confidence > existing.confidence:
-                        unique_results.remove(existing)
-                        unique_results.append(result)
-                    is_duplicate = True
-                    break
-            
+        rects = [_bbox_rect(r.bbox) for r in results]
+        index = BBoxGridIndex(_grid_cell_size(rects))
+        kept = []
+        
+        for i in sorted(range(len(results)), key=lambda k: -results[k].confidence):
+            is_duplicate = any(
+                _rect_iou(rects[i], rects[j]) >= self.dedup_iou_threshold
+                and self._calculate_text_similarity(results[i].text, results[j].text) > 0.8
+                for j in index.query(rects[i])
+            )
             if not is_duplicate:
-                unique_results.append(result)
+                index.insert(i, rects[i])
+                kept.append(i)
         
-        return unique_results
+        return [results[i] for i in sorted(kept)]
     
     def _calculate_text_similarity(self, text1: str, text2: str) -> float:
         """텍스트 유사도 계산"""
@@ -1093,4 +1416,19 @@ class OCRResultValidator:
 
 # 전역 인스턴스
 advanced_ocr_processor = MultiEngineOCRProcessor()
-ocr_validator = OCRResultValidator() 
\ No newline at end of file
+ocr_validator = OCRResultValidator()
+
+
+def run_ocr_job(payload: Dict[str, Any], report_progress) -> Dict[str, Any]:
+    """OCR 워커 작업 핸들러 (utils.ocr_job_queue 에서 호출, 끝나면 업로드 이미지 삭제)"""
+    try:
+        image = cv2.imread(payload['image_path'])
+        if image is None:
+            raise ValueError(f"이미지를 읽을 수 없습니다: {payload['image_path']}")
+        return advanced_ocr_processor.process_image_parallel(
+            image, payload.get('document_type'), progress_callback=report_progress,
+            mode=payload.get('mode', 'parallel'),
+            layout_first=payload.get('layout_first', False)
+        )
+    finally:
+        remove_job_upload(payload['image_path'])
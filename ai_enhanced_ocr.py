@@ -46,6 +46,15 @@ except ImportError:
     GOOGLE_AVAILABLE = False
     print("⚠️ Google Cloud Vision을 사용할 수 없습니다.")
 
+from utils.provider_dispatch import ProviderDispatcher, vote_fields
+
+# 제공자별 호출 설정 (제한 시간/헤지 시점은 초 단위, 가중치는 필드 투표용)
+AI_PROVIDER_SETTINGS = {
+    'openai': {'timeout': float(os.getenv('AI_OCR_OPENAI_TIMEOUT', 30)), 'hedge_after': None, 'weight': 1.5},
+    'azure': {'timeout': float(os.getenv('AI_OCR_AZURE_TIMEOUT', 15)), 'hedge_after': 5.0, 'weight': 1.0},
+    'google': {'timeout': float(os.getenv('AI_OCR_GOOGLE_TIMEOUT', 15)), 'hedge_after': 5.0, 'weight': 1.0}
+}
+
 class AIEnhancedOCR:
     """AI API 기반 고성능 OCR 시스템"""
     
@@ -62,6 +71,12 @@ class AIEnhancedOCR:
         # OCR 결과 캐시
         self.result_cache = {}
         
+        # 제공자 동시 호출 (제한 시간, 헤지 요청, 연속 실패 시 차단)
+        self.dispatcher = ProviderDispatcher()
+        for name, extractor in (('openai', self._extract_with_openai), ('azure', self._extract_with_azure),
+                                ('google', self._extract_with_google)):
+            self.dispatcher.register(name, extractor, **AI_PROVIDER_SETTINGS[name])
+        
         # 한글 특화 프롬프트
         self.korean_prompts = {
             "nutrition_label": """
@@ -179,109 +194,120 @@ JSON 형식으로 응답해주세요:
             return {}
         
         try:
-            # 이미지를 base64로 인코딩
-            with open(image_path, "rb") as image_file:
-                image_data = base64.b64encode(image_file.read()).decode('utf-8')
-            
-            # 프롬프트 선택
-            prompt = self.korean_prompts.get(prompt_type, self.korean_prompts["general_text"])
-            
-            # GPT-4 Vision API 호출
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4-vision-preview",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": prompt},
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{image_data}"
-                                }
-                            }
-                        ]
-                    }
-                ],
-                max_tokens=1000,
-                temperature=0.1
-            )
-            
-            # 응답 파싱
-            content = response.choices[0].message.content
-            
-            # JSON 응답인 경우 파싱
-            try:
-                if content.strip().startswith('{'):
-                    return json.loads(content)
-                else:
-                    # 일반 텍스트인 경우 구조화
-                    return self._parse_text_to_structure(content)
-            except json.JSONDecodeError:
-                return self._parse_text_to_structure(content)
-                
+            return self._extract_with_openai(image_path, prompt_type)
         except Exception as e:
             self.logger.error(f"❌ OpenAI OCR 실패: {e}")
             return {}
     
+    def _extract_with_openai(self, image_path: str, prompt_type: str = "nutrition_label") -> Dict:
+        """OpenAI 추출 (실패 시 예외 발생)"""
+        # 이미지를 base64로 인코딩
+        with open(image_path, "rb") as image_file:
+            image_data = base64.b64encode(image_file.read()).decode('utf-8')
+        
+        # 프롬프트 선택
+        prompt = self.korean_prompts.get(prompt_type, self.korean_prompts["general_text"])
+        
+        # GPT-4 Vision API 호출
+        response = self.openai_client.chat.completions.create(
+            model="gpt-4-vision-preview",
+            messages=[
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": prompt},
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:image/jpeg;base64,{image_data}"
+                            }
+                        }
+                    ]
+                }
+            ],
+            max_tokens=1000,
+            temperature=0.1,
+            timeout=AI_PROVIDER_SETTINGS['openai']['timeout']
+        )
+        
+        # 응답 파싱
+        content = response.choices[0].message.content
+        
+        # JSON 응답인 경우 파싱
+        try:
+            if content.strip().startswith('{'):
+                return json.loads(content)
+            else:
+                # 일반 텍스트인 경우 구조화
+                return self._parse_text_to_structure(content)
+        except json.JSONDecodeError:
+            return self._parse_text_to_structure(content)
+    
     def extract_with_azure(self, image_path: str) -> Dict:
         """Azure Computer Vision을 사용한 텍스트 추출"""
         if not self.azure_client:
             return {}
         
         try:
-            # 이미지 파일 열기
-            with open(image_path, "rb") as image_file:
-                image_data = image_file.read()
-            
-            # OCR 실행
-            result = self.azure_client.recognize_printed_text_in_stream(image_data)
-            
-            # 텍스트 추출
-            extracted_text = ""
-            for region in result.regions:
-                for line in region.lines:
-                    for word in line.words:
-                        extracted_text += word.text + " "
-                    extracted_text += "\n"
-            
-            # 구조화된 정보 추출
-            return self._extract_structured_info(extracted_text)
-            
+            return self._extract_with_azure(image_path)
         except Exception as e:
             self.logger.error(f"❌ Azure OCR 실패: {e}")
             return {}
     
+    def _extract_with_azure(self, image_path: str) -> Dict:
+        """Azure 추출 (실패 시 예외 발생)"""
+        # 이미지 파일 열기
+        with open(image_path, "rb") as image_file:
+            image_data = image_file.read()
+        
+        # OCR 실행
+        result = self.azure_client.recognize_printed_text_in_stream(image_data)
+        
+        # 텍스트 추출
+        extracted_text = ""
+        for region in result.regions:
+            for line in region.lines:
+                for word in line.words:
+                    extracted_text += word.text + " "
+                extracted_text += "\n"
+        
+        # 구조화된 정보 추출
+        return self._extract_structured_info(extracted_text)
+    
     def extract_with_google(self, image_path: str) -> Dict:
         """Google Cloud Vision을 사용한 텍스트 추출"""
         if not self.google_client:
             return {}
         
         try:
-            # 이미지 파일 읽기
-            with open(image_path, "rb") as image_file:
-                content = image_file.read()
-            
-            # 이미지 객체 생성
-            image = vision.Image(content=content)
-            
-            # OCR 실행
-            response = self.google_client.text_detection(image=image)
-            texts = response.text_annotations
-            
-            if not texts:
-                return {}
-            
-            # 전체 텍스트 추출
-            extracted_text = texts[0].description
-            
-            # 구조화된 정보 추출
-            return self._extract_structured_info(extracted_text)
-            
+            return self._extract_with_google(image_path)
         except Exception as e:
             self.logger.error(f"❌ Google OCR 실패: {e}")
             return {}
     
+    def _extract_with_google(self, image_path: str) -> Dict:
+        """Google 추출 (실패 시 예외 발생)"""
+        # 이미지 파일 읽기
+        with open(image_path, "rb") as image_file:
+            content = image_file.read()
+        
+        # 이미지 객체 생성
+        image = vision.Image(content=content)
+        
+        # OCR 실행
+        response = self.google_client.text_detection(image=image,
+                                                     timeout=AI_PROVIDER_SETTINGS['google']['timeout'])
+        texts = response.text_annotations
+        
+        if not texts:
+            return {}
+        
+        # 전체 텍스트 추출
+        extracted_text = texts[0].description
+        
+        # 구조화된 정보 추출
+        return self._extract_structured_info(extracted_text)
+    
     def _extract_structured_info(self, text: str) -> Dict:
         """텍스트에서 구조화된 정보 추출"""
         info = {}
@@ -360,82 +386,52 @@ JSON 형식으로 응답해주세요:
     
     def extract_label_info(self, image_path: str, use_ai_apis: bool = True) -> Dict:
         """AI API를 활용한 라벨 정보 추출"""
+        return self.extract_label_info_detailed(image_path, use_ai_apis)['result']
+    
+    def extract_label_info_detailed(self, image_path: str, use_ai_apis: bool = True) -> Dict:
+        """AI API 동시 호출 후 필드별 투표 결과와 신뢰도, 제공자별 호출 결과 반환"""
         self.logger.info(f"🤖 AI OCR 시작: {image_path}")
         
-        results = {}
-        
-        # 1. OpenAI GPT-4 Vision (가장 정확)
-        if use_ai_apis and self.openai_client:
-            self.logger.info("🔍 OpenAI GPT-4 Vision 처리 중...")
-            openai_result = self.extract_with_openai(image_path, "nutrition_label")
-            if openai_result:
-                results['openai'] = openai_result
-                self.logger.info("✅ OpenAI OCR 완료")
-        
-        # 2. Azure Computer Vision
-        if use_ai_apis and self.azure_client:
-            self.logger.info("🔍 Azure Computer Vision 처리 중...")
-            azure_result = self.extract_with_azure(image_path)
-            if azure_result:
-                results['azure'] = azure_result
-                self.logger.info("✅ Azure OCR 완료")
-        
-        # 3. Google Cloud Vision
-        if use_ai_apis and self.google_client:
-            self.logger.info("🔍 Google Cloud Vision 처리 중...")
-            google_result = self.extract_with_google(image_path)
-            if google_result:
-                results['google'] = google_result
-                self.logger.info("✅ Google OCR 완료")
+        clients = {'openai': self.openai_client, 'azure': self.azure_client, 'google': self.google_client}
+        names = [name for name in self.dispatcher.provider_names() if clients.get(name)] if use_ai_apis else []
+        if not names:
+            self.logger.warning("⚠️ 사용 가능한 AI OCR 엔진이 없습니다.")
+            return {'result': {}, 'field_confidence': {}, 'providers': {}}
+        
+        # 모든 제공자 동시 호출 (느린 제공자는 제한 시간 후 제외)
+        calls = self.dispatcher.dispatch((image_path,), names=names,
+                                         accept=lambda value: isinstance(value, dict))
+        results = {name: call.value for name, call in calls.items() if call.ok and call.value}
+        for name, call in calls.items():
+            if call.ok:
+                self.logger.info(f"✅ {name} OCR 완료 ({call.elapsed}초{', 헤지 응답' if call.hedged else ''})")
+            else:
+                self.logger.warning(f"⚠️ {name} OCR 제외: {call.error}")
         
         # 결과 통합 및 앙상블
+        final_result, field_confidence = self._ensemble_results(results)
         if results:
-            final_result = self._ensemble_results(results)
             self.logger.info(f"✅ AI OCR 완료: {len(results)}개 엔진 사용")
-            return final_result
-        else:
-            self.logger.warning("⚠️ 사용 가능한 AI OCR 엔진이 없습니다.")
-            return {}
+        return {
+            'result': final_result,
+            'field_confidence': field_confidence,
+            'providers': {name: {'ok': call.ok, 'error': call.error, 'elapsed': call.elapsed, 'hedged': call.hedged}
+                          for name, call in calls.items()}
+        }
     
-    def _ensemble_results(self, results: Dict) -> Dict:
-        """여러 AI 엔진의 결과를 앙상블하여 최적 결과 생성"""
+    def _ensemble_results(self, results: Dict) -> Tuple[Dict, Dict[str, float]]:
+        """여러 AI 엔진의 결과를 필드 단위 가중 투표로 통합, (결과, 필드별 신뢰도) 반환
+
+        OpenAI 가중치가 가장 높아 1:1 로 의견이 갈리면 OpenAI 값을, 나머지 엔진이
+        같은 값으로 일치하면 그 값을 채택한다. 한 엔진만 낸 필드는 그대로 보완된다.
+        """
         if not results:
-            return {}
-        
-        # OpenAI 결과를 기본으로 사용
-        if 'openai' in results:
-            base_result = results['openai'].copy()
-        else:
-            # OpenAI가 없으면 첫 번째 결과 사용
-            base_result = list(results.values())[0].copy()
-        
-        # 다른 엔진들의 결과로 보완
-        for engine, result in results.items():
-            if engine == 'openai':
-                continue
-            
-            # 제품명이 없으면 추가
-            if not base_result.get('product_name') and result.get('product_name'):
-                base_result['product_name'] = result['product_name']
-            
-            # 영양성분 보완
-            if 'nutrition' in result:
-                if 'nutrition' not in base_result:
-                    base_result['nutrition'] = {}
-                
-                for nutrient, value in result['nutrition'].items():
-                    if nutrient not in base_result['nutrition']:
-                        base_result['nutrition'][nutrient] = value
-            
-            # 알레르기 정보 보완
-            if not base_result.get('allergies') and result.get('allergies'):
-                base_result['allergies'] = result['allergies']
-            
-            # 성분 정보 보완
-            if not base_result.get('ingredients') and result.get('ingredients'):
-                base_result['ingredients'] = result['ingredients']
-        
-        return base_result
+            return {}, {}
+        return vote_fields(results, self.dispatcher.weights())
+    
+    def get_provider_status(self) -> Dict[str, Dict[str, Any]]:
+        """제공자별 차단기 상태"""
+        return self.dispatcher.get_status()
 
 # 전역 인스턴스
 ai_ocr = AIEnhancedOCR() 
\ No newline at end of file
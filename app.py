@@ -7,11 +7,14 @@
 - 중국, 미국 라면 수출 지원
 """
 
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for, send_from_directory
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, send_from_directory, Response
 from werkzeug.utils import secure_filename
 import pickle
 import os
 import re
+import threading
+import time
+import uuid
 from datetime import datetime
 import pandas as pd
 from sklearn.metrics.pairwise import cosine_similarity
@@ -162,6 +165,18 @@ try:
 except ImportError as e:
     print(f"⚠️ 통합 무역 데이터베이스 import 실패: {e}")
 
+# 필수 내부 모듈 (표준 라이브러리와 requirements.txt 의 Pillow 만 사용하므로 선택 의존성 처리 없이 import)
+# 자연어 질의 분류기
+from query_classifier import QueryClassifier
+
+# 선언형 규제 준수 규칙 엔진 / 규제 스냅샷 / 증분 검사 / 이벤트 스트림 / 폰트 레지스트리 / 일괄 라벨 렌더러
+from compliance_rule_engine import evaluate_compliance_rules, get_compiled_rules
+from utils.regulation_snapshot import FrozenDict, regulation_snapshots
+from incremental_compliance import fingerprint, incremental_compliance
+from utils.event_stream import EVENT_STREAM_HEADERS, EVENT_STREAM_MIMETYPES, stream_events
+from utils.font_registry import candidate_paths, get_font_registry
+from batch_label_renderer import get_batch_label_renderer
+
 # 🚀 최적화 시스템 import
 try:
     from utils.memory_manager import get_memory_manager, memory_manager
@@ -411,13 +426,132 @@ except ImportError as e:
     print(f"⚠️ 간단 PDF 생성기를 찾을 수 없습니다: {e}")
 
 try:
-    from label_ocr_extractor import LabelOCRExtractor
+    from label_ocr_extractor import LabelOCRExtractor, get_label_ocr_extractor
     print("✅ 라벨 OCR 추출기 import 성공")
 except ImportError as e:
     print(f"⚠️ 라벨 OCR 추출기를 찾을 수 없습니다: {e}")
 
+# OCR 엔진 풀 (엔진별 1회 로딩, OCR_WARMUP_ENGINES 지정 시 부팅 직후 백그라운드 워밍업)
+try:
+    from utils.ocr_engine_pool import ocr_engine_pool
+    ocr_engine_pool.warm_up_from_env()
+    print("✅ OCR 엔진 풀 import 성공")
+except ImportError as e:
+    ocr_engine_pool = None
+    print(f"⚠️ OCR 엔진 풀을 찾을 수 없습니다: {e}")
+
+# OCR 결과 캐시 (이미지 내용 해시 + 파이프라인 설정 기반)
+try:
+    from utils.ocr_result_cache import get_ocr_result_cache, hash_file
+    print("✅ OCR 결과 캐시 import 성공")
+except ImportError as e:
+    get_ocr_result_cache = None
+    print(f"⚠️ OCR 결과 캐시를 찾을 수 없습니다: {e}")
+
+def ocr_cache_key(file_path, **settings):
+    """업로드 파일 내용 기반 OCR 캐시 키 (캐시를 쓸 수 없으면 None)"""
+    if get_ocr_result_cache is None:
+        return None
+    try:
+        return get_ocr_result_cache().make_key(hash_file(file_path), **settings)
+    except OSError as e:
+        print(f"⚠️ OCR 캐시 키 생성 실패: {e}")
+        return None
+
+# 다중 문서 일괄 OCR (업로드된 여러 문서의 페이지를 한 번에 처리)
+try:
+    from batch_ocr_processor import get_batch_ocr_processor, IMAGE_EXTENSIONS as BATCH_OCR_EXTENSIONS
+    print("✅ 일괄 OCR 처리기 import 성공")
+except ImportError as e:
+    get_batch_ocr_processor = None
+    BATCH_OCR_EXTENSIONS = ()
+    print(f"⚠️ 일괄 OCR 처리기를 찾을 수 없습니다: {e}")
+
+def perform_batch_ocr_analysis(documents):
+    """여러 문서를 한 번에 OCR 하고 문서별 결과 반환
+
+    documents 는 [(문서 키, 파일 경로, 문서 유형)] 목록이다. 이미지/PDF 는 일괄 OCR 로
+    모아 처리하고, 일괄 처리에 실패했거나 그 밖의 형식은 기존 문서별 분석을 사용한다.
+    """
+    results = {}
+    batch_documents = []
+    if get_batch_ocr_processor is not None:
+        batch_documents = [
+            {'id': key, 'path': path} for key, path, _ in documents
+            if os.path.splitext(path)[1].lower() in BATCH_OCR_EXTENSIONS + ('.pdf',)
+        ]
+    if batch_documents:
+        try:
+            results = get_batch_ocr_processor().process(batch_documents)
+        except Exception as e:
+            print(f"⚠️ 일괄 OCR 실패, 문서별 처리로 전환: {e}")
+            results = {}
+    
+    for key, path, document_type in documents:
+        if key not in results or 'error' in results[key]:
+            results[key] = perform_lightweight_ocr_analysis(path, document_type)
+    return results
+
+# PDF 페이지 스트리밍 (텍스트 레이어 우선, 스캔 페이지만 OCR)
 try:
-    from label_compliance_checker import LabelComplianceChecker
+    from utils.pdf_page_stream import iter_pdf_pages, PYMUPDF_AVAILABLE
+    print("✅ PDF 페이지 스트리밍 import 성공")
+except ImportError as e:
+    iter_pdf_pages = None
+    PYMUPDF_AVAILABLE = False
+    print(f"⚠️ PDF 페이지 스트리밍을 찾을 수 없습니다: {e}")
+
+PDF_OCR_WORKERS = int(os.environ.get('PDF_OCR_WORKERS', 2))
+
+def pdf_page_ocr():
+    """스캔 PDF 페이지용 OCR 함수 (로컬 OCR 엔진이 없으면 None)"""
+    if get_batch_ocr_processor is None or get_batch_ocr_processor().select_engine() is None:
+        return None
+    return get_batch_ocr_processor().ocr_image
+
+# 라벨 텍스트 필드 추출 (모든 패턴을 한 번에 컴파일, 단일 패스 추출)
+from utils.field_extraction import NUTRITION_TEXT_PATTERNS, get_field_extractor
+
+# 외부 OCR 서비스 동시 호출 (제한 시간, 헤지 요청, 회로 차단)
+try:
+    from utils.provider_dispatch import ProviderDispatcher
+    print("✅ OCR 제공자 디스패처 import 성공")
+except ImportError as e:
+    ProviderDispatcher = None
+    print(f"⚠️ OCR 제공자 디스패처를 찾을 수 없습니다: {e}")
+
+# OCR 작업 큐 (무거운 OCR 은 별도 워커 프로세스에서 처리)
+try:
+    from utils.ocr_job_queue import OCRWorkerPool, job_upload_path
+    print("✅ OCR 작업 큐 import 성공")
+except ImportError as e:
+    OCRWorkerPool = None
+    print(f"⚠️ OCR 작업 큐를 찾을 수 없습니다: {e}")
+
+_ocr_worker_pool = None
+_ocr_worker_pool_lock = threading.Lock()
+
+def get_ocr_worker_pool():
+    """OCR 워커 풀
+
+    기본은 큐에만 등록하고 워커는 별도 실행 (python ocr_worker.py).
+    OCR_WORKER_EMBEDDED=true 이면 웹 프로세스 안에서 워커를 띄운다 (gunicorn 워커마다 생성되므로 개발용).
+    """
+    global _ocr_worker_pool
+    if _ocr_worker_pool is None and OCRWorkerPool is not None:
+        with _ocr_worker_pool_lock:
+            if _ocr_worker_pool is None:
+                pool = OCRWorkerPool(
+                    os.environ.get('OCR_JOB_DB', 'ocr_jobs.db'),
+                    num_workers=int(os.environ.get('OCR_WORKERS', 2))
+                )
+                if os.environ.get('OCR_WORKER_EMBEDDED', 'false').lower() == 'true':
+                    pool.start()
+                _ocr_worker_pool = pool
+    return _ocr_worker_pool
+
+try:
+    from label_compliance_checker import LabelComplianceChecker, get_label_compliance_checker
     print("✅ 라벨 규정 준수 검사기 import 성공")
 except ImportError as e:
     print(f"⚠️ 라벨 규정 준수 검사기를 찾을 수 없습니다: {e}")
@@ -492,12 +626,20 @@ def api_system_status():
         memory_status = memory_manager.get_status()
         cache_status = cache_manager.get_status()
         perf_status = performance_monitor.get_stats()
+        ocr_status = ocr_engine_pool.get_status() if ocr_engine_pool else {}
+        ocr_jobs_status = _ocr_worker_pool.get_status() if _ocr_worker_pool else {}
+        ocr_cache_status = get_ocr_result_cache().get_stats() if get_ocr_result_cache else {}
+        ocr_services_status = _ocr_service_dispatcher.get_status() if _ocr_service_dispatcher else {}
         
         return jsonify({
             'status': 'healthy',
             'memory': memory_status,
             'cache': cache_status,
             'performance': perf_status,
+            'ocr_engines': ocr_status,
+            'ocr_jobs': ocr_jobs_status,
+            'ocr_result_cache': ocr_cache_status,
+            'ocr_services': ocr_services_status,
             'timestamp': datetime.now().isoformat()
         })
     except Exception as e:
@@ -986,32 +1128,12 @@ def match_regulations_with_extracted_data(extracted_data, country, product_type)
         'improvement_suggestions': []
     }
     
-    # 1. 영양성분 규제 매칭
-    nutrition_results = check_nutrition_regulations(extracted_data, country, regulations)
-    matching_results['detailed_checks']['nutrition'] = nutrition_results
-    
-    # 2. 알레르기 정보 규제 매칭
-    allergy_results = check_allergy_regulations(extracted_data, country, regulations)
-    matching_results['detailed_checks']['allergy'] = allergy_results
-    
-    # 3. 성분/첨가물 규제 매칭
-    ingredient_results = check_ingredient_regulations(extracted_data, country, regulations)
-    matching_results['detailed_checks']['ingredients'] = ingredient_results
-    
-    # 4. 라벨 표기 규제 매칭
-    labeling_results = check_labeling_regulations(extracted_data, country, regulations)
-    matching_results['detailed_checks']['labeling'] = labeling_results
-    
-    # 5. 포장 정보 규제 매칭
-    packaging_results = check_packaging_regulations(extracted_data, country, regulations)
-    matching_results['detailed_checks']['packaging'] = packaging_results
+    # 영양성분, 알레르기, 성분/첨가물, 라벨 표기, 포장, 제조/유통 규제를 한 번에 매칭
+    evaluation = evaluate_compliance_rules(extracted_data, country, product_type, regulations)
+    matching_results['detailed_checks'] = evaluation.detailed_checks
     
-    # 6. 제조/유통 정보 규제 매칭
-    manufacturing_results = check_manufacturing_regulations(extracted_data, country, regulations)
-    matching_results['detailed_checks']['manufacturing'] = manufacturing_results
-    
-    # 전체 준수성 점수 계산
-    total_score = calculate_overall_compliance_score(matching_results['detailed_checks'])
+    # 전체 준수성 점수 계산 (규칙 엔진의 카테고리 가중치)
+    total_score = evaluation.overall_score
     matching_results['overall_compliance_score'] = total_score
     
     # 준수 상태 결정
@@ -1031,498 +1153,128 @@ def match_regulations_with_extracted_data(extracted_data, country, product_type)
     
     return matching_results
 
-def load_country_regulations(country, product_type):
-    """국가별 최신 규제 정보 로드"""
-    regulations = {
-        '중국': {
-            'nutrition': {
-                'required_nutrients': ['에너지', '단백질', '지방', '탄수화물', '나트륨', '당류', '포화지방'],
-                'unit': '100g당',
-                'format': '중국어 필수',
-                'year': '2027',
-                'regulation': 'GB 28050-2027'
-            },
-            'allergy': {
-                'required_allergens': ['우유', '계란', '생선', '갑각류', '견과류', '대두', '밀', '땅콩'],
-                'format': '중국어 필수',
-                'year': '2027',
-                'regulation': 'GB 7718-2027'
-            },
-            'ingredients': {
-                'restricted_additives': ['아황산나트륨', '아질산나트륨', '벤조산나트륨'],
-                'max_levels': {
-                    '아황산나트륨': '0.1g/kg',
-                    '아질산나트륨': '0.15g/kg',
-                    '벤조산나트륨': '1.0g/kg'
-                },
-                'year': '2027',
-                'regulation': 'GB 2760-2027'
-            },
-            'labeling': {
-                'required_info': ['제품명', '성분', '원산지', '유통기한', '보관방법', '제조사', '영양성분표'],
-                'language': '중국어 필수',
-                'font_size': '최소 1.8mm',
-                'year': '2027',
-                'regulation': 'GB 7718-2027'
-            },
-            'packaging': {
-                'required_info': ['포장단위', '총량', '개수'],
-                'year': '2027',
-                'regulation': 'GB 7718-2027'
-            },
-            'manufacturing': {
-                'required_info': ['제조일자', '유통기한', '제조사 정보', '식품안전인증번호'],
-                'year': '2027',
-                'regulation': 'GB 7718-2027'
-            }
+# 국가별 최신 규제 정보 원본 (규제 스냅샷 'compliance_rules' 로더)
+COUNTRY_REGULATIONS = {
+    '중국': {
+        'nutrition': {
+            'required_nutrients': ['에너지', '단백질', '지방', '탄수화물', '나트륨', '당류', '포화지방'],
+            'unit': '100g당',
+            'format': '중국어 필수',
+            'year': '2027',
+            'regulation': 'GB 28050-2027'
         },
-        '미국': {
-            'nutrition': {
-                'required_nutrients': ['Calories', 'Total Fat', 'Sodium', 'Total Carbohydrates', 'Protein'],
-                'unit': 'per serving',
-                'format': '영어 필수',
-                'year': '2024',
-                'regulation': 'FDA 21 CFR 101.9'
-            },
-            'allergy': {
-                'required_allergens': ['Milk', 'Eggs', 'Fish', 'Shellfish', 'Tree nuts', 'Peanuts', 'Wheat', 'Soybeans', 'Sesame'],
-                'format': '영어 필수',
-                'year': '2024',
-                'regulation': 'FDA FALCPA'
-            },
-            'ingredients': {
-                'restricted_additives': ['BHA', 'BHT', 'Propylene glycol'],
-                'max_levels': {
-                    'BHA': '0.02%',
-                    'BHT': '0.02%',
-                    'Propylene glycol': '0.5%'
-                },
-                'year': '2024',
-                'regulation': 'FDA 21 CFR 172'
-            },
-            'labeling': {
-                'required_info': ['Product name', 'Ingredients', 'Net weight', 'Manufacturer', 'Nutrition facts'],
-                'language': '영어 필수',
-                'font_size': '최소 1/16 inch',
-                'year': '2024',
-                'regulation': 'FDA 21 CFR 101'
+        'allergy': {
+            'required_allergens': ['우유', '계란', '생선', '갑각류', '견과류', '대두', '밀', '땅콩'],
+            'format': '중국어 필수',
+            'year': '2027',
+            'regulation': 'GB 7718-2027'
+        },
+        'ingredients': {
+            'restricted_additives': ['아황산나트륨', '아질산나트륨', '벤조산나트륨'],
+            'max_levels': {
+                '아황산나트륨': '0.1g/kg',
+                '아질산나트륨': '0.15g/kg',
+                '벤조산나트륨': '1.0g/kg'
             },
-            'packaging': {
-                'required_info': ['Net weight', 'Serving size', 'Servings per container'],
-                'year': '2024',
-                'regulation': 'FDA 21 CFR 101'
+            'year': '2027',
+            'regulation': 'GB 2760-2027'
+        },
+        'labeling': {
+            'required_info': ['제품명', '성분', '원산지', '유통기한', '보관방법', '제조사', '영양성분표'],
+            'language': '중국어 필수',
+            'font_size': '최소 1.8mm',
+            'year': '2027',
+            'regulation': 'GB 7718-2027'
+        },
+        'packaging': {
+            'required_info': ['포장단위', '총량', '개수'],
+            'year': '2027',
+            'regulation': 'GB 7718-2027'
+        },
+        'manufacturing': {
+            'required_info': ['제조일자', '유통기한', '제조사 정보', '식품안전인증번호'],
+            'year': '2027',
+            'regulation': 'GB 7718-2027'
+        }
+    },
+    '미국': {
+        'nutrition': {
+            'required_nutrients': ['Calories', 'Total Fat', 'Sodium', 'Total Carbohydrates', 'Protein'],
+            'unit': 'per serving',
+            'format': '영어 필수',
+            'year': '2024',
+            'regulation': 'FDA 21 CFR 101.9'
+        },
+        'allergy': {
+            'required_allergens': ['Milk', 'Eggs', 'Fish', 'Shellfish', 'Tree nuts', 'Peanuts', 'Wheat', 'Soybeans', 'Sesame'],
+            'format': '영어 필수',
+            'year': '2024',
+            'regulation': 'FDA FALCPA'
+        },
+        'ingredients': {
+            'restricted_additives': ['BHA', 'BHT', 'Propylene glycol'],
+            'max_levels': {
+                'BHA': '0.02%',
+                'BHT': '0.02%',
+                'Propylene glycol': '0.5%'
             },
-            'manufacturing': {
-                'required_info': ['Manufacturing date', 'Best before date', 'Manufacturer info', 'FDA registration'],
-                'year': '2024',
-                'regulation': 'FDA 21 CFR 101'
-            }
+            'year': '2024',
+            'regulation': 'FDA 21 CFR 172'
+        },
+        'labeling': {
+            'required_info': ['Product name', 'Ingredients', 'Net weight', 'Manufacturer', 'Nutrition facts'],
+            'language': '영어 필수',
+            'font_size': '최소 1/16 inch',
+            'year': '2024',
+            'regulation': 'FDA 21 CFR 101'
+        },
+        'packaging': {
+            'required_info': ['Net weight', 'Serving size', 'Servings per container'],
+            'year': '2024',
+            'regulation': 'FDA 21 CFR 101'
+        },
+        'manufacturing': {
+            'required_info': ['Manufacturing date', 'Best before date', 'Manufacturer info', 'FDA registration'],
+            'year': '2024',
+            'regulation': 'FDA 21 CFR 101'
         }
     }
-    
-    return regulations.get(country, {})
+}
 
-def check_nutrition_regulations(extracted_data, country, regulations):
-    """영양성분 규제 점검"""
-    nutrition_regs = regulations.get('nutrition', {})
-    results = {
-        'status': '미준수',
-        'score': 0,
-        'issues': [],
-        'details': {}
-    }
-    
-    # 추출된 영양성분 데이터 확인
-    nutrition_data = extracted_data.get('영양성분', [])
-    required_nutrients = nutrition_regs.get('required_nutrients', [])
-    
-    found_nutrients = []
-    missing_nutrients = []
-    
-    for nutrient in required_nutrients:
-        found = False
-        for item in nutrition_data:
-            if item.get('type') == 'text' and nutrient in item.get('content', ''):
-                found = True
-                found_nutrients.append(nutrient)
-                break
-            elif item.get('type') == 'table':
-                table_content = item.get('content', [])
-                for row in table_content:
-                    if any(nutrient in str(cell) for cell in row):
-                        found = True
-                        found_nutrients.append(nutrient)
-                        break
-                if found:
-                    break
-        
-        if not found:
-            missing_nutrients.append(nutrient)
-    
-    # 점수 계산
-    if required_nutrients:
-        compliance_rate = len(found_nutrients) / len(required_nutrients)
-        results['score'] = compliance_rate * 100
-        
-        if compliance_rate >= 0.9:
-            results['status'] = '준수'
-        elif compliance_rate >= 0.7:
-            results['status'] = '부분 준수'
-        else:
-            results['status'] = '미준수'
-    
-    # 문제점 기록
-    if missing_nutrients:
-        results['issues'].append(f"누락된 영양성분: {', '.join(missing_nutrients)}")
-    
-    results['details'] = {
-        'required': required_nutrients,
-        'found': found_nutrients,
-        'missing': missing_nutrients,
-        'regulation': nutrition_regs.get('regulation', ''),
-        'year': nutrition_regs.get('year', '')
-    }
-    
-    return results
+regulation_snapshots.register('compliance_rules', lambda: COUNTRY_REGULATIONS, levels=('country', 'category'))
 
-def check_allergy_regulations(extracted_data, country, regulations):
-    """알레르기 정보 규제 점검"""
-    allergy_regs = regulations.get('allergy', {})
-    results = {
-        'status': '미준수',
-        'score': 0,
-        'issues': [],
-        'details': {}
-    }
-    
-    # 추출된 알레르기 데이터 확인
-    allergy_data = extracted_data.get('표기사항', [])
-    required_allergens = allergy_regs.get('required_allergens', [])
-    
-    found_allergens = []
-    missing_allergens = []
-    
-    for allergen in required_allergens:
-        found = False
-        for item in allergy_data:
-            if item.get('type') == 'text' and allergen in item.get('content', ''):
-                found = True
-                found_allergens.append(allergen)
-                break
-            elif item.get('type') == 'table':
-                table_content = item.get('content', [])
-                for row in table_content:
-                    if any(allergen in str(cell) for cell in row):
-                        found = True
-                        found_allergens.append(allergen)
-                        break
-                if found:
-                    break
-        
-        if not found:
-            missing_allergens.append(allergen)
-    
-    # 점수 계산
-    if required_allergens:
-        compliance_rate = len(found_allergens) / len(required_allergens)
-        results['score'] = compliance_rate * 100
-        
-        if compliance_rate >= 0.9:
-            results['status'] = '준수'
-        elif compliance_rate >= 0.7:
-            results['status'] = '부분 준수'
-        else:
-            results['status'] = '미준수'
-    
-    # 문제점 기록
-    if missing_allergens:
-        results['issues'].append(f"누락된 알레르기 정보: {', '.join(missing_allergens)}")
-    
-    results['details'] = {
-        'required': required_allergens,
-        'found': found_allergens,
-        'missing': missing_allergens,
-        'regulation': allergy_regs.get('regulation', ''),
-        'year': allergy_regs.get('year', '')
-    }
-    
-    return results
+# 크롤러가 발행한 실시간 규제를 더한 (국가, 제품) 규제 (새 스냅샷이 발행되면 비움)
+_country_regulations_cache = {}
+_country_regulations_lock = threading.Lock()
 
-def check_ingredient_regulations(extracted_data, country, regulations):
-    """성분/첨가물 규제 점검"""
-    ingredient_regs = regulations.get('ingredients', {})
-    results = {
-        'status': '미준수',
-        'score': 0,
-        'issues': [],
-        'details': {}
-    }
-    
-    # 추출된 성분 데이터 확인
-    ingredient_data = extracted_data.get('원재료', [])
-    restricted_additives = ingredient_regs.get('restricted_additives', [])
-    max_levels = ingredient_regs.get('max_levels', {})
-    
-    found_restricted = []
-    violations = []
-    
-    for additive in restricted_additives:
-        for item in ingredient_data:
-            if item.get('type') == 'text' and additive in item.get('content', ''):
-                found_restricted.append(additive)
-                # 함량 확인 (간단한 패턴 매칭)
-                content = item.get('content', '')
-                if max_levels.get(additive):
-                    # 함량 초과 여부 확인 로직
-                    pass
-                break
-            elif item.get('type') == 'table':
-                table_content = item.get('content', [])
-                for row in table_content:
-                    if any(additive in str(cell) for cell in row):
-                        found_restricted.append(additive)
-                        break
-                if additive in found_restricted:
-                    break
-    
-    # 점수 계산 (제한 성분이 적을수록 높은 점수)
-    if restricted_additives:
-        violation_rate = len(found_restricted) / len(restricted_additives)
-        results['score'] = (1 - violation_rate) * 100
-        
-        if violation_rate == 0:
-            results['status'] = '준수'
-        elif violation_rate <= 0.3:
-            results['status'] = '부분 준수'
-        else:
-            results['status'] = '미준수'
-    
-    # 문제점 기록
-    if found_restricted:
-        results['issues'].append(f"제한 성분 발견: {', '.join(found_restricted)}")
-    
-    results['details'] = {
-        'restricted': restricted_additives,
-        'found': found_restricted,
-        'max_levels': max_levels,
-        'regulation': ingredient_regs.get('regulation', ''),
-        'year': ingredient_regs.get('year', '')
-    }
-    
-    return results
+def _on_regulation_snapshot(snapshot, changed):
+    """compliance_rules 또는 크롤러의 realtime_regulations 가 바뀌면 합친 규제를 다시 만들도록 비움"""
+    if 'compliance_rules' in changed or 'realtime_regulations' in changed:
+        with _country_regulations_lock:
+            _country_regulations_cache.clear()
 
-def check_labeling_regulations(extracted_data, country, regulations):
-    """라벨 표기 규제 점검"""
-    labeling_regs = regulations.get('labeling', {})
-    results = {
-        'status': '미준수',
-        'score': 0,
-        'issues': [],
-        'details': {}
-    }
-    
-    # 추출된 라벨 데이터 확인
-    labeling_data = extracted_data.get('표기사항', [])
-    required_info = labeling_regs.get('required_info', [])
-    
-    found_info = []
-    missing_info = []
-    
-    for info in required_info:
-        found = False
-        for item in labeling_data:
-            if item.get('type') == 'text' and info in item.get('content', ''):
-                found = True
-                found_info.append(info)
-                break
-            elif item.get('type') == 'table':
-                table_content = item.get('content', [])
-                for row in table_content:
-                    if any(info in str(cell) for cell in row):
-                        found = True
-                        found_info.append(info)
-                        break
-                if found:
-                    break
-        
-        if not found:
-            missing_info.append(info)
-    
-    # 점수 계산
-    if required_info:
-        compliance_rate = len(found_info) / len(required_info)
-        results['score'] = compliance_rate * 100
-        
-        if compliance_rate >= 0.9:
-            results['status'] = '준수'
-        elif compliance_rate >= 0.7:
-            results['status'] = '부분 준수'
-        else:
-            results['status'] = '미준수'
-    
-    # 문제점 기록
-    if missing_info:
-        results['issues'].append(f"누락된 라벨 정보: {', '.join(missing_info)}")
-    
-    results['details'] = {
-        'required': required_info,
-        'found': found_info,
-        'missing': missing_info,
-        'regulation': labeling_regs.get('regulation', ''),
-        'year': labeling_regs.get('year', '')
-    }
-    
-    return results
+regulation_snapshots.subscribe(_on_regulation_snapshot)
 
-def check_packaging_regulations(extracted_data, country, regulations):
-    """포장 정보 규제 점검"""
-    packaging_regs = regulations.get('packaging', {})
-    results = {
-        'status': '미준수',
-        'score': 0,
-        'issues': [],
-        'details': {}
-    }
-    
-    # 추출된 포장 데이터 확인
-    packaging_data = extracted_data.get('포장정보', [])
-    required_info = packaging_regs.get('required_info', [])
-    
-    found_info = []
-    missing_info = []
-    
-    for info in required_info:
-        found = False
-        for item in packaging_data:
-            if item.get('type') == 'text' and info in item.get('content', ''):
-                found = True
-                found_info.append(info)
-                break
-            elif item.get('type') == 'table':
-                table_content = item.get('content', [])
-                for row in table_content:
-                    if any(info in str(cell) for cell in row):
-                        found = True
-                        found_info.append(info)
-                        break
-                if found:
-                    break
-        
-        if not found:
-            missing_info.append(info)
-    
-    # 점수 계산
-    if required_info:
-        compliance_rate = len(found_info) / len(required_info)
-        results['score'] = compliance_rate * 100
-        
-        if compliance_rate >= 0.9:
-            results['status'] = '준수'
-        elif compliance_rate >= 0.7:
-            results['status'] = '부분 준수'
-        else:
-            results['status'] = '미준수'
-    
-    # 문제점 기록
-    if missing_info:
-        results['issues'].append(f"누락된 포장 정보: {', '.join(missing_info)}")
-    
-    results['details'] = {
-        'required': required_info,
-        'found': found_info,
-        'missing': missing_info,
-        'regulation': packaging_regs.get('regulation', ''),
-        'year': packaging_regs.get('year', '')
-    }
-    
-    return results
-def check_manufacturing_regulations(extracted_data, country, regulations):
-    """제조/유통 정보 규제 점검"""
-    manufacturing_regs = regulations.get('manufacturing', {})
-    results = {
-        'status': '미준수',
-        'score': 0,
-        'issues': [],
-        'details': {}
-    }
-    
-    # 추출된 제조 데이터 확인
-    manufacturing_data = extracted_data.get('기타정보', [])
-    required_info = manufacturing_regs.get('required_info', [])
-    
-    found_info = []
-    missing_info = []
-    
-    for info in required_info:
-        found = False
-        for item in manufacturing_data:
-            if item.get('type') == 'text' and info in item.get('content', ''):
-                found = True
-                found_info.append(info)
-                break
-            elif item.get('type') == 'table':
-                table_content = item.get('content', [])
-                for row in table_content:
-                    if any(info in str(cell) for cell in row):
-                        found = True
-                        found_info.append(info)
-                        break
-                if found:
-                    break
-        
-        if not found:
-            missing_info.append(info)
-    
-    # 점수 계산
-    if required_info:
-        compliance_rate = len(found_info) / len(required_info)
-        results['score'] = compliance_rate * 100
-        
-        if compliance_rate >= 0.9:
-            results['status'] = '준수'
-        elif compliance_rate >= 0.7:
-            results['status'] = '부분 준수'
-        else:
-            results['status'] = '미준수'
-    
-    # 문제점 기록
-    if missing_info:
-        results['issues'].append(f"누락된 제조 정보: {', '.join(missing_info)}")
-    
-    results['details'] = {
-        'required': required_info,
-        'found': found_info,
-        'missing': missing_info,
-        'regulation': manufacturing_regs.get('regulation', ''),
-        'year': manufacturing_regs.get('year', '')
-    }
-    
-    return results
+def load_country_regulations(country, product_type):
+    """국가별 최신 규제 정보 로드 (규제 스냅샷, 읽기 전용)
 
-def calculate_overall_compliance_score(detailed_checks):
-    """전체 준수성 점수 계산"""
-    total_score = 0
-    total_weight = 0
-    
-    # 각 항목별 가중치
-    weights = {
-        'nutrition': 25,      # 영양성분 (25%)
-        'allergy': 20,        # 알레르기 (20%)
-        'ingredients': 20,    # 성분/첨가물 (20%)
-        'labeling': 20,       # 라벨 표기 (20%)
-        'packaging': 10,      # 포장 정보 (10%)
-        'manufacturing': 5    # 제조 정보 (5%)
-    }
-    
-    for category, weight in weights.items():
-        if category in detailed_checks:
-            score = detailed_checks[category].get('score', 0)
-            total_score += score * weight
-            total_weight += weight
-    
-    if total_weight > 0:
-        return total_score / total_weight
-    return 0
+    크롤러(cloud_regulation_crawler, real_time_regulation_system)가 (국가, 제품) 규제를 발행했으면
+    'realtime_regulations' 항목으로 함께 돌려준다. 같은 스냅샷 동안은 같은 객체를 돌려주므로
+    컴파일된 규칙이 재사용되고, 새 규제가 발행되면 재시작 없이 반영된다.
+    """
+    snapshot = regulation_snapshots.snapshot()
+    regulations = snapshot.lookup('compliance_rules', country, default={})
+    realtime = snapshot.lookup('realtime_regulations', country, product_type)
+    if not realtime:
+        return regulations
+    
+    key = (country, product_type)
+    with _country_regulations_lock:
+        cached = _country_regulations_cache.get(key)
+        if cached is None or cached[0] != snapshot.version:
+            cached = (snapshot.version, FrozenDict({**regulations, 'realtime_regulations': realtime}))
+            _country_regulations_cache[key] = cached
+    return cached[1]
 
 def consolidate_issues_and_suggestions(matching_results):
     """문제점 및 개선사항 통합"""
@@ -1592,29 +1344,9 @@ def analyze_detailed_compliance_issues(extracted_data, regulation_matching, coun
         'checklist': []
     }
     
-    # 1. 영양성분 상세 분석
-    nutrition_issues = analyze_nutrition_issues(extracted_data, regulations, country)
-    detailed_analysis['detailed_issues'].extend(nutrition_issues)
-    
-    # 2. 알레르기 정보 상세 분석
-    allergy_issues = analyze_allergy_issues(extracted_data, regulations, country)
-    detailed_analysis['detailed_issues'].extend(allergy_issues)
-    
-    # 3. 성분/첨가물 상세 분석
-    ingredient_issues = analyze_ingredient_issues(extracted_data, regulations, country)
-    detailed_analysis['detailed_issues'].extend(ingredient_issues)
-    
-    # 4. 라벨 표기 상세 분석
-    labeling_issues = analyze_labeling_issues(extracted_data, regulations, country)
-    detailed_analysis['detailed_issues'].extend(labeling_issues)
-    
-    # 5. 포장 정보 상세 분석
-    packaging_issues = analyze_packaging_issues(extracted_data, regulations, country)
-    detailed_analysis['detailed_issues'].extend(packaging_issues)
-    
-    # 6. 제조/유통 정보 상세 분석
-    manufacturing_issues = analyze_manufacturing_issues(extracted_data, regulations, country)
-    detailed_analysis['detailed_issues'].extend(manufacturing_issues)
+    # 카테고리별 누락/제한 성분/형식 문제를 한 번에 분석
+    evaluation = evaluate_compliance_rules(extracted_data, country, product_type, regulations)
+    detailed_analysis['detailed_issues'].extend(evaluation.detailed_issues)
     
     # 액션플랜 생성
     action_plans = generate_action_plans(detailed_analysis['detailed_issues'], country, product_type)
@@ -1628,388 +1360,6 @@ def analyze_detailed_compliance_issues(extracted_data, regulation_matching, coun
     
     return detailed_analysis
 
-def analyze_nutrition_issues(extracted_data, regulations, country):
-    """영양성분 상세 분석"""
-    issues = []
-    nutrition_data = extracted_data.get('영양성분', [])
-    nutrition_regs = regulations.get('nutrition', {})
-    
-    required_nutrients = nutrition_regs.get('required_nutrients', [])
-    unit = nutrition_regs.get('unit', '')
-    format_requirement = nutrition_regs.get('format', '')
-    regulation_code = nutrition_regs.get('regulation', '')
-    year = nutrition_regs.get('year', '')
-    
-    # 필수 영양성분 누락 검사
-    for nutrient in required_nutrients:
-        found = False
-        found_content = ""
-        
-        for item in nutrition_data:
-            if item.get('type') == 'text' and nutrient in item.get('content', ''):
-                found = True
-                found_content = item.get('content', '')
-                break
-            elif item.get('type') == 'table':
-                table_content = item.get('content', [])
-                for row in table_content:
-                    if any(nutrient in str(cell) for cell in row):
-                        found = True
-                        found_content = str(row)
-                        break
-                if found:
-                    break
-        
-        if not found:
-            issues.append({
-                'category': '영양성분',
-                'issue_type': '누락',
-                'severity': 'critical',
-                'description': f'필수 영양성분 "{nutrient}"이(가) 누락되었습니다.',
-                'regulation_reference': f'{regulation_code} ({year}년)',
-                'regulation_detail': f'{country} 식품 라벨링 규정에 따라 {nutrient} 표기가 필수입니다.',
-                'location': '영양성분표',
-                'current_content': '표기 없음',
-                'required_content': f'{nutrient}: [함량] {unit}',
-                'action_required': '추가',
-                'example_correction': f'{nutrient}: 0.5g {unit}',
-                'design_recommendation': f'영양성분표에 {nutrient} 항목을 추가하고 함량을 {unit} 단위로 표기하세요.',
-                'additional_documents': ['영양성분분석서'],
-                'test_requirements': ['영양성분분석']
-            })
-    
-    # 단위 표기 오류 검사
-    for item in nutrition_data:
-        if item.get('type') == 'text':
-            content = item.get('content', '')
-            if unit and unit not in content and any(nutrient in content for nutrient in required_nutrients):
-                issues.append({
-                    'category': '영양성분',
-                    'issue_type': '단위 오류',
-                    'severity': 'major',
-                    'description': f'영양성분 단위가 {unit}로 표기되지 않았습니다.',
-                    'regulation_reference': f'{regulation_code} ({year}년)',
-                    'regulation_detail': f'{country} 규정에 따라 영양성분은 {unit} 단위로 표기해야 합니다.',
-                    'location': '영양성분표',
-                    'current_content': content,
-                    'required_content': f'[영양성분명]: [함량] {unit}',
-                    'action_required': '수정',
-                    'example_correction': content.replace('g', f'{unit}') if 'g' in content else f'{content} {unit}',
-                    'design_recommendation': f'모든 영양성분 함량 뒤에 {unit} 단위를 명시하세요.',
-                    'additional_documents': [],
-                    'test_requirements': []
-                })
-    
-    return issues
-
-def analyze_allergy_issues(extracted_data, regulations, country):
-    """알레르기 정보 상세 분석"""
-    issues = []
-    allergy_data = extracted_data.get('표기사항', [])
-    allergy_regs = regulations.get('allergy', {})
-    
-    required_allergens = allergy_regs.get('required_allergens', [])
-    format_requirement = allergy_regs.get('format', '')
-    regulation_code = allergy_regs.get('regulation', '')
-    year = allergy_regs.get('year', '')
-    
-    # 필수 알레르기 정보 누락 검사
-    for allergen in required_allergens:
-        found = False
-        found_content = ""
-        
-        for item in allergy_data:
-            if item.get('type') == 'text' and allergen in item.get('content', ''):
-                found = True
-                found_content = item.get('content', '')
-                break
-            elif item.get('type') == 'table':
-                table_content = item.get('content', [])
-                for row in table_content:
-                    if any(allergen in str(cell) for cell in row):
-                        found = True
-                        found_content = str(row)
-                        break
-                if found:
-                    break
-        
-        if not found:
-            issues.append({
-                'category': '알레르기',
-                'issue_type': '누락',
-                'severity': 'critical',
-                'description': f'알레르기 정보 "{allergen}"이(가) 누락되었습니다.',
-                'regulation_reference': f'{regulation_code} ({year}년)',
-                'regulation_detail': f'{country} 식품 라벨링 규정에 따라 {allergen} 알레르기 정보 표기가 필수입니다.',
-                'location': '알레르기 정보',
-                'current_content': '표기 없음',
-                'required_content': f'알레르기 정보: {allergen} 포함',
-                'action_required': '추가',
-                'example_correction': f'알레르기 정보: {allergen} 함유',
-                'design_recommendation': f'알레르기 정보 섹션에 {allergen} 포함 여부를 명시하세요.',
-                'additional_documents': ['알레르기 정보서'],
-                'test_requirements': ['알레르기 성분 검사']
-            })
-    
-    # 알레르기 정보 형식 검사
-    for item in allergy_data:
-        if item.get('type') == 'text':
-            content = item.get('content', '')
-            if '알레르기' in content and not any(allergen in content for allergen in required_allergens):
-                issues.append({
-                    'category': '알레르기',
-                    'issue_type': '형식 오류',
-                    'severity': 'major',
-                    'description': '알레르기 정보가 구체적으로 표기되지 않았습니다.',
-                    'regulation_reference': f'{regulation_code} ({year}년)',
-                    'regulation_detail': f'{country} 규정에 따라 구체적인 알레르기 원료를 명시해야 합니다.',
-                    'location': '알레르기 정보',
-                    'current_content': content,
-                    'required_content': f'알레르기 정보: [구체적 원료명] 포함',
-                    'action_required': '수정',
-                    'example_correction': f'알레르기 정보: {", ".join(required_allergens[:3])} 포함',
-                    'design_recommendation': '알레르기 정보에 구체적인 원료명을 나열하세요.',
-                    'additional_documents': [],
-                    'test_requirements': []
-                })
-    
-    return issues
-
-def analyze_ingredient_issues(extracted_data, regulations, country):
-    """성분/첨가물 상세 분석"""
-    issues = []
-    ingredient_data = extracted_data.get('원재료', [])
-    ingredient_regs = regulations.get('ingredients', {})
-    
-    restricted_additives = ingredient_regs.get('restricted_additives', [])
-    max_levels = ingredient_regs.get('max_levels', {})
-    regulation_code = ingredient_regs.get('regulation', '')
-    year = ingredient_regs.get('year', '')
-    
-    # 제한 첨가물 검사
-    for additive in restricted_additives:
-        for item in ingredient_data:
-            if item.get('type') == 'text' and additive in item.get('content', ''):
-                content = item.get('content', '')
-                max_level = max_levels.get(additive, '')
-                
-                issues.append({
-                    'category': '성분/첨가물',
-                    'issue_type': '제한 성분',
-                    'severity': 'critical',
-                    'description': f'제한 첨가물 "{additive}"이(가) 사용되었습니다.',
-                    'regulation_reference': f'{regulation_code} ({year}년)',
-                    'regulation_detail': f'{country} 식품첨가물 규정에 따라 {additive} 사용이 제한됩니다. (최대: {max_level})',
-                    'location': '성분표',
-                    'current_content': content,
-                    'required_content': f'{additive} 함량이 {max_level} 이하여야 함',
-                    'action_required': '검사',
-                    'example_correction': f'{additive} 함량: {max_level} 이하 확인',
-                    'design_recommendation': f'{additive} 함량을 {max_level} 이하로 제한하거나 대체 성분을 사용하세요.',
-                    'additional_documents': ['성분분석서'],
-                    'test_requirements': ['첨가물 함량 분석']
-                })
-    
-    # 성분 표기 형식 검사
-    for item in ingredient_data:
-        if item.get('type') == 'text':
-            content = item.get('content', '')
-            if '성분' in content and len(content.split()) < 3:
-                issues.append({
-                    'category': '성분/첨가물',
-                    'issue_type': '표기 불충분',
-                    'severity': 'major',
-                    'description': '성분 정보가 불충분하게 표기되었습니다.',
-                    'regulation_reference': f'{regulation_code} ({year}년)',
-                    'regulation_detail': f'{country} 규정에 따라 모든 성분을 함량 순으로 표기해야 합니다.',
-                    'location': '성분표',
-                    'current_content': content,
-                    'required_content': '성분: [원료명1], [원료명2], [원료명3]...',
-                    'action_required': '수정',
-                    'example_correction': '성분: 밀가루, 소금, 설탕, 향신료',
-                    'design_recommendation': '모든 성분을 함량 순으로 나열하고 구체적인 원료명을 사용하세요.',
-                    'additional_documents': [],
-                    'test_requirements': []
-                })
-    
-    return issues
-
-def analyze_labeling_issues(extracted_data, regulations, country):
-    """라벨 표기 상세 분석"""
-    issues = []
-    labeling_data = extracted_data.get('표기사항', [])
-    labeling_regs = regulations.get('labeling', {})
-    
-    required_info = labeling_regs.get('required_info', [])
-    language_requirement = labeling_regs.get('language', '')
-    font_size = labeling_regs.get('font_size', '')
-    regulation_code = labeling_regs.get('regulation', '')
-    year = labeling_regs.get('year', '')
-    
-    # 필수 표기사항 누락 검사
-    for info in required_info:
-        found = False
-        found_content = ""
-        
-        for item in labeling_data:
-            if item.get('type') == 'text' and info in item.get('content', ''):
-                found = True
-                found_content = item.get('content', '')
-                break
-            elif item.get('type') == 'table':
-                table_content = item.get('content', [])
-                for row in table_content:
-                    if any(info in str(cell) for cell in row):
-                        found = True
-                        found_content = str(row)
-                        break
-                if found:
-                    break
-        
-        if not found:
-            issues.append({
-                'category': '라벨 표기',
-                'issue_type': '누락',
-                'severity': 'critical',
-                'description': f'필수 표기사항 "{info}"이(가) 누락되었습니다.',
-                'regulation_reference': f'{regulation_code} ({year}년)',
-                'regulation_detail': f'{country} 식품 라벨링 규정에 따라 {info} 표기가 필수입니다.',
-                'location': '라벨',
-                'current_content': '표기 없음',
-                'required_content': f'{info}: [구체적 내용]',
-                'action_required': '추가',
-                'example_correction': f'{info}: [구체적 내용 입력]',
-                'design_recommendation': f'라벨에 {info} 섹션을 추가하고 구체적인 내용을 표기하세요.',
-                'additional_documents': [],
-                'test_requirements': []
-            })
-    
-    # 언어 요구사항 검사
-    if language_requirement:
-        for item in labeling_data:
-            if item.get('type') == 'text':
-                content = item.get('content', '')
-                # 간단한 언어 감지 (실제로는 더 정교한 로직 필요)
-                if language_requirement == '중국어 필수' and not any(char in content for char in '中文'):
-                    issues.append({
-                        'category': '라벨 표기',
-                        'issue_type': '언어 오류',
-                        'severity': 'major',
-                        'description': f'라벨이 {language_requirement}로 표기되지 않았습니다.',
-                        'regulation_reference': f'{regulation_code} ({year}년)',
-                        'regulation_detail': f'{country} 규정에 따라 라벨은 {language_requirement}로 표기해야 합니다.',
-                        'location': '라벨',
-                        'current_content': content,
-                        'required_content': f'{language_requirement} 표기',
-                        'action_required': '수정',
-                        'example_correction': f'{content} (중국어 번역 추가)',
-                        'design_recommendation': f'모든 라벨 정보를 {language_requirement}로 번역하여 표기하세요.',
-                        'additional_documents': ['번역문서'],
-                        'test_requirements': ['번역 검증']
-                    })
-    
-    return issues
-
-def analyze_packaging_issues(extracted_data, regulations, country):
-    """포장 정보 상세 분석"""
-    issues = []
-    packaging_data = extracted_data.get('포장정보', [])
-    packaging_regs = regulations.get('packaging', {})
-    
-    required_info = packaging_regs.get('required_info', [])
-    regulation_code = packaging_regs.get('regulation', '')
-    year = packaging_regs.get('year', '')
-    
-    # 필수 포장 정보 누락 검사
-    for info in required_info:
-        found = False
-        found_content = ""
-        
-        for item in packaging_data:
-            if item.get('type') == 'text' and info in item.get('content', ''):
-                found = True
-                found_content = item.get('content', '')
-                break
-            elif item.get('type') == 'table':
-                table_content = item.get('content', [])
-                for row in table_content:
-                    if any(info in str(cell) for cell in row):
-                        found = True
-                        found_content = str(row)
-                        break
-                if found:
-                    break
-        
-        if not found:
-            issues.append({
-                'category': '포장 정보',
-                'issue_type': '누락',
-                'severity': 'major',
-                'description': f'포장 정보 "{info}"이(가) 누락되었습니다.',
-                'regulation_reference': f'{regulation_code} ({year}년)',
-                'regulation_detail': f'{country} 포장 규정에 따라 {info} 표기가 필요합니다.',
-                'location': '포장',
-                'current_content': '표기 없음',
-                'required_content': f'{info}: [구체적 내용]',
-                'action_required': '추가',
-                'example_correction': f'{info}: [구체적 내용 입력]',
-                'design_recommendation': f'포장에 {info} 정보를 추가하세요.',
-                'additional_documents': [],
-                'test_requirements': []
-            })
-    
-    return issues
-
-def analyze_manufacturing_issues(extracted_data, regulations, country):
-    """제조/유통 정보 상세 분석"""
-    issues = []
-    manufacturing_data = extracted_data.get('기타정보', [])
-    manufacturing_regs = regulations.get('manufacturing', {})
-    
-    required_info = manufacturing_regs.get('required_info', [])
-    regulation_code = manufacturing_regs.get('regulation', '')
-    year = manufacturing_regs.get('year', '')
-    
-    # 필수 제조 정보 누락 검사
-    for info in required_info:
-        found = False
-        found_content = ""
-        
-        for item in manufacturing_data:
-            if item.get('type') == 'text' and info in item.get('content', ''):
-                found = True
-                found_content = item.get('content', '')
-                break
-            elif item.get('type') == 'table':
-                table_content = item.get('content', [])
-                for row in table_content:
-                    if any(info in str(cell) for cell in row):
-                        found = True
-                        found_content = str(row)
-                        break
-                if found:
-                    break
-        
-        if not found:
-            issues.append({
-                'category': '제조/유통',
-                'issue_type': '누락',
-                'severity': 'critical',
-                'description': f'제조 정보 "{info}"이(가) 누락되었습니다.',
-                'regulation_reference': f'{regulation_code} ({year}년)',
-                'regulation_detail': f'{country} 제조 규정에 따라 {info} 표기가 필수입니다.',
-                'location': '라벨/포장',
-                'current_content': '표기 없음',
-                'required_content': f'{info}: [구체적 내용]',
-                'action_required': '추가',
-                'example_correction': f'{info}: [구체적 내용 입력]',
-                'design_recommendation': f'라벨에 {info} 정보를 추가하세요.',
-                'additional_documents': ['제조시설 등록증'],
-                'test_requirements': []
-            })
-    
-    return issues
-
 def generate_action_plans(detailed_issues, country, product_type):
     """액션플랜 생성"""
     action_plans = {
@@ -2539,229 +1889,251 @@ def compliance_analysis():
     """규제 준수성 분석 페이지"""
     return render_template('compliance_analysis_dashboard.html')
 
-@app.route('/api/compliance-analysis', methods=['POST'])
-def api_compliance_analysis():
-    """규제 준수성 분석 API - OCR/문서분석 기반 (최적화된 버전)"""
-    print("🔍 준수성 분석 API 호출됨")
-    
-    try:
-        # 요청 데이터 안전하게 추출
-        country = ''
-        product_type = '식품'
-        use_ocr = True
-        company_info = {}
-        product_info = {}
-        uploaded_documents = []
-        prepared_documents = []
-        labeling_info = {}
-        
-        # Content-Type에 따라 데이터 추출 방식 결정
-        if request.content_type and 'application/json' in request.content_type:
-            try:
-                data = request.get_json()
-                if data:
-                    country = data.get('country', '')
-                    product_type = data.get('product_type', '식품')
-                    use_ocr = data.get('use_ocr', True)
-                    company_info = data.get('company_info', {})
-                    product_info = data.get('product_info', {})
-                    uploaded_documents = data.get('uploaded_documents', [])
-                    prepared_documents = data.get('prepared_documents', [])
-                    labeling_info = data.get('labeling_info', {})
-                else:
-                    # JSON이 비어있는 경우 기본값 설정
-                    country = ''
-                    product_type = '식품'
-                    use_ocr = True
-                    company_info = {}
-                    product_info = {}
-                    uploaded_documents = []
-                    prepared_documents = []
-                    labeling_info = {}
-            except Exception as e:
-                print(f"⚠️ JSON 파싱 오류: {e}")
-                print(f"요청 내용: {request.get_data(as_text=True)[:200]}...")
-                return jsonify({
-                    'error': '잘못된 JSON 형식입니다. 올바른 JSON 형식으로 요청해주세요.',
-                    'success': False,
-                    'details': str(e)
-                }), 400
-        else:
-            # FormData 요청 처리
-            country = request.form.get('country', '')
-            product_type = request.form.get('product_type', '식품')
-            use_ocr = request.form.get('use_ocr', 'true').lower() == 'true'
-            
-            try:
-                company_info = json.loads(request.form.get('company_info', '{}'))
-            except (json.JSONDecodeError, TypeError):
+def read_compliance_analysis_request():
+    """준수성 분석 요청 값 추출 (JSON/FormData) 및 업로드 파일 임시 저장
+
+    Returns:
+        (요청 값, 오류 응답). 요청이 잘못되었으면 요청 값은 None 이고 오류 응답을 그대로 반환하면 된다.
+    """
+    # 요청 데이터 안전하게 추출
+    country = ''
+    product_type = '식품'
+    use_ocr = True
+    company_info = {}
+    product_info = {}
+    uploaded_documents = []
+    prepared_documents = []
+    labeling_info = {}
+    
+    # Content-Type에 따라 데이터 추출 방식 결정
+    if request.content_type and 'application/json' in request.content_type:
+        try:
+            data = request.get_json()
+            if data:
+                country = data.get('country', '')
+                product_type = data.get('product_type', '식품')
+                use_ocr = data.get('use_ocr', True)
+                company_info = data.get('company_info', {})
+                product_info = data.get('product_info', {})
+                uploaded_documents = data.get('uploaded_documents', [])
+                prepared_documents = data.get('prepared_documents', [])
+                labeling_info = data.get('labeling_info', {})
+            else:
+                # JSON이 비어있는 경우 기본값 설정
+                country = ''
+                product_type = '식품'
+                use_ocr = True
                 company_info = {}
-                
-            try:
-                product_info = json.loads(request.form.get('product_info', '{}'))
-            except (json.JSONDecodeError, TypeError):
                 product_info = {}
-                
-            try:
-                uploaded_documents = json.loads(request.form.get('uploaded_documents', '[]'))
-            except (json.JSONDecodeError, TypeError):
                 uploaded_documents = []
-                
-            try:
-                prepared_documents = json.loads(request.form.get('prepared_documents', '[]'))
-            except (json.JSONDecodeError, TypeError):
                 prepared_documents = []
-                
-            try:
-                labeling_info = json.loads(request.form.get('labeling_info', '{}'))
-            except (json.JSONDecodeError, TypeError):
                 labeling_info = {}
-        
-        print(f"🌍 국가: {country}")
-        print(f"📦 제품타입: {product_type}")
-        print(f"📋 업로드된 문서: {len(uploaded_documents)}개")
-        print(f"🔍 OCR 사용: {use_ocr}")
-        
-        if not country:
-            return jsonify({
-                'error': '국가를 선택해주세요.',
+        except Exception as e:
+            print(f"⚠️ JSON 파싱 오류: {e}")
+            print(f"요청 내용: {request.get_data(as_text=True)[:200]}...")
+            return None, (jsonify({
+                'error': '잘못된 JSON 형식입니다. 올바른 JSON 형식으로 요청해주세요.',
                 'success': False,
-                'message': '분석을 위해 국가를 선택해주세요.'
-            }), 400
+                'details': str(e)
+            }), 400)
+    else:
+        # FormData 요청 처리
+        country = request.form.get('country', '')
+        product_type = request.form.get('product_type', '식품')
+        use_ocr = request.form.get('use_ocr', 'true').lower() == 'true'
         
-        # 파일 업로드 처리 (최적화된 버전)
-        uploaded_files = []
-        if use_ocr and request.files:
-            file_mapping = {
-                'labelFile': '라벨',
-                'nutritionFile': '영양성분표',
-                'ingredientFile': '원료리스트',
-                'sanitationFile': '위생증명서',
-                'originFile': '원산지증명서',
-                'otherFile': '기타문서'
-            }
+        try:
+            company_info = json.loads(request.form.get('company_info', '{}'))
+        except (json.JSONDecodeError, TypeError):
+            company_info = {}
             
-            for file_key, doc_type in file_mapping.items():
-                if file_key in request.files:
-                    file = request.files[file_key]
-                    if file and file.filename:
-                        try:
-                            # 파일 저장 (최적화된 방식)
-                            filename = secure_filename(file.filename)
-                            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                            unique_filename = f"{timestamp}_{filename}"
-                            filepath = os.path.join('temp_uploads', unique_filename)
-                            
-                            # 디렉토리 생성
-                            os.makedirs('temp_uploads', exist_ok=True)
-                            
-                            # 파일 저장
-                            file.save(filepath)
-                            print(f"✅ 파일 저장됨: {filepath}")
-                            
-                            uploaded_files.append({
-                                'type': doc_type,
-                                'path': filepath,
-                                'filename': filename
-                            })
-                        except Exception as e:
-                            print(f"⚠️ 파일 저장 실패: {e}")
-                            continue
-        
-        # 문서가 없는 경우 WebMVPSystem 사용 (체크박스 지원)
-        print(f"🔍 조건 확인: uploaded_files={len(uploaded_files)}, prepared_documents={len(prepared_documents)}, uploaded_documents={len(uploaded_documents)}")
-        print(f"🔍 조건 확인: uploaded_files={uploaded_files}, prepared_documents={prepared_documents}, uploaded_documents={uploaded_documents}")
-        
-        # 체크박스 정보가 있는지 확인
-        has_checkbox_info = any([
-            labeling_info.get('has_nutrition_label') is not None,
-            labeling_info.get('has_allergy_info') is not None,
-            labeling_info.get('has_expiry_date') is not None,
-            labeling_info.get('has_ingredients') is not None,
-            labeling_info.get('has_storage_info') is not None,
-            labeling_info.get('has_manufacturer_info') is not None
-        ])
-        print(f"🔍 체크박스 정보 존재: {has_checkbox_info}")
+        try:
+            product_info = json.loads(request.form.get('product_info', '{}'))
+        except (json.JSONDecodeError, TypeError):
+            product_info = {}
+            
+        try:
+            uploaded_documents = json.loads(request.form.get('uploaded_documents', '[]'))
+        except (json.JSONDecodeError, TypeError):
+            uploaded_documents = []
+            
+        try:
+            prepared_documents = json.loads(request.form.get('prepared_documents', '[]'))
+        except (json.JSONDecodeError, TypeError):
+            prepared_documents = []
+            
+        try:
+            labeling_info = json.loads(request.form.get('labeling_info', '{}'))
+        except (json.JSONDecodeError, TypeError):
+            labeling_info = {}
+    
+    print(f"🌍 국가: {country}")
+    print(f"📦 제품타입: {product_type}")
+    print(f"📋 업로드된 문서: {len(uploaded_documents)}개")
+    print(f"🔍 OCR 사용: {use_ocr}")
+    
+    if not country:
+        return None, (jsonify({
+            'error': '국가를 선택해주세요.',
+            'success': False,
+            'message': '분석을 위해 국가를 선택해주세요.'
+        }), 400)
+    
+    # 파일 업로드 처리 (최적화된 버전)
+    uploaded_files = []
+    if use_ocr and request.files:
+        file_mapping = {
+            'labelFile': '라벨',
+            'nutritionFile': '영양성분표',
+            'ingredientFile': '원료리스트',
+            'sanitationFile': '위생증명서',
+            'originFile': '원산지증명서',
+            'otherFile': '기타문서'
+        }
+        
+        for file_key, doc_type in file_mapping.items():
+            if file_key in request.files:
+                file = request.files[file_key]
+                if file and file.filename:
+                    try:
+                        # 파일 저장 (최적화된 방식)
+                        filename = secure_filename(file.filename)
+                        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                        unique_filename = f"{timestamp}_{filename}"
+                        filepath = os.path.join('temp_uploads', unique_filename)
+                        
+                        # 디렉토리 생성
+                        os.makedirs('temp_uploads', exist_ok=True)
+                        
+                        # 파일 저장
+                        file.save(filepath)
+                        print(f"✅ 파일 저장됨: {filepath}")
+                        
+                        uploaded_files.append({
+                            'type': doc_type,
+                            'path': filepath,
+                            'filename': filename
+                        })
+                    except Exception as e:
+                        print(f"⚠️ 파일 저장 실패: {e}")
+                        continue
+    
+    print(f"🔍 조건 확인: uploaded_files={len(uploaded_files)}, prepared_documents={len(prepared_documents)}, uploaded_documents={len(uploaded_documents)}")
+    return {
+        'country': country,
+        'product_type': product_type,
+        'company_info': company_info,
+        'product_info': product_info,
+        'uploaded_files': uploaded_files,
+        'uploaded_documents': uploaded_documents,
+        'prepared_documents': prepared_documents,
+        'labeling_info': labeling_info
+    }, None
+
+def has_labeling_checkbox_info(labeling_info):
+    """라벨 표기 체크박스 값이 하나라도 있는지 (있으면 문서 대신 WebMVPSystem 으로 분석)"""
+    return any(labeling_info.get(key) is not None for key in (
+        'has_nutrition_label', 'has_allergy_info', 'has_expiry_date',
+        'has_ingredients', 'has_storage_info', 'has_manufacturer_info'
+    ))
+
+def analyze_with_labeling_checkboxes(country, product_type, company_info, product_info, prepared_documents, labeling_info):
+    """체크박스 기반 WebMVPSystem 분석 (준수성 분석 API 응답 형식)"""
+    web_system = WebMVPSystem()
+    analysis_result = web_system.analyze_compliance(
+        country, product_type, company_info, product_info, 
+        prepared_documents, labeling_info
+    )
+    
+    # 응답 형식 맞추기
+    return {
+        'success': True,
+        'message': f'{country} {product_type} 규제 준수성 분석이 완료되었습니다.',
+        'compliance_analysis': {
+            'overall_score': analysis_result.get('overall_score', 0),
+            'compliance_status': analysis_result.get('compliance_status', '미준수'),
+            'critical_issues': analysis_result.get('critical_issues', []),
+            'minor_issues': analysis_result.get('minor_issues', []),
+            'suggestions': analysis_result.get('improvement_suggestions', []),
+            'analysis_details': {
+                'country': country,
+                'product_type': product_type,
+                'missing_documents': analysis_result.get('missing_requirements', []),
+                'has_nutrition_info': labeling_info.get('has_nutrition_label', False),
+                'has_allergy_info': labeling_info.get('has_allergy_info', False),
+                'has_manufacturer_info': labeling_info.get('has_manufacturer_info', False)
+            }
+        },
+        'analysis_summary': {
+            'compliance_score': analysis_result.get('overall_score', 0),
+            'critical_issues': len(analysis_result.get('critical_issues', [])),
+            'major_issues': 0,
+            'minor_issues': len(analysis_result.get('minor_issues', [])),
+            'total_documents': 0,
+            'analyzed_documents': []
+        },
+        'checklist': analysis_result.get('improvement_suggestions', []),
+        'correction_guide': {
+            'timeline': '2-4주 소요 예상',
+            'estimated_cost': '검역비용 및 서류 준비 비용',
+            'priority_actions': ['현지 언어로 라벨 작성', '필수 정보 표시 확인', '검역 서류 준비']
+        },
+        'ocr_results': {},
+        'structured_data': {},
+        'regulation_matching': {
+            'country': country,
+            'product_type': product_type,
+            'regulations': {},
+            'compliance_checks': {},
+            'missing_requirements': analysis_result.get('missing_requirements', []),
+            'violations': []
+        }
+    }
+
+def cleanup_uploaded_files(uploaded_files):
+    """업로드 임시 파일 삭제"""
+    for file_info in uploaded_files:
+        try:
+            if os.path.exists(file_info['path']):
+                os.remove(file_info['path'])
+                print(f"🗑️ 임시 파일 삭제: {file_info['path']}")
+        except Exception as e:
+            print(f"⚠️ 임시 파일 삭제 실패: {e}")
+
+@app.route('/api/compliance-analysis', methods=['POST'])
+def api_compliance_analysis():
+    """규제 준수성 분석 API - OCR/문서분석 기반 (최적화된 버전)"""
+    print("🔍 준수성 분석 API 호출됨")
+    
+    try:
+        values, error_response = read_compliance_analysis_request()
+        if error_response is not None:
+            return error_response
+        uploaded_files = values['uploaded_files']
         
         # 체크박스 정보가 있으면 WebMVPSystem 사용 (문서 유무와 관계없이)
+        has_checkbox_info = has_labeling_checkbox_info(values['labeling_info'])
+        print(f"🔍 체크박스 정보 존재: {has_checkbox_info}")
         if has_checkbox_info:
             print("📋 문서 없음 - WebMVPSystem 분석 수행")
-            web_system = WebMVPSystem()
-            analysis_result = web_system.analyze_compliance(
-                country, product_type, company_info, product_info, 
-                prepared_documents, labeling_info
-            )
-            
-            # 응답 형식 맞추기
-            return jsonify({
-                'success': True,
-                'message': f'{country} {product_type} 규제 준수성 분석이 완료되었습니다.',
-                'compliance_analysis': {
-                    'overall_score': analysis_result.get('overall_score', 0),
-                    'compliance_status': analysis_result.get('compliance_status', '미준수'),
-                    'critical_issues': analysis_result.get('critical_issues', []),
-                    'minor_issues': analysis_result.get('minor_issues', []),
-                    'suggestions': analysis_result.get('improvement_suggestions', []),
-                    'analysis_details': {
-                        'country': country,
-                        'product_type': product_type,
-                        'missing_documents': analysis_result.get('missing_requirements', []),
-                        'has_nutrition_info': labeling_info.get('has_nutrition_label', False),
-                        'has_allergy_info': labeling_info.get('has_allergy_info', False),
-                        'has_manufacturer_info': labeling_info.get('has_manufacturer_info', False)
-                    }
-                },
-                'analysis_summary': {
-                    'compliance_score': analysis_result.get('overall_score', 0),
-                    'critical_issues': len(analysis_result.get('critical_issues', [])),
-                    'major_issues': 0,
-                    'minor_issues': len(analysis_result.get('minor_issues', [])),
-                    'total_documents': 0,
-                    'analyzed_documents': []
-                },
-                'checklist': analysis_result.get('improvement_suggestions', []),
-                'correction_guide': {
-                    'timeline': '2-4주 소요 예상',
-                    'estimated_cost': '검역비용 및 서류 준비 비용',
-                    'priority_actions': ['현지 언어로 라벨 작성', '필수 정보 표시 확인', '검역 서류 준비']
-                },
-                'ocr_results': {},
-                'structured_data': {},
-                'regulation_matching': {
-                    'country': country,
-                    'product_type': product_type,
-                    'regulations': {},
-                    'compliance_checks': {},
-                    'missing_requirements': analysis_result.get('missing_requirements', []),
-                    'violations': []
-                }
-            })
+            return jsonify(analyze_with_labeling_checkboxes(
+                values['country'], values['product_type'], values['company_info'], values['product_info'],
+                values['prepared_documents'], values['labeling_info']
+            ))
         
         try:
             # 최적화된 OCR/문서분석 수행
             result = perform_optimized_compliance_analysis(
-                country, product_type, uploaded_files, uploaded_documents, 
-                company_info, product_info
+                values['country'], values['product_type'], uploaded_files, values['uploaded_documents'],
+                values['company_info'], values['product_info']
             )
             
             # 임시 파일 정리
-            for file_info in uploaded_files:
-                try:
-                    if os.path.exists(file_info['path']):
-                        os.remove(file_info['path'])
-                        print(f"🗑️ 임시 파일 삭제: {file_info['path']}")
-                except Exception as e:
-                    print(f"⚠️ 임시 파일 삭제 실패: {e}")
-            
+            cleanup_uploaded_files(uploaded_files)
             return result
         except Exception as e:
             # 임시 파일 정리 (오류 발생 시에도)
-            for file_info in uploaded_files:
-                try:
-                    if os.path.exists(file_info['path']):
-                        os.remove(file_info['path'])
-                except Exception:
-                    pass
+            cleanup_uploaded_files(uploaded_files)
             
             print(f"❌ 준수성 분석 오류: {str(e)}")
             return jsonify({
@@ -2775,8 +2147,84 @@ def api_compliance_analysis():
             'success': False
         })
 
+
+# 스트리밍 응답 하트비트 간격 (프록시 유휴 시간 초과 방지)
+STREAM_HEARTBEAT_SECONDS = float(os.environ.get('STREAM_HEARTBEAT_SECONDS', 15))
+
+def event_stream_format():
+    """요청한 스트림 형식 (?format=) 과 지원하지 않는 형식일 때의 400 응답"""
+    fmt = request.args.get('format', 'sse')
+    if fmt not in EVENT_STREAM_MIMETYPES:
+        return fmt, (jsonify({
+            'error': f'지원하지 않는 스트림 형식입니다: {fmt} (sse, ndjson)',
+            'success': False
+        }), 400)
+    return fmt, None
+
+def event_stream_response(events):
+    """(이벤트, 데이터) 생성기를 스트리밍 응답으로 변환 (?format=ndjson 이면 줄 단위 JSON, 기본은 SSE)"""
+    fmt, error_response = event_stream_format()
+    if error_response is not None:
+        return error_response
+    return Response(stream_events(events, fmt, heartbeat=STREAM_HEARTBEAT_SECONDS),
+                    mimetype=EVENT_STREAM_MIMETYPES[fmt], headers=EVENT_STREAM_HEADERS)
+
+@app.route('/api/compliance-analysis/stream', methods=['POST'])
+def api_compliance_analysis_stream():
+    """규제 준수성 분석 스트리밍 API - 문서별 OCR, 규제 매칭, 점수, 체크리스트를 끝나는 대로 전송"""
+    print("🔍 준수성 분석 스트리밍 API 호출됨")
+    
+    # 업로드 파일을 저장하기 전에 스트림 형식 확인 (형식 오류로 끝나면 저장한 파일을 정리할 곳이 없음)
+    _, error_response = event_stream_format()
+    if error_response is not None:
+        return error_response
+    
+    try:
+        # 요청 데이터와 업로드 파일은 응답 스트리밍 전에 읽어 둠 (스트림은 요청 컨텍스트 밖에서 실행)
+        values, error_response = read_compliance_analysis_request()
+        if error_response is not None:
+            return error_response
+    except Exception as e:
+        print(f"❌ API 준수성 분석 오류: {str(e)}")
+        return jsonify({
+            'error': f'API 처리 중 오류가 발생했습니다: {str(e)}',
+            'success': False
+        })
+    
+    def events():
+        try:
+            if has_labeling_checkbox_info(values['labeling_info']):
+                yield 'result', analyze_with_labeling_checkboxes(
+                    values['country'], values['product_type'], values['company_info'], values['product_info'],
+                    values['prepared_documents'], values['labeling_info']
+                )
+                return
+            yield from iter_optimized_compliance_analysis(
+                values['country'], values['product_type'], values['uploaded_files'], values['uploaded_documents'],
+                values['company_info'], values['product_info']
+            )
+        finally:
+            # 완료, 오류, 클라이언트 연결 종료 모두 임시 파일 정리
+            cleanup_uploaded_files(values['uploaded_files'])
+    
+    return event_stream_response(events())
+
 def perform_optimized_compliance_analysis(country, product_type, uploaded_files, uploaded_documents, company_info, product_info):
-    """최적화된 OCR/문서분석 기반 준수성 분석"""
+    """최적화된 OCR/문서분석 기반 준수성 분석 (모든 단계가 끝난 뒤 한 번에 응답)"""
+    result = None
+    for event, data in iter_optimized_compliance_analysis(
+        country, product_type, uploaded_files, uploaded_documents, company_info, product_info
+    ):
+        if event in ('result', 'error'):
+            result = data
+    return jsonify(result)
+
+def iter_optimized_compliance_analysis(country, product_type, uploaded_files, uploaded_documents, company_info, product_info):
+    """최적화된 준수성 분석 단계별 결과를 (이벤트, 데이터) 로 차례로 생성
+
+    이벤트: stage(단계 시작), document(문서별 OCR), regulation_matching, compliance_analysis,
+    checklist(체크리스트와 수정 안내), result(최종 결과) 또는 error
+    """
     try:
         print("🔍 최적화된 준수성 분석 시작...")
         
@@ -2785,50 +2233,62 @@ def perform_optimized_compliance_analysis(country, product_type, uploaded_files,
         structured_data = {}
         ocr_results = {}
         
-        # 업로드된 파일 처리 (최적화된 방식)
-        for file_info in uploaded_files:
-            doc_type = file_info['type']
-            doc_path = file_info['path']
-            
-            try:
-                # 메모리 효율적인 OCR 분석
-                ocr_result = perform_lightweight_ocr_analysis(doc_path, doc_type)
-                ocr_results[doc_type] = ocr_result
-                
-                # 구조화된 데이터 추출 (간소화)
-                structured_data[doc_type] = extract_basic_structured_data(ocr_result, doc_type)
+        # 업로드 파일과 기존 문서를 한 번에 일괄 OCR (문서별 순차 처리 대신)
+        # 내용이 바뀌지 않은 문서는 이전 OCR/구조화 결과를 재사용 (incremental_compliance)
+        batch_documents = [(f"file-{i}", info['path'], info['type']) for i, info in enumerate(uploaded_files)]
+        batch_documents += [
+            (f"document-{i}", info.get('path', ''), info.get('type', ''))
+            for i, info in enumerate(uploaded_documents)
+            if info.get('path') and os.path.exists(info['path'])
+        ]
+        yield 'stage', {'stage': 'ocr', 'total_documents': len(batch_documents)}
+        document_types = {key: doc_type for key, _, doc_type in batch_documents}
+        document_analyses = {}
+        for key, analysis in incremental_compliance.iter_documents(
+            batch_documents, perform_batch_ocr_analysis, extract_basic_structured_data
+        ):
+            document_analyses[key] = analysis
+            yield 'document', {
+                'key': key,
+                'document_type': document_types[key],
+                'reused': analysis.reused,
+                'ocr_result': analysis.ocr_result,
+                'structured_data': analysis.structured_data
+            }
+        
+        section_fingerprints = {}
+        reused_documents = []
+        for key, _, doc_type in batch_documents:
+            analysis = document_analyses[key]
+            ocr_results[doc_type] = analysis.ocr_result
+            structured_data[doc_type] = analysis.structured_data
+            if analysis.fingerprint:
+                section_fingerprints[doc_type] = analysis.fingerprint
+            else:
+                section_fingerprints.pop(doc_type, None)
+            if analysis.reused:
+                reused_documents.append(doc_type)
+                print(f"⚡ {doc_type} 이전 분석 결과 재사용")
+            else:
                 print(f"✅ {doc_type} 분석 완료")
-                
-                # 메모리 정리
-                del ocr_result
-            except Exception as e:
-                print(f"⚠️ {doc_type} 분석 실패: {e}")
-                ocr_results[doc_type] = {'error': str(e)}
-                structured_data[doc_type] = {}
-        
-        # 기존 문서 정보 처리
-        for doc_info in uploaded_documents:
-            doc_type = doc_info.get('type', '')
-            doc_path = doc_info.get('path', '')
-            
-            if doc_path and os.path.exists(doc_path):
-                try:
-                    ocr_result = perform_lightweight_ocr_analysis(doc_path, doc_type)
-                    ocr_results[doc_type] = ocr_result
-                    structured_data[doc_type] = extract_basic_structured_data(ocr_result, doc_type)
-                except Exception as e:
-                    print(f"⚠️ 기존 문서 {doc_type} 분석 실패: {e}")
         
         print(f"✅ OCR 분석 완료: {len(ocr_results)}개 문서")
         
         # 2단계: 규제 매칭 (최적화)
         print("🔍 2단계: 규제 매칭 시작...")
+        yield 'stage', {'stage': 'regulation_matching'}
         regulation_matching = {}
         try:
             # 함수 존재 여부 확인
             if 'match_regulations_with_structured_data' in globals():
-                regulation_matching = match_regulations_with_structured_data(
-                    structured_data, country, product_type
+                # 모든 문서 지문과 규제 스냅샷 버전이 같으면 이전 매칭 결과 재사용
+                matching_key = None
+                if set(section_fingerprints) == set(structured_data):
+                    matching_key = (country, product_type, regulation_snapshots.version,
+                                    tuple(sorted(section_fingerprints.items())))
+                regulation_matching, _ = incremental_compliance.memoize(
+                    'regulation_matching', matching_key,
+                    lambda: match_regulations_with_structured_data(structured_data, country, product_type)
                 )
             else:
                 print("⚠️ match_regulations_with_structured_data 함수를 찾을 수 없음")
@@ -2836,13 +2296,18 @@ def perform_optimized_compliance_analysis(country, product_type, uploaded_files,
         except Exception as e:
             print(f"⚠️ 규제 매칭 실패: {e}")
             regulation_matching = {}
+        yield 'regulation_matching', regulation_matching
         
         # 3단계: 준수성 분석 (최적화)
         print("🔍 3단계: 준수성 분석 시작...")
+        yield 'stage', {'stage': 'compliance_analysis'}
+        evaluation = None
         try:
-            compliance_analysis = analyze_optimized_compliance_issues(
-                structured_data, regulation_matching, country, product_type
+            # 입력이 바뀐 규칙만 다시 평가
+            evaluation = incremental_compliance.evaluate(
+                structured_data, country, product_type, section_fingerprints
             )
+            compliance_analysis = evaluation.analysis
         except Exception as e:
             print(f"⚠️ 준수성 분석 실패: {e}")
             compliance_analysis = {
@@ -2852,6 +2317,7 @@ def perform_optimized_compliance_analysis(country, product_type, uploaded_files,
                 'minor_issues': [],
                 'suggestions': ["문서를 다시 업로드해주세요"]
             }
+        yield 'compliance_analysis', compliance_analysis
         
         # 4단계: 체크리스트 생성
         print("🔍 4단계: 체크리스트 생성...")
@@ -2876,6 +2342,7 @@ def perform_optimized_compliance_analysis(country, product_type, uploaded_files,
                 "timeline": "확인 필요",
                 "estimated_cost": "상담 후 결정"
             }
+        yield 'checklist', {'checklist': checklist, 'correction_guide': correction_guide}
         
         # 6단계: 임시 파일 정리
         try:
@@ -2903,18 +2370,23 @@ def perform_optimized_compliance_analysis(country, product_type, uploaded_files,
             'compliance_analysis': compliance_analysis,
             'checklist': checklist,
             'correction_guide': correction_guide,
+            'incremental': {
+                'reused_documents': reused_documents,
+                'evaluated_rules': evaluation.evaluated_rules if evaluation else [],
+                'reused_rules': evaluation.reused_rules if evaluation else []
+            },
             'message': f'{country} {product_type} 규제 준수성 분석이 완료되었습니다.'
         }
         
         print(f"✅ 최적화된 준수성 분석 완료: {final_result['analysis_summary']['compliance_score']}점")
-        return jsonify(final_result)
+        yield 'result', final_result
         
     except Exception as e:
         print(f"❌ 최적화된 준수성 분석 오류: {str(e)}")
-        return jsonify({
+        yield 'error', {
             'error': f'분석 중 오류가 발생했습니다: {str(e)}',
             'success': False
-        })
+        }
 
 def perform_lightweight_ocr_analysis(file_path, document_type):
     """가벼운 OCR 분석 (메모리 최적화)"""
@@ -2957,172 +2429,28 @@ def extract_basic_structured_data(ocr_result, document_type):
         
         # 문서 타입별 기본 추출
         if document_type == '라벨':
-            return analyze_basic_label_document(text_content, tables)
-        elif document_type == '영양성분표':
-            return analyze_basic_nutrition_label(text_content, tables)
-        elif document_type == '원료리스트':
-            return analyze_basic_ingredient_list(text_content, tables)
-        else:
-            return {'text': text_content, 'tables': tables}
-            
-    except Exception as e:
-        print(f"⚠️ 기본 구조화 데이터 추출 실패: {e}")
-        return {}
-
-def analyze_optimized_compliance_issues(structured_data, regulation_matching, country, product_type):
-    """사용자 입력 기반 준수성 분석 - 단순하고 정확한 점수 계산"""
-    try:
-        print(f"🔍 준수성 분석 시작: {country}, {product_type}")
-        print(f"📊 입력 데이터: {structured_data}")
-        
-        # 초기 점수 설정
-        base_score = 100
-        critical_issues = []
-        major_issues = []
-        minor_issues = []
-        
-        # 1. 필수 서류 검사 (15점)
-        required_docs = ["상업송장", "포장명세서", "원산지증명서"]
-        missing_docs = []
-        
-        for doc in required_docs:
-            if not any(doc.lower() in str(data).lower() for data in structured_data.values()):
-                missing_docs.append(doc)
-        
-        if missing_docs:
-            doc_deduction = len(missing_docs) * 5  # 문서당 5점 차감 (기존 7점에서 조정)
-            base_score -= min(doc_deduction, 15)
-            critical_issues.extend([f"필수 서류 누락: {doc}" for doc in missing_docs])
-        
-        # 2. 국가별 언어 요구사항 검사 (20점)
-        if country == "중국":
-            if not any('중국어' in str(data) or 'chinese' in str(data).lower() for data in structured_data.values()):
-                base_score -= 20
-                critical_issues.append("중국어 라벨 표기 필수")
-        elif country == "미국":
-            if not any('영어' in str(data) or 'english' in str(data).lower() for data in structured_data.values()):
-                base_score -= 20
-                critical_issues.append("영어 라벨 표기 필수")
-        elif country == "한국":
-            if not any('한국어' in str(data) or 'korean' in str(data).lower() for data in structured_data.values()):
-                base_score -= 20
-                critical_issues.append("한국어 라벨 표기 필수")
-        
-        # 3. 제품 정보 검사 (15점)
-        product_info_checks = ["제품명", "성분", "유통기한", "중량"]
-        missing_product_info = []
-        
-        for info in product_info_checks:
-            if not any(info in str(data) for data in structured_data.values()):
-                missing_product_info.append(info)
-        
-        if missing_product_info:
-            info_deduction = len(missing_product_info) * 3  # 정보당 3점 차감 (기존 5점에서 조정)
-            base_score -= min(info_deduction, 15)
-            major_issues.extend([f"제품 정보 누락: {info}" for info in missing_product_info])
-        
-        # 4. 영양성분 정보 검사 (10점)
-        nutrition_keywords = ["영양", "nutrition", "열량", "calorie", "단백질", "protein"]
-        has_nutrition = any(any(keyword in str(data) for keyword in nutrition_keywords) 
-                          for data in structured_data.values())
-        
-        if not has_nutrition:
-            base_score -= 10
-            major_issues.append("영양성분 정보 표시 필요")
-        
-        # 5. 알레르기 정보 검사 (5점)
-        allergy_keywords = ["알레르기", "allergy", "알레르겐", "allergen"]
-        has_allergy = any(any(keyword in str(data) for keyword in allergy_keywords) 
-                         for data in structured_data.values())
-        
-        if not has_allergy:
-            base_score -= 5
-            minor_issues.append("알레르기 정보 표시 권장")
-        
-        # 6. 제조사 정보 검사 (5점)
-        manufacturer_keywords = ["제조사", "manufacturer", "생산자", "producer"]
-        has_manufacturer = any(any(keyword in str(data) for keyword in manufacturer_keywords) 
-                              for data in structured_data.values())
-        
-        if not has_manufacturer:
-            base_score -= 5
-            major_issues.append("제조사 정보 표시 필요")
-        
-        # 점수 보정 (0-100 범위)
-        final_score = max(0, min(100, base_score))
-        
-        # 데이터 품질에 따른 추가 보정
-        data_quality_bonus = 0
-        total_data_items = len(structured_data)
-        
-        if total_data_items == 0:
-            # 빈 데이터는 추가 차감
-            final_score = max(0, final_score - 10)
-        elif total_data_items == 1:
-            # 최소한의 데이터는 약간의 보너스
-            data_quality_bonus = 5
-        elif total_data_items >= 3:
-            # 충분한 데이터는 보너스
-            data_quality_bonus = 10
-        
-        # 최종 점수 계산
-        final_score = max(0, min(100, final_score + data_quality_bonus))
-        
-        # 준수 상태 결정
-        if final_score >= 90:
-            compliance_status = "준수"
-        elif final_score >= 70:
-            compliance_status = "부분 준수"
-        elif final_score >= 50:
-            compliance_status = "미준수 (개선 가능)"
-        else:
-            compliance_status = "심각한 미준수"
-        
-        # 개선 제안 생성
-        suggestions = []
-        if critical_issues:
-            suggestions.append("🚨 긴급 개선사항:")
-            suggestions.extend([f"   • {issue}" for issue in critical_issues[:3]])
-        
-        if major_issues:
-            suggestions.append("⚠️ 주요 개선사항:")
-            suggestions.extend([f"   • {issue}" for issue in major_issues[:3]])
-        
-        if minor_issues:
-            suggestions.append("💡 권장 개선사항:")
-            suggestions.extend([f"   • {issue}" for issue in minor_issues[:2]])
-        
-        # 국가별 특별 제안
-        if country == "중국":
-            suggestions.append("🇨🇳 중국 특별 요건:")
-            suggestions.append("   • GB 7718-2011 표준 준수")
-            suggestions.append("   • 8대 알레르기 정보 필수")
-            suggestions.append("   • 식품안전인증서 필요")
-        elif country == "미국":
-            suggestions.append("🇺🇸 미국 특별 요건:")
-            suggestions.append("   • FDA 규정 준수")
-            suggestions.append("   • 영양성분표 필수")
-            suggestions.append("   • 알레르기 정보 표시")
+            return analyze_basic_label_document(text_content, tables)
+        elif document_type == '영양성분표':
+            return analyze_basic_nutrition_label(text_content, tables)
+        elif document_type == '원료리스트':
+            return analyze_basic_ingredient_list(text_content, tables)
+        else:
+            return {'text': text_content, 'tables': tables}
+            
+    except Exception as e:
+        print(f"⚠️ 기본 구조화 데이터 추출 실패: {e}")
+        return {}
+
+def analyze_optimized_compliance_issues(structured_data, regulation_matching, country, product_type):
+    """사용자 입력 기반 준수성 분석 - 단순하고 정확한 점수 계산"""
+    try:
+        print(f"🔍 준수성 분석 시작: {country}, {product_type}")
         
-        print(f"✅ 분석 완료 - 점수: {final_score}, 상태: {compliance_status}")
+        # 검사 항목/배점은 incremental_compliance.COMPLIANCE_RULES (섹션/규칙 결과 재사용)
+        compliance_analysis = incremental_compliance.evaluate(structured_data, country, product_type).analysis
         
-        return {
-            'overall_score': final_score,
-            'compliance_status': compliance_status,
-            'critical_issues': critical_issues,
-            'major_issues': major_issues,
-            'minor_issues': minor_issues,
-            'suggestions': suggestions,
-            'analysis_details': {
-                'country': country,
-                'product_type': product_type,
-                'missing_documents': missing_docs,
-                'missing_product_info': missing_product_info,
-                'has_nutrition_info': has_nutrition,
-                'has_allergy_info': has_allergy,
-                'has_manufacturer_info': has_manufacturer
-            }
-        }
+        print(f"✅ 분석 완료 - 점수: {compliance_analysis['overall_score']}, 상태: {compliance_analysis['compliance_status']}")
+        return compliance_analysis
             
     except Exception as e:
         print(f"⚠️ 준수성 분석 실패: {e}")
@@ -3171,6 +2499,19 @@ def generate_basic_correction_guide(compliance_analysis, country, product_type):
         }
 
 def try_basic_ocr_from_file(file_path):
+    """파일에서 기본 OCR 수행 (같은 내용의 파일은 OCR 결과 캐시 사용)"""
+    cache_key = ocr_cache_key(file_path, pipeline='basic_tesseract', lang='kor+eng')
+    if cache_key is None:
+        return _try_basic_ocr_from_file(file_path)
+    
+    result, cache_hit = get_ocr_result_cache().get_or_compute(
+        cache_key, lambda: _try_basic_ocr_from_file(file_path), should_cache=lambda r: 'error' not in r
+    )
+    if cache_hit:
+        print(f"⚡ OCR 결과 캐시 적중: {file_path}")
+    return result
+
+def _try_basic_ocr_from_file(file_path):
     """파일에서 기본 OCR 수행"""
     try:
         from PIL import Image
@@ -3572,14 +2913,26 @@ def perform_basic_compliance_analysis(country, product_type, company_info, produ
                 "주의사항": ["라벨 미표기 시 반송", "원산지 미표기 시 반송"]
             }
         
+        # 회사/제품 정보 섹션 지문이 같으면 이전 점수/체크리스트/안내 재사용
+        section_key = (country, product_type, fingerprint(company_info), fingerprint(product_info))
+        
         # 사용자 입력 기반 동적 점수 계산
-        score_calculation = calculate_dynamic_compliance_score(country, product_type, company_info, product_info)
+        score_calculation, _ = incremental_compliance.memoize(
+            'dynamic_score', section_key,
+            lambda: calculate_dynamic_compliance_score(country, product_type, company_info, product_info)
+        )
         
         # 동적 체크리스트 생성
-        dynamic_checklist = generate_dynamic_checklist(country, product_type, company_info, product_info)
+        dynamic_checklist, _ = incremental_compliance.memoize(
+            'dynamic_checklist', section_key,
+            lambda: generate_dynamic_checklist(country, product_type, company_info, product_info)
+        )
         
         # 동적 수정 안내 생성
-        dynamic_guide = generate_dynamic_correction_guide(country, product_type, company_info, product_info, score_calculation)
+        dynamic_guide, _ = incremental_compliance.memoize(
+            'dynamic_guide', section_key,
+            lambda: generate_dynamic_correction_guide(country, product_type, company_info, product_info, score_calculation)
+        )
         
         result = {
             'success': True,
@@ -3786,23 +3139,9 @@ def test_chinese_rendering():
     
     test_text = "营养标签 营养成分表 过敏原信息"
     
-    # 폰트 로드 시도
-    font = None
-    font_paths = [
-        "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
-        "/usr/share/fonts/truetype/noto/NotoSansSC-Regular.otf",
-        "fonts/msyh.ttc",
-        "fonts/simsun.ttc",
-    ]
-    
-    for font_path in font_paths:
-        try:
-            if os.path.exists(font_path):
-                font = ImageFont.truetype(font_path, 20)
-                print(f"✅ 폰트 로드 성공: {font_path}")
-                break
-        except Exception as e:
-            print(f"❌ 폰트 로드 실패: {font_path} - {e}")
+    # 폰트 로드 시도 (폰트 레지스트리의 중국어 폰트)
+    font_path = get_font_registry().resolve('chinese')
+    font = get_font_registry().find_font('chinese', 20)
     
     if font is None:
         try:
@@ -3812,7 +3151,7 @@ def test_chinese_rendering():
             return jsonify({
                 'success': False, 
                 'error': f'폰트 로드 완전 실패: {str(e)}',
-                'available_fonts': font_paths
+                'available_fonts': candidate_paths('chinese')
             })
     
     # 이미지 생성 테스트
@@ -3830,14 +3169,14 @@ def test_chinese_rendering():
         return jsonify({
             'success': True, 
             'image_path': image_path,
-            'font_used': font_path if 'font_path' in locals() else 'default',
+            'font_used': font_path or 'default',
             'test_text': test_text
         })
     except Exception as e:
         return jsonify({
             'success': False, 
             'error': f'이미지 생성 실패: {str(e)}',
-            'font_used': font_path if 'font_path' in locals() else 'default'
+            'font_used': font_path or 'default'
         })
 
 @app.route('/api/test-document-generation', methods=['POST'])
@@ -4138,93 +3477,14 @@ def match_regulations_with_structured_data(structured_data, country, product_typ
         'violations': []
     }
     
-    # 각 문서별 규제 준수 검사
-    for doc_type, data in structured_data.items():
-        print(f"🔍 {doc_type} 규제 준수 검사...")
-        
-        if doc_type == '라벨':
-            check_label_compliance(data, regulations, matching_results)
-        elif doc_type == '영양성분표':
-            check_nutrition_compliance(data, regulations, matching_results)
-        elif doc_type == '원료리스트':
-            check_ingredient_compliance(data, regulations, matching_results)
-        elif doc_type == '위생증명서':
-            check_sanitation_compliance(data, regulations, matching_results)
-        elif doc_type == '원산지증명서':
-            check_origin_compliance(data, regulations, matching_results)
+    # 각 문서별 규제 준수 검사 (compliance_rule_engine.DOCUMENT_RULES)
+    print(f"🔍 {', '.join(structured_data)} 규제 준수 검사...")
+    missing_requirements, violations = get_compiled_rules(country, product_type, regulations).evaluate_documents(structured_data)
+    matching_results['missing_requirements'].extend(missing_requirements)
+    matching_results['violations'].extend(violations)
     
     return matching_results
 
-def check_label_compliance(data, regulations, results):
-    """라벨 규제 준수 검사"""
-    required_elements = regulations.get('라벨필수요소', [])
-    
-    for element in required_elements:
-        if element not in str(data):
-            results['missing_requirements'].append(f"라벨: {element} 누락")
-            results['violations'].append({
-                'type': 'label_missing',
-                'element': element,
-                'severity': 'critical',
-                'description': f'라벨에 {element}이(가) 누락되었습니다.'
-            })
-
-def check_nutrition_compliance(data, regulations, results):
-    """영양성분표 규제 준수 검사"""
-    required_nutrition = regulations.get('영양성분필수', [])
-    
-    for nutrition in required_nutrition:
-        if nutrition not in str(data):
-            results['missing_requirements'].append(f"영양성분표: {nutrition} 누락")
-            results['violations'].append({
-                'type': 'nutrition_missing',
-                'element': nutrition,
-                'severity': 'major',
-                'description': f'영양성분표에 {nutrition}이(가) 누락되었습니다.'
-            })
-
-def check_ingredient_compliance(data, regulations, results):
-    """원료리스트 규제 준수 검사"""
-    prohibited_ingredients = regulations.get('금지성분', [])
-    
-    for ingredient in data.get('ingredients', []):
-        for prohibited in prohibited_ingredients:
-            if prohibited in ingredient:
-                results['violations'].append({
-                    'type': 'prohibited_ingredient',
-                    'element': prohibited,
-                    'severity': 'critical',
-                    'description': f'금지된 성분 {prohibited}이(가) 포함되어 있습니다.'
-                })
-
-def check_sanitation_compliance(data, regulations, results):
-    """위생증명서 규제 준수 검사"""
-    required_certifications = regulations.get('필수인증', [])
-    
-    for cert in required_certifications:
-        if cert not in str(data):
-            results['missing_requirements'].append(f"위생증명서: {cert} 누락")
-            results['violations'].append({
-                'type': 'certification_missing',
-                'element': cert,
-                'severity': 'critical',
-                'description': f'위생증명서에 {cert}이(가) 누락되었습니다.'
-            })
-
-def check_origin_compliance(data, regulations, results):
-    """원산지증명서 규제 준수 검사"""
-    required_origin_info = regulations.get('원산지필수', [])
-    
-    for info in required_origin_info:
-        if info not in str(data):
-            results['missing_requirements'].append(f"원산지증명서: {info} 누락")
-            results['violations'].append({
-                'type': 'origin_info_missing',
-                'element': info,
-                'severity': 'major',
-                'description': f'원산지증명서에 {info}이(가) 누락되었습니다.'
-            })
-
 def analyze_compliance_issues(structured_data, regulation_matching, country, product_type):
     """준수성 이슈 상세 분석"""
     print(f"🔍 {country} {product_type} 준수성 이슈 분석...")
@@ -5032,7 +4292,17 @@ def try_basic_ocr(image):
         return simulate_ocr_from_image(image)
 
 def extract_text_from_pdf(file_path):
-    """PDF 파일에서 텍스트 추출"""
+    """PDF 파일에서 텍스트 추출 (페이지 단위 스트리밍, 스캔 페이지는 OCR)"""
+    if iter_pdf_pages is not None and PYMUPDF_AVAILABLE:
+        try:
+            texts = []
+            for page in iter_pdf_pages(file_path, ocr=pdf_page_ocr(), ocr_workers=PDF_OCR_WORKERS):
+                if page.text.strip():
+                    texts.append(page.text)
+            return "\n".join(texts)
+        except Exception as pdf_error:
+            print(f"⚠️ PDF 스트리밍 추출 실패, PyPDF2 사용: {pdf_error}")
+    
     try:
         import PyPDF2
         
@@ -5118,47 +4388,135 @@ def simulate_ocr_from_image(image):
         print(f"❌ OCR 시뮬레이션 오류: {str(e)}")
         return "영양성분 라벨 이미지가 업로드되었습니다."
 
+def temp_upload_path(filename, temp_dir="temp_uploads"):
+    """업로드 파일 임시 저장 경로 (같은 이름의 업로드가 서로 덮어쓰지 않도록 고유 이름, 확장자 유지)"""
+    stem, extension = os.path.splitext(filename)
+    stem = secure_filename(stem)
+    # secure_filename 은 한글 파일명을 지우므로 확장자는 따로 정리
+    extension = os.path.splitext(secure_filename(f"upload{extension}"))[1].lower()
+    unique_name = f"{uuid.uuid4().hex}_{stem}{extension}" if stem else f"{uuid.uuid4().hex}{extension}"
+    return os.path.join(temp_dir, unique_name)
+
+def is_ocr_image_file(file_path):
+    """AI OCR 서비스로 보낼 수 있는 이미지 파일인지"""
+    return file_path.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.gif'))
+
+def try_ai_ocr_from_file(file_path):
+    """이미지 파일을 무료 AI OCR 서비스로 추출 (모든 서비스가 실패하면 빈 문자열)"""
+    try:
+        from PIL import Image
+        
+        with Image.open(file_path) as image:
+            image.load()
+            return try_multiple_ocr_services(file_path, image) or ""
+    except Exception as e:
+        print(f"❌ AI OCR 오류: {str(e)}")
+        return ""
+
+def try_basic_ocr_from_image_file(file_path):
+    """이미지 파일 기본 OCR (Tesseract 또는 시뮬레이션, 이미지를 열 수 없으면 빈 문자열)"""
+    try:
+        from PIL import Image
+        
+        with Image.open(file_path) as image:
+            return try_basic_ocr(image)
+    except Exception as e:
+        print(f"❌ 기본 OCR 오류: {str(e)}")
+        return ""
+
 def process_uploaded_files(files):
-    """업로드된 파일들을 OCR 처리 (개선된 버전)"""
+    """업로드된 파일들을 OCR 처리 (AI OCR 서비스 우선, 실패한 파일만 모아 로컬 일괄 OCR)"""
     ocr_results = {}
+    temp_paths = []
     
     try:
+        temp_dir = "temp_uploads"
+        os.makedirs(temp_dir, exist_ok=True)
         for file in files:
             if file and file.filename:
                 print(f"🔍 파일 처리 중: {file.filename}")
-                
-                # 임시 파일로 저장
-                temp_dir = "temp_uploads"
-                os.makedirs(temp_dir, exist_ok=True)
-                
-                temp_path = os.path.join(temp_dir, file.filename)
+                temp_path = temp_upload_path(file.filename, temp_dir)
+                temp_paths.append(temp_path)
                 file.save(temp_path)
-                
-                # OCR 처리 (간단한 텍스트 추출)
-                extracted_text = extract_text_from_file(temp_path)
-                print(f"📝 추출된 텍스트 길이: {len(extracted_text)}")
-                
-                # 영양정보 추출 시도
-                nutrition_info = extract_nutrition_from_text(extracted_text)
-                
-                if nutrition_info:
-                    print(f"✅ 영양정보 추출 성공: {nutrition_info}")
-                    ocr_results.update(nutrition_info)
+        
+        # 1순위: AI OCR 서비스 (이미지)
+        texts = {temp_path: try_ai_ocr_from_file(temp_path) if is_ocr_image_file(temp_path) else ""
+                 for temp_path in temp_paths}
+        
+        # 2순위: AI OCR 결과가 없는 파일만 모아 로컬 일괄 OCR
+        pending = [{'id': path, 'path': path} for path in temp_paths
+                   if not texts[path].strip() and os.path.splitext(path)[1].lower() in BATCH_OCR_EXTENSIONS + ('.pdf',)]
+        batch_results = {}
+        if pending and get_batch_ocr_processor is not None:
+            try:
+                batch_results = get_batch_ocr_processor().process(pending)
+            except Exception as e:
+                print(f"⚠️ 일괄 OCR 실패, 파일별 처리로 전환: {e}")
+        
+        for temp_path in temp_paths:
+            extracted_text = texts[temp_path]
+            if not extracted_text.strip():
+                batch_result = batch_results.get(temp_path, {})
+                extracted_text = batch_result.get('text', '') if 'error' not in batch_result else ''
+            if not extracted_text.strip():
+                # 3순위: 이미지는 기본 OCR (AI OCR 은 이미 시도함), 그 밖의 파일은 기존 텍스트 추출
+                if is_ocr_image_file(temp_path):
+                    extracted_text = try_basic_ocr_from_image_file(temp_path)
                 else:
-                    print("⚠️ 영양정보 추출 실패")
-                
-                # 임시 파일 삭제
-                os.remove(temp_path)
-                
+                    extracted_text = extract_text_from_file(temp_path)
+            print(f"📝 추출된 텍스트 길이: {len(extracted_text)}")
+            
+            # 영양정보 추출 시도
+            nutrition_info = extract_nutrition_from_text(extracted_text)
+            
+            if nutrition_info:
+                print(f"✅ 영양정보 추출 성공: {nutrition_info}")
+                ocr_results.update(nutrition_info)
+            else:
+                print("⚠️ 영양정보 추출 실패")
+            
     except Exception as e:
         print(f"❌ OCR 처리 오류: {str(e)}")
         import traceback
         traceback.print_exc()
+    finally:
+        # 임시 파일 삭제 (처리 중 오류가 나도 남기지 않음)
+        for temp_path in temp_paths:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
     
     print(f"🔍 최종 OCR 결과: {ocr_results}")
     return ocr_results
 
+def extract_text_from_file_settings(file_path):
+    """텍스트 추출 결과를 바꾸는 설정 (AI OCR 서비스 목록, 기본 OCR, PDF 스캔 페이지 OCR 엔진)"""
+    if file_path.lower().endswith('.pdf'):
+        engine = None
+        if iter_pdf_pages is not None and PYMUPDF_AVAILABLE and get_batch_ocr_processor is not None:
+            engine = get_batch_ocr_processor().select_engine()
+        return {'pdf_streaming': iter_pdf_pages is not None and PYMUPDF_AVAILABLE, 'pdf_ocr_engine': engine}
+    return {
+        'ai_services': [name for name, _, _ in OCR_SERVICE_SETTINGS],
+        'ai_dispatcher': ProviderDispatcher is not None,
+        'basic_ocr': 'tesseract', 'lang': 'kor+eng', 'psm': 6
+    }
+
 def extract_text_from_file(file_path):
+    """파일에서 텍스트 추출 (같은 내용의 파일은 OCR 결과 캐시 사용)"""
+    cache_key = ocr_cache_key(file_path, pipeline='extract_text_from_file', **extract_text_from_file_settings(file_path))
+    if cache_key is None:
+        return _extract_text_from_file(file_path)
+    
+    text, cache_hit = get_ocr_result_cache().get_or_compute(
+        cache_key, lambda: _extract_text_from_file(file_path), should_cache=lambda t: bool(t and t.strip())
+    )
+    if cache_hit:
+        print(f"⚡ OCR 결과 캐시 적중: {file_path}")
+    return text
+
+def _extract_text_from_file(file_path):
     """파일에서 텍스트 추출 (무료 AI OCR 서비스 통합)"""
     try:
         print(f"📁 파일 처리: {file_path}")
@@ -5203,27 +4561,53 @@ def extract_text_from_file(file_path):
         print(f"❌ 파일 처리 오류: {str(e)}")
         return ""
 
+# 무료 AI OCR 서비스 동시 호출 설정 (우선순위 순, 제한 시간/헤지 시점 초 단위)
+OCR_SERVICE_SETTINGS = [
+    ('ocr_space', 'try_ocr_space', {'timeout': 20.0, 'hedge_after': 8.0}),
+    ('mathpix', 'try_mathpix_ocr', {'timeout': 20.0, 'hedge_after': None}),
+    ('google_vision_free', 'try_google_vision_free', {'timeout': 5.0, 'hedge_after': None}),
+    ('azure_vision_free', 'try_azure_vision_free', {'timeout': 5.0, 'hedge_after': None})
+]
+OCR_SERVICE_DEADLINE = float(os.environ.get('OCR_SERVICE_DEADLINE', 25))
+
+_ocr_service_dispatcher = None
+_ocr_service_dispatcher_lock = threading.Lock()
+
+def get_ocr_service_dispatcher():
+    """무료 AI OCR 서비스 디스패처 (최초 호출 시 생성, 사용 불가면 None)"""
+    global _ocr_service_dispatcher
+    if ProviderDispatcher is None:
+        return None
+    with _ocr_service_dispatcher_lock:
+        if _ocr_service_dispatcher is None:
+            dispatcher = ProviderDispatcher(max_workers=8)
+            for name, func_name, settings in OCR_SERVICE_SETTINGS:
+                # 빈 결과만 돌려주는 서비스(키 미설정 등)는 3회 후 5분간 호출하지 않음
+                dispatcher.register(name, globals()[func_name], reset_timeout=300.0, **settings)
+            _ocr_service_dispatcher = dispatcher
+    return _ocr_service_dispatcher
+
 def try_multiple_ocr_services(file_path, image):
-    """여러 무료 AI OCR 서비스 시도"""
-    services = [
-        try_ocr_space,
-        try_mathpix_ocr,
-        try_google_vision_free,
-        try_azure_vision_free
-    ]
-    
-    for service in services:
-        try:
-            print(f"🔍 {service.__name__} 시도 중...")
-            result = service(file_path, image)
-            if result and result.strip():
-                print(f"✅ {service.__name__} 성공!")
-                return result
-            time.sleep(1)  # API 호출 간격
-        except Exception as e:
-            print(f"❌ {service.__name__} 실패: {str(e)}")
-            continue
+    """여러 무료 AI OCR 서비스 동시 시도 (가장 먼저 텍스트를 돌려준 서비스 결과 사용)"""
+    dispatcher = get_ocr_service_dispatcher()
+    if dispatcher is None:
+        for name, func_name, _ in OCR_SERVICE_SETTINGS:
+            try:
+                result = globals()[func_name](file_path, image)
+                if result and result.strip():
+                    print(f"✅ {func_name} 성공!")
+                    return result
+            except Exception as e:
+                print(f"❌ {func_name} 실패: {str(e)}")
+        return ""
     
+    calls = dispatcher.dispatch((file_path, image), mode='first', deadline=OCR_SERVICE_DEADLINE,
+                                accept=lambda text: bool(text and text.strip()))
+    for name, call in calls.items():
+        if call.ok:
+            print(f"✅ {name} 성공! ({call.elapsed}초)")
+            return call.value
+    print(f"❌ 모든 OCR 서비스 실패: {', '.join(f'{name}={call.error}' for name, call in calls.items())}")
     return ""
 
 def try_ocr_space(file_path, image):
@@ -5386,55 +4770,41 @@ def extract_pdf_data(filepath):
     }
     
     try:
-        # PyMuPDF 사용 (설치된 경우)
-        try:
-            import fitz
-            doc = fitz.open(filepath)
-            
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                
-                # 텍스트 추출
-                text = page.get_text()
-                if text.strip():
+        # PyMuPDF 페이지 스트리밍 (설치된 경우)
+        if iter_pdf_pages is not None and PYMUPDF_AVAILABLE:
+            page_sources = {}
+            for page in iter_pdf_pages(filepath, ocr=pdf_page_ocr(), ocr_workers=PDF_OCR_WORKERS,
+                                       extract_tables=True):
+                # 텍스트 추출 (스캔 페이지는 OCR 결과)
+                if page.text.strip():
                     data['text_content'].append({
-                        'page': page_num + 1,
-                        'text': text.strip()
+                        'page': page.page,
+                        'text': page.text.strip(),
+                        'source': page.source,
+                        'confidence': page.confidence
                     })
                 
-                # 테이블 추출 (PyMuPDF 버전에 따라 다를 수 있음)
-                try:
-                    tables = page.get_tables()
-                    for table_idx, table in enumerate(tables):
-                        data['tables'].append({
-                            'page': page_num + 1,
-                            'table_index': table_idx,
-                            'data': table
-                        })
-                except AttributeError:
-                    # get_tables 메서드가 없는 경우
-                    print("⚠️ 테이블 추출 기능을 사용할 수 없습니다")
-    except Exception as e:
-                    print(f"⚠️ 테이블 추출 실패: {e}")
+                # 테이블 추출
+                for table_idx, table in enumerate(page.tables):
+                    data['tables'].append({
+                        'page': page.page,
+                        'table_index': table_idx,
+                        'data': table
+                    })
                 
-                # 이미지 추출 (PyMuPDF 버전에 따라 다를 수 있음)
-                try:
-                    images = page.get_images()
-                    for img_idx, img in enumerate(images):
-                        data['images'].append({
-                            'page': page_num + 1,
-                            'image_index': img_idx,
-                            'bbox': img[0:4]
-                        })
-                except AttributeError:
-                    # get_images 메서드가 없는 경우
-                    print("⚠️ 이미지 추출 기능을 사용할 수 없습니다")
-                except Exception as e:
-                    print(f"⚠️ 이미지 추출 실패: {e}")
-            
-            doc.close()
+                # 이미지 정보
+                if page.image_count:
+                    data['images'].append({
+                        'page': page.page,
+                        'image_count': page.image_count,
+                        'ocr_dpi': page.dpi
+                    })
+                
+                # 페이지 출처별 개수 (text_layer / ocr / image_only / empty)
+                page_sources[page.source] = page_sources.get(page.source, 0) + 1
             
-        except ImportError:
+            data['metadata'] = {'page_count': sum(page_sources.values()), 'page_sources': page_sources}
+        else:
             # PyMuPDF가 없는 경우 기본 텍스트 추출
             print("⚠️ PyMuPDF 없음, 기본 PDF 추출 사용")
             data['text_content'].append({
@@ -5556,176 +4926,51 @@ def extract_generic_data(filepath):
     return data
 
 def extract_nutrition_from_text(text):
-    """텍스트에서 영양정보 추출 (강화된 정규식)"""
+    """텍스트에서 영양정보 추출 (컴파일된 단일 패스 필드 추출기 사용)
+
+    반환값의 'nutrition_spans' 는 필드별 원문 위치 [start, end] (화면 하이라이트용)
+    """
     nutrition_info = {}
+    nutrition_spans = {}
     
     try:
-        import re
-        
         print(f"🔍 텍스트에서 영양정보 추출 시작: {text[:100]}...")
         
-        # 칼로리 추출 (다양한 패턴)
-        calorie_patterns = [
-            r'(\d+)\s*(?:kcal|칼로리|calories?)',
-            r'칼로리[:\s]*(\d+(?:\.\d+)?)',
-            r'calories?[:\s]*(\d+(?:\.\d+)?)',
-            r'(\d+)\s*kcal',
-            r'열량[:\s]*(\d+(?:\.\d+)?)',
-            r'에너지[:\s]*(\d+(?:\.\d+)?)'
-        ]
-        for pattern in calorie_patterns:
-            calorie_match = re.search(pattern, text, re.IGNORECASE)
-            if calorie_match:
-                nutrition_info['calories'] = calorie_match.group(1)
-                print(f"✅ 칼로리 추출: {calorie_match.group(1)}")
-                break
-        
-        # 단백질 추출 (다양한 패턴)
-        protein_patterns = [
-            r'단백질[:\s]*(\d+(?:\.\d+)?)',
-            r'protein[:\s]*(\d+(?:\.\d+)?)',
-            r'(\d+(?:\.\d+)?)\s*g\s*단백질',
-            r'(\d+(?:\.\d+)?)\s*g\s*protein'
-        ]
-        for pattern in protein_patterns:
-            protein_match = re.search(pattern, text, re.IGNORECASE)
-            if protein_match:
-                nutrition_info['protein'] = protein_match.group(1)
-                print(f"✅ 단백질 추출: {protein_match.group(1)}")
-                break
-        
-        # 지방 추출 (다양한 패턴)
-        fat_patterns = [
-            r'지방[:\s]*(\d+(?:\.\d+)?)',
-            r'fat[:\s]*(\d+(?:\.\d+)?)',
-            r'(\d+(?:\.\d+)?)\s*g\s*지방',
-            r'(\d+(?:\.\d+)?)\s*g\s*fat'
-        ]
-        for pattern in fat_patterns:
-            fat_match = re.search(pattern, text, re.IGNORECASE)
-            if fat_match:
-                nutrition_info['fat'] = fat_match.group(1)
-                print(f"✅ 지방 추출: {fat_match.group(1)}")
-                break
-        
-        # 탄수화물 추출 (다양한 패턴)
-        carbs_patterns = [
-            r'탄수화물[:\s]*(\d+(?:\.\d+)?)',
-            r'carbohydrate[:\s]*(\d+(?:\.\d+)?)',
-            r'carbs[:\s]*(\d+(?:\.\d+)?)',
-            r'(\d+(?:\.\d+)?)\s*g\s*탄수화물',
-            r'(\d+(?:\.\d+)?)\s*g\s*carb'
-        ]
-        for pattern in carbs_patterns:
-            carbs_match = re.search(pattern, text, re.IGNORECASE)
-            if carbs_match:
-                nutrition_info['carbs'] = carbs_match.group(1)
-                print(f"✅ 탄수화물 추출: {carbs_match.group(1)}")
-                break
-        
-        # 나트륨 추출 (다양한 패턴)
-        sodium_patterns = [
-            r'나트륨[:\s]*(\d+(?:\.\d+)?)',
-            r'sodium[:\s]*(\d+(?:\.\d+)?)',
-            r'(\d+(?:\.\d+)?)\s*mg\s*나트륨',
-            r'(\d+(?:\.\d+)?)\s*mg\s*sodium'
-        ]
-        for pattern in sodium_patterns:
-            sodium_match = re.search(pattern, text, re.IGNORECASE)
-            if sodium_match:
-                nutrition_info['sodium'] = sodium_match.group(1)
-                print(f"✅ 나트륨 추출: {sodium_match.group(1)}")
-                break
-        
-        # 당류 추출 (다양한 패턴)
-        sugar_patterns = [
-            r'당류[:\s]*(\d+(?:\.\d+)?)',
-            r'sugar[:\s]*(\d+(?:\.\d+)?)',
-            r'(\d+(?:\.\d+)?)\s*g\s*당류',
-            r'(\d+(?:\.\d+)?)\s*g\s*sugar'
-        ]
-        for pattern in sugar_patterns:
-            sugar_match = re.search(pattern, text, re.IGNORECASE)
-            if sugar_match:
-                nutrition_info['sugar'] = sugar_match.group(1)
-                print(f"✅ 당류 추출: {sugar_match.group(1)}")
-                break
-        
-        # 식이섬유 추출 (다양한 패턴)
-        fiber_patterns = [
-            r'식이섬유[:\s]*(\d+(?:\.\d+)?)',
-            r'fiber[:\s]*(\d+(?:\.\d+)?)',
-            r'dietary\s*fiber[:\s]*(\d+(?:\.\d+)?)',
-            r'(\d+(?:\.\d+)?)\s*g\s*식이섬유',
-            r'(\d+(?:\.\d+)?)\s*g\s*fiber'
-        ]
-        for pattern in fiber_patterns:
-            fiber_match = re.search(pattern, text, re.IGNORECASE)
-            if fiber_match:
-                nutrition_info['fiber'] = fiber_match.group(1)
-                print(f"✅ 식이섬유 추출: {fiber_match.group(1)}")
-                break
-        
-        # 1회 제공량 추출 (다양한 패턴)
-        serving_patterns = [
-            r'(?:1회\s*제공량|서빙\s*사이즈|제공량)[:\s]*(\d+(?:\.\d+)?)',
-            r'(?:serving\s*size|portion)[:\s]*(\d+(?:\.\d+)?)',
-            r'(\d+(?:\.\d+)?)\s*g\s*(?:1회\s*제공량|서빙)',
-            r'(\d+(?:\.\d+)?)\s*g\s*serving'
-        ]
-        for pattern in serving_patterns:
-            serving_match = re.search(pattern, text, re.IGNORECASE)
-            if serving_match:
-                nutrition_info['serving_size'] = serving_match.group(1)
-                print(f"✅ 1회 제공량 추출: {serving_match.group(1)}")
-                break
-        
-        # 제품명 추출
-        product_name_patterns = [
-            r'제품명[:\s]*([^\n\r]+)',
-            r'product[:\s]*([^\n\r]+)',
-            r'상품명[:\s]*([^\n\r]+)'
-        ]
-        for pattern in product_name_patterns:
-            product_match = re.search(pattern, text, re.IGNORECASE)
-            if product_match:
-                nutrition_info['product_name'] = product_match.group(1).strip()
-                print(f"✅ 제품명 추출: {product_match.group(1).strip()}")
-                break
+        field_labels = {
+            'calories': '칼로리', 'protein': '단백질', 'fat': '지방', 'carbs': '탄수화물',
+            'sodium': '나트륨', 'sugar': '당류', 'fiber': '식이섬유',
+            'serving_size': '1회 제공량', 'product_name': '제품명'
+        }
+        candidates = get_field_extractor(NUTRITION_TEXT_PATTERNS).extract_all(text)
         
-        # 알레르기 정보 추출 (개선된 패턴)
-        allergy_patterns = [
-            r'알레르기\s*정보[:\s]*([^\n\r]+)',
-            r'allergy\s*information[:\s]*([^\n\r]+)',
-            r'함유[:\s]*([^\n\r]+)',
-            r'contains[:\s]*([^\n\r]+)',
-            r'우유[,\s]*계란[,\s]*대두',
-            r'milk[,\s]*eggs[,\s]*soybeans'
-        ]
+        for field, label in field_labels.items():
+            if field in candidates:
+                match = candidates[field][0]
+                nutrition_info[field] = match.value
+                nutrition_spans[field] = [match.start, match.end]
+                print(f"✅ {label} 추출: {match.value}")
         
-        # 제외할 키워드들
+        # 알레르기 정보 추출 (제외 키워드만 남으면 다음 패턴 결과 사용)
         exclude_keywords = ['알레르기', '정보', 'allergy', 'information', '함유', 'contains']
         
-        for pattern in allergy_patterns:
-            allergy_match = re.search(pattern, text, re.IGNORECASE)
-            if allergy_match:
-                allergy_text = allergy_match.group(1).strip() if allergy_match.groups() else allergy_match.group(0)
-                # 알레르기 성분들을 쉼표나 공백으로 분리
-                allergies = []
-                for item in re.split(r'[,，\s]+', allergy_text):
-                    item = item.strip()
-                    if item and item.lower() not in [kw.lower() for kw in exclude_keywords]:
-                        allergies.append(item)
-                
-                if allergies:
-                    nutrition_info['allergies'] = allergies
-                    print(f"✅ 알레르기 정보 추출: {allergies}")
-                    break
+        for match in candidates.get('allergies', []):
+            # 알레르기 성분들을 쉼표나 공백으로 분리
+            allergies = []
+            for item in re.split(r'[,，\s]+', match.value):
+                item = item.strip()
+                if item and item.lower() not in [kw.lower() for kw in exclude_keywords]:
+                    allergies.append(item)
+            
+            if allergies:
+                nutrition_info['allergies'] = allergies
+                nutrition_spans['allergies'] = [match.start, match.end]
+                print(f"✅ 알레르기 정보 추출: {allergies}")
+                break
         
         print(f"🔍 최종 추출된 영양정보: {nutrition_info}")
         
         # nutrition 키로 감싸서 반환
-        return {'nutrition': nutrition_info}
+        return {'nutrition': nutrition_info, 'nutrition_spans': nutrition_spans}
         
     except Exception as e:
         print(f"❌ 영양정보 추출 오류: {str(e)}")
@@ -5988,56 +5233,9 @@ def create_simple_test_label(country, product_info):
         image = Image.new('RGB', (width, height), (255, 255, 255))
         draw = ImageDraw.Draw(image)
         
-        # 폰트 설정 (국가별 폰트 우선)
-        font = None
+        # 폰트 설정 (국가별 폰트 우선, 폰트 레지스트리에서 프로세스당 한 번만 탐색/로드)
         font_size = 20
-        
-        # 국가별 폰트 경로 (우선순위 순) - 개선된 버전
-        if country == "중국":
-            font_paths = [
-                # 프로젝트 내 폰트 폴더 (우선)
-                "fonts/msyh.ttc",                    # Microsoft YaHei (중국어, 영어, 한글)
-                "fonts/simsun.ttc",                  # SimSun (중국어, 영어)
-                "fonts/malgun.ttf",                  # 맑은 고딕 (한글)
-                # Windows 폰트 경로 (로컬 환경용)
-                "C:/Windows/Fonts/msyh.ttc",        # Microsoft YaHei (중국어, 영어, 한글)
-                "C:/Windows/Fonts/simsun.ttc",      # SimSun (중국어, 영어)
-                "C:/Windows/Fonts/msyhbd.ttc",      # Microsoft YaHei Bold
-                "C:/Windows/Fonts/simhei.ttf",      # SimHei (중국어)
-                "C:/Windows/Fonts/malgun.ttf",      # 맑은 고딕 (한글)
-                "C:/Windows/Fonts/arial.ttf",       # Arial (영어)
-                # 상대 경로 폰트 (현재 디렉토리)
-                "msyh.ttc",
-                "simsun.ttc",
-                "malgun.ttf"
-            ]
-        else:  # 미국
-            font_paths = [
-                # 프로젝트 내 폰트 폴더 (우선)
-                "fonts/arial.ttf",                   # Arial (영어)
-                "fonts/msyh.ttc",                    # Microsoft YaHei (다국어)
-                "fonts/malgun.ttf",                  # 맑은 고딕 (한글)
-                # Windows 폰트 경로 (로컬 환경용)
-                "C:/Windows/Fonts/arial.ttf",       # Arial (영어)
-                "C:/Windows/Fonts/calibri.ttf",     # Calibri (영어)
-                "C:/Windows/Fonts/msyh.ttc",        # Microsoft YaHei (다국어)
-                "C:/Windows/Fonts/malgun.ttf",      # 맑은 고딕 (한글)
-                # 상대 경로 폰트 (현재 디렉토리)
-                "arial.ttf",
-                "msyh.ttc"
-            ]
-        
-        for font_path in font_paths:
-            try:
-                if os.path.exists(font_path):
-                    font = ImageFont.truetype(font_path, font_size)
-                    print(f"✅ 폰트 로드 성공: {font_path}")
-                    break
-                else:
-                    print(f"⚠️ 폰트 파일 없음: {font_path}")
-            except Exception as font_error:
-                print(f"❌ 폰트 로드 실패: {font_path} - {font_error}")
-                continue
+        font = get_font_registry().find_font('chinese' if country == "중국" else 'english', font_size)
         
         if font is None:
             print("⚠️ 모든 폰트 로드 실패, 기본 폰트 사용")
@@ -6432,6 +5630,16 @@ def api_ocr_extract():
         # 번역 언어 파라미터 확인
         translate_to = request.form.get('translate_to', None)  # 'en', 'zh-cn' 등
         
+        # AI API 사용 여부 확인
+        use_ai_apis = request.form.get('use_ai_apis', 'true').lower() == 'true'
+        
+        # 비동기 모드: OCR 워커 큐에 등록 후 즉시 job_id 반환
+        if request.form.get('async', 'false').lower() == 'true':
+            return enqueue_ocr_job('label_extract', {
+                'translate_to': translate_to,
+                'use_ai_apis': use_ai_apis
+            }, image_file)
+        
         # 이미지 저장
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"uploaded_label_{timestamp}.png"
@@ -6441,11 +5649,8 @@ def api_ocr_extract():
         image_path = os.path.join(upload_dir, filename)
         image_file.save(image_path)
         
-        # AI API 사용 여부 확인
-        use_ai_apis = request.form.get('use_ai_apis', 'true').lower() == 'true'
-        
         # OCR 추출 (한글 우선 + 번역 + AI API)
-        extractor = LabelOCRExtractor()
+        extractor = get_label_ocr_extractor()
         result = extractor.extract_label_info(image_path, translate_to=translate_to, use_ai_apis=use_ai_apis)
         
         return jsonify({
@@ -6461,6 +5666,73 @@ def api_ocr_extract():
     except Exception as e:
         return jsonify({'error': f'OCR 추출 중 오류가 발생했습니다: {str(e)}'})
 
+def enqueue_ocr_job(kind, payload, image_file):
+    """업로드 이미지를 작업 전용 경로에 저장하고 OCR 작업을 큐에 등록한 뒤 202 응답 반환
+
+    작업 전용 경로는 웹에 공개되지 않으며, 작업 핸들러가 끝나면 파일을 삭제한다.
+    """
+    pool = get_ocr_worker_pool()
+    if pool is None:
+        return jsonify({'success': False, 'error': 'OCR 작업 큐를 사용할 수 없습니다.'}), 503
+    
+    image_path = job_upload_path(secure_filename(image_file.filename) or 'image')
+    image_file.save(image_path)
+    job_id = pool.submit(kind, dict(payload, image_path=image_path))
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': f'/api/ocr-jobs/{job_id}',
+        'result_url': f'/api/ocr-jobs/{job_id}/result'
+    }), 202
+
+@app.route('/api/ocr-jobs', methods=['POST'])
+def api_create_ocr_job():
+    """OCR 작업 등록 API (다중 엔진 OCR / 라벨 추출을 워커 프로세스에서 처리)"""
+    try:
+        if 'image' not in request.files or request.files['image'].filename == '':
+            return jsonify({'success': False, 'error': '이미지 파일이 없습니다.'}), 400
+        
+        job_type = request.form.get('job_type', 'ocr_parallel')
+        if job_type not in ('ocr_parallel', 'label_extract'):
+            return jsonify({'success': False, 'error': f'지원하지 않는 작업 종류입니다: {job_type}'}), 400
+        
+        payload = {}
+        if job_type == 'ocr_parallel':
+            payload['document_type'] = request.form.get('document_type') or None
+            payload['mode'] = 'cascade' if request.form.get('mode') == 'cascade' else 'parallel'
+            payload['layout_first'] = request.form.get('layout_first', 'false').lower() == 'true'
+        else:
+            payload['translate_to'] = request.form.get('translate_to') or None
+            payload['use_ai_apis'] = request.form.get('use_ai_apis', 'true').lower() == 'true'
+        
+        return enqueue_ocr_job(job_type, payload, request.files['image'])
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'OCR 작업 등록 중 오류가 발생했습니다: {str(e)}'}), 500
+
+@app.route('/api/ocr-jobs/<job_id>', methods=['GET'])
+def api_ocr_job_status(job_id):
+    """OCR 작업 상태/진행률 조회 API"""
+    pool = get_ocr_worker_pool()
+    job = pool.queue.get_job(job_id) if pool else None
+    if job is None:
+        return jsonify({'success': False, 'error': '작업을 찾을 수 없습니다.'}), 404
+    return jsonify({'success': True, 'job': job})
+
+@app.route('/api/ocr-jobs/<job_id>/result', methods=['GET'])
+def api_ocr_job_result(job_id):
+    """OCR 작업 결과 조회 API (완료 전에는 202)"""
+    pool = get_ocr_worker_pool()
+    job = pool.queue.get_job(job_id) if pool else None
+    if job is None:
+        return jsonify({'success': False, 'error': '작업을 찾을 수 없습니다.'}), 404
+    if job['status'] == 'failed':
+        return jsonify({'success': False, 'job': job, 'error': job['error']}), 500
+    if job['status'] != 'done':
+        return jsonify({'success': True, 'job': job, 'result': None}), 202
+    return jsonify({'success': True, 'job': job, 'result': pool.queue.get_result(job_id)})
+
 @app.route('/api/compliance-check', methods=['POST'])
 def api_compliance_check():
     """라벨 규제 준수성 검토 API"""
@@ -6472,7 +5744,7 @@ def api_compliance_check():
         if not country:
             return jsonify({'error': '국가를 선택해주세요.'})
         
-        checker = LabelComplianceChecker()
+        checker = get_label_compliance_checker()
         report = checker.generate_compliance_report(label_info, country)
         
         return jsonify({
@@ -6483,6 +5755,47 @@ def api_compliance_check():
     except Exception as e:
         return jsonify({'error': f'준수성 검토 중 오류가 발생했습니다: {str(e)}'})
 
+BULK_COMPLIANCE_MAX_CELLS = int(os.environ.get('BULK_COMPLIANCE_MAX_CELLS', 200000))
+
+@app.route('/api/compliance-check/bulk', methods=['POST'])
+def api_compliance_check_bulk():
+    """라벨 여러 개 × 국가 여러 개 일괄 준수성 검토 API (점수/오류 행렬 반환)
+
+    요청: {'labels': [label_info 또는 {'id', 'label_info'}], 'countries': [...], 'include_warnings': false}
+    """
+    try:
+        data = request.get_json() or {}
+        labels = data.get('labels', [])
+        countries = data.get('countries', [])
+        
+        if not labels or not countries:
+            return jsonify({'success': False, 'error': 'labels 와 countries 가 필요합니다.'}), 400
+        if not isinstance(labels, list) or not isinstance(countries, list):
+            return jsonify({'success': False, 'error': 'labels 와 countries 는 목록이어야 합니다.'}), 400
+        for index, item in enumerate(labels):
+            if not isinstance(item, dict) or not isinstance(item.get('label_info', {}), dict):
+                return jsonify({'success': False, 'error': f'labels[{index}] 는 label_info 객체여야 합니다.'}), 400
+        for index, country in enumerate(countries):
+            if not isinstance(country, str):
+                return jsonify({'success': False, 'error': f'countries[{index}] 는 국가 이름 문자열이어야 합니다.'}), 400
+        if len(labels) * len(countries) > BULK_COMPLIANCE_MAX_CELLS:
+            return jsonify({'success': False,
+                            'error': f'한 번에 최대 {BULK_COMPLIANCE_MAX_CELLS}건까지 검토할 수 있습니다.'}), 400
+        
+        ids = [item.get('id', index) if 'label_info' in item else index for index, item in enumerate(labels)]
+        label_infos = [item['label_info'] if 'label_info' in item else item for item in labels]
+        
+        started = time.time()
+        matrix = get_label_compliance_checker().check_compliance_bulk(
+            label_infos, countries, include_warnings=bool(data.get('include_warnings'))
+        )
+        print(f"✅ 일괄 준수성 검토 완료: {len(labels)}개 라벨 × {len(countries)}개 국가 ({time.time() - started:.2f}초)")
+        
+        return jsonify({'success': True, 'label_ids': ids, **matrix})
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'일괄 준수성 검토 중 오류가 발생했습니다: {str(e)}'}), 500
+
 @app.route('/api/nutrition-label', methods=['POST'])
 def api_nutrition_label():
     """영양성분표 생성 API"""
@@ -6540,6 +5853,53 @@ def api_nutrition_label():
             'success': False
         })
 
+BATCH_LABEL_MAX_LABELS = int(os.environ.get('BATCH_LABEL_MAX_LABELS', 5000))
+
+@app.route('/api/nutrition-label/batch', methods=['POST'])
+def api_nutrition_label_batch():
+    """대량 라벨 생성 API (제품 여러 개 × 국가 여러 개, 워커 프로세스 풀에서 병렬 렌더링)
+
+    요청: {'products': [product_info 또는 {'id', 'product_info'}], 'countries': ['중국', '미국'],
+           'output': 'zip'(기본, zip 스트림 응답) | 'directory'(advanced_labels/batch_<시각>_<고유값> 에 저장)}
+    zip 과 디렉터리 모두 마지막에 라벨별 파일 이름/크기/오류를 담은 manifest.json 포함
+    """
+    try:
+        data = request.get_json() or {}
+        products = data.get('products', [])
+        countries = data.get('countries', ['중국', '미국'])
+        
+        if not products or not countries:
+            return jsonify({'success': False, 'error': 'products 와 countries 가 필요합니다.'}), 400
+        if not isinstance(products, list) or not isinstance(countries, list):
+            return jsonify({'success': False, 'error': 'products 와 countries 는 목록이어야 합니다.'}), 400
+        for index, product in enumerate(products):
+            if not isinstance(product, dict) or not isinstance(product.get('product_info', {}), dict):
+                return jsonify({'success': False, 'error': f'products[{index}] 는 제품 정보 객체여야 합니다.'}), 400
+        for index, country in enumerate(countries):
+            if not isinstance(country, str):
+                return jsonify({'success': False, 'error': f'countries[{index}] 는 국가 이름 문자열이어야 합니다.'}), 400
+        if len(products) * len(countries) > BATCH_LABEL_MAX_LABELS:
+            return jsonify({'success': False,
+                            'error': f'한 번에 최대 {BATCH_LABEL_MAX_LABELS}개 라벨까지 생성할 수 있습니다.'}), 400
+        
+        renderer = get_batch_label_renderer()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        print(f"🏷️ 대량 라벨 생성: {len(products)}개 제품 × {len(countries)}개 국가")
+        
+        if data.get('output') == 'directory':
+            # 같은 초에 들어온 요청끼리 디렉터리가 겹치지 않도록 고유 접미사
+            output_dir = os.path.join('advanced_labels', f"batch_{timestamp}_{uuid.uuid4().hex[:8]}")
+            manifest = renderer.write_directory(products, countries, output_dir)
+            return jsonify({'success': True, 'output_dir': output_dir, 'manifest': manifest})
+        
+        # 렌더링되는 대로 zip 조각 전송 (연결이 끊기면 남은 작업 취소)
+        return Response(renderer.iter_zip(products, countries), mimetype='application/zip',
+                        headers={'Content-Disposition': f'attachment; filename=labels_{timestamp}.zip',
+                                 **EVENT_STREAM_HEADERS})
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'대량 라벨 생성 중 오류가 발생했습니다: {str(e)}'}), 500
+
 @app.route('/uploaded_labels/<filename>')
 def serve_uploaded_label(filename):
     """업로드된 라벨 이미지 서빙"""
@@ -6912,6 +6272,54 @@ def api_dynamic_compliance_analysis():
             'error': f'동적 준수성 분석 중 오류: {str(e)}'
         })
 
+@app.route('/api/dynamic-compliance-analysis/stream', methods=['POST'])
+def api_dynamic_compliance_analysis_stream():
+    """동적 준수성 분석 스트리밍 API - 규제 매칭, 점수, 체크리스트를 끝나는 대로 전송"""
+    data = request.get_json(silent=True) or {}
+    country = data.get('country', '')
+    product_type = data.get('product_type', '식품')
+    structured_data = data.get('structured_data', {})
+    
+    if not country:
+        return jsonify({
+            'success': False,
+            'error': '국가 파라미터가 필요합니다.'
+        })
+    
+    def events():
+        try:
+            yield 'stage', {'stage': 'regulation_matching'}
+            try:
+                regulation_matching = match_regulations_with_structured_data(structured_data, country, product_type)
+            except Exception as e:
+                print(f"⚠️ 규제 매칭 실패: {e}")
+                regulation_matching = {}
+            yield 'regulation_matching', regulation_matching
+            
+            yield 'stage', {'stage': 'compliance_analysis'}
+            analysis_result = analyze_optimized_compliance_issues(
+                structured_data, regulation_matching, country, product_type
+            )
+            yield 'compliance_analysis', analysis_result
+            yield 'checklist', {
+                'checklist': generate_basic_compliance_checklist(analysis_result, country, product_type),
+                'correction_guide': generate_basic_correction_guide(analysis_result, country, product_type)
+            }
+            
+            yield 'result', {
+                'success': True,
+                'country': country,
+                'product_type': product_type,
+                'analysis': analysis_result
+            }
+        except Exception as e:
+            yield 'error', {
+                'success': False,
+                'error': f'동적 준수성 분석 중 오류: {str(e)}'
+            }
+    
+    return event_stream_response(events())
+
 def extract_image_data(filepath):
     """이미지 파일 데이터 추출 (OCR)"""
     data = {
@@ -8312,14 +7720,60 @@ def api_coordinate_preview():
 # 공공데이터 수출입 실적 분석 API 엔드포인트
 # ============================================================================
 
+def serialize_public_data_analysis(hs_code, analysis_result):
+    """공공데이터 수출입 실적 분석 결과를 API 응답 형태로 변환"""
+    # DB 테이블 데이터 생성
+    db_data = mvp_system.public_data_analyzer.generate_db_table_data(analysis_result)
+    
+    return {
+        'hs_code': hs_code,
+        'trade_data': [
+            {
+                'country': data.country,
+                'export_amount': data.export_amount,
+                'import_amount': data.import_amount,
+                'trade_balance': data.trade_balance,
+                'market_share': data.market_share,
+                'growth_rate': data.growth_rate,
+                'volatility': data.volatility,
+                'market_potential_score': data.market_potential_score,
+                'ranking': data.ranking,
+                'trend_direction': data.trend_direction,
+                'risk_level': data.risk_level
+            }
+            for data in analysis_result['trade_data']
+        ],
+        'ranking_data': [
+            {
+                'country': ranking.country,
+                'overall_score': ranking.overall_score,
+                'market_potential': ranking.market_potential,
+                'growth_potential': ranking.growth_potential,
+                'stability_score': ranking.stability_score,
+                'risk_score': ranking.risk_score,
+                'ranking': ranking.ranking,
+                'ranking_change': ranking.ranking_change,
+                'trend_analysis': ranking.trend_analysis,
+                'recommendation': ranking.recommendation
+            }
+            for ranking in analysis_result['ranking_data']
+        ],
+        'analysis_summary': analysis_result['analysis_summary'],
+        'db_tables': db_data,
+        'created_at': analysis_result['created_at']
+    }
+
 @app.route('/api/public-data-trade-analysis', methods=['POST'])
 def api_public_data_trade_analysis():
-    """공공데이터 수출입 실적 분석 API"""
+    """공공데이터 수출입 실적 분석 API (hs_codes 로 여러 HS CODE 일괄 분석 지원)"""
     try:
         data = request.get_json()
         hs_code = data.get('hs_code', '')
+        hs_codes = data.get('hs_codes') or []
+        if isinstance(hs_codes, str):
+            hs_codes = [code.strip() for code in hs_codes.split(',') if code.strip()]
         
-        if not hs_code:
+        if not hs_code and not hs_codes:
             return jsonify({
                 'success': False,
                 'error': 'HS CODE를 입력해주세요.'
@@ -8331,6 +7785,20 @@ def api_public_data_trade_analysis():
                 'error': '공공데이터 분석기가 초기화되지 않았습니다.'
             })
         
+        # 여러 HS CODE: 랭킹을 한 번의 배열 연산으로 계산
+        if hs_codes:
+            batch_results = mvp_system.public_data_analyzer.get_trade_data_batch(hs_codes)
+            return jsonify({
+                'success': True,
+                'hs_codes': hs_codes,
+                'results': {
+                    code: serialize_public_data_analysis(code, result)
+                    for code, result in batch_results.items() if result
+                },
+                'missing_hs_codes': [code for code, result in batch_results.items() if not result],
+                'created_at': datetime.now().isoformat()
+            })
+        
         # 수출입 실적 데이터 분석
         analysis_result = mvp_system.public_data_analyzer.get_trade_data(hs_code)
         
@@ -8340,46 +7808,9 @@ def api_public_data_trade_analysis():
                 'error': f'HS CODE {hs_code}에 대한 데이터를 찾을 수 없습니다.'
             })
         
-        # DB 테이블 데이터 생성
-        db_data = mvp_system.public_data_analyzer.generate_db_table_data(analysis_result)
-        
         return jsonify({
             'success': True,
-            'hs_code': hs_code,
-            'trade_data': [
-                {
-                    'country': data.country,
-                    'export_amount': data.export_amount,
-                    'import_amount': data.import_amount,
-                    'trade_balance': data.trade_balance,
-                    'market_share': data.market_share,
-                    'growth_rate': data.growth_rate,
-                    'volatility': data.volatility,
-                    'market_potential_score': data.market_potential_score,
-                    'ranking': data.ranking,
-                    'trend_direction': data.trend_direction,
-                    'risk_level': data.risk_level
-                }
-                for data in analysis_result['trade_data']
-            ],
-            'ranking_data': [
-                {
-                    'country': ranking.country,
-                    'overall_score': ranking.overall_score,
-                    'market_potential': ranking.market_potential,
-                    'growth_potential': ranking.growth_potential,
-                    'stability_score': ranking.stability_score,
-                    'risk_score': ranking.risk_score,
-                    'ranking': ranking.ranking,
-                    'ranking_change': ranking.ranking_change,
-                    'trend_analysis': ranking.trend_analysis,
-                    'recommendation': ranking.recommendation
-                }
-                for ranking in analysis_result['ranking_data']
-            ],
-            'analysis_summary': analysis_result['analysis_summary'],
-            'db_tables': db_data,
-            'created_at': analysis_result['created_at']
+            **serialize_public_data_analysis(hs_code, analysis_result)
         })
         
     except Exception as e:
@@ -8595,15 +8026,28 @@ def api_natural_language_query():
             "message": f"자연어 질의 처리 중 오류: {str(e)}"
         })
 
-def process_simple_natural_language_query(query):
-    """간단한 자연어 질의 처리"""
-    query_lower = query.lower()
-    
-    # 중국 관련 질문
-    if '중국' in query_lower:
-        if '라면' in query_lower or '면류' in query_lower:
-            if '서류' in query_lower or '필요' in query_lower:
-                return """중국 라면 수출에 필요한 주요 서류는 다음과 같습니다:
+# 간단한 자연어 질의 분류기: 국가/품목/주제 키워드를 하나의 정규식으로 컴파일
+SIMPLE_NL_CLASSIFIER = QueryClassifier(
+    {
+        "documents": ["서류", "필요"],
+        "regulation": ["규제", "제한"],
+        "risk": ["리스크", "위험", "주의사항"]
+    },
+    countries={"중국": ["중국"]},
+    products={"라면": ["라면", "면류"]},
+    hs_pattern=None,
+    default_intent=None
+)
+
+# 품목별 주제 우선순위 (앞선 주제가 함께 매칭되면 우선)
+SIMPLE_NL_TOPIC_PRIORITY = {
+    "라면": ("documents", "regulation"),
+    None: ("risk", "documents")
+}
+
+# (국가, 품목, 주제) -> 답변
+SIMPLE_NL_ANSWERS = {
+    ("중국", "라면", "documents"): """중국 라면 수출에 필요한 주요 서류는 다음과 같습니다:
 
 1. **상업송장 (Commercial Invoice)**
    - 품목, 수량, 가격, 원산지 명시
@@ -8628,9 +8072,8 @@ def process_simple_natural_language_query(query):
    - 식품첨가물 사용증명서
    - 알레르기 정보 표시
 
-⚠️ 주의사항: 중국은 식품 수입 규제가 엄격하므로 모든 서류를 정확히 준비해야 합니다."""
-            elif '규제' in query_lower or '제한' in query_lower:
-                return """중국 라면 수출 주요 규제사항:
+⚠️ 주의사항: 중국은 식품 수입 규제가 엄격하므로 모든 서류를 정확히 준비해야 합니다.""",
+    ("중국", "라면", "regulation"): """중국 라면 수출 주요 규제사항:
 
 1. **식품안전 규제**
    - GB 7718-2011 식품안전국가표준
@@ -8658,12 +8101,9 @@ def process_simple_natural_language_query(query):
    - 수입허가증 필요
    - 검역비용 부담
 
-💡 팁: 중국 수출 시에는 현지 대리인을 통한 사전 검증을 권장합니다."""
-            else:
-                return "중국 라면 수출에 대해 구체적으로 질문해주세요. 서류 요건, 규제사항, 관세 등에 대해 답변드릴 수 있습니다."
-        
-        elif '리스크' in query_lower or '위험' in query_lower or '주의사항' in query_lower:
-            return """중국 수출 주요 리스크:
+💡 팁: 중국 수출 시에는 현지 대리인을 통한 사전 검증을 권장합니다.""",
+    ("중국", "라면", None): "중국 라면 수출에 대해 구체적으로 질문해주세요. 서류 요건, 규제사항, 관세 등에 대해 답변드릴 수 있습니다.",
+    ("중국", None, "risk"): """중국 수출 주요 리스크:
 
 1. **규제 리스크**
    - 엄격한 식품안전 규제 (GB 7718-2011)
@@ -8705,10 +8145,8 @@ def process_simple_natural_language_query(query):
 - 현지 대리인과의 협력
 - 사전 검증 서비스 이용
 - 보험 가입
-- 단계적 시장 진입"""
-        
-        elif '서류' in query_lower or '필요' in query_lower:
-            return """중국 수출 일반 서류 요건:
+- 단계적 시장 진입""",
+    ("중국", None, "documents"): """중국 수출 일반 서류 요건:
 
 1. **기본 서류**
    - 상업송장 (Commercial Invoice)
@@ -8730,14 +8168,22 @@ def process_simple_natural_language_query(query):
    - 검역검사 통과
    - 포장재 안전성 검증
 
-구체적인 품목을 알려주시면 더 상세한 정보를 제공해드릴 수 있습니다."""
-        
-        # 기본 응답
-        return "중국 수출에 대해 구체적으로 질문해주세요. 서류 요건, 규제사항, 관세 등에 대해 답변드릴 수 있습니다."
-        return jsonify({
-            "success": False,
-            "message": f"샘플 데이터 로드 중 오류: {str(e)}"
-        })
+구체적인 품목을 알려주시면 더 상세한 정보를 제공해드릴 수 있습니다.""",
+    ("중국", None, None): "중국 수출에 대해 구체적으로 질문해주세요. 서류 요건, 규제사항, 관세 등에 대해 답변드릴 수 있습니다."
+}
+
+SIMPLE_NL_DEFAULT_ANSWER = "현재 중국 수출 관련 질의를 지원합니다. 국가와 품목을 포함해 구체적으로 질문해주세요."
+
+def process_simple_natural_language_query(query):
+    """간단한 자연어 질의 처리"""
+    classified = SIMPLE_NL_CLASSIFIER.classify(query)
+    
+    topic = next(
+        (t for t in SIMPLE_NL_TOPIC_PRIORITY[classified.product] if t in classified.matched_intents),
+        None
+    )
+    return SIMPLE_NL_ANSWERS.get((classified.country, classified.product, topic), SIMPLE_NL_DEFAULT_ANSWER)
+
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
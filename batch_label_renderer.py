@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🏷️ 대량 라벨 렌더링
+- 제품 정보 목록 × 국가 목록의 라벨을 프로세스 풀에서 병렬 생성
+  (워커마다 폰트 레지스트리와 컴파일된 레이아웃을 한 번만 준비하고 이후 라벨은 가변 값만 그림)
+- PNG 인코딩까지 워커에서 처리하고, 결과는 입력 순서대로 받으며 동시에 처리 중인 묶음 수를 제한
+- zip 스트림(마지막 항목 manifest.json) 또는 출력 디렉터리(+ manifest.json) 로 저장
+
+사용 예:
+    python batch_label_renderer.py products.json --countries 중국 미국 --zip labels.zip
+    python batch_label_renderer.py products.jsonl --output-dir advanced_labels/batch --workers 4
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스 수 (0 이면 CPU 코어 수)
+BATCH_LABEL_WORKERS = int(os.environ.get('BATCH_LABEL_WORKERS', 0)) or os.cpu_count() or 1
+
+# 워커에 한 번에 넘기는 라벨 수 (프로세스 간 전달 횟수 감소)
+CHUNK_SIZE = 8
+
+# 국가별 라벨 종류 (그 외 국가는 기본 영양정보 라벨)
+LABEL_TYPES = {
+    '중국': 'china_2027',
+    '미국': 'us_2025'
+}
+
+MANIFEST_NAME = 'manifest.json'
+
+# 프로세스별 라벨 생성기 (라벨 종류마다 하나, 중국 라벨 생성기는 중국어 폰트로 바뀌므로 분리)
+_generators: Dict[str, Any] = {}
+_generators_lock = threading.Lock()
+
+
+def label_type_for(country: str) -> str:
+    return LABEL_TYPES.get(country, 'basic')
+
+
+def _generator(label_type: str):
+    generator = _generators.get(label_type)
+    if generator is None:
+        with _generators_lock:
+            generator = _generators.get(label_type)
+            if generator is None:
+                if label_type == 'basic':
+                    from nutrition_label_generator import NutritionLabelGenerator
+                    generator = NutritionLabelGenerator()
+                else:
+                    from advanced_label_generator import AdvancedLabelGenerator
+                    generator = AdvancedLabelGenerator()
+                _generators[label_type] = generator
+    return generator
+
+
+def render_label(country: str, product_info: Dict):
+    """국가별 라벨 이미지 한 장 생성 (PIL 이미지, 라벨 종류)"""
+    label_type = label_type_for(country)
+    generator = _generator(label_type)
+    if label_type == 'china_2027':
+        image = generator.generate_china_2027_label(product_info)
+    elif label_type == 'us_2025':
+        image = generator.generate_us_2025_label(product_info)
+    else:
+        image = generator.generate_nutrition_label(product_info, country)
+    return image, label_type
+
+
+def label_filename(index: int, label_id: Any, label_type: str) -> str:
+    """zip/디렉터리 안의 파일 이름 (입력 순번 + 제품 id + 라벨 종류)"""
+    safe_id = re.sub(r'[^\w.-]+', '_', str(label_id)).strip('._')[:60] or 'label'
+    return f"{index:05d}_{safe_id}_{label_type}.png"
+
+
+@dataclass
+class RenderedLabel:
+    """렌더링 결과 한 건 (실패하면 png 없이 error)"""
+    index: int
+    label_id: Any
+    country: str
+    label_type: str
+    filename: str
+    png: Optional[bytes] = None
+    size: Optional[Tuple[int, int]] = None
+    error: Optional[str] = None
+
+    def manifest_entry(self) -> Dict:
+        entry = {
+            'index': self.index,
+            'id': self.label_id,
+            'country': self.country,
+            'label_type': self.label_type,
+            'success': self.png is not None
+        }
+        if self.png is not None:
+            entry.update({
+                'filename': self.filename,
+                'width': self.size[0],
+                'height': self.size[1],
+                'bytes': len(self.png),
+                'sha256': hashlib.sha256(self.png).hexdigest()
+            })
+        else:
+            entry['error'] = self.error
+        return entry
+
+
+def build_tasks(products: List[Any], countries: List[str]) -> List[Tuple[int, Any, str, Dict]]:
+    """(순번, 제품 id, 국가, 제품 정보) 작업 목록 (제품 순서 × 국가 순서)
+
+    products 항목은 product_info 그대로이거나 {'id', 'product_info'} 형태.
+    """
+    tasks = []
+    for position, item in enumerate(products):
+        if isinstance(item, dict) and 'product_info' in item:
+            label_id, product_info = item.get('id', position), item['product_info']
+        else:
+            label_id, product_info = position, item
+        for country in countries:
+            tasks.append((len(tasks), label_id, country, product_info))
+    return tasks
+
+
+def render_tasks(tasks: List[Tuple[int, Any, str, Dict]]) -> List[RenderedLabel]:
+    """작업 묶음 렌더링 + PNG 인코딩 (워커 프로세스에서 실행, 라벨별 실패는 결과에 기록)"""
+    results = []
+    for index, label_id, country, product_info in tasks:
+        label_type = label_type_for(country)
+        filename = label_filename(index, label_id, label_type)
+        try:
+            image, label_type = render_label(country, product_info)
+            buffer = io.BytesIO()
+            image.save(buffer, 'PNG')
+            results.append(RenderedLabel(index, label_id, country, label_type, filename,
+                                         buffer.getvalue(), image.size))
+        except Exception as e:
+            logger.warning(f"⚠️ 라벨 렌더링 실패 ({label_id}, {country}): {e}")
+            results.append(RenderedLabel(index, label_id, country, label_type, filename, error=str(e)))
+    return results
+
+
+def _warm_up_worker():
+    """워커 시작 시 라벨 생성기/폰트 미리 로드"""
+    for label_type in ('china_2027', 'us_2025', 'basic'):
+        _generator(label_type)
+
+
+def build_manifest(entries: List[Dict], elapsed: float, workers: int) -> Dict:
+    succeeded = sum(1 for entry in entries if entry['success'])
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'total': len(entries),
+        'succeeded': succeeded,
+        'failed': len(entries) - succeeded,
+        'workers': workers,
+        'elapsed_seconds': round(elapsed, 3),
+        'labels': entries
+    }
+
+
+class _ZipStream:
+    """zipfile 이 쓰는 바이트를 모아 두었다가 조각으로 내보내는 비탐색(non-seekable) 버퍼"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data, self._chunks = b''.join(self._chunks), []
+        return data
+
+
+class BatchLabelRenderer:
+    """프로세스 풀 기반 대량 라벨 렌더러
+
+    spawn 방식 워커를 처음 병렬 작업 때 띄워 재사용한다. 라벨 수가 min_parallel 보다
+    적거나 워커가 1개이면 프로세스 시작 비용 없이 현재 프로세스에서 렌더링한다.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE, min_parallel: int = 16):
+        self.workers = max(1, workers or BATCH_LABEL_WORKERS)
+        self.chunk_size = max(1, chunk_size)
+        self.min_parallel = min_parallel
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.stats = {'batches': 0, 'labels': 0, 'failed': 0, 'parallel_batches': 0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_warm_up_worker
+                )
+                logger.info(f"🚀 라벨 렌더링 워커 프로세스 {self.workers}개 시작")
+            return self._executor
+
+    def iter_render(self, products: List[Any], countries: List[str]) -> Iterator[RenderedLabel]:
+        """라벨을 입력 순서대로 렌더링해 하나씩 반환 (소비를 멈추면 남은 묶음 취소)"""
+        tasks = build_tasks(products, countries)
+        chunks = [tasks[start:start + self.chunk_size] for start in range(0, len(tasks), self.chunk_size)]
+        self.stats['batches'] += 1
+
+        if self.workers <= 1 or len(tasks) < self.min_parallel:
+            for chunk in chunks:
+                yield from self._counted(render_tasks(chunk))
+            return
+
+        self.stats['parallel_batches'] += 1
+        executor = self._get_executor()
+        # 결과(PNG)가 메모리에 쌓이지 않도록 워커 수의 몇 배만 미리 제출
+        window = self.workers * 4
+        pending = deque()
+        remaining = iter(chunks)
+        try:
+            for chunk in remaining:
+                pending.append(executor.submit(render_tasks, chunk))
+                if len(pending) >= window:
+                    break
+            while pending:
+                results = pending.popleft().result()
+                next_chunk = next(remaining, None)
+                if next_chunk is not None:
+                    pending.append(executor.submit(render_tasks, next_chunk))
+                yield from self._counted(results)
+        except BrokenProcessPool:
+            logger.error("❌ 라벨 렌더링 워커 프로세스가 비정상 종료되어 풀을 다시 만듭니다.")
+            with self._lock:
+                self._executor = None
+            raise
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _counted(self, results: List[RenderedLabel]) -> Iterator[RenderedLabel]:
+        for result in results:
+            self.stats['labels'] += 1
+            if result.png is None:
+                self.stats['failed'] += 1
+            yield result
+
+    def iter_zip(self, products: List[Any], countries: List[str]) -> Iterator[bytes]:
+        """zip 파일 바이트 조각 (라벨 PNG 는 무압축 저장, 마지막에 manifest.json)"""
+        started = time.time()
+        stream = _ZipStream()
+        entries = []
+        with zipfile.ZipFile(stream, 'w') as archive:
+            for result in self.iter_render(products, countries):
+                if result.png is not None:
+                    archive.writestr(result.filename, result.png, compress_type=zipfile.ZIP_STORED)
+                entries.append(result.manifest_entry())
+                chunk = stream.drain()
+                if chunk:
+                    yield chunk
+            manifest = build_manifest(entries, time.time() - started, self.workers)
+            archive.writestr(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2),
+                             compress_type=zipfile.ZIP_DEFLATED)
+        yield stream.drain()
+        logger.info(f"✅ 라벨 zip 생성 완료: {manifest['succeeded']}/{manifest['total']}개 "
+                    f"({manifest['elapsed_seconds']}초)")
+
+    def write_zip(self, products: List[Any], countries: List[str], path: str) -> int:
+        """zip 파일로 저장 (바이트 수 반환)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        written = 0
+        with open(path, 'wb') as f:
+            for chunk in self.iter_zip(products, countries):
+                f.write(chunk)
+                written += len(chunk)
+        return written
+
+    def write_directory(self, products: List[Any], countries: List[str], output_dir: str) -> Dict:
+        """출력 디렉터리에 라벨 PNG 와 manifest.json 저장 (manifest 반환)"""
+        started = time.time()
+        os.makedirs(output_dir, exist_ok=True)
+        entries = []
+        for result in self.iter_render(products, countries):
+            if result.png is not None:
+                with open(os.path.join(output_dir, result.filename), 'wb') as f:
+                    f.write(result.png)
+            entries.append(result.manifest_entry())
+        manifest = build_manifest(entries, time.time() - started, self.workers)
+        with open(os.path.join(output_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        logger.info(f"✅ 라벨 {manifest['succeeded']}/{manifest['total']}개 저장: {output_dir} "
+                    f"({manifest['elapsed_seconds']}초)")
+        return manifest
+
+    def shutdown(self):
+        """워커 프로세스 종료"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'workers': self.workers, 'pool_started': self._executor is not None}
+
+
+# 전역 대량 라벨 렌더러 (워커 프로세스는 첫 병렬 작업 때 시작)
+batch_label_renderer = BatchLabelRenderer()
+
+
+def get_batch_label_renderer() -> BatchLabelRenderer:
+    """전역 대량 라벨 렌더러 반환"""
+    return batch_label_renderer
+
+
+def load_products(path: str) -> List[Any]:
+    """제품 정보 파일 읽기 (JSON 목록, {'products': [...]} 또는 JSONL)"""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            return [json.loads(line) for line in f if line.strip()]
+        data = json.load(f)
+    return data.get('products', []) if isinstance(data, dict) else data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대량 라벨 렌더링")
+    parser.add_argument("products", help="제품 정보 파일 (JSON 목록, {'products': [...]} 또는 JSONL)")
+    parser.add_argument("--countries", nargs="+", default=["중국", "미국"], help="라벨을 만들 국가")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--zip", dest="zip_path", help="zip 파일 경로")
+    output.add_argument("--output-dir", help="출력 디렉터리 (기본: advanced_labels/batch_<시각>)")
+    parser.add_argument("--workers", type=int, default=BATCH_LABEL_WORKERS, help="워커 프로세스 수")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="워커에 한 번에 넘길 라벨 수")
+    args = parser.parse_args()
+
+    products = load_products(args.products)
+    renderer = BatchLabelRenderer(workers=args.workers, chunk_size=args.chunk_size)
+    try:
+        if args.zip_path:
+            written = renderer.write_zip(products, args.countries, args.zip_path)
+            print(f"✅ {args.zip_path} 저장 완료 ({written:,} bytes)")
+        else:
+            output_dir = args.output_dir or os.path.join(
+                "advanced_labels", f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+            manifest = renderer.write_directory(products, args.countries, output_dir)
+            print(f"✅ {output_dir}: 라벨 {manifest['succeeded']}/{manifest['total']}개 "
+                  f"({manifest['elapsed_seconds']}초, 워커 {manifest['workers']}개)")
+        stats = renderer.get_stats()
+        if stats['failed']:
+            print(f"⚠️ 실패한 라벨 {stats['failed']}개 (manifest.json 참고)")
+    finally:
+        renderer.shutdown()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+📚 다중 문서 일괄 OCR 처리기
+- 여러 이미지/PDF 페이지를 한 번에 모아 OCR (문서별 순차 처리 대신)
+- EasyOCR 은 비슷한 크기의 페이지끼리 묶어 readtext_batched 로 일괄 인식
+- Tesseract 는 페이지 단위로 CPU 코어 수만큼 병렬 실행
+- PDF 는 텍스트 레이어가 있는 페이지는 그대로 사용하고 이미지 페이지만 OCR
+  (이미지 페이지는 차례로 렌더링하고 OCR 묶음 크기만큼만 메모리에 둠)
+- 결과는 문서별로 다시 모아 반환 (OCR 결과 캐시 사용)
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+import cv2
+import numpy as np
+
+try:
+    import pytesseract
+    TESSERACT_AVAILABLE = True
+except ImportError:
+    TESSERACT_AVAILABLE = False
+
+from utils.ocr_engine_pool import ocr_engine_pool
+from utils.ocr_result_cache import get_ocr_result_cache, hash_file
+from utils.pdf_page_stream import PYMUPDF_AVAILABLE, choose_page_dpi, render_page
+
+if PYMUPDF_AVAILABLE:
+    import fitz
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.gif')
+
+NO_ENGINE_ERROR = "사용 가능한 OCR 엔진이 없습니다."
+
+
+class BatchOCRProcessor:
+    """여러 문서의 페이지를 모아 한 번에 OCR 하는 처리기"""
+
+    def __init__(self, engine: str = 'auto', max_workers: Optional[int] = None, batch_size: int = 8,
+                 lang: str = 'kor+eng', pdf_dpi: int = 200, result_cache='default'):
+        """
+        Args:
+            engine: 'auto' (EasyOCR 우선, 없으면 Tesseract), 'easyocr', 'tesseract'
+            max_workers: Tesseract 병렬 실행 수 (기본: CPU 코어 수)
+            batch_size: EasyOCR 한 번에 인식할 페이지 수
+            lang: Tesseract 언어 설정
+            pdf_dpi: 이미지 전용 PDF 페이지 렌더링 해상도 (None 이면 페이지별로 결정)
+            result_cache: 문서 단위 OCR 결과 캐시 ('default' 면 전역 캐시, None 이면 사용하지 않음)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.engine = engine
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.batch_size = max(1, batch_size)
+        self.lang = lang
+        self.pdf_dpi = pdf_dpi
+        self._result_cache = result_cache
+
+    @property
+    def result_cache(self):
+        """문서 단위 OCR 결과 캐시 (전역 캐시는 처음 사용할 때 생성)"""
+        return get_ocr_result_cache() if self._result_cache == 'default' else self._result_cache
+
+    def select_engine(self) -> Optional[str]:
+        """사용할 OCR 엔진 이름 (없으면 None)"""
+        if self.engine != 'auto':
+            return self.engine if ocr_engine_pool.is_available(self.engine) else None
+        for name in ('easyocr', 'tesseract'):
+            if ocr_engine_pool.is_available(name):
+                return name
+        return None
+
+    def process(self, documents: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """문서 목록 일괄 OCR
+
+        Args:
+            documents: [{'id': 문서 식별자, 'path': 파일 경로}, ...]
+
+        Returns:
+            {문서 식별자: {'text', 'tables', 'confidence', 'pages', 'engine', 'cache_hit'}}
+            (실패한 문서는 'error' 포함)
+        """
+        started = time.time()
+        engine = self.select_engine()
+        # 렌더링된 페이지 이미지는 OCR 한 번에 처리할 만큼만 메모리에 둠
+        window_size = self.batch_size if engine == 'easyocr' else self.max_workers
+        results = {}
+        pending = {}
+        window = []
+        ocr_page_count = 0
+
+        for document in documents:
+            doc_id, path = document['id'], document['path']
+            cache_key = self._cache_key(path, engine)
+            if cache_key is not None:
+                cached = self.result_cache.get(cache_key)
+                if cached is not None:
+                    results[doc_id] = {**cached, 'cache_hit': True}
+                    continue
+
+            pages = []
+            try:
+                for page in self._iter_pages(path):
+                    pages.append(page)
+                    if page.get('image') is None:
+                        continue
+                    if engine is None:
+                        page.pop('image')
+                        page['error'] = NO_ENGINE_ERROR
+                        continue
+                    window.append(page)
+                    if len(window) >= window_size:
+                        ocr_page_count += self._ocr_pages(window, engine)
+                        window = []
+            except Exception as e:
+                self.logger.warning(f"⚠️ 문서 로드 실패 ({path}): {e}")
+                results[doc_id] = {'text': '', 'tables': [], 'error': str(e), 'cache_hit': False}
+                failed = {id(page) for page in pages}
+                window = [page for page in window if id(page) not in failed]
+                continue
+            pending[doc_id] = (cache_key, pages)
+
+        if window:
+            ocr_page_count += self._ocr_pages(window, engine)
+        if ocr_page_count:
+            self.logger.info(f"🔍 일괄 OCR: {len(pending)}개 문서, {ocr_page_count}페이지 ({engine})")
+
+        for doc_id, (cache_key, pages) in pending.items():
+            result = self._assemble(pages, engine)
+            if cache_key is not None and 'error' not in result and result['text'].strip():
+                self.result_cache.set(cache_key, result)
+            results[doc_id] = {**result, 'cache_hit': False}
+
+        self.logger.info(f"✅ 일괄 OCR 완료: {len(results)}개 문서 ({time.time() - started:.2f}초)")
+        return results
+
+    def _ocr_pages(self, pages: List[Dict[str, Any]], engine: str) -> int:
+        """페이지 묶음 OCR 후 렌더링 이미지 해제, 처리한 페이지 수 반환"""
+        if engine == 'easyocr':
+            self._ocr_with_easyocr(pages)
+        else:
+            self._ocr_with_tesseract(pages)
+        for page in pages:
+            page.pop('image', None)
+        return len(pages)
+
+    def _cache_key(self, path: str, engine: Optional[str]) -> Optional[str]:
+        if self.result_cache is None or engine is None:
+            return None
+        try:
+            return self.result_cache.make_key(hash_file(path), pipeline='batch_ocr', engine=engine,
+                                              lang=self.lang, pdf_dpi=self.pdf_dpi)
+        except OSError:
+            return None
+
+    def _iter_pages(self, path: str) -> Iterator[Dict[str, Any]]:
+        """문서의 페이지를 차례로 생성 (OCR 이 필요한 페이지에만 'image')"""
+        ext = os.path.splitext(path)[1].lower()
+        if ext in IMAGE_EXTENSIONS:
+            yield {'page': 1, 'image': self._read_image(path), 'source': 'ocr'}
+        elif ext == '.pdf':
+            yield from self._iter_pdf_pages(path)
+        else:
+            raise ValueError(f"지원하지 않는 파일 형식: {ext}")
+
+    def _read_image(self, path: str) -> np.ndarray:
+        image = cv2.imread(path)
+        if image is None:
+            # GIF 등 OpenCV 가 읽지 못하는 형식은 PIL 로 읽음
+            from PIL import Image
+            with Image.open(path) as pil_image:
+                image = cv2.cvtColor(np.array(pil_image.convert('RGB')), cv2.COLOR_RGB2BGR)
+        return image
+
+    def _iter_pdf_pages(self, path: str) -> Iterator[Dict[str, Any]]:
+        """텍스트 레이어가 있는 페이지는 텍스트 그대로, 없는 페이지만 필요할 때 렌더링"""
+        if not PYMUPDF_AVAILABLE:
+            raise RuntimeError("PDF 페이지 처리를 위해 PyMuPDF 가 필요합니다.")
+        with fitz.open(path) as pdf:
+            for index, pdf_page in enumerate(pdf, start=1):
+                text = pdf_page.get_text()
+                if text.strip():
+                    yield {'page': index, 'text': text, 'confidence': 1.0, 'source': 'text_layer'}
+                    continue
+                dpi = self.pdf_dpi or choose_page_dpi(pdf_page)
+                yield {'page': index, 'image': render_page(pdf_page, dpi), 'source': 'ocr'}
+
+    def ocr_image(self, image: np.ndarray):
+        """이미지 한 장 OCR, (텍스트, 평균 신뢰도) 반환 (PDF 스트리밍 등 단건 처리용)"""
+        page = {'page': 1, 'image': image, 'source': 'ocr'}
+        engine = self.select_engine()
+        if engine == 'easyocr':
+            self._ocr_with_easyocr([page])
+        elif engine == 'tesseract':
+            self._ocr_with_tesseract([page])
+        else:
+            raise RuntimeError(NO_ENGINE_ERROR)
+        if 'error' in page:
+            raise RuntimeError(page['error'])
+        return page.get('text', ''), page.get('confidence', 0.0)
+
+    def _ocr_with_tesseract(self, pages: List[Dict[str, Any]]) -> None:
+        """페이지 단위 병렬 Tesseract (동시 실행 수는 엔진 풀이 제한)"""
+        def run(page):
+            try:
+                with ocr_engine_pool.acquire('tesseract') as tesseract:
+                    if tesseract is None:
+                        page['error'] = NO_ENGINE_ERROR
+                        return
+                    page['text'], page['confidence'] = self._tesseract_page(page['image'])
+            except Exception as e:
+                page['error'] = str(e)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pages))) as executor:
+            list(executor.map(run, pages))
+
+    def _tesseract_page(self, image: np.ndarray):
+        """Tesseract 한 페이지 인식, (텍스트, 평균 신뢰도) 반환"""
+        data = pytesseract.image_to_data(image, lang=self.lang, output_type=pytesseract.Output.DICT)
+        lines = {}
+        confidences = []
+        # image_to_string 을 따로 호출하지 않고 단어 결과로 줄 단위 텍스트 구성
+        for i, word in enumerate(data['text']):
+            if not word.strip() or float(data['conf'][i]) < 0:
+                continue
+            line_key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            lines.setdefault(line_key, []).append(word)
+            confidences.append(float(data['conf'][i]))
+        text = '\n'.join(' '.join(words) for _, words in sorted(lines.items()))
+        return text, (sum(confidences) / len(confidences) / 100 if confidences else 0.0)
+
+    def _ocr_with_easyocr(self, pages: List[Dict[str, Any]]) -> None:
+        """비슷한 크기의 페이지끼리 묶어 readtext_batched 로 일괄 인식
+
+        묶음 안의 페이지는 오른쪽/아래를 흰색으로 채워 크기를 맞추므로 좌표는 바뀌지 않는다.
+        """
+        ordered = sorted(pages, key=lambda p: (p['image'].shape[0], p['image'].shape[1]))
+        try:
+            with ocr_engine_pool.acquire('easyocr') as reader:
+                if reader is None:
+                    for page in pages:
+                        page['error'] = NO_ENGINE_ERROR
+                    return
+                for start in range(0, len(ordered), self.batch_size):
+                    group = ordered[start:start + self.batch_size]
+                    height = max(p['image'].shape[0] for p in group)
+                    width = max(p['image'].shape[1] for p in group)
+                    images = [self._pad_to(p['image'], height, width) for p in group]
+                    batch_results = reader.readtext_batched(images, batch_size=len(images))
+                    for page, detections in zip(group, batch_results):
+                        page['text'] = '\n'.join(d[1] for d in detections)
+                        page['confidence'] = (sum(float(d[2]) for d in detections) / len(detections)
+                                              if detections else 0.0)
+        except Exception as e:
+            self.logger.warning(f"❌ EasyOCR 일괄 인식 실패: {e}")
+            for page in pages:
+                if 'text' not in page:
+                    page['error'] = str(e)
+
+    @staticmethod
+    def _pad_to(image: np.ndarray, height: int, width: int) -> np.ndarray:
+        pad_bottom, pad_right = height - image.shape[0], width - image.shape[1]
+        if not pad_bottom and not pad_right:
+            return image
+        return cv2.copyMakeBorder(image, 0, pad_bottom, 0, pad_right, cv2.BORDER_CONSTANT, value=(255, 255, 255))
+
+    def _assemble(self, pages: List[Dict[str, Any]], engine: Optional[str]) -> Dict[str, Any]:
+        """페이지 결과를 문서 결과로 합침"""
+        page_results = []
+        for page in pages:
+            page.pop('image', None)
+            page_results.append({
+                'page': page['page'],
+                'text': page.get('text', ''),
+                'confidence': round(page.get('confidence', 0.0), 3),
+                'source': page['source'],
+                **({'error': page['error']} if 'error' in page else {})
+            })
+
+        result = {
+            'text': '\n'.join(p['text'] for p in page_results if p['text']),
+            'tables': [],
+            'confidence': round(float(np.mean([p['confidence'] for p in page_results])), 3) if page_results else 0.0,
+            'pages': page_results,
+            'engine': engine
+        }
+        errors = [p['error'] for p in page_results if 'error' in p]
+        if errors and len(errors) == len(page_results):
+            result['error'] = errors[0]
+        return result
+
+
+# 전역 일괄 OCR 처리기
+batch_ocr_processor = BatchOCRProcessor()
+
+
+def get_batch_ocr_processor() -> BatchOCRProcessor:
+    """전역 일괄 OCR 처리기 반환"""
+    return batch_ocr_processor
@@ -15,6 +15,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import threading
 from cloud_storage import cloud_storage
+from utils.regulation_snapshot import regulation_snapshots
 
 class CloudRegulationCrawler:
     """클라우드 실시간 규제 크롤링 시스템"""
@@ -303,6 +304,9 @@ class CloudRegulationCrawler:
         with self.data_lock:
             self.live_data[f"{country}_{product_type}"] = regulations
         
+        # 규제 스냅샷 발행 (사용처는 재시작 없이 새 버전을 조회)
+        regulation_snapshots.publish('realtime_regulations', regulations, path=(country, product_type))
+        
         return regulations
     
     def crawl_korea_regulations(self, product_type: str = "라면") -> Dict:
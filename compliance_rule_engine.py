@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+📐 선언형 규제 준수 규칙 엔진
+- 카테고리별 점검 내용(어느 섹션에서 어떤 규제 항목을 찾는지, 점수 방식, 이슈 문구)을 데이터로 정의
+- (국가, 제품) 규제 정보를 한 번 컴파일해 섹션별 용어 색인과 술어 표를 만듦
+- 추출 데이터의 섹션을 한 번씩만 훑어 모든 카테고리의 점검 결과(detailed_checks)와 상세 이슈를 함께 산출
+"""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from utils.field_extraction import FieldExtractor
+from utils.regulation_snapshot import freeze
+
+# 이슈 필드 순서 (app.analyze_*_issues 응답 형식)
+ISSUE_FIELDS = ('issue_type', 'severity', 'description', 'regulation_reference', 'regulation_detail',
+                'location', 'current_content', 'required_content', 'action_required', 'example_correction',
+                'design_recommendation', 'additional_documents', 'test_requirements')
+
+
+def _issue(issue_type, severity, description, detail, location, current, required, action, example, design,
+           documents=(), tests=()):
+    """이슈 템플릿 ({term}, {country}, {regulation}, {content} 등은 평가 시 채움)"""
+    return dict(zip(ISSUE_FIELDS, (issue_type, severity, description, '{regulation} ({year}년)', detail, location,
+                                   current, required, action, example, design, tuple(documents), tuple(tests))))
+
+
+@dataclass(frozen=True)
+class CategoryRule:
+    """카테고리 하나의 규제 항목 점검 규칙
+
+    kind 가 'required' 이면 항목이 모두 표기돼야 하고(누락 항목마다 term_issue),
+    'restricted' 이면 항목이 없어야 한다(항목이 발견된 텍스트마다 term_issue).
+    """
+    key: str
+    name: str
+    section: str
+    terms_field: str
+    kind: str
+    weight: int
+    summary: str
+    term_issue: Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class ItemRule:
+    """섹션의 텍스트 항목 하나에 대한 술어 규칙
+
+    when 의 조건을 모두 만족하는 텍스트 항목마다 이슈를 만든다.
+    - ('set', 필드): 규제 필드 값이 있음 (컴파일 시 판정)
+    - ('equals', 필드, 값): 규제 필드 값이 같음 (컴파일 시 판정)
+    - ('contains', 문자열) / ('lacks', 문자열): 텍스트에 포함됨/포함되지 않음 ({unit} 등은 컴파일 시 채움)
+    - ('lacks_chars', 문자들): 텍스트에 어느 문자도 없음
+    - ('any_term', bool): 카테고리 규제 항목이 하나라도 포함됐는지 여부
+    - ('fewer_words', n): 공백 기준 단어 수가 n 미만
+    """
+    category: str
+    when: Tuple[Tuple, ...]
+    issue: Dict[str, Any]
+
+
+CATEGORY_RULES = (
+    CategoryRule(
+        key='nutrition', name='영양성분', section='영양성분', terms_field='required_nutrients', kind='required',
+        weight=25, summary='누락된 영양성분',
+        term_issue=_issue('누락', 'critical', '필수 영양성분 "{term}"이(가) 누락되었습니다.',
+                          '{country} 식품 라벨링 규정에 따라 {term} 표기가 필수입니다.', '영양성분표', '표기 없음',
+                          '{term}: [함량] {unit}', '추가', '{term}: 0.5g {unit}',
+                          '영양성분표에 {term} 항목을 추가하고 함량을 {unit} 단위로 표기하세요.',
+                          ['영양성분분석서'], ['영양성분분석'])
+    ),
+    CategoryRule(
+        key='allergy', name='알레르기', section='표기사항', terms_field='required_allergens', kind='required',
+        weight=20, summary='누락된 알레르기 정보',
+        term_issue=_issue('누락', 'critical', '알레르기 정보 "{term}"이(가) 누락되었습니다.',
+                          '{country} 식품 라벨링 규정에 따라 {term} 알레르기 정보 표기가 필수입니다.', '알레르기 정보',
+                          '표기 없음', '알레르기 정보: {term} 포함', '추가', '알레르기 정보: {term} 함유',
+                          '알레르기 정보 섹션에 {term} 포함 여부를 명시하세요.',
+                          ['알레르기 정보서'], ['알레르기 성분 검사'])
+    ),
+    CategoryRule(
+        key='ingredients', name='성분/첨가물', section='원재료', terms_field='restricted_additives', kind='restricted',
+        weight=20, summary='제한 성분 발견',
+        term_issue=_issue('제한 성분', 'critical', '제한 첨가물 "{term}"이(가) 사용되었습니다.',
+                          '{country} 식품첨가물 규정에 따라 {term} 사용이 제한됩니다. (최대: {max_level})', '성분표',
+                          '{content}', '{term} 함량이 {max_level} 이하여야 함', '검사', '{term} 함량: {max_level} 이하 확인',
+                          '{term} 함량을 {max_level} 이하로 제한하거나 대체 성분을 사용하세요.',
+                          ['성분분석서'], ['첨가물 함량 분석'])
+    ),
+    CategoryRule(
+        key='labeling', name='라벨 표기', section='표기사항', terms_field='required_info', kind='required',
+        weight=20, summary='누락된 라벨 정보',
+        term_issue=_issue('누락', 'critical', '필수 표기사항 "{term}"이(가) 누락되었습니다.',
+                          '{country} 식품 라벨링 규정에 따라 {term} 표기가 필수입니다.', '라벨', '표기 없음',
+                          '{term}: [구체적 내용]', '추가', '{term}: [구체적 내용 입력]',
+                          '라벨에 {term} 섹션을 추가하고 구체적인 내용을 표기하세요.')
+    ),
+    CategoryRule(
+        key='packaging', name='포장 정보', section='포장정보', terms_field='required_info', kind='required',
+        weight=10, summary='누락된 포장 정보',
+        term_issue=_issue('누락', 'major', '포장 정보 "{term}"이(가) 누락되었습니다.',
+                          '{country} 포장 규정에 따라 {term} 표기가 필요합니다.', '포장', '표기 없음',
+                          '{term}: [구체적 내용]', '추가', '{term}: [구체적 내용 입력]', '포장에 {term} 정보를 추가하세요.')
+    ),
+    CategoryRule(
+        key='manufacturing', name='제조/유통', section='기타정보', terms_field='required_info', kind='required',
+        weight=5, summary='누락된 제조 정보',
+        term_issue=_issue('누락', 'critical', '제조 정보 "{term}"이(가) 누락되었습니다.',
+                          '{country} 제조 규정에 따라 {term} 표기가 필수입니다.', '라벨/포장', '표기 없음',
+                          '{term}: [구체적 내용]', '추가', '{term}: [구체적 내용 입력]', '라벨에 {term} 정보를 추가하세요.',
+                          ['제조시설 등록증'])
+    ),
+)
+
+ITEM_RULES = (
+    ItemRule('nutrition', (('set', 'unit'), ('lacks', '{unit}'), ('any_term', True)),
+             _issue('단위 오류', 'major', '영양성분 단위가 {unit}로 표기되지 않았습니다.',
+                    '{country} 규정에 따라 영양성분은 {unit} 단위로 표기해야 합니다.', '영양성분표', '{content}',
+                    '[영양성분명]: [함량] {unit}', '수정', '{content_with_unit}',
+                    '모든 영양성분 함량 뒤에 {unit} 단위를 명시하세요.')),
+    ItemRule('allergy', (('contains', '알레르기'), ('any_term', False)),
+             _issue('형식 오류', 'major', '알레르기 정보가 구체적으로 표기되지 않았습니다.',
+                    '{country} 규정에 따라 구체적인 알레르기 원료를 명시해야 합니다.', '알레르기 정보', '{content}',
+                    '알레르기 정보: [구체적 원료명] 포함', '수정', '알레르기 정보: {examples} 포함',
+                    '알레르기 정보에 구체적인 원료명을 나열하세요.')),
+    ItemRule('ingredients', (('contains', '성분'), ('fewer_words', 3)),
+             _issue('표기 불충분', 'major', '성분 정보가 불충분하게 표기되었습니다.',
+                    '{country} 규정에 따라 모든 성분을 함량 순으로 표기해야 합니다.', '성분표', '{content}',
+                    '성분: [원료명1], [원료명2], [원료명3]...', '수정', '성분: 밀가루, 소금, 설탕, 향신료',
+                    '모든 성분을 함량 순으로 나열하고 구체적인 원료명을 사용하세요.')),
+    ItemRule('labeling', (('equals', 'language', '중국어 필수'), ('lacks_chars', '中文')),
+             _issue('언어 오류', 'major', '라벨이 {language}로 표기되지 않았습니다.',
+                    '{country} 규정에 따라 라벨은 {language}로 표기해야 합니다.', '라벨', '{content}',
+                    '{language} 표기', '수정', '{content} (중국어 번역 추가)',
+                    '모든 라벨 정보를 {language}로 번역하여 표기하세요.', ['번역문서'], ['번역 검증'])),
+)
+
+CATEGORY_WEIGHTS = {rule.key: rule.weight for rule in CATEGORY_RULES}
+
+
+@dataclass(frozen=True)
+class DocumentRule:
+    """구조화 문서(라벨, 영양성분표 등) 하나의 규제 항목 점검 규칙
+
+    kind 가 'required' 이면 문서 전체 텍스트에 항목이 없을 때,
+    'prohibited' 이면 문서의 ingredients 항목에 금지 항목이 있을 때 위반이다.
+    """
+    terms_field: str
+    kind: str
+    violation_type: str
+    severity: str
+    label: str
+    description: str
+
+
+DOCUMENT_RULES = {
+    '라벨': DocumentRule('라벨필수요소', 'required', 'label_missing', 'critical', '라벨',
+                       '라벨에 {term}이(가) 누락되었습니다.'),
+    '영양성분표': DocumentRule('영양성분필수', 'required', 'nutrition_missing', 'major', '영양성분표',
+                          '영양성분표에 {term}이(가) 누락되었습니다.'),
+    '원료리스트': DocumentRule('금지성분', 'prohibited', 'prohibited_ingredient', 'critical', '원료리스트',
+                          '금지된 성분 {term}이(가) 포함되어 있습니다.'),
+    '위생증명서': DocumentRule('필수인증', 'required', 'certification_missing', 'critical', '위생증명서',
+                          '위생증명서에 {term}이(가) 누락되었습니다.'),
+    '원산지증명서': DocumentRule('원산지필수', 'required', 'origin_info_missing', 'major', '원산지증명서',
+                           '원산지증명서에 {term}이(가) 누락되었습니다.')
+}
+
+
+class _Context(dict):
+    """없는 템플릿 변수는 빈 문자열"""
+
+    def __missing__(self, key):
+        return ''
+
+
+def _fill(template: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: list(value) if isinstance(value, tuple) else value.format_map(context)
+            for key, value in template.items()}
+
+
+class TermIndex:
+    """용어 목록 -> 텍스트 한 번 훑어 포함된 용어 번호 집합 (부분 문자열 포함, 대소문자 구분)"""
+
+    def __init__(self, terms: List[str]):
+        self.terms: List[str] = []
+        self._positions: Dict[str, int] = {}
+        for term in terms:
+            self.add(term)
+        self._extractor: Optional[FieldExtractor] = None
+
+    def add(self, term: str) -> int:
+        if term not in self._positions:
+            self._positions[term] = len(self.terms)
+            self.terms.append(term)
+            self._extractor = None
+        return self._positions[term]
+
+    def position(self, term: str) -> int:
+        return self._positions[term]
+
+    def find(self, text: str) -> Set[int]:
+        if not text or not self.terms:
+            return set()
+        if self._extractor is None:
+            self._extractor = FieldExtractor({str(i): [re.escape(term)] for i, term in enumerate(self.terms)}, flags=0)
+        return {int(key) for key in self._extractor.extract_all(text)}
+
+
+# 표의 셀 경계 (셀에 걸친 용어가 매치되지 않도록 셀마다 따로 검사한 것과 같은 결과)
+_CELL_SEPARATOR = '\x00'
+
+
+@dataclass
+class _CompiledCategory:
+    rule: CategoryRule
+    regulations: Dict[str, Any]
+    terms: List[str]
+    term_ids: List[int]
+    context: Dict[str, Any]
+
+
+@dataclass
+class _CompiledItemRule:
+    category: int
+    contains: Tuple[int, ...] = ()
+    lacks: Tuple[int, ...] = ()
+    any_term: Optional[bool] = None
+    fewer_words: Optional[int] = None
+    issue: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class RuleEvaluation:
+    """한 번의 평가 결과"""
+    detailed_checks: Dict[str, Dict[str, Any]]
+    detailed_issues: List[Dict[str, Any]]
+
+    @property
+    def overall_score(self) -> float:
+        return calculate_weighted_score(self.detailed_checks)
+
+
+class CompiledRuleSet:
+    """(국가, 제품) 규제 정보로 컴파일한 술어 표
+
+    섹션마다 모든 카테고리의 규제 항목과 항목 규칙의 문자열 조건을 하나의 용어 색인으로 합친다.
+    평가 시 섹션의 항목마다 색인을 한 번만 검색하고, 카테고리 점수/이슈는 용어 번호 집합으로 판정한다.
+    """
+
+    def __init__(self, country: str, regulations: Dict[str, Any]):
+        self.country = country
+        self.source = freeze(regulations)
+        self.sections: Dict[str, TermIndex] = {}
+        self.categories: List[_CompiledCategory] = []
+        self.item_rules: Dict[str, List[_CompiledItemRule]] = {}
+
+        for rule in CATEGORY_RULES:
+            regs = self.source.get(rule.key, {})
+            terms = list(regs.get(rule.terms_field, []))
+            index = self.sections.setdefault(rule.section, TermIndex([]))
+            context = _Context({key: value for key, value in regs.items() if not isinstance(value, (list, dict))})
+            context.update(country=country, examples=', '.join(terms[:3]))
+            self.categories.append(_CompiledCategory(rule, regs, terms, [index.add(term) for term in terms], context))
+
+        positions = {category.rule.key: i for i, category in enumerate(self.categories)}
+        for item_rule in ITEM_RULES:
+            compiled = self._compile_item_rule(item_rule, positions[item_rule.category])
+            if compiled is not None:
+                section = self.categories[compiled.category].rule.section
+                self.item_rules.setdefault(section, []).append(compiled)
+
+        self.documents: Dict[str, Tuple[DocumentRule, List[str], TermIndex]] = {}
+        for doc_type, doc_rule in DOCUMENT_RULES.items():
+            terms = list(self.source.get(doc_rule.terms_field, []))
+            self.documents[doc_type] = (doc_rule, terms, TermIndex(terms))
+
+    def _compile_item_rule(self, item_rule: ItemRule, position: int) -> Optional[_CompiledItemRule]:
+        """규제 값 조건은 여기서 판정하고(불만족이면 규칙 제외), 문자열 조건은 섹션 색인의 용어 번호로 바꿈"""
+        category = self.categories[position]
+        index = self.sections[category.rule.section]
+        compiled = _CompiledItemRule(category=position, issue=item_rule.issue)
+        contains, lacks = [], []
+        for condition in item_rule.when:
+            kind = condition[0]
+            if kind == 'set':
+                if not category.regulations.get(condition[1]):
+                    return None
+            elif kind == 'equals':
+                if category.regulations.get(condition[1], '') != condition[2]:
+                    return None
+            elif kind == 'contains':
+                contains.append(index.add(condition[1].format_map(category.context)))
+            elif kind == 'lacks':
+                lacks.append(index.add(condition[1].format_map(category.context)))
+            elif kind == 'lacks_chars':
+                lacks.extend(index.add(char) for char in condition[1])
+            elif kind == 'any_term':
+                compiled.any_term = condition[1]
+            elif kind == 'fewer_words':
+                compiled.fewer_words = condition[1]
+            else:
+                raise ValueError(f"알 수 없는 규칙 조건: {condition}")
+        compiled.contains, compiled.lacks = tuple(contains), tuple(lacks)
+        return compiled
+
+    def evaluate(self, extracted_data: Dict[str, Any]) -> RuleEvaluation:
+        """extracted_data({'영양성분': [{'type': 'text'|'table', 'content': ...}], ...}) 평가"""
+        found: Dict[str, Set[int]] = {}
+        texts: Dict[str, List[Tuple[str, Set[int]]]] = {}
+        for section, index in self.sections.items():
+            section_found: Set[int] = set()
+            section_texts = []
+            for item in extracted_data.get(section, []) or []:
+                if item.get('type') == 'text':
+                    content = item.get('content', '')
+                    content = content if isinstance(content, str) else str(content)
+                    item_found = index.find(content)
+                    section_texts.append((content, item_found))
+                    section_found |= item_found
+                elif item.get('type') == 'table':
+                    for row in item.get('content', []) or []:
+                        section_found |= index.find(_CELL_SEPARATOR.join(str(cell) for cell in row))
+            found[section], texts[section] = section_found, section_texts
+
+        detailed_checks = {}
+        issues_by_category: List[List[Dict[str, Any]]] = []
+        for category in self.categories:
+            section = category.rule.section
+            detailed_checks[category.rule.key] = self._category_result(category, found[section])
+            issues_by_category.append(self._term_issues(category, found[section], texts[section]))
+
+        for section, rules in self.item_rules.items():
+            for item_rule in rules:
+                category = self.categories[item_rule.category]
+                term_ids = set(category.term_ids)
+                for content, item_found in texts[section]:
+                    if not self._matches(item_rule, content, item_found, term_ids):
+                        continue
+                    unit = category.context['unit']
+                    context = _Context(category.context, content=content,
+                                       content_with_unit=content.replace('g', unit) if 'g' in content else f'{content} {unit}')
+                    issues_by_category[item_rule.category].append(
+                        {'category': category.rule.name, **_fill(item_rule.issue, context)})
+
+        return RuleEvaluation(detailed_checks, [issue for issues in issues_by_category for issue in issues])
+
+    @staticmethod
+    def _matches(item_rule: _CompiledItemRule, content: str, item_found: Set[int], term_ids: Set[int]) -> bool:
+        if any(term not in item_found for term in item_rule.contains):
+            return False
+        if any(term in item_found for term in item_rule.lacks):
+            return False
+        if item_rule.any_term is not None and bool(term_ids & item_found) != item_rule.any_term:
+            return False
+        if item_rule.fewer_words is not None and len(content.split()) >= item_rule.fewer_words:
+            return False
+        return True
+
+    @staticmethod
+    def _category_result(category: _CompiledCategory, section_found: Set[int]) -> Dict[str, Any]:
+        """app.check_*_regulations 와 같은 형식의 카테고리 점검 결과"""
+        rule, terms = category.rule, category.terms
+        hits = [term for term, term_id in zip(terms, category.term_ids) if term_id in section_found]
+        misses = [term for term, term_id in zip(terms, category.term_ids) if term_id not in section_found]
+        results = {'status': '미준수', 'score': 0, 'issues': [], 'details': {}}
+
+        if rule.kind == 'restricted':
+            if terms:
+                violation_rate = len(hits) / len(terms)
+                results['score'] = (1 - violation_rate) * 100
+                if violation_rate == 0:
+                    results['status'] = '준수'
+                elif violation_rate <= 0.3:
+                    results['status'] = '부분 준수'
+            if hits:
+                results['issues'].append(f"{rule.summary}: {', '.join(hits)}")
+            results['details'] = {'restricted': terms, 'found': hits,
+                                  'max_levels': category.regulations.get('max_levels', {})}
+        else:
+            if terms:
+                compliance_rate = len(hits) / len(terms)
+                results['score'] = compliance_rate * 100
+                if compliance_rate >= 0.9:
+                    results['status'] = '준수'
+                elif compliance_rate >= 0.7:
+                    results['status'] = '부분 준수'
+            if misses:
+                results['issues'].append(f"{rule.summary}: {', '.join(misses)}")
+            results['details'] = {'required': terms, 'found': hits, 'missing': misses}
+
+        results['details'].update(regulation=category.regulations.get('regulation', ''),
+                                  year=category.regulations.get('year', ''))
+        return results
+
+    @staticmethod
+    def _term_issues(category: _CompiledCategory, section_found: Set[int],
+                     section_texts: List[Tuple[str, Set[int]]]) -> List[Dict[str, Any]]:
+        """누락된 필수 항목마다, 또는 제한 항목이 발견된 텍스트마다 이슈"""
+        rule, issues = category.rule, []
+        max_levels = category.regulations.get('max_levels', {})
+        for term, term_id in zip(category.terms, category.term_ids):
+            if rule.kind == 'restricted':
+                for content, item_found in section_texts:
+                    if term_id in item_found:
+                        context = _Context(category.context, term=term, content=content,
+                                           max_level=max_levels.get(term, ''))
+                        issues.append({'category': rule.name, **_fill(rule.term_issue, context)})
+            elif term_id not in section_found:
+                context = _Context(category.context, term=term)
+                issues.append({'category': rule.name, **_fill(rule.term_issue, context)})
+        return issues
+
+    def evaluate_documents(self, structured_data: Dict[str, Any]) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """구조화 문서별 규제 점검 -> (누락 요구사항 목록, 위반 목록)"""
+        missing_requirements, violations = [], []
+        for doc_type, data in structured_data.items():
+            if doc_type not in self.documents:
+                continue
+            doc_rule, terms, index = self.documents[doc_type]
+            if not terms:
+                continue
+            if doc_rule.kind == 'prohibited':
+                for ingredient in data.get('ingredients', []):
+                    ingredient_found = index.find(str(ingredient))
+                    for term in terms:
+                        if index.position(term) in ingredient_found:
+                            violations.append(self._violation(doc_rule, term))
+                continue
+            document_found = index.find(str(data))
+            for term in terms:
+                if index.position(term) not in document_found:
+                    missing_requirements.append(f"{doc_rule.label}: {term} 누락")
+                    violations.append(self._violation(doc_rule, term))
+        return missing_requirements, violations
+
+    @staticmethod
+    def _violation(doc_rule: DocumentRule, term: str) -> Dict[str, Any]:
+        return {'type': doc_rule.violation_type, 'element': term, 'severity': doc_rule.severity,
+                'description': doc_rule.description.format(term=term)}
+
+
+def calculate_weighted_score(detailed_checks: Dict[str, Dict[str, Any]]) -> float:
+    """카테고리 가중 평균 점수 (CATEGORY_RULES 의 weight)"""
+    total_score = 0
+    total_weight = 0
+    for category, weight in CATEGORY_WEIGHTS.items():
+        if category in detailed_checks:
+            total_score += detailed_checks[category].get('score', 0) * weight
+            total_weight += weight
+    if total_weight > 0:
+        return total_score / total_weight
+    return 0
+
+
+_compiled_cache: Dict[Tuple[str, str], CompiledRuleSet] = {}
+_compiled_cache_lock = threading.Lock()
+
+
+def get_compiled_rules(country: str, product_type: str, regulations: Dict[str, Any]) -> CompiledRuleSet:
+    """(국가, 제품) 규칙은 한 번만 컴파일해 공유
+
+    규제 스냅샷 객체가 같으면 바로 재사용하고, 새 스냅샷이 발행돼 내용이 바뀌었으면 다시 컴파일한다.
+    """
+    key = (country, product_type)
+    with _compiled_cache_lock:
+        compiled = _compiled_cache.get(key)
+        if compiled is None or (compiled.source is not regulations and compiled.source != regulations):
+            compiled = CompiledRuleSet(country, regulations)
+            _compiled_cache[key] = compiled
+        return compiled
+
+
+def evaluate_compliance_rules(extracted_data: Dict[str, Any], country: str, product_type: str,
+                              regulations: Dict[str, Any]) -> RuleEvaluation:
+    """모든 카테고리를 추출 데이터 한 번 훑어 평가"""
+    return get_compiled_rules(country, product_type, regulations).evaluate(extracted_data)
@@ -5,6 +5,8 @@ import pandas as pd
 import json
 from datetime import datetime
 
+from utils.regulation_snapshot import regulation_snapshots
+
 # 상세한 국가별 규제 데이터
 DETAILED_REGULATIONS = {
     "중국": {
@@ -319,17 +321,16 @@ DETAILED_REGULATIONS = {
     }
 }
 
+regulation_snapshots.register('detailed_regulations', lambda: DETAILED_REGULATIONS, levels=('country', 'product', 'category'))
+
 def get_detailed_regulations(country, product):
     """상세한 국가별 규제정보 조회"""
-    if country in DETAILED_REGULATIONS:
-        if product in DETAILED_REGULATIONS[country]:
-            return DETAILED_REGULATIONS[country][product]
-    return None
+    return regulation_snapshots.get('detailed_regulations', country, product)
 
 def search_detailed_regulations(keyword):
     """키워드로 상세 규제정보 검색"""
     results = []
-    for country, products in DETAILED_REGULATIONS.items():
+    for country, products in regulation_snapshots.source('detailed_regulations').items():
         for product, regulations in products.items():
             if keyword in product or any(keyword in str(reg) for reg in regulations.values()):
                 results.append({
@@ -341,12 +342,12 @@ def search_detailed_regulations(keyword):
 
 def get_all_countries():
     """모든 수출대상국 목록 반환"""
-    return list(DETAILED_REGULATIONS.keys())
+    return list(regulation_snapshots.source('detailed_regulations').keys())
 
 def get_all_products():
     """모든 제품 카테고리 목록 반환"""
     products = set()
-    for country_data in DETAILED_REGULATIONS.values():
+    for country_data in regulation_snapshots.source('detailed_regulations').values():
         products.update(country_data.keys())
     return list(products)
 
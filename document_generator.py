@@ -6,6 +6,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import os
 
+from utils.regulation_snapshot import regulation_snapshots
+
 # PyMuPDF 선택적 import
 try:
     import fitz
@@ -18,11 +20,21 @@ class DocumentGenerator:
     """규제 정보 기반 자동 서류 생성 시스템"""
     
     def __init__(self):
-        self.templates = self._load_templates()
-        self.regulations = self._load_regulations()
+        self._load_regulations()
+    
+    @property
+    def templates(self) -> Dict:
+        """서류 템플릿 (규제 스냅샷 'document_templates', 읽기 전용)"""
+        return regulation_snapshots.source('document_templates')
     
-    def _load_templates(self) -> Dict:
-        """서류 템플릿 로딩"""
+    @property
+    def regulations(self) -> Dict:
+        """국가/제품별 상세 규제 정보 (규제 스냅샷 'detailed_regulations', 읽기 전용)"""
+        return regulation_snapshots.source('detailed_regulations')
+    
+    @staticmethod
+    def _load_templates() -> Dict:
+        """서류 템플릿 원본 (스냅샷 로더)"""
         return {
             # === 기본 필수 서류 (모든 국가 공통) ===
             "상업송장": {
@@ -680,10 +692,10 @@ EORI 번호: {eori_number}
         }
     
     def _load_regulations(self) -> Dict:
-        """규제 정보 로딩"""
+        """규제 정보 로딩 (detailed_regulations 모듈이 스냅샷 소스를 등록)"""
         try:
-            from detailed_regulations import DETAILED_REGULATIONS
-            return DETAILED_REGULATIONS
+            import detailed_regulations
+            return self.regulations
         except ImportError:
             print("⚠️ 상세 규제정보를 찾을 수 없습니다.")
             return {}
@@ -1295,6 +1307,8 @@ EORI 번호: {eori_number}
         
         return checklist
 
+regulation_snapshots.register('document_templates', DocumentGenerator._load_templates, levels=('category',))
+
 def main():
     """서류 생성 시스템 테스트"""
     generator = DocumentGenerator()
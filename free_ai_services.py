@@ -17,6 +17,19 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime
 import time
 
+from utils.field_extraction import NUTRITION_TEXT_PATTERNS, get_field_extractor
+
+# 규칙 기반 분석 결과 필드: (추출 패턴 필드, 표시 단위)
+RULE_BASED_NUTRIENTS = {
+    'calories': ('calories', ' kcal'),
+    'protein': ('protein', 'g'),
+    'fat': ('fat', 'g'),
+    'carbohydrates': ('carbs', 'g'),
+    'sodium': ('sodium', 'mg'),
+    'sugar': ('sugar', 'g'),
+    'fiber': ('fiber', 'g')
+}
+
 class FreeAIServices:
     """완전 무료 AI 서비스 시스템"""
     
@@ -132,11 +145,12 @@ class FreeAIServices:
             model_name = "microsoft/DialoGPT-medium"
             
             # 간단한 규칙 기반 분석
-            nutrition_data = self._rule_based_nutrition_extraction(text)
+            nutrition_data, field_spans = self._rule_based_nutrition_extraction(text)
             
             return {
                 'success': True,
                 'nutrition_data': nutrition_data,
+                'field_spans': field_spans,
                 'raw_text': text,
                 'source': '무료 규칙 기반 분석'
             }
@@ -145,8 +159,8 @@ class FreeAIServices:
             print(f"❌ 무료 영양 분석 실패: {e}")
             return self._fallback_nutrition_analysis()
     
-    def _rule_based_nutrition_extraction(self, text: str) -> Dict[str, Any]:
-        """규칙 기반 영양 정보 추출"""
+    def _rule_based_nutrition_extraction(self, text: str):
+        """규칙 기반 영양 정보 추출, (영양 정보, {필드: [start, end]}) 반환"""
         text_lower = text.lower()
         
         # 기본 영양 정보 추출
@@ -161,31 +175,14 @@ class FreeAIServices:
             'ingredients': [],
             'allergens': []
         }
+        field_spans = {}
         
-        # 칼로리 추출
-        if 'kcal' in text_lower or 'calories' in text_lower:
-            import re
-            calorie_match = re.search(r'(\d+)\s*(kcal|calories?)', text_lower)
-            if calorie_match:
-                nutrition_data['calories'] = f"{calorie_match.group(1)} kcal"
-        
-        # 단백질 추출
-        if 'protein' in text_lower or '단백질' in text:
-            protein_match = re.search(r'(\d+(?:\.\d+)?)\s*(g|g단백질)', text_lower)
-            if protein_match:
-                nutrition_data['protein'] = f"{protein_match.group(1)}g"
-        
-        # 지방 추출
-        if 'fat' in text_lower or '지방' in text:
-            fat_match = re.search(r'(\d+(?:\.\d+)?)\s*(g|g지방)', text_lower)
-            if fat_match:
-                nutrition_data['fat'] = f"{fat_match.group(1)}g"
-        
-        # 탄수화물 추출
-        if 'carbohydrate' in text_lower or '탄수화물' in text:
-            carb_match = re.search(r'(\d+(?:\.\d+)?)\s*(g|g탄수화물)', text_lower)
-            if carb_match:
-                nutrition_data['carbohydrates'] = f"{carb_match.group(1)}g"
+        # 영양성분 수치 추출 (공용 필드 추출기, 한 번에 모든 영양소)
+        matches = get_field_extractor(NUTRITION_TEXT_PATTERNS).extract(text)
+        for key, (field, unit) in RULE_BASED_NUTRIENTS.items():
+            if field in matches:
+                nutrition_data[key] = f"{matches[field].value}{unit}"
+                field_spans[key] = [matches[field].start, matches[field].end]
         
         # 성분 추출
         if '성분' in text or 'ingredient' in text_lower:
@@ -201,7 +198,7 @@ class FreeAIServices:
                 if any(keyword in line.lower() for keyword in ['알레르기', 'allergen', '주의']):
                     nutrition_data['allergens'].append(line.strip())
         
-        return nutrition_data
+        return nutrition_data, field_spans
     
     def _fallback_ocr(self, image_path: str) -> Dict[str, Any]:
         """폴백 OCR (기본 텍스트 추출)"""
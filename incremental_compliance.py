@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+증분 준수성 재검토
+- 입력 섹션(문서별 내용, 회사/제품 정보)마다 지문(내용 해시)을 계산
+- 문서별 OCR/구조화 결과는 파일 내용 지문으로 보관 → 바뀌지 않은 문서는 OCR 생략
+- 규칙별 결과는 그 규칙이 읽는 입력(발견 키워드, 국가)으로 보관 → 입력이 바뀐 규칙만 다시 평가
+- 필드 하나만 고쳐 다시 검토할 때 전체 파이프라인 대신 바뀐 부분만 계산
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from utils.ocr_result_cache import hash_file, json_default
+from utils.regulation_snapshot import freeze
+
+# 규칙 정의 (analyze_optimized_compliance_issues 의 검사 항목과 배점)
+REQUIRED_DOCUMENTS = ("상업송장", "포장명세서", "원산지증명서")
+
+# 국가: (현지어 표기, 영문 표기, 누락 시 이슈)
+LANGUAGE_REQUIREMENTS = {
+    "중국": ("중국어", "chinese", "중국어 라벨 표기 필수"),
+    "미국": ("영어", "english", "영어 라벨 표기 필수"),
+    "한국": ("한국어", "korean", "한국어 라벨 표기 필수")
+}
+
+PRODUCT_INFO_FIELDS = ("제품명", "성분", "유통기한", "중량")
+
+KEYWORD_GROUPS = {
+    'nutrition': ("영양", "nutrition", "열량", "calorie", "단백질", "protein"),
+    'allergy': ("알레르기", "allergy", "알레르겐", "allergen"),
+    'manufacturer': ("제조사", "manufacturer", "생산자", "producer")
+}
+
+COUNTRY_SUGGESTIONS = {
+    "중국": ["🇨🇳 중국 특별 요건:", "   • GB 7718-2011 표준 준수", "   • 8대 알레르기 정보 필수",
+            "   • 식품안전인증서 필요"],
+    "미국": ["🇺🇸 미국 특별 요건:", "   • FDA 규정 준수", "   • 영양성분표 필수", "   • 알레르기 정보 표시"]
+}
+
+
+def fingerprint(value: Any) -> str:
+    """입력 섹션 지문 (키 순서와 무관한 정규화 JSON 의 해시)"""
+    payload = json.dumps(value, ensure_ascii=False, sort_keys=True, default=json_default)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def file_fingerprint(path: str, document_type: str) -> Optional[str]:
+    """업로드 문서 지문 (파일 내용 + 문서 유형, 읽을 수 없으면 None)"""
+    try:
+        return fingerprint([hash_file(path), document_type])
+    except OSError:
+        return None
+
+
+def scan_section(data: Any) -> FrozenSet[str]:
+    """섹션 하나에서 규칙들이 찾는 키워드를 한 번에 수집 (str(data) 한 번만 계산)"""
+    text = str(data)
+    lowered = text.lower()
+    found = {f"doc:{doc}" for doc in REQUIRED_DOCUMENTS if doc.lower() in lowered}
+    found.update(f"lang:{country}" for country, (native, english, _) in LANGUAGE_REQUIREMENTS.items()
+                 if native in text or english in lowered)
+    found.update(f"info:{info}" for info in PRODUCT_INFO_FIELDS if info in text)
+    found.update(group for group, keywords in KEYWORD_GROUPS.items()
+                 if any(keyword in text for keyword in keywords))
+    return frozenset(found)
+
+
+@dataclass(frozen=True)
+class RuleOutcome:
+    """규칙 하나의 평가 결과 (점수 차감, 심각도별 이슈, analysis_details 항목)"""
+    deduction: int = 0
+    critical: Tuple[str, ...] = ()
+    major: Tuple[str, ...] = ()
+    minor: Tuple[str, ...] = ()
+    details: Tuple[Tuple[str, Any], ...] = ()
+
+
+def _required_documents(found: FrozenSet[str], country: str) -> RuleOutcome:
+    missing = [doc for doc in REQUIRED_DOCUMENTS if f"doc:{doc}" not in found]
+    return RuleOutcome(deduction=min(len(missing) * 5, 15),
+                       critical=tuple(f"필수 서류 누락: {doc}" for doc in missing),
+                       details=(('missing_documents', tuple(missing)),))
+
+
+def _language(found: FrozenSet[str], country: str) -> RuleOutcome:
+    if country not in LANGUAGE_REQUIREMENTS or f"lang:{country}" in found:
+        return RuleOutcome()
+    return RuleOutcome(deduction=20, critical=(LANGUAGE_REQUIREMENTS[country][2],))
+
+
+def _product_info(found: FrozenSet[str], country: str) -> RuleOutcome:
+    missing = [info for info in PRODUCT_INFO_FIELDS if f"info:{info}" not in found]
+    return RuleOutcome(deduction=min(len(missing) * 3, 15),
+                       major=tuple(f"제품 정보 누락: {info}" for info in missing),
+                       details=(('missing_product_info', tuple(missing)),))
+
+
+def _keyword_rule(group: str, deduction: int, severity: str, issue: str, detail: str):
+    def evaluate(found: FrozenSet[str], country: str) -> RuleOutcome:
+        present = group in found
+        return RuleOutcome(deduction=0 if present else deduction,
+                           **({} if present else {severity: (issue,)}),
+                           details=((detail, present),))
+    return evaluate
+
+
+@dataclass(frozen=True)
+class ComplianceRule:
+    """증분 평가 단위 규칙 (tokens: 규칙이 읽는 키워드, by_country: 국가에 따라 결과가 달라지는지)"""
+    key: str
+    tokens: FrozenSet[str]
+    evaluate: Callable[[FrozenSet[str], str], RuleOutcome]
+    by_country: bool = False
+
+
+# 이슈 목록 순서를 유지하도록 기존 검사 순서대로 나열
+COMPLIANCE_RULES = (
+    ComplianceRule('required_documents', frozenset(f"doc:{doc}" for doc in REQUIRED_DOCUMENTS),
+                   _required_documents),
+    ComplianceRule('language', frozenset(f"lang:{country}" for country in LANGUAGE_REQUIREMENTS),
+                   _language, by_country=True),
+    ComplianceRule('product_info', frozenset(f"info:{info}" for info in PRODUCT_INFO_FIELDS), _product_info),
+    ComplianceRule('nutrition', frozenset(['nutrition']),
+                   _keyword_rule('nutrition', 10, 'major', "영양성분 정보 표시 필요", 'has_nutrition_info')),
+    ComplianceRule('allergy', frozenset(['allergy']),
+                   _keyword_rule('allergy', 5, 'minor', "알레르기 정보 표시 권장", 'has_allergy_info')),
+    ComplianceRule('manufacturer', frozenset(['manufacturer']),
+                   _keyword_rule('manufacturer', 5, 'major', "제조사 정보 표시 필요", 'has_manufacturer_info'))
+)
+
+
+def compose_analysis(outcomes: Iterable[RuleOutcome], section_count: int, country: str,
+                     product_type: str) -> Dict:
+    """규칙 결과를 모아 점수/상태/개선 제안 계산 (analyze_optimized_compliance_issues 응답 형식)"""
+    base_score = 100
+    critical_issues, major_issues, minor_issues = [], [], []
+    details = {}
+    for outcome in outcomes:
+        base_score -= outcome.deduction
+        critical_issues.extend(outcome.critical)
+        major_issues.extend(outcome.major)
+        minor_issues.extend(outcome.minor)
+        details.update((key, list(value) if isinstance(value, tuple) else value)
+                       for key, value in outcome.details)
+
+    final_score = max(0, min(100, base_score))
+
+    # 데이터 품질에 따른 보정 (빈 데이터는 추가 차감, 문서가 많을수록 보너스)
+    data_quality_bonus = 0
+    if section_count == 0:
+        final_score = max(0, final_score - 10)
+    elif section_count == 1:
+        data_quality_bonus = 5
+    elif section_count >= 3:
+        data_quality_bonus = 10
+    final_score = max(0, min(100, final_score + data_quality_bonus))
+
+    if final_score >= 90:
+        compliance_status = "준수"
+    elif final_score >= 70:
+        compliance_status = "부분 준수"
+    elif final_score >= 50:
+        compliance_status = "미준수 (개선 가능)"
+    else:
+        compliance_status = "심각한 미준수"
+
+    suggestions = []
+    if critical_issues:
+        suggestions.append("🚨 긴급 개선사항:")
+        suggestions.extend(f"   • {issue}" for issue in critical_issues[:3])
+    if major_issues:
+        suggestions.append("⚠️ 주요 개선사항:")
+        suggestions.extend(f"   • {issue}" for issue in major_issues[:3])
+    if minor_issues:
+        suggestions.append("💡 권장 개선사항:")
+        suggestions.extend(f"   • {issue}" for issue in minor_issues[:2])
+    suggestions.extend(COUNTRY_SUGGESTIONS.get(country, []))
+
+    return {
+        'overall_score': final_score,
+        'compliance_status': compliance_status,
+        'critical_issues': critical_issues,
+        'major_issues': major_issues,
+        'minor_issues': minor_issues,
+        'suggestions': suggestions,
+        'analysis_details': {
+            'country': country,
+            'product_type': product_type,
+            'missing_documents': details['missing_documents'],
+            'missing_product_info': details['missing_product_info'],
+            'has_nutrition_info': details['has_nutrition_info'],
+            'has_allergy_info': details['has_allergy_info'],
+            'has_manufacturer_info': details['has_manufacturer_info']
+        }
+    }
+
+
+class _LRUCache:
+    """항목 수 제한 메모리 LRU (스레드 안전)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._items: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+@dataclass(frozen=True)
+class DocumentAnalysis:
+    """문서 하나의 OCR/구조화 결과 (fingerprint 는 재사용 가능한 결과일 때만 설정)"""
+    fingerprint: Optional[str]
+    ocr_result: Dict
+    structured_data: Any
+    reused: bool = False
+
+
+@dataclass
+class IncrementalEvaluation:
+    """증분 평가 결과와 이번에 다시 평가/재사용한 규칙"""
+    analysis: Dict
+    evaluated_rules: List[str] = field(default_factory=list)
+    reused_rules: List[str] = field(default_factory=list)
+
+
+class IncrementalComplianceAnalyzer:
+    """섹션 지문 기반 증분 준수성 분석기
+
+    모든 캐시는 내용 주소 기반이라 세션 식별자가 필요 없다. 같은 파일을 다시 올리거나
+    다른 필드만 고친 요청은 이전 결과를 그대로 쓰고, 바뀐 섹션과 그 섹션을 읽는 규칙만 계산한다.
+    """
+
+    def __init__(self, max_documents: int = 256, max_entries: int = 4096):
+        """
+        Args:
+            max_documents: 보관할 문서별 OCR/구조화 결과 수
+            max_entries: 보관할 섹션 키워드/규칙 결과/단계 결과 수
+        """
+        self._documents = _LRUCache(max_documents)
+        self._sections = _LRUCache(max_entries)
+        self._outcomes = _LRUCache(max_entries)
+        self._stages = _LRUCache(max_entries)
+        self._stats_lock = threading.Lock()
+        self.stats = {'documents_reused': 0, 'documents_analyzed': 0, 'sections_reused': 0,
+                      'sections_scanned': 0, 'rules_reused': 0, 'rules_evaluated': 0,
+                      'stages_reused': 0, 'stages_computed': 0}
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def analyze_documents(self, documents: List[Tuple[str, str, str]],
+                          ocr_batch: Callable[[List[Tuple[str, str, str]]], Dict[str, Dict]],
+                          structure: Callable[[Dict, str], Any]) -> Dict[str, DocumentAnalysis]:
+        """[(문서 키, 파일 경로, 문서 유형)] 중 내용이 바뀐 문서만 OCR/구조화
+
+        Args:
+            ocr_batch: 남은 문서를 한 번에 OCR 하는 함수 ({문서 키: OCR 결과})
+            structure: OCR 결과와 문서 유형으로 구조화 데이터를 만드는 함수
+        """
+        return dict(self.iter_documents(documents, ocr_batch, structure))
+
+    def iter_documents(self, documents: List[Tuple[str, str, str]],
+                       ocr_batch: Callable[[List[Tuple[str, str, str]]], Dict[str, Dict]],
+                       structure: Callable[[Dict, str], Any]) -> Iterator[Tuple[str, DocumentAnalysis]]:
+        """analyze_documents 와 같지만 (문서 키, 결과) 를 준비되는 대로 생성 (재사용 문서가 먼저)"""
+        pending = []
+        reused = 0
+        for key, path, document_type in documents:
+            document_fingerprint = file_fingerprint(path, document_type)
+            cached = self._documents.get(document_fingerprint) if document_fingerprint else None
+            if cached is not None:
+                reused += 1
+                yield key, DocumentAnalysis(document_fingerprint, cached[0], cached[1], reused=True)
+            else:
+                pending.append((key, path, document_type, document_fingerprint))
+        self._count('documents_reused', reused)
+        if not pending:
+            return
+
+        self._count('documents_analyzed', len(pending))
+        try:
+            ocr_results = ocr_batch([(key, path, document_type) for key, path, document_type, _ in pending])
+        except Exception as e:
+            print(f"⚠️ 일괄 OCR 분석 실패: {e}")
+            ocr_results = {key: {'error': str(e), 'text': '', 'tables': []} for key, _, _, _ in pending}
+
+        for key, _, document_type, document_fingerprint in pending:
+            ocr_result = ocr_results.get(key) or {'error': 'OCR 결과 없음', 'text': '', 'tables': []}
+            try:
+                structured_data = structure(ocr_result, document_type)
+            except Exception as e:
+                print(f"⚠️ {document_type} 분석 실패: {e}")
+                ocr_result, structured_data = {'error': str(e)}, {}
+            # 실패한 결과는 다음 요청에서 다시 시도하도록 보관하지 않음
+            if document_fingerprint is None or 'error' in ocr_result:
+                yield key, DocumentAnalysis(None, ocr_result, structured_data)
+                continue
+            ocr_result, structured_data = freeze(ocr_result), freeze(structured_data)
+            self._documents.set(document_fingerprint, (ocr_result, structured_data))
+            yield key, DocumentAnalysis(document_fingerprint, ocr_result, structured_data)
+
+    def evaluate(self, structured_data: Dict[str, Any], country: str, product_type: str,
+                 fingerprints: Optional[Dict[str, str]] = None) -> IncrementalEvaluation:
+        """구조화 데이터 준수성 평가 (바뀐 섹션만 다시 훑고, 입력이 바뀐 규칙만 다시 평가)
+
+        Args:
+            fingerprints: {섹션 이름: 지문}. 문서 지문처럼 미리 아는 지문이 있으면 넘겨
+                섹션 내용을 다시 직렬화하지 않는다. 없는 섹션은 내용으로 지문을 계산한다.
+        """
+        fingerprints = fingerprints or {}
+        found = set()
+        for name, data in structured_data.items():
+            section_key = fingerprints.get(name) or fingerprint(data)
+            keywords = self._sections.get(section_key)
+            if keywords is None:
+                keywords = scan_section(data)
+                self._sections.set(section_key, keywords)
+                self._count('sections_scanned')
+            else:
+                self._count('sections_reused')
+            found |= keywords
+
+        evaluation = IncrementalEvaluation(analysis={})
+        outcomes = []
+        for rule in COMPLIANCE_RULES:
+            rule_key = (rule.key, country if rule.by_country else None, frozenset(found & rule.tokens))
+            outcome = self._outcomes.get(rule_key)
+            if outcome is None:
+                outcome = rule.evaluate(rule_key[2], country)
+                self._outcomes.set(rule_key, outcome)
+                evaluation.evaluated_rules.append(rule.key)
+            else:
+                evaluation.reused_rules.append(rule.key)
+            outcomes.append(outcome)
+        self._count('rules_evaluated', len(evaluation.evaluated_rules))
+        self._count('rules_reused', len(evaluation.reused_rules))
+
+        evaluation.analysis = compose_analysis(outcomes, len(structured_data), country, product_type)
+        return evaluation
+
+    def memoize(self, stage: str, key: Optional[Hashable], compute: Callable[[], Any]) -> Tuple[Any, bool]:
+        """입력 지문(key)이 같으면 이전 단계 결과 재사용. key 가 None 이면 항상 계산
+
+        Returns:
+            (결과, 재사용 여부). 결과는 여러 응답이 공유하므로 읽기 전용으로 보관한다.
+        """
+        if key is None:
+            return compute(), False
+        cached = self._stages.get((stage, key))
+        if cached is not None:
+            self._count('stages_reused')
+            return cached, True
+        result = freeze(compute())
+        self._stages.set((stage, key), result)
+        self._count('stages_computed')
+        return result, False
+
+    def clear(self):
+        for cache in (self._documents, self._sections, self._outcomes, self._stages):
+            cache.clear()
+
+    def get_stats(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats.update(cached_documents=len(self._documents), cached_sections=len(self._sections),
+                     cached_rule_outcomes=len(self._outcomes), cached_stages=len(self._stages))
+        return stats
+
+
+# 전역 증분 준수성 분석기
+incremental_compliance = IncrementalComplianceAnalyzer()
+
+
+def get_incremental_compliance() -> IncrementalComplianceAnalyzer:
+    """전역 증분 준수성 분석기 반환"""
+    return incremental_compliance
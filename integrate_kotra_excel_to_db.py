@@ -59,6 +59,11 @@ def integrate_kotra_excel_data():
         print(f"   - 처리된 파일: {len(kotra_files)}개")
         print(f"   - 총 삽입된 레코드: {total_inserted}개")
         
+        # 스냅샷 모드면 웹 워커가 사용할 불변 스냅샷 발행
+        snapshot_path = db.publish_snapshot()
+        if snapshot_path:
+            print(f"📸 스냅샷 발행 완료: {snapshot_path}")
+        
         # 데이터베이스 상태 확인
         status = db.get_database_status()
         print(f"\n📈 데이터베이스 상태:")
@@ -7,6 +7,7 @@
 """
 
 import json
+import os
 import sqlite3
 import logging
 from datetime import datetime
@@ -14,6 +15,7 @@ from dataclasses import dataclass, asdict
 from typing import List, Dict, Optional, Any, Tuple
 from pathlib import Path
 import re
+import time
 import pandas as pd
 from collections import defaultdict
 
@@ -30,6 +32,29 @@ except ImportError:
     AI_PROCESSOR_AVAILABLE = False
     logger.warning("⚠️ AI 자연어 처리기 import 실패 - 기본 규칙 기반 처리 사용")
 
+# 비동기 질의 로그 기록기 import
+try:
+    from utils.query_log_writer import QueryLogWriter
+    QUERY_LOG_WRITER_AVAILABLE = True
+except ImportError:
+    QUERY_LOG_WRITER_AVAILABLE = False
+    logger.warning("⚠️ 비동기 질의 로그 기록기 import 실패 - 동기 로그 저장 사용")
+
+# 답변 캐시 import
+try:
+    from utils.cache_manager import CacheManager
+    ANSWER_CACHE_AVAILABLE = True
+except ImportError:
+    ANSWER_CACHE_AVAILABLE = False
+    logger.warning("⚠️ 캐시 매니저 import 실패 - 답변 캐시 비활성화")
+
+from query_classifier import QueryClassifier
+from trade_db_snapshot import TradeDBSnapshotManager
+
+# 데이터 버전 계산에 사용하는 테이블 (질의 로그 제외)
+DATA_TABLES = ["regulations", "trade_statistics", "market_analysis", "strategy_reports",
+               "kotra_global_trade", "kotra_market_recommendation"]
+
 @dataclass
 class QueryResult:
     """질의 결과"""
@@ -52,10 +77,29 @@ class DataSource:
 class IntegratedTradeDatabase:
     """통합 무역 데이터베이스"""
     
-    def __init__(self, db_path: str = "integrated_trade.db"):
+    def __init__(self, db_path: str = "integrated_trade.db", async_query_log: bool = True,
+                 snapshot_dir: Optional[str] = None):
         self.db_path = db_path
         self.init_database()
         
+        # 스냅샷 모드: db_path 는 스테이징(쓰기) DB, 조회는 발행된 불변 스냅샷 사용
+        snapshot_dir = snapshot_dir or os.environ.get("TRADE_DB_SNAPSHOT_DIR")
+        self.snapshot_manager = None
+        if snapshot_dir:
+            try:
+                self.snapshot_manager = TradeDBSnapshotManager(self.db_path, snapshot_dir)
+                logger.info(f"📸 스냅샷 모드 활성화: {snapshot_dir}")
+            except Exception as e:
+                logger.error(f"❌ 스냅샷 관리자 초기화 실패: {e}")
+        
+        # 질의 로그는 백그라운드에서 배치 저장 (요청 경로의 쓰기 지연 제거)
+        self.query_log_writer = None
+        if async_query_log and QUERY_LOG_WRITER_AVAILABLE:
+            try:
+                self.query_log_writer = QueryLogWriter(self.db_path)
+            except Exception as e:
+                logger.error(f"❌ 비동기 질의 로그 기록기 초기화 실패: {e}")
+        
         # AI 자연어 처리기 초기화
         if AI_PROCESSOR_AVAILABLE:
             try:
@@ -106,6 +150,20 @@ class IntegratedTradeDatabase:
                 r"권장|제안|필요|중요"
             ]
         }
+        
+        # 의도/엔티티 분류기 (질의 패턴을 하나의 정규식으로 컴파일)
+        self.query_classifier = QueryClassifier(
+            self.query_patterns,
+            countries={"중국": ["중국", "china"], "미국": ["미국", "usa"]},
+            products={keyword: [keyword] for keyword in ["라면", "마스크", "전자제품", "의류", "식품", "화학제품"]}
+        )
+        
+        # 답변 캐시: (의도, 엔티티, 데이터 버전) -> 검색 결과 및 답변
+        self.answer_cache = CacheManager(max_size=500) if ANSWER_CACHE_AVAILABLE else None
+        self.answer_cache_ttl = 3600
+        self.data_version_ttl = 5.0
+        self._data_version = None
+        self._data_version_checked_at = 0.0
 
     def init_database(self):
         """데이터베이스 초기화 및 테이블 생성"""
@@ -245,6 +303,7 @@ class IntegratedTradeDatabase:
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_trade_stats_country_hs ON trade_statistics(country, hs_code)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_market_analysis_country_product ON market_analysis(country, product)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_strategy_reports_country_product ON strategy_reports(country, product)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_query_logs_created_at ON query_logs(created_at)')
                 
                 conn.commit()
                 logger.info("✅ 통합 무역 데이터베이스 초기화 완료")
@@ -275,6 +334,7 @@ class IntegratedTradeDatabase:
                 ))
                 
                 conn.commit()
+                self._invalidate_data_version()
                 logger.info(f"✅ 규제 데이터 삽입 완료: {regulation_data.get('title')}")
                 
         except Exception as e:
@@ -305,6 +365,7 @@ class IntegratedTradeDatabase:
                 ))
                 
                 conn.commit()
+                self._invalidate_data_version()
                 logger.info(f"✅ 무역 통계 데이터 삽입 완료: {trade_data.get('country')} {trade_data.get('product')}")
                 
         except Exception as e:
@@ -333,6 +394,7 @@ class IntegratedTradeDatabase:
                 ))
                 
                 conn.commit()
+                self._invalidate_data_version()
                 logger.info(f"✅ 시장 분석 데이터 삽입 완료: {market_data.get('title')}")
                 
         except Exception as e:
@@ -370,6 +432,7 @@ class IntegratedTradeDatabase:
                 ))
                 
                 conn.commit()
+                self._invalidate_data_version()
                 logger.info(f"✅ 전략 보고서 데이터 삽입 완료: {report_data.get('title')}")
                 
         except Exception as e:
@@ -422,6 +485,7 @@ class IntegratedTradeDatabase:
                     inserted_count += 1
                 
                 conn.commit()
+                self._invalidate_data_version()
                 logger.info(f"✅ 글로벌 무역현황 데이터 삽입 완료: {inserted_count}개 레코드")
                 
         except Exception as e:
@@ -459,6 +523,7 @@ class IntegratedTradeDatabase:
                     inserted_count += 1
                 
                 conn.commit()
+                self._invalidate_data_version()
                 logger.info(f"✅ 해외유망시장추천 데이터 삽입 완료: {inserted_count}개 레코드")
                 
         except Exception as e:
@@ -470,58 +535,24 @@ class IntegratedTradeDatabase:
         start_time = datetime.now()
         
         try:
-            # 1. AI 자연어 처리 (가능한 경우)
-            if self.ai_processor:
-                try:
-                    ai_processed = self.ai_processor.process_query(query)
-                    logger.info(f"🤖 AI 처리 결과 - 의도: {ai_processed.intent}, 신뢰도: {ai_processed.confidence:.2f}")
-                    
-                    # AI 처리된 정보 활용
-                    query_type = ai_processed.intent
-                    entities = ai_processed.entities
-                    country = entities.get('country', [''])[0] if entities.get('country') else ''
-                    product = entities.get('product', [''])[0] if entities.get('product') else ''
-                    hs_code = entities.get('hs_code', [''])[0] if entities.get('hs_code') else ''
-                    
-                    # AI가 향상시킨 질의 사용
-                    enhanced_query = ai_processed.processed_query
-                    
-                except Exception as e:
-                    logger.warning(f"AI 처리 실패, 기본 처리 사용: {e}")
-                    query_type = self._analyze_query_type(query)
-                    country, product, hs_code = self._extract_entities(query)
-                    enhanced_query = query
-            else:
-                # 기본 처리
-                query_type = self._analyze_query_type(query)
-                country, product, hs_code = self._extract_entities(query)
-                enhanced_query = query
+            # 1. 질의 분류 (동일 질의는 캐시된 분류 결과 사용)
+            query_type, country, product, hs_code, enhanced_query = self._classify_query(query)
             
-            # 2. 데이터 검색
-            results = self._search_data(query_type, country, product, hs_code, enhanced_query)
+            # 2~5. 검색 및 답변 생성 (동일 의도/엔티티/데이터 버전이면 캐시 사용)
+            answer_key = None
+            cached = None
+            if self.answer_cache:
+                answer_key = f"answer:{query_type}:{country}:{product}:{hs_code}:{self._get_data_version()}"
+                cached = self.answer_cache.get(answer_key)
             
-            # 3. AI를 통한 자연스러운 답변 생성
-            if self.ai_processor and results:
-                try:
-                    answer = self.ai_processor.generate_natural_response(query, results)
-                    logger.info("🤖 AI 생성 답변 사용")
-                except Exception as e:
-                    logger.warning(f"AI 답변 생성 실패, 기본 답변 사용: {e}")
-                    answer = self._generate_answer(query, results, query_type)
+            if cached:
+                results, answer, data_sources, confidence_score = cached
             else:
-                answer = self._generate_answer(query, results, query_type)
-            
-            # 4. 데이터 소스 수집
-            data_sources = self._collect_data_sources(results)
-            
-            # 5. 신뢰도 점수 계산 (AI 처리 결과 반영)
-            if self.ai_processor and hasattr(self.ai_processor, 'ai_processed'):
-                confidence_score = max(
-                    self._calculate_confidence_score(results),
-                    getattr(self.ai_processor, 'ai_processed', AIProcessedQuery('', '', '', {}, 0.5, '')).confidence
+                results, answer, data_sources, confidence_score = self._retrieve_and_answer(
+                    query, query_type, country, product, hs_code, enhanced_query
                 )
-            else:
-                confidence_score = self._calculate_confidence_score(results)
+                if answer_key:
+                    self.answer_cache.set(answer_key, (results, answer, data_sources, confidence_score), self.answer_cache_ttl)
             
             # 6. 후속 질문 생성
             suggested_followup = self._generate_followup_questions(query, results)
@@ -555,43 +586,134 @@ class IntegratedTradeDatabase:
                 timestamp=datetime.now().isoformat()
             )
 
-    def _analyze_query_type(self, query: str) -> str:
-        """질의 타입 분석"""
-        query_lower = query.lower()
+    def _classify_query(self, query: str) -> Tuple[str, Optional[str], Optional[str], Optional[str], str]:
+        """질의 의도 및 엔티티 분류 (질의 문자열 기준 캐시)"""
+        cache_key = "classify:" + " ".join(query.split())
+        if self.answer_cache:
+            cached = self.answer_cache.get(cache_key)
+            if cached:
+                return cached
+        
+        # AI 자연어 처리 (가능한 경우)
+        if self.ai_processor:
+            try:
+                ai_processed = self.ai_processor.process_query(query)
+                logger.info(f"🤖 AI 처리 결과 - 의도: {ai_processed.intent}, 신뢰도: {ai_processed.confidence:.2f}")
+                
+                # AI 처리된 정보 활용
+                query_type = ai_processed.intent
+                entities = ai_processed.entities
+                country = entities.get('country', [''])[0] if entities.get('country') else ''
+                product = entities.get('product', [''])[0] if entities.get('product') else ''
+                hs_code = entities.get('hs_code', [''])[0] if entities.get('hs_code') else ''
+                
+                # AI가 향상시킨 질의 사용
+                enhanced_query = ai_processed.processed_query
+                
+            except Exception as e:
+                logger.warning(f"AI 처리 실패, 기본 처리 사용: {e}")
+                query_type = self._analyze_query_type(query)
+                country, product, hs_code = self._extract_entities(query)
+                enhanced_query = query
+        else:
+            # 기본 처리
+            query_type = self._analyze_query_type(query)
+            country, product, hs_code = self._extract_entities(query)
+            enhanced_query = query
+        
+        classified = (query_type, country, product, hs_code, enhanced_query)
+        if self.answer_cache:
+            self.answer_cache.set(cache_key, classified, self.answer_cache_ttl)
+        return classified
+
+    def _retrieve_and_answer(self, query: str, query_type: str, country: str, product: str,
+                             hs_code: str, enhanced_query: str) -> Tuple[Dict[str, Any], str, List[str], float]:
+        """데이터 검색, 답변 생성, 데이터 소스 수집 및 신뢰도 계산"""
+        # 데이터 검색
+        results = self._search_data(query_type, country, product, hs_code, enhanced_query)
+        
+        # AI를 통한 자연스러운 답변 생성
+        if self.ai_processor and results:
+            try:
+                answer = self.ai_processor.generate_natural_response(query, results)
+                logger.info("🤖 AI 생성 답변 사용")
+            except Exception as e:
+                logger.warning(f"AI 답변 생성 실패, 기본 답변 사용: {e}")
+                answer = self._generate_answer(query, results, query_type)
+        else:
+            answer = self._generate_answer(query, results, query_type)
+        
+        # 데이터 소스 수집
+        data_sources = self._collect_data_sources(results)
+        
+        # 신뢰도 점수 계산 (AI 처리 결과 반영)
+        if self.ai_processor and hasattr(self.ai_processor, 'ai_processed'):
+            confidence_score = max(
+                self._calculate_confidence_score(results),
+                getattr(self.ai_processor, 'ai_processed', AIProcessedQuery('', '', '', {}, 0.5, '')).confidence
+            )
+        else:
+            confidence_score = self._calculate_confidence_score(results)
+        
+        return results, answer, data_sources, confidence_score
+
+    def _get_data_version(self) -> Tuple:
+        """데이터 테이블 버전 (각 테이블의 MAX(id)), data_version_ttl 동안 재사용"""
+        now = time.time()
+        if self._data_version is not None and now - self._data_version_checked_at < self.data_version_ttl:
+            return self._data_version
+        
+        snapshot = self.snapshot_manager.current_snapshot() if self.snapshot_manager else None
+        if snapshot:
+            # 발행된 스냅샷은 불변이므로 스냅샷 파일명이 곧 데이터 버전
+            version = (snapshot,)
+            self._data_version = version
+            self._data_version_checked_at = now
+            return version
         
-        for query_type, patterns in self.query_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, query_lower):
-                    return query_type
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                version = tuple(
+                    cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+                    for table in DATA_TABLES
+                )
+        except Exception as e:
+            logger.error(f"❌ 데이터 버전 확인 실패: {e}")
+            version = None
         
-        return "general"
+        self._data_version = version
+        self._data_version_checked_at = now
+        return version
+
+    def _invalidate_data_version(self):
+        """데이터 삽입 후 다음 질의에서 데이터 버전을 다시 확인"""
+        self._data_version_checked_at = 0.0
+
+    def _analyze_query_type(self, query: str) -> str:
+        """질의 타입 분석"""
+        return self.query_classifier.classify(query).intent
 
     def _extract_entities(self, query: str) -> Tuple[str, str, str]:
         """국가, 품목, HS코드 추출"""
-        country = None
-        product = None
-        hs_code = None
-        
-        # 국가 추출
-        if "중국" in query or "china" in query.lower():
-            country = "중국"
-        elif "미국" in query or "usa" in query.lower() or "미국" in query:
-            country = "미국"
-        
-        # HS코드 추출
-        hs_pattern = r'HS코드\s*(\d{4,8})|(\d{4,8})\s*HS코드'
-        hs_match = re.search(hs_pattern, query)
-        if hs_match:
-            hs_code = hs_match.group(1) or hs_match.group(2)
-        
-        # 품목 추출 (간단한 패턴 매칭)
-        product_keywords = ["라면", "마스크", "전자제품", "의류", "식품", "화학제품"]
-        for keyword in product_keywords:
-            if keyword in query:
-                product = keyword
-                break
-        
-        return country, product, hs_code
+        return self.query_classifier.classify(query).entities
+
+    def _read_connection(self) -> sqlite3.Connection:
+        """조회용 연결 (스냅샷 모드면 최신 불변 스냅샷, 아니면 db_path)"""
+        if self.snapshot_manager:
+            conn = self.snapshot_manager.connect()
+            if conn is not None:
+                return conn
+        return sqlite3.connect(self.db_path)
+
+    def publish_snapshot(self) -> Optional[str]:
+        """스테이징 DB 를 불변 스냅샷으로 발행 (스냅샷 모드에서만)"""
+        if not self.snapshot_manager:
+            logger.info("ℹ️ 스냅샷 모드가 아니므로 발행하지 않습니다 (TRADE_DB_SNAPSHOT_DIR 미설정)")
+            return None
+        path = self.snapshot_manager.publish()
+        self._invalidate_data_version()
+        return path
 
     def _search_data(self, query_type: str, country: str, product: str, hs_code: str, query: str) -> Dict[str, Any]:
         """데이터 검색"""
@@ -605,7 +727,7 @@ class IntegratedTradeDatabase:
         }
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._read_connection() as conn:
                 cursor = conn.cursor()
                 
                 # 규제 정보 검색
@@ -878,6 +1000,10 @@ class IntegratedTradeDatabase:
 
     def _log_query(self, query: str, query_type: str, answer: str, data_sources: List[str], confidence_score: float, response_time: float):
         """질의 로그 저장"""
+        if self.query_log_writer:
+            self.query_log_writer.log(query, query_type, answer, data_sources, confidence_score, response_time)
+            return
+        
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
@@ -900,6 +1026,13 @@ class IntegratedTradeDatabase:
         except Exception as e:
             logger.error(f"❌ 질의 로그 저장 실패: {e}")
 
+    def close(self):
+        """남은 질의 로그를 기록하고 백그라운드 기록기와 스냅샷 읽기 연결 종료"""
+        if self.query_log_writer:
+            self.query_log_writer.close()
+        if self.snapshot_manager:
+            self.snapshot_manager.close()
+
     def get_database_status(self) -> Dict[str, Any]:
         """데이터베이스 상태 확인"""
         try:
@@ -932,6 +1065,9 @@ class IntegratedTradeDatabase:
                     "kotra_global_trade_count": record_counts.get("kotra_global_trade", 0),
                     "kotra_market_recommendation_count": record_counts.get("kotra_market_recommendation", 0),
                     "query_logs_count": record_counts.get("query_logs", 0),
+                    "query_log_writer": self.query_log_writer.get_status() if self.query_log_writer else None,
+                    "answer_cache": self.answer_cache.get_stats() if self.answer_cache else None,
+                    "snapshot": self.snapshot_manager.get_status() if self.snapshot_manager else None,
                     "last_regulation_update": last_regulation_update,
                     "last_trade_update": last_trade_update,
                     "reliability_scores": self.reliability_scores,
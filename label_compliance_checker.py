@@ -10,21 +10,79 @@
 """
 
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import json
+import threading
+
+import numpy as np
+
+from nutrition_table_parser import NutritionTable
+from utils.regulation_snapshot import regulation_snapshots
+
+# 필수 표기사항 -> label_info 필드 후보
+REQUIRED_FIELD_MAPPING = {
+    "제품명": ["product_name", "name"],
+    "Product Name": ["product_name", "name"],
+    "성분표": ["ingredients", "ingredient_list"],
+    "Ingredients List": ["ingredients", "ingredient_list"],
+    "제조사": ["manufacturer", "producer"],
+    "Manufacturer": ["manufacturer", "producer"],
+    "유통기한": ["expiry_date", "expiration_date"],
+    "Expiration Date": ["expiry_date", "expiration_date"],
+    "보관방법": ["storage", "storage_method"],
+    "Storage Instructions": ["storage", "storage_method"],
+    "중량": ["weight", "net_weight"],
+    "Net Weight": ["weight", "net_weight"],
+    "영양성분표": ["nutrition", "nutrition_facts"],
+    "Nutrition Facts": ["nutrition", "nutrition_facts"]
+}
+
+# 영양성분 -> nutrition 키 후보
+NUTRITION_COMPONENT_MAPPING = {
+    "열량": ["calories", "energy", "열량"],
+    "단백질": ["protein", "단백질"],
+    "지방": ["fat", "지방"],
+    "탄수화물": ["carbohydrates", "carbs", "탄수화물"],
+    "나트륨": ["sodium", "나트륨"],
+    "당류": ["sugar", "당류"],
+    "Calories": ["calories", "energy"],
+    "Protein": ["protein"],
+    "Fat": ["fat"],
+    "Carbohydrate": ["carbohydrates", "carbs"],
+    "Sodium": ["sodium"],
+    "Sugar": ["sugar"]
+}
+
+# 간단한 언어 감지 패턴 (실제로는 더 정교한 방법 필요)
+LANGUAGE_PATTERNS = {
+    "한국어": r"[가-힣]",
+    "중국어": r"[一-龯]",
+    "일본어": r"[あ-んア-ン]",
+    "영어": r"[a-zA-Z]"
+}
+
+# 표기사항 품질 검증에서 감점하는 특수문자
+SPECIAL_CHARS = ['※', '★', '♥', '*', '!', '?']
 
 class LabelComplianceChecker:
     """라벨 규제 준수성 검토기"""
     
     def __init__(self):
-        self.regulations = self._load_regulations()
         self.required_fields = self._load_required_fields()
         self.language_requirements = self._load_language_requirements()
         self.format_requirements = self._load_format_requirements()
+        self._compiled_rules = None
+        self._compile_lock = threading.Lock()
     
-    def _load_regulations(self) -> Dict:
-        """국가별 라벨링 규정 로딩"""
+    @property
+    def regulations(self) -> Dict:
+        """국가별 라벨링 규정 (규제 스냅샷 'label_regulations', 읽기 전용)"""
+        return regulation_snapshots.source('label_regulations')
+    
+    @staticmethod
+    def _load_regulations() -> Dict:
+        """국가별 라벨링 규정 원본 (스냅샷 로더)"""
         return {
             "중국": {
                 "name": "GB 7718-2025",
@@ -213,7 +271,8 @@ class LabelComplianceChecker:
         print(f"🔍 라벨 준수성 검토 시작: {country}")
         print(f"📊 라벨 정보: {label_info}")
         
-        if country not in self.regulations:
+        regulations = self.regulations
+        if country not in regulations:
             return {
                 "compliant": False,
                 "errors": [f"지원하지 않는 국가: {country}"],
@@ -222,7 +281,7 @@ class LabelComplianceChecker:
                 "compliance_status": "지원하지 않는 국가"
             }
         
-        regulation = self.regulations[country]
+        regulation = regulations[country]
         errors = []
         warnings = []
         score = 100
@@ -318,35 +377,39 @@ class LabelComplianceChecker:
             else:
                 # 필드 품질 검증 - 입력 데이터의 품질에 따라 점수 차감
                 field_value = self._get_field_value(label_info, statement)
-                if field_value:
-                    # 길이 기반 품질 평가
-                    if len(field_value) < 2:
-                        warnings.append(f"표기사항이 너무 짧음: {statement}")
-                        score_deduction += max_deduction_per_field * 0.3  # 30% 차감
-                    elif len(field_value) < 5:
-                        warnings.append(f"표기사항이 부족함: {statement}")
-                        score_deduction += max_deduction_per_field * 0.1  # 10% 차감
-                    elif len(field_value) > 500:
-                        warnings.append(f"표기사항이 너무 김: {statement}")
-                        score_deduction += max_deduction_per_field * 0.2  # 20% 차감
-                    
-                    # 특수 문자 및 품질 검증
-                    special_chars = ['※', '★', '♥', '*', '!', '?']
-                    special_char_count = sum(1 for char in special_chars if char in field_value)
-                    if special_char_count > 0:
-                        warnings.append(f"부적절한 특수문자 사용: {statement}")
-                        score_deduction += max_deduction_per_field * 0.1 * special_char_count
-                    
-                    # 숫자와 문자의 균형 검증 (제품명, 제조사 등)
-                    if statement in ["제품명", "Product Name", "제조사", "Manufacturer"]:
-                        digit_ratio = sum(1 for c in field_value if c.isdigit()) / len(field_value)
-                        if digit_ratio > 0.5:
-                            warnings.append(f"숫자가 과도하게 많음: {statement}")
-                            score_deduction += max_deduction_per_field * 0.2
+                for warning, ratio in self._field_quality_issues(statement, field_value):
+                    warnings.append(warning)
+                    score_deduction += max_deduction_per_field * ratio
         
         # 최대 30점까지만 차감
         return errors, warnings, min(score_deduction, 30)
     
+    def _field_quality_issues(self, statement: str, field_value: Optional[str]) -> List[Tuple[str, float]]:
+        """표기사항 값의 품질 문제 목록 [(경고, 필드 배점 대비 감점 비율)]"""
+        issues = []
+        if not field_value:
+            return issues
+        
+        # 길이 기반 품질 평가
+        if len(field_value) < 2:
+            issues.append((f"표기사항이 너무 짧음: {statement}", 0.3))  # 30% 차감
+        elif len(field_value) < 5:
+            issues.append((f"표기사항이 부족함: {statement}", 0.1))  # 10% 차감
+        elif len(field_value) > 500:
+            issues.append((f"표기사항이 너무 김: {statement}", 0.2))  # 20% 차감
+        
+        # 특수 문자 및 품질 검증
+        special_char_count = sum(1 for char in SPECIAL_CHARS if char in field_value)
+        if special_char_count > 0:
+            issues.append((f"부적절한 특수문자 사용: {statement}", 0.1 * special_char_count))
+        
+        # 숫자와 문자의 균형 검증 (제품명, 제조사 등)
+        if statement in ["제품명", "Product Name", "제조사", "Manufacturer"]:
+            digit_ratio = sum(1 for c in field_value if c.isdigit()) / len(field_value)
+            if digit_ratio > 0.5:
+                issues.append((f"숫자가 과도하게 많음: {statement}", 0.2))
+        return issues
+    
     def _check_language_requirements(self, label_info: Dict, regulation: Dict) -> Tuple[List, List, int]:
         """언어 요구사항 검증 (25점 만점)"""
         errors = []
@@ -361,17 +424,24 @@ class LabelComplianceChecker:
                 score_deduction += 25
             else:
                 # 금지 문자 검증
-                forbidden_chars = self._get_forbidden_characters([language])
-                for field, value in label_info.items():
-                    if isinstance(value, str):
-                        for char in forbidden_chars:
-                            if char in value:
-                                warnings.append(f"금지 문자 사용: {char} in {field}")
-                                score_deduction += 2
+                for warning in self._forbidden_char_warnings(label_info, language):
+                    warnings.append(warning)
+                    score_deduction += 2
         
         # 최대 25점까지만 차감
         return errors, warnings, min(score_deduction, 25)
     
+    def _forbidden_char_warnings(self, label_info: Dict, language: str) -> List[str]:
+        """언어별 금지 문자 사용 경고 (경고당 2점 감점)"""
+        warnings = []
+        forbidden_chars = self._get_forbidden_characters([language])
+        for field, value in label_info.items():
+            if isinstance(value, str):
+                for char in forbidden_chars:
+                    if char in value:
+                        warnings.append(f"금지 문자 사용: {char} in {field}")
+        return warnings
+    
     def _check_format_requirements(self, label_info: Dict, regulation: Dict) -> Tuple[List, List, int]:
         """형식 요구사항 검증 (10점 만점)"""
         errors = []
@@ -393,8 +463,8 @@ class LabelComplianceChecker:
                 score_deduction += 5
         
         # 영양성분 형식 검증
-        if "nutrition" in label_info:
-            nutrition_info = label_info["nutrition"]
+        if "nutrition" in label_info or "nutrition_table" in label_info:
+            nutrition_info = self._get_nutrition_info(label_info)
             for nutrient, value in nutrition_info.items():
                 if not self._is_valid_nutrition_format(value):
                     warnings.append(f"영양성분 형식 오류: {nutrient}")
@@ -410,7 +480,7 @@ class LabelComplianceChecker:
         score_deduction = 0
         
         required_components = regulation.get("nutrition_components", [])
-        nutrition_info = label_info.get("nutrition", {})
+        nutrition_info = self._get_nutrition_info(label_info)
         
         # 필수 영양성분 검증
         max_deduction_per_component = 20 // len(required_components) if required_components else 20
@@ -421,35 +491,9 @@ class LabelComplianceChecker:
             else:
                 # 영양성분 값 품질 검증
                 component_value = self._get_nutrition_component_value(nutrition_info, component)
-                if component_value:
-                    try:
-                        # 숫자 값 추출
-                        numeric_value = float(re.findall(r'\d+(?:\.\d+)?', str(component_value))[0])
-                        
-                        # 값의 적절성 검증
-                        if numeric_value < 0:
-                            errors.append(f"영양성분 값이 음수: {component}")
-                            score_deduction += max_deduction_per_component * 0.5
-                        elif numeric_value == 0:
-                            warnings.append(f"영양성분 값이 0: {component}")
-                            score_deduction += max_deduction_per_component * 0.2
-                        elif numeric_value > 10000:
-                            warnings.append(f"영양성분 값이 비정상적으로 큼: {component}")
-                            score_deduction += max_deduction_per_component * 0.3
-                        
-                        # 단위 검증
-                        if not self._has_valid_nutrition_unit(component_value, component):
-                            warnings.append(f"영양성분 단위 부적절: {component}")
-                            score_deduction += max_deduction_per_component * 0.2
-                        
-                        # 영양성분별 합리적 범위 검증
-                        if not self._is_nutrition_value_reasonable(component, numeric_value):
-                            warnings.append(f"영양성분 값이 비합리적: {component} ({numeric_value})")
-                            score_deduction += max_deduction_per_component * 0.2
-                            
-                    except (ValueError, IndexError):
-                        warnings.append(f"영양성분 값 형식 오류: {component}")
-                        score_deduction += max_deduction_per_component * 0.3
+                for is_error, message, ratio in self._nutrition_value_issues(component, component_value):
+                    (errors if is_error else warnings).append(message)
+                    score_deduction += max_deduction_per_component * ratio
         
         # 영양성분 정보 완성도 검증
         total_nutrition_fields = len(nutrition_info)
@@ -465,24 +509,55 @@ class LabelComplianceChecker:
         # 최대 20점까지만 차감
         return errors, warnings, min(score_deduction, 20)
     
+    def _nutrition_value_issues(self, component: str, component_value: Optional[str]) -> List[Tuple[bool, str, float]]:
+        """영양성분 값의 문제 목록 [(오류 여부, 메시지, 성분 배점 대비 감점 비율)]"""
+        issues = []
+        if not component_value:
+            return issues
+        try:
+            # 숫자 값 추출
+            numeric_value = float(re.findall(r'\d+(?:\.\d+)?', str(component_value))[0])
+            
+            # 값의 적절성 검증
+            if numeric_value < 0:
+                issues.append((True, f"영양성분 값이 음수: {component}", 0.5))
+            elif numeric_value == 0:
+                issues.append((False, f"영양성분 값이 0: {component}", 0.2))
+            elif numeric_value > 10000:
+                issues.append((False, f"영양성분 값이 비정상적으로 큼: {component}", 0.3))
+            
+            # 단위 검증
+            if not self._has_valid_nutrition_unit(component_value, component):
+                issues.append((False, f"영양성분 단위 부적절: {component}", 0.2))
+            
+            # 영양성분별 합리적 범위 검증
+            if not self._is_nutrition_value_reasonable(component, numeric_value):
+                issues.append((False, f"영양성분 값이 비합리적: {component} ({numeric_value})", 0.2))
+                
+        except (ValueError, IndexError):
+            issues.append((False, f"영양성분 값 형식 오류: {component}", 0.3))
+        return issues
+    
+    def _get_nutrition_info(self, label_info: Dict) -> Dict:
+        """영양성분 값 (OCR 좌표로 복원한 영양성분표가 있으면 그 값을 우선 사용)
+
+        nutrition_table 은 NutritionTable.to_dict() 형식 (OCR 결과의 'nutrition_table')이며,
+        표에서 찾지 못한 성분은 텍스트에서 추출한 nutrition 값을 그대로 쓴다.
+        """
+        nutrition_info = dict(label_info.get("nutrition") or {})
+        table = label_info.get("nutrition_table")
+        if table:
+            try:
+                table_info = NutritionTable.from_dict(table).to_nutrition_info()
+            except (KeyError, TypeError, ValueError):
+                return nutrition_info
+            # 성분 매핑은 영문 키(calories, sodium 등)를 먼저 찾으므로 표 값이 우선한다
+            nutrition_info.update(table_info)
+        return nutrition_info
+    
     def _get_nutrition_component_value(self, nutrition_info: Dict, component: str) -> Optional[str]:
         """영양성분 값 가져오기"""
-        component_mapping = {
-            "열량": ["calories", "energy", "열량"],
-            "단백질": ["protein", "단백질"],
-            "지방": ["fat", "지방"],
-            "탄수화물": ["carbohydrates", "carbs", "탄수화물"],
-            "나트륨": ["sodium", "나트륨"],
-            "당류": ["sugar", "당류"],
-            "Calories": ["calories", "energy"],
-            "Protein": ["protein"],
-            "Fat": ["fat"],
-            "Carbohydrate": ["carbohydrates", "carbs"],
-            "Sodium": ["sodium"],
-            "Sugar": ["sugar"]
-        }
-        
-        possible_names = component_mapping.get(component, [component.lower()])
+        possible_names = NUTRITION_COMPONENT_MAPPING.get(component, [component.lower()])
         for name in possible_names:
             if name in nutrition_info:
                 return str(nutrition_info[name])
@@ -597,46 +672,12 @@ class LabelComplianceChecker:
     
     def _has_required_field(self, label_info: Dict, field_name: str) -> bool:
         """필수 필드 존재 여부 확인"""
-        field_mapping = {
-            "제품명": ["product_name", "name"],
-            "Product Name": ["product_name", "name"],
-            "성분표": ["ingredients", "ingredient_list"],
-            "Ingredients List": ["ingredients", "ingredient_list"],
-            "제조사": ["manufacturer", "producer"],
-            "Manufacturer": ["manufacturer", "producer"],
-            "유통기한": ["expiry_date", "expiration_date"],
-            "Expiration Date": ["expiry_date", "expiration_date"],
-            "보관방법": ["storage", "storage_method"],
-            "Storage Instructions": ["storage", "storage_method"],
-            "중량": ["weight", "net_weight"],
-            "Net Weight": ["weight", "net_weight"],
-            "영양성분표": ["nutrition", "nutrition_facts"],
-            "Nutrition Facts": ["nutrition", "nutrition_facts"]
-        }
-        
-        possible_fields = field_mapping.get(field_name, [field_name.lower()])
+        possible_fields = REQUIRED_FIELD_MAPPING.get(field_name, [field_name.lower()])
         return any(field in label_info for field in possible_fields)
     
     def _get_field_value(self, label_info: Dict, field_name: str) -> Optional[str]:
         """필드 값 가져오기"""
-        field_mapping = {
-            "제품명": ["product_name", "name"],
-            "Product Name": ["product_name", "name"],
-            "성분표": ["ingredients", "ingredient_list"],
-            "Ingredients List": ["ingredients", "ingredient_list"],
-            "제조사": ["manufacturer", "producer"],
-            "Manufacturer": ["manufacturer", "producer"],
-            "유통기한": ["expiry_date", "expiration_date"],
-            "Expiration Date": ["expiry_date", "expiration_date"],
-            "보관방법": ["storage", "storage_method"],
-            "Storage Instructions": ["storage", "storage_method"],
-            "중량": ["weight", "net_weight"],
-            "Net Weight": ["weight", "net_weight"],
-            "영양성분표": ["nutrition", "nutrition_facts"],
-            "Nutrition Facts": ["nutrition", "nutrition_facts"]
-        }
-        
-        possible_fields = field_mapping.get(field_name, [field_name.lower()])
+        possible_fields = REQUIRED_FIELD_MAPPING.get(field_name, [field_name.lower()])
         for field in possible_fields:
             if field in label_info:
                 return str(label_info[field])
@@ -645,15 +686,7 @@ class LabelComplianceChecker:
     
     def _has_language_content(self, label_info: Dict, language: str) -> bool:
         """언어별 내용 존재 여부 확인"""
-        # 간단한 언어 감지 (실제로는 더 정교한 방법 필요)
-        language_patterns = {
-            "한국어": r"[가-힣]",
-            "중국어": r"[一-龯]",
-            "일본어": r"[あ-んア-ン]",
-            "영어": r"[a-zA-Z]"
-        }
-        
-        pattern = language_patterns.get(language, r"")
+        pattern = LANGUAGE_PATTERNS.get(language, r"")
         if not pattern:
             return True  # 패턴이 없으면 모든 언어 허용
         
@@ -702,25 +735,19 @@ class LabelComplianceChecker:
     
     def _has_nutrition_component(self, nutrition_info: Dict, component: str) -> bool:
         """영양성분 존재 여부 확인"""
-        # 영양성분 매핑
-        component_mapping = {
-            "열량": ["calories", "energy", "열량"],
-            "단백질": ["protein", "단백질"],
-            "지방": ["fat", "지방"],
-            "탄수화물": ["carbohydrates", "carbs", "탄수화물"],
-            "나트륨": ["sodium", "나트륨"],
-            "당류": ["sugar", "당류"],
-            "Calories": ["calories", "energy"],
-            "Protein": ["protein"],
-            "Fat": ["fat"],
-            "Carbohydrate": ["carbohydrates", "carbs"],
-            "Sodium": ["sodium"],
-            "Sugar": ["sugar"]
-        }
-        
-        possible_names = component_mapping.get(component, [component.lower()])
+        possible_names = NUTRITION_COMPONENT_MAPPING.get(component, [component.lower()])
         return any(name in nutrition_info for name in possible_names)
     
+    def check_compliance_bulk(self, labels: List[Dict], countries: List[str],
+                              include_warnings: bool = False) -> Dict[str, Any]:
+        """라벨 N개 × 국가 M개 일괄 검토 (점수/오류 행렬 반환, CompiledComplianceRules.evaluate 참고)"""
+        with self._compile_lock:
+            # 규정 스냅샷이 새로 발행되면 다시 컴파일
+            if self._compiled_rules is None or self._compiled_rules.regulations is not self.regulations:
+                self._compiled_rules = CompiledComplianceRules(self)
+            compiled = self._compiled_rules
+        return compiled.evaluate(labels, countries, include_warnings)
+    
     def generate_compliance_report(self, label_info: Dict, country: str) -> Dict:
         """규제 준수성 보고서 생성"""
         compliance_result = self.check_compliance(label_info, country)
@@ -777,6 +804,220 @@ class LabelComplianceChecker:
         
         return recommendations
 
+class CompiledComplianceRules:
+    """여러 라벨 × 여러 국가 일괄 검토용으로 미리 컴파일한 규정
+
+    국가별 규정을 열 인덱스(필수 표기사항 -> 필드 열, 영양성분 -> 성분 키 열)로 한 번 변환해 두고,
+    라벨 쪽 판정(필드 존재, 값 품질, 언어 감지, 형식)은 라벨마다 한 번만 계산한다.
+    국가별 점수는 존재 여부 행렬에서 열을 골라 벡터 연산으로 구하므로
+    check_compliance 를 N×M 번 호출하는 것과 같은 점수/오류를 낸다.
+    """
+
+    def __init__(self, checker: 'LabelComplianceChecker'):
+        self.checker = checker
+        self.regulations = checker.regulations
+        self.statements: List[str] = []
+        self.components: List[str] = []
+        self.languages: List[str] = []
+        self.countries: Dict[str, Dict[str, Any]] = {}
+
+        for country, regulation in self.regulations.items():
+            statements = regulation.get("mandatory_statements", [])
+            components = regulation.get("nutrition_components", [])
+            languages = regulation.get("required_language", [])
+            self.countries[country] = {
+                "regulation": regulation["name"],
+                "statements": np.array([self._index(self.statements, s) for s in statements], dtype=np.intp),
+                "per_field": 30 // len(statements) if statements else 30,
+                "components": np.array([self._index(self.components, c) for c in components], dtype=np.intp),
+                "per_component": 20 // len(components) if components else 20,
+                "component_count": len(components),
+                "languages": np.array([self._index(self.languages, l) for l in languages], dtype=np.intp),
+                "allergen_count": regulation.get("allergen_count", 10)
+            }
+
+        # 필드 키 열과 표기사항/성분별 후보 열 (후보 수가 다르면 항상 False 인 마지막 열로 채움)
+        self.field_keys = sorted({key for s in self.statements
+                                  for key in REQUIRED_FIELD_MAPPING.get(s, [s.lower()])})
+        self.statement_columns = self._candidate_columns(
+            self.field_keys, [REQUIRED_FIELD_MAPPING.get(s, [s.lower()]) for s in self.statements])
+        self.nutrition_keys = sorted({key for c in self.components
+                                      for key in NUTRITION_COMPONENT_MAPPING.get(c, [c.lower()])})
+        self.component_columns = self._candidate_columns(
+            self.nutrition_keys, [NUTRITION_COMPONENT_MAPPING.get(c, [c.lower()]) for c in self.components])
+
+    @staticmethod
+    def _index(names: List[str], name: str) -> int:
+        if name not in names:
+            names.append(name)
+        return names.index(name)
+
+    @staticmethod
+    def _candidate_columns(keys: List[str], candidates: List[List[str]]) -> np.ndarray:
+        width = max((len(c) for c in candidates), default=1)
+        columns = np.full((len(candidates), width), len(keys), dtype=np.intp)
+        for row, names in enumerate(candidates):
+            columns[row, :len(names)] = [keys.index(name) for name in names]
+        return columns
+
+    @staticmethod
+    def _presence(records: List[Dict], keys: List[str], columns: np.ndarray) -> np.ndarray:
+        """(레코드 수 × 항목 수) 존재 행렬: 후보 키 중 하나라도 있으면 True"""
+        present = np.zeros((len(records), len(keys) + 1), dtype=bool)
+        for row, record in enumerate(records):
+            present[row, :len(keys)] = [key in record for key in keys]
+        if not len(columns):
+            return np.zeros((len(records), 0), dtype=bool)
+        return present[:, columns].any(axis=2)
+
+    def evaluate(self, labels: List[Dict], countries: List[str], include_warnings: bool = False) -> Dict[str, Any]:
+        """라벨 N개 × 국가 M개 검토
+
+        Returns:
+            {'countries', 'regulations', 'scores' (N×M), 'compliant' (N×M), 'error_counts',
+             'warning_counts', 'errors' (N×M 메시지 목록), ['warnings']}
+        """
+        checker = self.checker
+        n = len(labels)
+
+        # 라벨별 판정 (국가와 무관, 라벨마다 한 번)
+        statement_present = self._presence(labels, self.field_keys, self.statement_columns)
+        statement_ratio = np.zeros((n, len(self.statements)))
+        statement_warnings: Dict[Tuple[int, int], List[str]] = {}
+        for row, col in zip(*np.nonzero(statement_present)):
+            issues = checker._field_quality_issues(self.statements[col],
+                                                   checker._get_field_value(labels[row], self.statements[col]))
+            if issues:
+                statement_ratio[row, col] = sum(ratio for _, ratio in issues)
+                statement_warnings[(row, col)] = [warning for warning, _ in issues]
+
+        nutrition = [checker._get_nutrition_info(label) for label in labels]
+        nutrition_count = np.array([len(info) for info in nutrition])
+        component_present = self._presence(nutrition, self.nutrition_keys, self.component_columns)
+        component_ratio = np.zeros((n, len(self.components)))
+        component_issues: Dict[Tuple[int, int], List[Tuple[bool, str, float]]] = {}
+        for row, col in zip(*np.nonzero(component_present)):
+            component = self.components[col]
+            issues = checker._nutrition_value_issues(
+                component, checker._get_nutrition_component_value(nutrition[row], component))
+            if issues:
+                component_ratio[row, col] = sum(ratio for _, _, ratio in issues)
+                component_issues[(row, col)] = issues
+
+        language_present = np.array([[checker._has_language_content(label, language) for language in self.languages]
+                                     for label in labels], dtype=bool).reshape(n, len(self.languages))
+        forbidden = [[checker._forbidden_char_warnings(label, language) if language_present[row, col] else []
+                      for col, language in enumerate(self.languages)] for row, label in enumerate(labels)]
+        forbidden_count = np.array([[len(w) for w in row] for row in forbidden], dtype=float).reshape(n, len(self.languages))
+
+        allergies = []
+        for label in labels:
+            items = label.get("allergies", [])
+            if isinstance(items, str):
+                items = [item.strip() for item in items.split(',') if item.strip()]
+            allergies.append(items)
+        allergy_count = np.array([len(items) for items in allergies])
+        short_allergies = [[item for item in items if len(item) < 2] for items in allergies]
+        short_count = np.array([len(items) for items in short_allergies])
+
+        formats = [checker._check_format_requirements(label, {}) for label in labels]
+        format_deduction = np.array([deduction for _, _, deduction in formats], dtype=float)
+
+        scores = np.zeros((n, len(countries)))
+        compliant = np.zeros((n, len(countries)), dtype=bool)
+        errors = [[[] for _ in countries] for _ in range(n)]
+        warnings = [[[] for _ in countries] for _ in range(n)]
+
+        for col, country in enumerate(countries):
+            rules = self.countries.get(country)
+            if rules is None:
+                for row in range(n):
+                    errors[row][col] = [f"지원하지 않는 국가: {country}"]
+                continue
+
+            # 1. 필수 표기사항 (30점)
+            present = statement_present[:, rules["statements"]]
+            field_deduction = np.minimum(
+                rules["per_field"] * ((~present).sum(axis=1) + statement_ratio[:, rules["statements"]].sum(axis=1)), 30)
+
+            # 2. 언어 (25점)
+            language = language_present[:, rules["languages"]]
+            language_deduction = np.minimum(
+                (~language).sum(axis=1) * 25 + 2 * forbidden_count[:, rules["languages"]].sum(axis=1), 25)
+
+            # 3. 영양성분 (20점)
+            components = component_present[:, rules["components"]]
+            nutrition_deduction = rules["per_component"] * (
+                (~components).sum(axis=1) + component_ratio[:, rules["components"]].sum(axis=1))
+            required = rules["component_count"]
+            if required:
+                completion = nutrition_count / required
+                incomplete = nutrition_count < required
+                nutrition_deduction += np.where(incomplete & (completion < 0.5), 5,
+                                                np.where(incomplete & (completion < 0.8), 2, 0))
+            nutrition_deduction = np.minimum(nutrition_deduction, 20)
+
+            # 4. 알레르기 (15점)
+            too_many = allergy_count > rules["allergen_count"]
+            allergy_deduction = np.minimum(too_many * 5 + short_count * 2, 15)
+
+            total = field_deduction + language_deduction + nutrition_deduction + allergy_deduction + format_deduction
+            scores[:, col] = np.clip(100 - total, 0, 100)
+
+            for row in range(n):
+                cell_errors, cell_warnings = errors[row][col], warnings[row][col]
+                for index in rules["statements"]:
+                    if not statement_present[row, index]:
+                        cell_errors.append(f"필수 표기사항 누락: {self.statements[index]}")
+                    else:
+                        cell_warnings.extend(statement_warnings.get((row, index), []))
+                for index in rules["languages"]:
+                    if not language_present[row, index]:
+                        cell_errors.append(f"필수 언어 누락: {self.languages[index]}")
+                    else:
+                        cell_warnings.extend(forbidden[row][index])
+                for index in rules["components"]:
+                    if not component_present[row, index]:
+                        cell_errors.append(f"필수 영양성분 누락: {self.components[index]}")
+                    else:
+                        for is_error, message, _ in component_issues.get((row, index), []):
+                            (cell_errors if is_error else cell_warnings).append(message)
+                if required and nutrition_count[row] < required:
+                    if nutrition_count[row] / required < 0.5:
+                        cell_warnings.append("영양성분 정보가 부족함")
+                    elif nutrition_count[row] / required < 0.8:
+                        cell_warnings.append("영양성분 정보가 부분적으로 부족함")
+                if too_many[row]:
+                    cell_warnings.append(f"알레르기 정보가 너무 많음: {allergy_count[row]}개")
+                cell_warnings.extend(f"알레르기 정보가 너무 짧음: {item}" for item in short_allergies[row])
+                cell_errors.extend(formats[row][0])
+                cell_warnings.extend(formats[row][1])
+                compliant[row, col] = not cell_errors
+
+        result = {
+            "countries": list(countries),
+            "regulations": [self.countries[c]["regulation"] if c in self.countries else None for c in countries],
+            "scores": np.round(scores, 2).tolist(),
+            "compliant": compliant.tolist(),
+            "error_counts": [[len(cell) for cell in row] for row in errors],
+            "warning_counts": [[len(cell) for cell in row] for row in warnings],
+            "errors": errors
+        }
+        if include_warnings:
+            result["warnings"] = warnings
+        return result
+
+
+regulation_snapshots.register('label_regulations', LabelComplianceChecker._load_regulations, levels=('country', 'category'))
+
+# 전역 검토기 (규정 사전과 컴파일된 규칙을 요청마다 다시 만들지 않음)
+label_compliance_checker = LabelComplianceChecker()
+
+
+def get_label_compliance_checker() -> LabelComplianceChecker:
+    """전역 라벨 규제 준수성 검토기 반환"""
+    return label_compliance_checker
+
 def main():
     """라벨 규제 준수성 검토 시스템 테스트"""
     
@@ -16,6 +16,7 @@ import cv2
 import numpy as np
 from PIL import Image
 import json
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
 import logging
@@ -58,6 +59,32 @@ except ImportError:
     TRANSFORMERS_AVAILABLE = False
     print("⚠️ Transformers를 사용할 수 없습니다.")
 
+from nutrition_table_parser import parse_nutrition_table
+from utils.field_extraction import get_field_extractor, spans_of
+from utils.image_preprocessing import preprocessing_pipeline
+from utils.ocr_engine_pool import ocr_engine_pool
+from utils.ocr_job_queue import remove_job_upload
+from utils.ocr_result_cache import get_ocr_result_cache, hash_file
+
+# 라벨 추출에 사용하는 OCR 엔진 (우선순위 순)
+LABEL_OCR_ENGINES = ['tesseract', 'easyocr']
+
+# 라벨 이미지 전처리 설정 (utils.image_preprocessing.PreprocessingPipeline 형식)
+LABEL_PREPROCESS_SETTINGS = {
+    'enhance_resolution': False,
+    'noise_reduction': 'moderate',
+    'contrast_enhancement': 'balanced',
+    'rotation_correction': False,
+    'binarization': 'adaptive',
+    'morphology': 'basic_cleaning'
+}
+
+NO_OCR_ENGINE_TEXT = "OCR 엔진을 사용할 수 없습니다. 이미지를 확인해주세요."
+
+# 라벨 추출 결과 형식 버전 (결과에 담는 항목이 바뀌면 올려서 이전 캐시 결과를 무효화)
+# 2: 영양성분표(nutrition_table) 추가
+LABEL_EXTRACT_PIPELINE_VERSION = 2
+
 # AI API 통합
 try:
     from ai_enhanced_ocr import ai_ocr
@@ -78,6 +105,7 @@ class LabelOCRExtractor:
         self.ocr_engines = self._initialize_ocr_engines()
         self.ner_model = self._initialize_ner_model()
         self.extraction_patterns = self._load_extraction_patterns()
+        self.field_extractor = get_field_extractor(self.extraction_patterns)
         self.data_normalizer = DataNormalizer()
         
         # 번역기 초기화
@@ -98,65 +126,11 @@ class LabelOCRExtractor:
         return None
     
     def _initialize_ocr_engines(self) -> Dict:
-        """OCR 엔진 초기화 (한글 우선)"""
-        engines = {}
-        
-        # Tesseract 초기화
-        if TESSERACT_AVAILABLE:
-            try:
-                # Tesseract 경로 설정 (Windows)
-                if os.name == 'nt':
-                    # 여러 가능한 경로 시도
-                    possible_paths = [
-                        r'C:\Program Files\Tesseract-OCR\tesseract.exe',
-                        r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe',
-                        r'C:\Users\양지호\AppData\Local\Programs\Tesseract-OCR\tesseract.exe'
-                    ]
-                    
-                    tesseract_found = False
-                    for path in possible_paths:
-                        if os.path.exists(path):
-                            pytesseract.pytesseract.tesseract_cmd = path
-                            tesseract_found = True
-                            break
-                    
-                    if not tesseract_found:
-                        raise FileNotFoundError("Tesseract 실행 파일을 찾을 수 없습니다.")
-                
-                # 테스트 실행
-                test_result = pytesseract.get_tesseract_version()
-                engines['tesseract'] = {
-                    'available': True,
-                    'version': str(test_result),
-                    'languages': ['kor', 'eng', 'chi_sim']  # 한국어 우선
-                }
-                self.logger.info(f"✅ Tesseract 초기화 성공: {test_result}")
-            except Exception as e:
-                engines['tesseract'] = {'available': False, 'error': str(e)}
-                self.logger.warning(f"❌ Tesseract 초기화 실패: {e}")
-        
-        # EasyOCR 초기화 (한국어 우선)
-        if EASYOCR_AVAILABLE:
-            try:
-                # 한국어를 첫 번째 언어로 설정
-                engines['easyocr'] = {
-                    'available': True,
-                    'languages': ['ko', 'en', 'ch_sim'],
-                    'reader': easyocr.Reader(['ko', 'en', 'ch_sim'])  # 한국어 우선
-                }
-                self.logger.info("✅ EasyOCR 초기화 성공 (한국어 우선)")
-            except Exception as e:
-                # 실패 시 한국어와 영어만 사용
-                try:
-                    engines['easyocr'] = {
-                        'available': True,
-                        'languages': ['ko', 'en'],
-                        'reader': easyocr.Reader(['ko', 'en'])
-                    }
-                    self.logger.info("✅ EasyOCR 초기화 성공 (한국어+영어)")
-                except Exception as e2:
-                    engines['easyocr'] = {'available': False, 'error': str(e2)}
-                    self.logger.warning(f"❌ EasyOCR 초기화 실패: {e2}")
+        """OCR 엔진 상태 확인 (한글 우선)
+
+        엔진 자체는 프로세스 전역 풀에서 첫 사용 시 한 번만 로딩된다.
+        """
+        engines = ocr_engine_pool.get_status(LABEL_OCR_ENGINES)
         
         # 최소 하나의 OCR 엔진이 사용 가능한지 확인
         available_engines = [name for name, config in engines.items() if config.get('available', False)]
@@ -293,14 +267,48 @@ class LabelOCRExtractor:
         }
     
     def extract_label_info(self, image_path: str, use_advanced_ocr: bool = True, translate_to: str = None, use_ai_apis: bool = True) -> Dict:
-        """라벨 이미지에서 정보 추출 (한글 우선 + 번역 지원 + AI API)"""
+        """라벨 이미지에서 정보 추출 (한글 우선 + 번역 지원 + AI API)
+
+        같은 이미지 내용과 같은 추출 설정이면 디스크 캐시의 결과를 반환한다.
+        """
+        ai_requested = bool(use_ai_apis and self.use_ai_apis)
+        ocr_result_cache = get_ocr_result_cache()
+        try:
+            cache_key = ocr_result_cache.make_key(
+                hash_file(image_path),
+                pipeline='label_extract',
+                pipeline_version=LABEL_EXTRACT_PIPELINE_VERSION,
+                use_advanced_ocr=use_advanced_ocr,
+                translate_to=translate_to,
+                use_ai_apis=ai_requested,
+                engines=[name for name in LABEL_OCR_ENGINES if ocr_engine_pool.is_available(name)]
+            )
+        except OSError as e:
+            self.logger.warning(f"⚠️ OCR 결과 캐시 키 생성 실패: {e}")
+            return self._extract_label_info(image_path, use_advanced_ocr, translate_to, use_ai_apis)
+        
+        result, cache_hit = ocr_result_cache.get_or_compute(
+            cache_key,
+            lambda: self._extract_label_info(image_path, use_advanced_ocr, translate_to, use_ai_apis),
+            # OCR 엔진이 없거나, AI API 를 요청했는데 일시 오류로 기본 OCR 결과만 나온 경우는 저장하지 않음
+            should_cache=lambda r: r.get('raw_text') != NO_OCR_ENGINE_TEXT and (r.get('ai_enhanced') or not ai_requested)
+        )
+        if cache_hit:
+            self.logger.info(f"⚡ 라벨 OCR 결과 캐시 적중: {image_path}")
+            result['image_path'] = image_path
+        result['cache_hit'] = cache_hit
+        return result
+    
+    def _extract_label_info(self, image_path: str, use_advanced_ocr: bool = True, translate_to: str = None, use_ai_apis: bool = True) -> Dict:
+        """라벨 정보 추출 (캐시 미사용)"""
         
         self.logger.info(f"🔍 라벨 정보 추출 시작: {image_path}")
         
         # AI API 우선 사용 (가장 정확)
         if use_ai_apis and self.use_ai_apis:
             self.logger.info("🤖 AI API OCR 시작...")
-            ai_result = ai_ocr.extract_label_info(image_path, use_ai_apis=True)
+            ai_detail = ai_ocr.extract_label_info_detailed(image_path, use_ai_apis=True)
+            ai_result = ai_detail['result']
             
             if ai_result:
                 # AI API 결과가 있으면 번역 처리
@@ -309,8 +317,12 @@ class LabelOCRExtractor:
                     translated_info = self.translate_extracted_info(ai_result, translate_to)
                     ai_result = translated_info
                 
-                # 신뢰도 평가 (AI API는 높은 신뢰도)
-                confidence_scores = {key: 0.95 for key in ai_result.keys()}
+                # 신뢰도 평가 (AI API 간 필드 투표 일치도, 항목별 하위 필드 평균)
+                field_confidence = ai_detail['field_confidence']
+                confidence_scores = {}
+                for key in ai_result.keys():
+                    scores = [c for path, c in field_confidence.items() if path == key or path.startswith(f"{key}.")]
+                    confidence_scores[key] = round(0.95 * sum(scores) / len(scores), 3) if scores else 0.95
                 
                 result = {
                     "extracted_info": ai_result,
@@ -319,7 +331,8 @@ class LabelOCRExtractor:
                     "extraction_timestamp": datetime.now().isoformat(),
                     "image_path": image_path,
                     "translated": translate_to is not None,
-                    "ai_enhanced": True
+                    "ai_enhanced": True,
+                    "ai_providers": ai_detail['providers']
                 }
                 
                 self.logger.info(f"✅ AI API OCR 완료: {len(ai_result)}개 항목")
@@ -331,11 +344,12 @@ class LabelOCRExtractor:
         # 이미지 전처리
         processed_image = self._preprocess_image(image_path)
         
-        # OCR 텍스트 추출 (한글 우선)
-        extracted_text = self._extract_text(processed_image, use_advanced_ocr)
+        # OCR 텍스트 추출 (한글 우선, 좌표가 있는 토큰은 영양성분표 복원에 사용)
+        ocr_tokens = []
+        extracted_text = self._extract_text(processed_image, use_advanced_ocr, tokens=ocr_tokens)
         
         # 정보 추출
-        label_info = self._extract_information(extracted_text)
+        label_info, field_spans = self._extract_information(extracted_text)
         
         # 데이터 정규화
         normalized_info = self.data_normalizer.normalize_data(label_info)
@@ -349,10 +363,16 @@ class LabelOCRExtractor:
         # 신뢰도 평가
         confidence_scores = self._calculate_confidence(extracted_text, normalized_info)
         
+        # OCR 좌표로 복원한 영양성분표 (준수성 검사기가 텍스트 추출 값보다 우선 사용)
+        nutrition_table = parse_nutrition_table(ocr_tokens) if ocr_tokens else None
+        if nutrition_table is not None and nutrition_table.rows:
+            normalized_info["nutrition_table"] = nutrition_table.to_dict()
+        
         result = {
             "extracted_info": normalized_info,
             "confidence_scores": confidence_scores,
             "raw_text": extracted_text,
+            "field_spans": field_spans,
             "extraction_timestamp": datetime.now().isoformat(),
             "image_path": image_path,
             "translated": translate_to is not None,
@@ -370,63 +390,56 @@ class LabelOCRExtractor:
             if image is None:
                 raise ValueError(f"이미지를 로드할 수 없습니다: {image_path}")
             
-            # 그레이스케일 변환
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
-            # 노이즈 제거
-            denoised = cv2.fastNlMeansDenoising(gray)
-            
-            # 대비 향상
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-            enhanced = clahe.apply(denoised)
+            # 공용 전처리 파이프라인 (그레이스케일 -> 잡음제거 -> 대비 향상 -> 적응형 이진화)
+            processed, info = preprocessing_pipeline.run(image, LABEL_PREPROCESS_SETTINGS)
             
-            # 이진화 (적응형)
-            binary = cv2.adaptiveThreshold(
-                enhanced, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-                cv2.THRESH_BINARY, 11, 2
-            )
-            
-            # 모폴로지 연산으로 텍스트 선명화
-            kernel = np.ones((1,1), np.uint8)
-            processed = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
-            
-            self.logger.info("✅ 이미지 전처리 완료")
+            self.logger.info(f"✅ 이미지 전처리 완료 ({info['elapsed_ms']}ms)")
             return processed
             
         except Exception as e:
             self.logger.error(f"❌ 이미지 전처리 실패: {e}")
             return cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
     
-    def _extract_text(self, image: np.ndarray, use_advanced_ocr: bool = True) -> str:
-        """OCR을 사용한 텍스트 추출 (한글 우선)"""
+    def _extract_text(self, image: np.ndarray, use_advanced_ocr: bool = True,
+                      tokens: Optional[List[Dict]] = None) -> str:
+        """OCR을 사용한 텍스트 추출 (한글 우선)
+
+        tokens 목록을 넘기면 좌표가 있는 OCR 결과({'text', 'confidence', 'bbox'})를 채운다.
+        """
         extracted_texts = []
         
         # Tesseract OCR (한국어 우선)
-        if self.ocr_engines.get('tesseract', {}).get('available', False):
+        if TESSERACT_AVAILABLE:
             try:
-                # 한국어 우선 설정
-                tesseract_config = '--oem 3 --psm 6 -l kor+eng+chi_sim'
-                tesseract_text = pytesseract.image_to_string(image, config=tesseract_config)
-                extracted_texts.append(('tesseract', tesseract_text))
-                self.logger.info("✅ Tesseract 텍스트 추출 완료 (한국어 우선)")
+                with ocr_engine_pool.acquire('tesseract') as tesseract:
+                    if tesseract is not None:
+                        # 한국어 우선 설정
+                        tesseract_config = '--oem 3 --psm 6 -l kor+eng+chi_sim'
+                        tesseract_text = pytesseract.image_to_string(image, config=tesseract_config)
+                        extracted_texts.append(('tesseract', tesseract_text))
+                        self.logger.info("✅ Tesseract 텍스트 추출 완료 (한국어 우선)")
             except Exception as e:
                 self.logger.warning(f"❌ Tesseract 텍스트 추출 실패: {e}")
         
         # EasyOCR (한국어 우선)
-        if self.ocr_engines.get('easyocr', {}).get('available', False):
+        if EASYOCR_AVAILABLE:
             try:
-                reader = self.ocr_engines['easyocr']['reader']
-                easyocr_results = reader.readtext(image)
-                easyocr_text = '\n'.join([text[1] for text in easyocr_results])
-                extracted_texts.append(('easyocr', easyocr_text))
-                self.logger.info("✅ EasyOCR 텍스트 추출 완료 (한국어 우선)")
+                with ocr_engine_pool.acquire('easyocr') as reader:
+                    if reader is not None:
+                        easyocr_results = reader.readtext(image)
+                        if tokens is not None:
+                            tokens.extend({'text': text, 'confidence': float(confidence), 'bbox': bbox}
+                                          for bbox, text, confidence in easyocr_results)
+                        easyocr_text = '\n'.join([text[1] for text in easyocr_results])
+                        extracted_texts.append(('easyocr', easyocr_text))
+                        self.logger.info("✅ EasyOCR 텍스트 추출 완료 (한국어 우선)")
             except Exception as e:
                 self.logger.warning(f"❌ EasyOCR 텍스트 추출 실패: {e}")
         
         # OCR 엔진이 없는 경우 기본 텍스트 반환
         if not extracted_texts:
             self.logger.warning("⚠️ 사용 가능한 OCR 엔진이 없습니다. 기본 텍스트를 반환합니다.")
-            return "OCR 엔진을 사용할 수 없습니다. 이미지를 확인해주세요."
+            return NO_OCR_ENGINE_TEXT
         
         # 텍스트 결합 및 정리
         combined_text = self._combine_ocr_results(extracted_texts)
@@ -583,42 +596,33 @@ class LabelOCRExtractor:
         
         return text.strip()
     
-    def _extract_information(self, text: str) -> Dict:
-        """정규표현식을 사용한 정보 추출"""
+    def _extract_information(self, text: str) -> Tuple[Dict, Dict]:
+        """정규표현식을 사용한 정보 추출, (추출 정보, {필드: [start, end]}) 반환
+
+        모든 필드 패턴을 한 번 컴파일한 추출기로 텍스트를 한 번만 훑는다.
+        영양성분 span 키는 'nutrition.calories' 형식이다.
+        """
+        # 기본 정보 + 영양성분 추출
+        matches = self.field_extractor.extract(text)
         extracted_info = {}
-        
-        # 기본 정보 추출
-        for field, patterns in self.extraction_patterns.items():
-            if field == "nutrition":
-                # 영양성분은 별도 처리
-                extracted_info[field] = self._extract_nutrition_info(text)
-            else:
-                # 일반 필드 추출
-                for pattern in patterns:
-                    match = re.search(pattern, text, re.IGNORECASE)
-                    if match:
-                        extracted_info[field] = match.group(1).strip()
-                        break
+        for field, match in matches.items():
+            if not field.startswith("nutrition."):
+                extracted_info[field] = match.value
+        extracted_info["nutrition"] = {
+            field.split(".", 1)[1]: match.value for field, match in matches.items() if field.startswith("nutrition.")
+        }
         
         # NER 모델을 사용한 추가 정보 추출
         if self.ner_model:
             ner_info = self._extract_with_ner(text)
             extracted_info.update(ner_info)
         
-        return extracted_info
+        return extracted_info, spans_of(matches)
     
     def _extract_nutrition_info(self, text: str) -> Dict:
         """영양성분 정보 추출"""
-        nutrition_info = {}
-        
-        for nutrient, patterns in self.extraction_patterns["nutrition"].items():
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    nutrition_info[nutrient] = match.group(1).strip()
-                    break
-        
-        return nutrition_info
+        extractor = get_field_extractor(self.extraction_patterns["nutrition"])
+        return {nutrient: match.value for nutrient, match in extractor.extract(text).items()}
     
     def _extract_with_ner(self, text: str) -> Dict:
         """NER 모델을 사용한 정보 추출"""
@@ -760,6 +764,30 @@ class DataNormalizer:
             return numbers[0]
         return text
 
+_shared_extractor = None
+_shared_extractor_lock = threading.Lock()
+
+def get_label_ocr_extractor() -> LabelOCRExtractor:
+    """요청 간 공유하는 라벨 OCR 추출기 (최초 호출 시 1회 생성)"""
+    global _shared_extractor
+    if _shared_extractor is None:
+        with _shared_extractor_lock:
+            if _shared_extractor is None:
+                _shared_extractor = LabelOCRExtractor()
+    return _shared_extractor
+
+def run_label_extract_job(payload: Dict[str, Any], report_progress) -> Dict:
+    """OCR 워커 작업 핸들러 (utils.ocr_job_queue 에서 호출, 끝나면 업로드 이미지 삭제)"""
+    report_progress(0.1, "라벨 정보 추출 중")
+    try:
+        return get_label_ocr_extractor().extract_label_info(
+            payload['image_path'],
+            translate_to=payload.get('translate_to'),
+            use_ai_apis=payload.get('use_ai_apis', True)
+        )
+    finally:
+        remove_job_upload(payload['image_path'])
+
 def main():
     """OCR 라벨 추출 시스템 테스트"""
     
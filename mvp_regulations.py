@@ -5,6 +5,8 @@ import pandas as pd
 import json
 from datetime import datetime
 
+from utils.regulation_snapshot import regulation_snapshots
+
 # MVP 버전 규제 데이터 (중국, 미국만)
 MVP_REGULATIONS = {
     "중국": {
@@ -122,17 +124,16 @@ MVP_REGULATIONS = {
     }
 }
 
+regulation_snapshots.register('mvp_regulations', lambda: MVP_REGULATIONS, levels=('country', 'product', 'category'))
+
 def get_mvp_regulations(country, product):
     """MVP 버전 국가별 규제정보 조회"""
-    if country in MVP_REGULATIONS:
-        if product in MVP_REGULATIONS[country]:
-            return MVP_REGULATIONS[country][product]
-    return None
+    return regulation_snapshots.get('mvp_regulations', country, product)
 
 def search_mvp_regulations(keyword):
     """키워드로 MVP 규제정보 검색"""
     results = []
-    for country, products in MVP_REGULATIONS.items():
+    for country, products in regulation_snapshots.source('mvp_regulations').items():
         for product, regulations in products.items():
             if keyword in product or any(keyword in str(reg) for reg in regulations.values()):
                 results.append({
@@ -144,12 +145,12 @@ def search_mvp_regulations(keyword):
 
 def get_mvp_countries():
     """MVP 지원 국가 목록 반환"""
-    return list(MVP_REGULATIONS.keys())
+    return list(regulation_snapshots.source('mvp_regulations').keys())
 
 def get_mvp_products():
     """MVP 지원 제품 카테고리 목록 반환"""
     products = set()
-    for country_data in MVP_REGULATIONS.values():
+    for country_data in regulation_snapshots.source('mvp_regulations').values():
         products.update(country_data.keys())
     return list(products)
 
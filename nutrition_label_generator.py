@@ -8,6 +8,50 @@ import requests
 import json
 from typing import Dict, List, Optional
 
+from utils.font_registry import get_font_registry
+from utils.label_layout import Advance, Field, LabelTemplate, Rows, Rule, Section, Text, get_label_layouts
+
+# 기본 영양정보 라벨 레이아웃 (영역마다 고정 위치, 정적 문구/구분선은 Text/Rule, 제품별 값은 Field/Rows)
+NUTRITION_LABEL_TEMPLATE = LabelTemplate(
+    name='nutrition_basic', country='공통', version=1, placeholder="N/A",
+    ops=(
+        # 헤더 영역
+        Section(20),
+        Field(20, 'product_name', 'title', 'accent'), Advance(40),
+        Field(20, 'origin', 'body', 'text'), Advance(25),
+        Field(20, 'manufacturer', 'body', 'text'), Advance(25),
+        Field(20, 'expiry_date', 'body', 'text'), Advance(40),
+        Rule('accent', 2),
+        # 영양성분표 영역
+        Section(150),
+        Text(20, "영양성분표 (100g당)", 'header', 'accent'), Advance(30),
+        Text(20, "구분", 'body', 'text'), Text(200, "함량", 'body', 'text'), Advance(25),
+        Rule('text', 1), Advance(10),
+        Rows('nutrition', 20, ((20, 'body', 'text'), (200, 'body', 'text'))), Advance(20),
+        Rule('accent', 2),
+        # 성분 정보 영역
+        Section(350),
+        Text(20, "성분", 'header', 'accent'), Advance(25),
+        Rows('ingredients', 18, ((20, 'body', 'text'),)), Advance(10),
+        Rule('accent', 1),
+        # 알레르기 정보 영역
+        Section(450),
+        Text(20, "알레르기 정보", 'header', 'warning'), Advance(25),
+        Field(20, 'allergy', 'body', 'warning'), Advance(25),
+        Text(20, "※ 알레르기 성분이 함유된 제품입니다.", 'small', 'warning'),
+        # 보관 방법 영역
+        Section(520),
+        Text(20, "보관방법", 'header', 'accent'), Advance(25),
+        Field(20, 'storage_method', 'body', 'text'),
+        # 제조사 정보 영역
+        Section(570),
+        Field(20, 'manufacturer_detail', 'small', 'text'), Advance(15),
+        Field(20, 'address', 'small', 'text'), Advance(15),
+        Field(20, 'phone', 'small', 'text')
+    )
+)
+
+
 class NutritionLabelGenerator:
     """제품 영양정보 라벨 이미지 생성 시스템"""
     
@@ -23,55 +67,12 @@ class NutritionLabelGenerator:
         self._load_fonts()
     
     def _load_fonts(self):
-        """폰트 로딩 (개선된 예외 처리)"""
-        try:
-            # 다국어 지원 폰트 우선 시도 (중국어, 영어, 한글 모두 지원)
-            multilingual_fonts = [
-                "C:/Windows/Fonts/msyh.ttc",      # Microsoft YaHei (중국어, 영어, 한글)
-                "C:/Windows/Fonts/simsun.ttc",    # SimSun (중국어, 영어)
-                "C:/Windows/Fonts/simhei.ttf",    # SimHei (중국어, 영어)
-                "C:/Windows/Fonts/arial.ttf",     # Arial (영어, 기본)
-                "C:/Windows/Fonts/calibri.ttf",   # Calibri (영어, 기본)
-                "C:/Windows/Fonts/tahoma.ttf",    # Tahoma (영어, 기본)
-                "msyh.ttc",                       # Microsoft YaHei
-                "simsun.ttc",                     # SimSun
-                "simhei.ttf",                     # SimHei
-                "arial.ttf",                      # Arial
-                "calibri.ttf",                    # Calibri
-                "tahoma.ttf",                     # Tahoma
-                "malgun.ttf",                     # 맑은 고딕 (한글)
-                "gulim.ttc",                      # 굴림 (한글)
-            ]
-            
-            font_found = False
-            for font_path in multilingual_fonts:
-                try:
-                    self.title_font = ImageFont.truetype(font_path, 24)
-                    self.header_font = ImageFont.truetype(font_path, 18)
-                    self.body_font = ImageFont.truetype(font_path, 14)
-                    self.small_font = ImageFont.truetype(font_path, 12)
-                    print(f"✅ 다국어 폰트 로드 성공: {font_path}")
-                    font_found = True
-                    break
-                except Exception as e:
-                    print(f"❌ 폰트 로드 실패: {font_path} - {e}")
-                    continue
-            
-            if not font_found:
-                # 폰트를 찾을 수 없는 경우 기본 폰트 사용
-                self.title_font = ImageFont.load_default()
-                self.header_font = ImageFont.load_default()
-                self.body_font = ImageFont.load_default()
-                self.small_font = ImageFont.load_default()
-                print("⚠️ 다국어 폰트를 찾을 수 없어 기본 폰트를 사용합니다.")
-                
-        except Exception as e:
-            # 폰트를 찾을 수 없는 경우 기본 폰트 사용
-            self.title_font = ImageFont.load_default()
-            self.header_font = ImageFont.load_default()
-            self.body_font = ImageFont.load_default()
-            self.small_font = ImageFont.load_default()
-            print(f"⚠️ 폰트 로드 실패: {e}")
+        """폰트 로딩 (폰트 레지스트리에서 프로세스당 한 번만 탐색/로드, 없으면 기본 폰트)"""
+        fonts = get_font_registry()
+        self.title_font = fonts.get_font('multilingual', 24)
+        self.header_font = fonts.get_font('multilingual', 18)
+        self.body_font = fonts.get_font('multilingual', 14)
+        self.small_font = fonts.get_font('multilingual', 12)
     
     def _safe_draw_text(self, draw: ImageDraw.Draw, position: tuple, text: str, font: ImageFont.FreeTypeFont, fill: tuple):
         """안전한 텍스트 그리기 (중국어 지원)"""
@@ -96,78 +97,27 @@ class NutritionLabelGenerator:
                 pass
     
     def generate_nutrition_label(self, product_info: Dict, country: str = "한국") -> Image.Image:
-        """영양정보 라벨 이미지 생성"""
-        
-        # 이미지 생성
-        image = Image.new('RGB', (self.label_width, self.label_height), self.background_color)
-        draw = ImageDraw.Draw(image)
-        
-        # 제목 영역
-        self._draw_header(draw, product_info, country)
-        
-        # 영양성분표 영역
-        self._draw_nutrition_table(draw, product_info)
-        
-        # 성분 정보 영역
-        self._draw_ingredients(draw, product_info)
-        
-        # 알레르기 정보 영역
-        self._draw_allergy_info(draw, product_info)
-        
-        # 보관 방법 영역
-        self._draw_storage_info(draw, product_info)
-        
-        # 제조사 정보 영역
-        self._draw_manufacturer_info(draw, product_info)
-        
-        return image
+        """영양정보 라벨 이미지 생성 (캐시된 정적 레이어 위에 제품별 값만 그림)"""
+        fonts = {'title': self.title_font, 'header': self.header_font, 'body': self.body_font, 'small': self.small_font}
+        palette = {
+            'background': self.background_color, 'text': self.text_color,
+            'accent': self.accent_color, 'warning': self.warning_color
+        }
+        return get_label_layouts().render(NUTRITION_LABEL_TEMPLATE, (self.label_width, self.label_height),
+                                          fonts, palette, self._label_values(product_info))
     
-    def _draw_header(self, draw: ImageDraw.Draw, product_info: Dict, country: str):
-        """헤더 영역 그리기"""
-        y_position = 20
-        
-        # 제품명
-        product_name = product_info.get("product_name", "제품명")
-        self._safe_draw_text(draw, (20, y_position), product_name, self.title_font, self.accent_color)
-        y_position += 40
-        
-        # 원산지
-        origin = product_info.get("origin", "대한민국")
-        self._safe_draw_text(draw, (20, y_position), f"원산지: {origin}", self.body_font, self.text_color)
-        y_position += 25
+    def _label_values(self, product_info: Dict) -> Dict:
+        """라벨 가변 값 (제품명, 원산지, 영양성분, 성분, 알레르기, 보관 방법, 제조사)"""
+        values = {}
         
-        # 제조사
+        # 헤더 영역
+        values['product_name'] = product_info.get("product_name", "제품명")
+        values['origin'] = f"원산지: {product_info.get('origin', '대한민국')}"
         manufacturer = product_info.get("manufacturer", "제조사")
-        self._safe_draw_text(draw, (20, y_position), f"제조사: {manufacturer}", self.body_font, self.text_color)
-        y_position += 25
-        
-        # 유통기한
-        expiry_date = product_info.get("expiry_date", "유통기한")
-        self._safe_draw_text(draw, (20, y_position), f"유통기한: {expiry_date}", self.body_font, self.text_color)
-        y_position += 40
-        
-        # 구분선
-        draw.line([(20, y_position), (self.label_width-20, y_position)], fill=self.accent_color, width=2)
-        y_position += 20
-    
-    def _draw_nutrition_table(self, draw: ImageDraw.Draw, product_info: Dict):
-        """영양성분표 그리기"""
-        y_position = 150
-        
-        # 제목
-        self._safe_draw_text(draw, (20, y_position), "영양성분표 (100g당)", self.header_font, self.accent_color)
-        y_position += 30
+        values['manufacturer'] = f"제조사: {manufacturer}"
+        values['expiry_date'] = f"유통기한: {product_info.get('expiry_date', '유통기한')}"
         
-        # 표 헤더
-        self._safe_draw_text(draw, (20, y_position), "구분", self.body_font, self.text_color)
-        self._safe_draw_text(draw, (200, y_position), "함량", self.body_font, self.text_color)
-        y_position += 25
-        
-        # 구분선
-        draw.line([(20, y_position), (self.label_width-20, y_position)], fill=self.text_color, width=1)
-        y_position += 10
-        
-        # 영양성분 데이터
+        # 영양성분표 영역
         nutrition_data = product_info.get("nutrition", {
             "열량": "400 kcal",
             "단백질": "12g",
@@ -176,29 +126,9 @@ class NutritionLabelGenerator:
             "나트륨": "800mg",
             "당류": "5g"
         })
+        values['nutrition'] = list(nutrition_data.items())
         
-        for nutrient, value in nutrition_data.items():
-            self._safe_draw_text(draw, (20, y_position), nutrient, self.body_font, self.text_color)
-            self._safe_draw_text(draw, (200, y_position), value, self.body_font, self.text_color)
-            y_position += 20
-        
-        y_position += 20
-        
-        # 구분선
-        draw.line([(20, y_position), (self.label_width-20, y_position)], fill=self.accent_color, width=2)
-        y_position += 20
-        
-        return y_position
-    
-    def _draw_ingredients(self, draw: ImageDraw.Draw, product_info: Dict):
-        """성분 정보 그리기"""
-        y_position = 350
-        
-        # 제목
-        self._safe_draw_text(draw, (20, y_position), "성분", self.header_font, self.accent_color)
-        y_position += 25
-        
-        # 성분 목록
+        # 성분 정보 영역
         ingredients = product_info.get("ingredients", [
             "면류(밀가루, 소금)",
             "분말스프",
@@ -206,67 +136,24 @@ class NutritionLabelGenerator:
             "조미료",
             "향신료"
         ])
+        values['ingredients'] = [(f"• {ingredient}",) for ingredient in ingredients]
         
-        for ingredient in ingredients:
-            self._safe_draw_text(draw, (20, y_position), f"• {ingredient}", self.body_font, self.text_color)
-            y_position += 18
-        
-        y_position += 10
-        
-        # 구분선
-        draw.line([(20, y_position), (self.label_width-20, y_position)], fill=self.accent_color, width=1)
-        y_position += 15
-    
-    def _draw_allergy_info(self, draw: ImageDraw.Draw, product_info: Dict):
-        """알레르기 정보 그리기"""
-        y_position = 450
-        
-        # 제목
-        self._safe_draw_text(draw, (20, y_position), "알레르기 정보", self.header_font, self.warning_color)
-        y_position += 25
-        
-        # 알레르기 성분
+        # 알레르기 정보 영역
         allergy_ingredients = product_info.get("allergy_ingredients", ["밀", "대두"])
-        
         if allergy_ingredients:
-            allergy_text = "함유: " + ", ".join(allergy_ingredients)
-            self._safe_draw_text(draw, (20, y_position), allergy_text, self.body_font, self.warning_color)
+            values['allergy'] = "함유: " + ", ".join(allergy_ingredients)
         else:
-            self._safe_draw_text(draw, (20, y_position), "함유: 없음", self.body_font, self.text_color)
-        
-        y_position += 25
-        
-        # 주의사항
-        self._safe_draw_text(draw, (20, y_position), "※ 알레르기 성분이 함유된 제품입니다.", self.small_font, self.warning_color)
-        y_position += 20
-    
-    def _draw_storage_info(self, draw: ImageDraw.Draw, product_info: Dict):
-        """보관 방법 그리기"""
-        y_position = 520
+            values['allergy'] = ("함유: 없음", 'body', 'text')
         
-        # 제목
-        self._safe_draw_text(draw, (20, y_position), "보관방법", self.header_font, self.accent_color)
-        y_position += 25
-        
-        # 보관 방법
-        storage_method = product_info.get("storage_method", "직사광선을 피해 서늘한 곳에 보관")
-        self._safe_draw_text(draw, (20, y_position), storage_method, self.body_font, self.text_color)
-        y_position += 20
-    
-    def _draw_manufacturer_info(self, draw: ImageDraw.Draw, product_info: Dict):
-        """제조사 정보 그리기"""
-        y_position = 570
+        # 보관 방법 영역
+        values['storage_method'] = product_info.get("storage_method", "직사광선을 피해 서늘한 곳에 보관")
         
-        # 제조사 정보
-        manufacturer = product_info.get("manufacturer", "제조사")
-        address = product_info.get("address", "주소")
-        phone = product_info.get("phone", "연락처")
+        # 제조사 정보 영역
+        values['manufacturer_detail'] = f"제조사: {manufacturer}"
+        values['address'] = f"주소: {product_info.get('address', '주소')}"
+        values['phone'] = f"연락처: {product_info.get('phone', '연락처')}"
         
-        self._safe_draw_text(draw, (20, y_position), f"제조사: {manufacturer}", self.small_font, self.text_color)
-        y_position += 15
-        self._safe_draw_text(draw, (20, y_position), f"주소: {address}", self.small_font, self.text_color)
-        y_position += 15
-        self._safe_draw_text(draw, (20, y_position), f"연락처: {phone}", self.small_font, self.text_color)
+        return values
     
     def generate_chinese_nutrition_label(self, product_info: Dict) -> Image.Image:
         """중국어 영양정보 라벨 생성 (개선된 버전)"""
@@ -374,32 +261,14 @@ class NutritionLabelGenerator:
         return chinese_info
     
     def _load_chinese_fonts(self):
-        """중국어 전용 폰트 로딩"""
-        try:
-            chinese_fonts = [
-                "C:/Windows/Fonts/msyh.ttc",      # Microsoft YaHei
-                "C:/Windows/Fonts/simsun.ttc",    # SimSun
-                "C:/Windows/Fonts/simhei.ttf",    # SimHei
-                "msyh.ttc",
-                "simsun.ttc",
-                "simhei.ttf"
-            ]
-            
-            for font_path in chinese_fonts:
-                try:
-                    self.title_font = ImageFont.truetype(font_path, 24)
-                    self.header_font = ImageFont.truetype(font_path, 18)
-                    self.body_font = ImageFont.truetype(font_path, 14)
-                    self.small_font = ImageFont.truetype(font_path, 12)
-                    print(f"✅ 중국어 폰트 로드 성공: {font_path}")
-                    return
-                except:
-                    continue
-            
-            print("⚠️ 중국어 폰트를 찾을 수 없어 기본 폰트를 사용합니다.")
-            
-        except Exception as e:
-            print(f"⚠️ 중국어 폰트 로드 실패: {e}")
+        """중국어 전용 폰트 적용 (중국어 폰트가 없으면 현재 폰트 유지)"""
+        fonts = get_font_registry()
+        if fonts.resolve('chinese') is None:
+            return
+        self.title_font = fonts.find_font('chinese', 24)
+        self.header_font = fonts.find_font('chinese', 18)
+        self.body_font = fonts.find_font('chinese', 14)
+        self.small_font = fonts.find_font('chinese', 12)
     
     def _generate_fallback_label(self, product_info: Dict) -> Image.Image:
         """폴백 라벨 생성 (영어)"""
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+📊 OCR 좌표 기반 영양성분표 파서
+- OCR 토큰의 bbox 세로 중심으로 행을 묶음 (텍스트를 한 줄로 합친 뒤 정규식 검색하지 않음)
+- 행마다 영양성분명과 값/단위를 분리하고, 헤더 행(100g당, 1회 제공량당, %기준치)의 가로 위치로 열 배정
+- 토큰을 한 번만 훑어 수치/단위가 분리된 표(NutritionTable)를 만듦
+"""
+
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# 영양성분 키 -> 표기 (긴 표기부터 비교하므로 '포화지방'이 '지방'보다 먼저 매치)
+NUTRIENT_ALIASES = {
+    'calories': ['열량', '에너지', 'calories', 'energy', '能量', '热量'],
+    'sodium': ['나트륨', 'sodium', '钠'],
+    'carbohydrates': ['탄수화물', 'carbohydrates', 'carbohydrate', 'total carbohydrate', '碳水化合物'],
+    'sugar': ['당류', 'sugars', 'sugar', 'total sugars', '糖'],
+    'fiber': ['식이섬유', 'dietary fiber', 'fiber', 'fibre', '膳食纤维'],
+    'fat': ['지방', 'fat', 'total fat', '脂肪'],
+    'saturated_fat': ['포화지방', 'saturated fat', '饱和脂肪'],
+    'trans_fat': ['트랜스지방', 'trans fat', '反式脂肪'],
+    'cholesterol': ['콜레스테롤', 'cholesterol', '胆固醇'],
+    'protein': ['단백질', 'protein', '蛋白质']
+}
+
+# 헤더 열 표기
+COLUMN_PATTERNS = [
+    ('percent_nrv', re.compile(r'%\s*(?:기준치|영양성분\s*기준치|daily\s*value|dv|nrv)|기준치에\s*대한\s*비율|nrv\s*%|营养素参考值', re.IGNORECASE)),
+    ('per_100g', re.compile(r'100\s*(?:g|ml|그램|克|毫升)\s*(?:당|per)?|per\s*100\s*(?:g|ml)|每\s*100', re.IGNORECASE)),
+    ('per_serving', re.compile(r'1회\s*제공량\s*당|per\s*serving|每份', re.IGNORECASE)),
+    ('per_package', re.compile(r'총\s*내용량\s*당|per\s*(?:package|container)', re.IGNORECASE))
+]
+
+SERVING_SIZE_PATTERN = re.compile(r'1회\s*제공량|serving\s*size|总\s*内容量|총\s*내용량', re.IGNORECASE)
+
+# 쉼표 뒤 세 자리는 천 단위 구분 기호 (1,200mg), 한두 자리는 소수점 (3,5g)
+VALUE_PATTERN = re.compile(r'(\d{1,3}(?:,\d{3}(?!\d))+(?:\.\d+)?|\d+(?:\.\d+|,\d{1,2}(?!\d))?)'
+                           r'\s*(kcal|kj|mg|mcg|µg|μg|g|ml|%)(?![a-z])', re.IGNORECASE)
+THOUSANDS_PATTERN = re.compile(r'\d{1,3}(?:,\d{3})+(?:\.\d+)?')
+
+# 영양성분 값으로 쓸 열 우선순위 (규정 검증용)
+VALUE_COLUMN_PRIORITY = ['per_serving', 'per_package', 'per_100g', 'amount']
+
+_ALIAS_LOOKUP = sorted(((alias.lower(), key) for key, aliases in NUTRIENT_ALIASES.items() for alias in aliases),
+                       key=lambda item: -len(item[0]))
+
+
+@dataclass
+class NutrientValue:
+    """영양성분 값 하나 (수치와 단위 분리)"""
+    amount: float
+    unit: str
+    column: str
+    text: str
+    x: float = 0.0
+
+
+@dataclass
+class NutritionRow:
+    """영양성분표 한 행"""
+    nutrient: str
+    label: str
+    values: Dict[str, NutrientValue] = field(default_factory=dict)
+    bbox: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 0.0)
+    confidence: float = 0.0
+
+
+@dataclass
+class NutritionTable:
+    """OCR 좌표로 복원한 영양성분표"""
+    rows: List[NutritionRow] = field(default_factory=list)
+    columns: List[str] = field(default_factory=list)
+    serving_size: Optional[NutrientValue] = None
+
+    def get(self, nutrient: str, column: Optional[str] = None) -> Optional[NutrientValue]:
+        """영양성분 값 (column 이 없으면 VALUE_COLUMN_PRIORITY 순)"""
+        for row in self.rows:
+            if row.nutrient != nutrient:
+                continue
+            if column is not None:
+                return row.values.get(column)
+            for candidate in VALUE_COLUMN_PRIORITY:
+                if candidate in row.values:
+                    return row.values[candidate]
+        return None
+
+    def to_nutrition_info(self) -> Dict[str, str]:
+        """{'sodium': '350mg', ...} 형식 (LabelComplianceChecker 의 nutrition 과 같은 형식)"""
+        info = {}
+        for row in self.rows:
+            value = self.get(row.nutrient)
+            if value is not None and row.nutrient not in info:
+                info[row.nutrient] = f"{value.amount:g}{value.unit}"
+        return info
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'NutritionTable':
+        rows = [NutritionRow(nutrient=row['nutrient'], label=row.get('label', ''),
+                             values={column: NutrientValue(**value) for column, value in row.get('values', {}).items()},
+                             bbox=tuple(row.get('bbox', (0.0, 0.0, 0.0, 0.0))),
+                             confidence=row.get('confidence', 0.0))
+                for row in data.get('rows', [])]
+        serving_size = data.get('serving_size')
+        return cls(rows=rows, columns=list(data.get('columns', [])),
+                   serving_size=NutrientValue(**serving_size) if serving_size else None)
+
+
+def _token_fields(token) -> Tuple[str, float, Tuple[float, float, float, float]]:
+    """OCRResult 또는 {'text', 'confidence', 'bbox'} -> (텍스트, 신뢰도, 사각형)"""
+    if isinstance(token, dict):
+        text, confidence, bbox = token.get('text', ''), token.get('confidence', 0.0), token.get('bbox')
+    else:
+        text, confidence, bbox = token.text, token.confidence, token.bbox
+    xs = [float(p[0]) for p in bbox]
+    ys = [float(p[1]) for p in bbox]
+    return str(text), float(confidence), (min(xs), min(ys), max(xs), max(ys))
+
+
+def cluster_rows(tokens: List[Any], overlap: float = 0.5) -> List[List[Tuple[str, float, Tuple]]]:
+    """bbox 세로 중심으로 토큰을 행으로 묶고, 행 안에서는 x 순 정렬
+
+    세로 중심 차이가 (행 높이와 토큰 높이 중 큰 값) * overlap 이하이면 같은 행이다.
+    """
+    items = []
+    for token in tokens:
+        text, confidence, rect = _token_fields(token)
+        if text.strip():
+            items.append((text, confidence, rect))
+    items.sort(key=lambda item: (item[2][1] + item[2][3]) / 2)
+
+    rows = []
+    row_center = row_height = None
+    for item in items:
+        rect = item[2]
+        center, height = (rect[1] + rect[3]) / 2, rect[3] - rect[1]
+        if rows and abs(center - row_center) <= max(height, row_height) * overlap:
+            rows[-1].append(item)
+            count = len(rows[-1])
+            row_center += (center - row_center) / count
+            row_height = max(row_height, height)
+        else:
+            rows.append([item])
+            row_center, row_height = center, height
+    return [sorted(row, key=lambda item: item[2][0]) for row in rows]
+
+
+def _row_text(row) -> Tuple[str, List[float]]:
+    """행 텍스트와 글자별 추정 x 좌표 (토큰 안에서는 글자 수 비율로 보간)"""
+    text, xs = '', []
+    for index, (token_text, _, rect) in enumerate(row):
+        if index:
+            text += ' '
+            xs.append(rect[0])
+        width = rect[2] - rect[0]
+        for position in range(len(token_text)):
+            xs.append(rect[0] + width * (position + 0.5) / len(token_text))
+        text += token_text
+    return text, xs
+
+
+def _match_nutrient(label: str) -> Optional[str]:
+    normalized = re.sub(r'\s+', ' ', label).strip().lower()
+    for alias, key in _ALIAS_LOOKUP:
+        if alias in normalized:
+            return key
+    return None
+
+
+def _header_columns(text: str, xs: List[float]) -> List[Tuple[str, float]]:
+    columns = []
+    for name, pattern in COLUMN_PATTERNS:
+        for match in pattern.finditer(text):
+            if not any(match.start() < end and start < match.end() for _, _, start, end in columns):
+                columns.append((name, (xs[match.start()] + xs[match.end() - 1]) / 2, match.start(), match.end()))
+                break
+    return [(name, x) for name, x, _, _ in sorted(columns, key=lambda c: c[1])]
+
+
+class NutritionTableParser:
+    """OCR 토큰 목록 -> NutritionTable"""
+
+    def __init__(self, row_overlap: float = 0.5):
+        self.row_overlap = row_overlap
+
+    def parse(self, tokens: List[Any]) -> NutritionTable:
+        table = NutritionTable()
+        header: List[Tuple[str, float]] = []
+
+        for row in cluster_rows(tokens, self.row_overlap):
+            text, xs = _row_text(row)
+            values = list(VALUE_PATTERN.finditer(text))
+            label = text[:values[0].start()] if values else text
+            nutrient = _match_nutrient(label)
+
+            if nutrient is None:
+                columns = _header_columns(text, xs)
+                if columns:
+                    header = columns
+                    for name, _ in columns:
+                        if name not in table.columns:
+                            table.columns.append(name)
+                if values and table.serving_size is None and SERVING_SIZE_PATTERN.search(label):
+                    table.serving_size = self._value(values[0], xs, 'serving_size')
+                continue
+            if not values:
+                continue
+
+            parsed = NutritionRow(
+                nutrient=nutrient,
+                label=label.strip(' :\t'),
+                bbox=(min(r[2][0] for r in row), min(r[2][1] for r in row),
+                      max(r[2][2] for r in row), max(r[2][3] for r in row)),
+                confidence=round(sum(r[1] for r in row) / len(row), 3)
+            )
+            for index, match in enumerate(values):
+                value = self._value(match, xs, None)
+                value.column = self._assign_column(value, header, index, parsed.values)
+                if value.column not in parsed.values:
+                    parsed.values[value.column] = value
+            if not header:
+                for column in parsed.values:
+                    if column not in table.columns:
+                        table.columns.append(column)
+            table.rows.append(parsed)
+        return table
+
+    @staticmethod
+    def _value(match, xs: List[float], column: Optional[str]) -> NutrientValue:
+        unit = match.group(2)
+        unit = unit if unit == '%' else unit.lower().replace('kj', 'kJ').replace('µg', 'mcg').replace('μg', 'mcg')
+        number = match.group(1)
+        number = number.replace(',', '') if THOUSANDS_PATTERN.fullmatch(number) else number.replace(',', '.')
+        return NutrientValue(amount=float(number), unit=unit, column=column or '',
+                             text=match.group(0), x=round((xs[match.start()] + xs[match.end() - 1]) / 2, 1))
+
+    @staticmethod
+    def _assign_column(value: NutrientValue, header: List[Tuple[str, float]], index: int,
+                       taken: Dict[str, NutrientValue]) -> str:
+        """헤더가 있으면 가장 가까운 열, 없으면 단위로 결정 (%는 기준치 비율)"""
+        if value.unit == '%':
+            return 'percent_nrv'
+        amount_columns = [(name, x) for name, x in header if name != 'percent_nrv']
+        if amount_columns:
+            return min(amount_columns, key=lambda column: abs(column[1] - value.x))[0]
+        return 'amount' if 'amount' not in taken else f"amount_{index + 1}"
+
+
+def parse_nutrition_table(tokens: List[Any]) -> NutritionTable:
+    """OCR 토큰(OCRResult 또는 dict) 목록에서 영양성분표 복원"""
+    return NutritionTableParser().parse(tokens)
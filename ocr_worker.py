@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+OCR 워커 실행 스크립트
+- 웹 서버(gunicorn)와 별도로 실행되어 ocr_jobs.db 큐의 작업을 처리
+- 사용법: python ocr_worker.py --workers 2 --warm-up easyocr,tesseract
+- 웹 프로세스 안에서 워커를 띄우려면 OCR_WORKER_EMBEDDED=true (단일 프로세스 개발 서버용)
+"""
+
+import logging
+
+from utils.ocr_job_queue import main
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -5,7 +5,6 @@ PDF 시장 진출 전략보고서 처리기
 KOTRA 진출전략보고서 PDF를 파싱하여 구조화된 데이터로 변환
 """
 
-import fitz  # PyMuPDF
 import json
 import os
 import re
@@ -16,6 +15,7 @@ import logging
 
 # 기존 파서 import
 from market_entry_strategy_parser import MarketEntryStrategyParser, MarketEntryReport
+from utils.pdf_page_stream import iter_pdf_pages
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -28,6 +28,7 @@ class PDFMarketStrategyProcessor:
         self.parser = MarketEntryStrategyParser()
         self.upload_dir = "uploaded_documents"
         self.cache_dir = "regulation_cache"
+        self.ocr_workers = int(os.environ.get('PDF_OCR_WORKERS', 2))
         
         # 디렉토리 생성
         os.makedirs(self.cache_dir, exist_ok=True)
@@ -66,23 +67,28 @@ class PDFMarketStrategyProcessor:
             return None
     
     def _extract_text_from_pdf(self, pdf_path: str) -> Optional[str]:
-        """PDF에서 텍스트 추출"""
+        """PDF에서 텍스트 추출 (페이지 단위 스트리밍, 스캔 페이지는 OCR)"""
         try:
-            doc = fitz.open(pdf_path)
-            text = ""
-            
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                page_text = page.get_text()
-                text += page_text + "\n"
-            
-            doc.close()
-            return text.strip()
+            page_texts = []
+            for page in iter_pdf_pages(pdf_path, ocr=self._page_ocr(), ocr_workers=self.ocr_workers):
+                if page.source == 'image_only':
+                    logger.warning(f"⚠️ {page.page}페이지는 스캔 이미지이나 OCR 엔진이 없어 건너뜀")
+                page_texts.append(page.text)
+            return "\n".join(page_texts).strip()
             
         except Exception as e:
             logger.error(f"❌ PDF 텍스트 추출 오류: {e}")
             return None
     
+    def _page_ocr(self):
+        """스캔 페이지 OCR 함수 (로컬 OCR 엔진이 없으면 None)"""
+        try:
+            from batch_ocr_processor import get_batch_ocr_processor
+        except ImportError:
+            return None
+        processor = get_batch_ocr_processor()
+        return processor.ocr_image if processor.select_engine() else None
+    
     def _save_report_to_cache(self, report: MarketEntryReport, country: str, product: str):
         """보고서를 캐시에 저장"""
         try:
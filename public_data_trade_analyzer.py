@@ -12,6 +12,11 @@ import os
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
 
+from trade_analytics_engine import (
+    columns_from_records, compute_scores, classify_trend,
+    classify_recommendation, rank_within_groups
+)
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -91,44 +96,9 @@ class PublicDataTradeAnalyzer:
         logger.info("✅ 공공데이터 수출입 실적 분석기 초기화 완료")
     
     def get_trade_data(self, hs_code: str) -> Optional[Dict]:
-        """특정 HS CODE의 수출입 실적 데이터 조회"""
-        try:
-            logger.info(f"🔍 HS CODE {hs_code} 수출입 실적 데이터 조회 시작")
-            
-            # 캐시 확인
-            cache_key = f"trade_data_{hs_code}"
-            cached_data = self._load_from_cache(cache_key)
-            if cached_data:
-                logger.info(f"✅ 캐시된 데이터 사용: {cache_key}")
-                return cached_data
-            
-            # 공공데이터포털에서 데이터 다운로드
-            trade_data = self._download_public_data(hs_code)
-            
-            if trade_data:
-                # 시장 유망도 랭킹 계산
-                ranking_data = self._calculate_market_ranking(trade_data)
-                
-                # 결과 통합
-                result = {
-                    "hs_code": hs_code,
-                    "trade_data": trade_data,
-                    "ranking_data": ranking_data,
-                    "analysis_summary": self._generate_analysis_summary(trade_data, ranking_data),
-                    "created_at": datetime.now().isoformat()
-                }
-                
-                # 캐시 저장
-                self._save_to_cache(cache_key, result)
-                logger.info(f"✅ HS CODE {hs_code} 데이터 조회 완료")
-                return result
-            else:
-                logger.warning(f"⚠️ HS CODE {hs_code} 데이터 없음")
-                return None
-                
-        except Exception as e:
-            logger.error(f"❌ 수출입 실적 데이터 조회 중 오류: {str(e)}")
-            return None
+        """특정 HS CODE의 수출입 실적 데이터 조회 (일괄 조회와 같은 랭킹 경로 사용)"""
+        logger.info(f"🔍 HS CODE {hs_code} 수출입 실적 데이터 조회 시작")
+        return self.get_trade_data_batch([hs_code]).get(hs_code)
     
     def _download_public_data(self, hs_code: str) -> Optional[List[TradePerformance]]:
         """공공데이터포털에서 데이터 다운로드"""
@@ -161,9 +131,6 @@ class PublicDataTradeAnalyzer:
                 export_amount, import_amount, market_share, growth_rate, volatility
             )
             
-            # 랭킹 계산 (임시)
-            ranking = np.random.randint(1, 100)
-            
             # 트렌드 방향
             if growth_rate > 0.1:
                 trend_direction = "상승"
@@ -190,7 +157,7 @@ class PublicDataTradeAnalyzer:
                 growth_rate=growth_rate,
                 volatility=volatility,
                 market_potential_score=market_potential_score,
-                ranking=ranking,
+                ranking=0,
                 trend_direction=trend_direction,
                 risk_level=risk_level,
                 created_at=datetime.now().isoformat()
@@ -198,6 +165,11 @@ class PublicDataTradeAnalyzer:
             
             sample_data.append(performance)
         
+        # 시장 잠재력 점수 내림차순 순위
+        ordered = sorted(sample_data, key=lambda performance: -performance.market_potential_score)
+        for rank, performance in enumerate(ordered, start=1):
+            performance.ranking = rank
+        
         return sample_data
     
     def _calculate_market_potential(self, export_amount: float, import_amount: float, 
@@ -225,57 +197,106 @@ class PublicDataTradeAnalyzer:
             return 0.0
     
     def _calculate_market_ranking(self, trade_data: List[TradePerformance]) -> List[MarketRanking]:
-        """시장 유망도 랭킹 계산"""
+        """시장 유망도 랭킹 계산 (HS CODE 별 종합 점수 내림차순, 일괄 계산과 같은 결과)"""
+        return self._calculate_market_ranking_batch(trade_data)
+    
+    def get_trade_data_batch(self, hs_codes: List[str]) -> Dict[str, Optional[Dict]]:
+        """여러 HS CODE 의 수출입 실적 데이터를 조회하고 랭킹을 한 번에 계산"""
+        results: Dict[str, Optional[Dict]] = {}
+        pending: Dict[str, List[TradePerformance]] = {}
+        
         try:
-            rankings = []
-            
-            for performance in trade_data:
-                # 종합 점수 계산
-                overall_score = self._calculate_overall_score(performance)
-                
-                # 성장 잠재력 계산
-                growth_potential = self._calculate_growth_potential(performance)
+            for hs_code in hs_codes:
+                if hs_code in results or hs_code in pending:
+                    continue
                 
-                # 안정성 점수 계산
-                stability_score = self._calculate_stability_score(performance)
+                cache_key = f"trade_data_{hs_code}"
+                cached_data = self._load_from_cache(cache_key)
+                if cached_data:
+                    logger.info(f"✅ 캐시된 데이터 사용: {cache_key}")
+                    results[hs_code] = cached_data
+                    continue
                 
-                # 리스크 점수 계산
-                risk_score = self._calculate_risk_score(performance)
+                trade_data = self._download_public_data(hs_code)
+                if trade_data:
+                    pending[hs_code] = trade_data
+                else:
+                    logger.warning(f"⚠️ HS CODE {hs_code} 데이터 없음")
+                    results[hs_code] = None
+            
+            # 모든 HS CODE 의 랭킹을 한 번의 배열 연산으로 계산
+            all_trade_data = [performance for trade_data in pending.values() for performance in trade_data]
+            all_rankings = self._calculate_market_ranking_batch(all_trade_data)
+            
+            offset = 0
+            for hs_code, trade_data in pending.items():
+                ranking_data = all_rankings[offset:offset + len(trade_data)]
+                offset += len(trade_data)
                 
-                # 시장 잠재력 (기존 계산값 사용)
-                market_potential = performance.market_potential_score
-                
-                # 랭킹 계산 (임시)
-                ranking = np.random.randint(1, 50)
-                ranking_change = np.random.randint(-5, 6)
-                
-                # 트렌드 분석
-                trend_analysis = self._analyze_trend(performance)
-                
-                # 추천사항
-                recommendation = self._generate_recommendation(performance, overall_score)
-                
-                ranking_data = MarketRanking(
+                result = {
+                    "hs_code": hs_code,
+                    "trade_data": trade_data,
+                    "ranking_data": ranking_data,
+                    "analysis_summary": self._generate_analysis_summary(trade_data, ranking_data),
+                    "created_at": datetime.now().isoformat()
+                }
+                self._save_to_cache(f"trade_data_{hs_code}", result)
+                results[hs_code] = result
+            
+            logger.info(f"✅ HS CODE {len(results)}개 일괄 조회 완료")
+            return {hs_code: results.get(hs_code) for hs_code in hs_codes}
+            
+        except Exception as e:
+            logger.error(f"❌ 수출입 실적 데이터 일괄 조회 중 오류: {str(e)}")
+            return {hs_code: results.get(hs_code) for hs_code in hs_codes}
+    
+    def _calculate_market_ranking_batch(self, trade_data: List[TradePerformance]) -> List[MarketRanking]:
+        """시장 유망도 랭킹 일괄 계산 (NumPy 배열 연산)
+        
+        점수는 _calculate_overall_score 등 행 단위 메서드와 같은 값을 내고,
+        랭킹은 HS CODE 별 종합 점수 내림차순(argsort)으로 매긴다.
+        입력 순서와 같은 순서의 MarketRanking 목록을 반환한다.
+        """
+        try:
+            if not trade_data:
+                return []
+            
+            columns = columns_from_records(trade_data)
+            scores = compute_scores(columns, self.ranking_weights)
+            
+            # 행 단위 메서드의 round(x, 2) 와 같은 결과를 내도록 내장 round 사용
+            rounded = {
+                name: [round(value, 2) for value in scores[name].tolist()]
+                for name in ("overall_score", "growth_potential", "stability_score", "risk_score")
+            }
+            overall_score = np.array(rounded["overall_score"])
+            
+            rankings = rank_within_groups(columns["hs_code"], overall_score)
+            ranking_changes = np.random.randint(-5, 6, size=len(trade_data))
+            trend_analysis = classify_trend(columns["growth_rate"])
+            recommendations = classify_recommendation(overall_score)
+            created_at = datetime.now().isoformat()
+            
+            return [
+                MarketRanking(
                     hs_code=performance.hs_code,
                     country=performance.country,
-                    overall_score=overall_score,
-                    market_potential=market_potential,
-                    growth_potential=growth_potential,
-                    stability_score=stability_score,
-                    risk_score=risk_score,
-                    ranking=ranking,
-                    ranking_change=ranking_change,
-                    trend_analysis=trend_analysis,
-                    recommendation=recommendation,
-                    created_at=datetime.now().isoformat()
+                    overall_score=rounded["overall_score"][i],
+                    market_potential=performance.market_potential_score,
+                    growth_potential=rounded["growth_potential"][i],
+                    stability_score=rounded["stability_score"][i],
+                    risk_score=rounded["risk_score"][i],
+                    ranking=int(rankings[i]),
+                    ranking_change=int(ranking_changes[i]),
+                    trend_analysis=trend_analysis[i],
+                    recommendation=recommendations[i],
+                    created_at=created_at
                 )
-                
-                rankings.append(ranking_data)
-            
-            return rankings
+                for i, performance in enumerate(trade_data)
+            ]
             
         except Exception as e:
-            logger.error(f"❌ 시장 유망도 랭킹 계산 중 오류: {str(e)}")
+            logger.error(f"❌ 시장 유망도 랭킹 일괄 계산 중 오류: {str(e)}")
             return []
     
     def _calculate_overall_score(self, performance: TradePerformance) -> float:
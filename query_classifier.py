@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+컴파일된 자연어 질의 분류기
+- 의도/국가/품목을 하나의 교대식 정규식으로 질의를 한 번 훑어 매칭 (HS코드는 별도 패턴)
+- 동일 질의 반복 시 분류 결과 재사용 (LRU)
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Pattern, Tuple
+
+DEFAULT_HS_PATTERN = r'HS코드\s*(\d{4,8})|(\d{4,8})\s*HS코드'
+
+
+@dataclass(frozen=True)
+class ClassifiedQuery:
+    """분류된 질의"""
+    intent: str
+    country: Optional[str]
+    product: Optional[str]
+    hs_code: Optional[str]
+    matched_intents: FrozenSet[str]
+
+    @property
+    def entities(self) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        return self.country, self.product, self.hs_code
+
+
+def _alternation(alternatives: List[str]) -> str:
+    return '|'.join(f'(?:{a})' for a in alternatives)
+
+
+class QueryClassifier:
+    """의도 키워드와 엔티티 사전을 하나의 정규식으로 컴파일한 분류기
+
+    각 의도/엔티티는 하나의 `(?=(?P<g0>...)|(?P<g1>...)|...)` 교대식의 이름 있는 그룹이 되므로
+    질의를 finditer 로 한 번 훑으면 키워드가 시작되는 위치마다 매칭된 그룹을 얻는다.
+    같은 위치에서 여러 그룹이 시작될 수 있으므로 그 위치에서만 나머지 그룹을 확인한다.
+    의도와 엔티티는 선언 순서가 우선순위이며, 기존 순차 `re.search`/`in` 검사와 같은 결과를 낸다.
+    """
+
+    def __init__(self, intent_patterns: Dict[str, List[str]],
+                 countries: Optional[Dict[str, List[str]]] = None,
+                 products: Optional[Dict[str, List[str]]] = None,
+                 hs_pattern: Optional[str] = DEFAULT_HS_PATTERN,
+                 default_intent: str = "general",
+                 cache_size: int = 1024):
+        self.default_intent = default_intent
+        self.cache_size = cache_size
+        self._groups: List[Tuple[str, str, str]] = []  # (group, kind, name)
+
+        flags = re.IGNORECASE | re.DOTALL
+        parts = []
+        # 같은 위치에서 시작하는 다른 그룹 확인용 (그룹별 패턴)
+        self._group_patterns: Dict[str, Pattern] = {}
+        for kind, table in (("intent", intent_patterns), ("country", countries or {}),
+                            ("product", products or {})):
+            for name, alternatives in table.items():
+                group = f"g{len(self._groups)}"
+                self._groups.append((group, kind, name))
+                parts.append(f"(?P<{group}>{_alternation(alternatives)})")
+                self._group_patterns[group] = re.compile(_alternation(alternatives), flags)
+
+        # 폭 0 전방탐색이므로 finditer 가 키워드끼리 겹쳐도 모든 시작 위치를 찾음
+        self._pattern: Pattern = re.compile("(?=" + "|".join(parts) + ")", flags) if parts else None
+        self._hs_pattern: Optional[Pattern] = re.compile(hs_pattern) if hs_pattern else None
+
+        self._cache: "OrderedDict[str, ClassifiedQuery]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def classify(self, query: str) -> ClassifiedQuery:
+        """질의 분류 (동일 질의는 캐시에서 반환)"""
+        key = " ".join(query.split())
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.stats['hits'] += 1
+                return cached
+            self.stats['misses'] += 1
+
+        result = self._classify(key)
+
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def _classify(self, query: str) -> ClassifiedQuery:
+        matched = set()
+        for match in (self._pattern.finditer(query) if self._pattern else ()):
+            matched.add(match.lastgroup)
+            position = match.start()
+            for group, _, _ in self._groups:
+                if group not in matched and self._group_patterns[group].match(query, position):
+                    matched.add(group)
+
+        found = {"intent": [], "country": [], "product": []}
+        for group, kind, name in self._groups:
+            if group in matched:
+                found[kind].append(name)
+
+        hs_code = None
+        if self._hs_pattern:
+            hs_match = self._hs_pattern.search(query)
+            if hs_match:
+                hs_code = next((g for g in hs_match.groups() if g), hs_match.group(0))
+
+        return ClassifiedQuery(
+            intent=found["intent"][0] if found["intent"] else self.default_intent,
+            country=found["country"][0] if found["country"] else None,
+            product=found["product"][0] if found["product"] else None,
+            hs_code=hs_code,
+            matched_intents=frozenset(found["intent"])
+        )
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
@@ -25,6 +25,8 @@ import schedule
 from dataclasses import dataclass
 from pathlib import Path
 
+from utils.regulation_snapshot import regulation_snapshots
+
 @dataclass
 class RegulationSource:
     """규제 데이터 출처 정보"""
@@ -436,6 +438,9 @@ class RealTimeRegulationCrawler:
         with self.data_lock:
             self.live_data[f"{country}_{product_type}"] = regulations
         
+        # 규제 스냅샷 발행 (사용처는 재시작 없이 새 버전을 조회)
+        regulation_snapshots.publish('realtime_regulations', regulations, path=(country, product_type))
+        
         return regulations
     
     def update_all_regulations(self, product_type: str = "라면"):
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+대량 라벨 렌더링 테스트
+제품 × 국가 zip/manifest, 프로세스 풀 결과가 단일 라벨 생성과 동일, 실패 라벨 기록, 디렉터리 출력 검증
+"""
+
+import io
+import json
+import os
+import tempfile
+import zipfile
+
+from PIL import Image, ImageChops
+
+from advanced_label_generator import AdvancedLabelGenerator
+from batch_label_renderer import MANIFEST_NAME, BatchLabelRenderer, load_products
+
+PRODUCTS = [
+    {'id': 'ramen-01', 'product_info': {'product_name': '라면', 'allergies': ['밀'], 'expiry_date': '2027-03-01'}},
+    {'id': 'kimchi/02', 'product_info': {'product_name': '김치', 'nutrition': {'calories': 40, 'sodium': 600}}},
+    {'product_name': '된장', 'ingredients_english': ['Soybean', 'Salt']}
+]
+
+
+def _zip_contents(renderer, products, countries):
+    data = b''.join(renderer.iter_zip(products, countries))
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    return archive, json.loads(archive.read(MANIFEST_NAME))
+
+
+def test_zip_with_manifest_in_input_order():
+    renderer = BatchLabelRenderer(workers=1)
+    archive, manifest = _zip_contents(renderer, PRODUCTS, ['중국', '미국', '한국'])
+
+    assert manifest['total'] == 9 and manifest['succeeded'] == 9 and manifest['failed'] == 0
+    assert [(entry['id'], entry['country']) for entry in manifest['labels'][:4]] == [
+        ('ramen-01', '중국'), ('ramen-01', '미국'), ('ramen-01', '한국'), ('kimchi/02', '중국')]
+    assert [entry['label_type'] for entry in manifest['labels'][:3]] == ['china_2027', 'us_2025', 'basic']
+    assert manifest['labels'][3]['filename'] == '00003_kimchi_02_china_2027.png'
+    assert archive.namelist()[-1] == MANIFEST_NAME
+
+    # zip 안의 PNG 는 단일 라벨 생성 결과와 같음
+    expected = AdvancedLabelGenerator().generate_us_2025_label(PRODUCTS[0]['product_info'])
+    entry = manifest['labels'][1]
+    image = Image.open(io.BytesIO(archive.read(entry['filename'])))
+    assert (entry['width'], entry['height']) == image.size == (800, 1000)
+    assert ImageChops.difference(image.convert('RGB'), expected).getbbox() is None
+
+
+def test_process_pool_matches_in_process_and_records_failures():
+    products = PRODUCTS + [{'id': 'broken', 'product_info': {'nutrition': {'포화지방': '많음'}}}]
+    pool_renderer = BatchLabelRenderer(workers=2, chunk_size=2, min_parallel=0)
+    try:
+        parallel = list(pool_renderer.iter_render(products, ['미국', '한국']))
+        assert pool_renderer.get_stats()['parallel_batches'] == 1
+    finally:
+        pool_renderer.shutdown()
+    serial = list(BatchLabelRenderer(workers=1).iter_render(products, ['미국', '한국']))
+
+    assert [result.index for result in parallel] == list(range(8))
+    assert [result.png for result in parallel] == [result.png for result in serial]
+
+    # FOP 값이 숫자가 아니면 미국 라벨만 실패, 나머지는 계속 렌더링
+    failed = [result for result in parallel if result.png is None]
+    assert [(result.label_id, result.country) for result in failed] == [('broken', '미국')]
+    assert failed[0].manifest_entry()['success'] is False and failed[0].manifest_entry()['error']
+
+
+def test_write_directory_and_load_products():
+    renderer = BatchLabelRenderer(workers=1)
+    with tempfile.TemporaryDirectory() as directory:
+        products_path = os.path.join(directory, 'products.jsonl')
+        with open(products_path, 'w', encoding='utf-8') as f:
+            for product in PRODUCTS:
+                f.write(json.dumps(product, ensure_ascii=False) + '\n')
+        products = load_products(products_path)
+        assert products == PRODUCTS
+
+        output_dir = os.path.join(directory, 'labels')
+        manifest = renderer.write_directory(products, ['중국'], output_dir)
+        with open(os.path.join(output_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            assert json.load(f)['labels'] == manifest['labels']
+        files = sorted(name for name in os.listdir(output_dir) if name.endswith('.png'))
+        assert files == [entry['filename'] for entry in manifest['labels']]
+
+
+if __name__ == "__main__":
+    test_zip_with_manifest_in_input_order()
+    test_process_pool_matches_in_process_and_records_failures()
+    test_write_directory_and_load_products()
+    print("✅ 대량 라벨 렌더링 테스트 통과")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+다중 문서 일괄 OCR 테스트
+Tesseract 페이지 병렬 처리, EasyOCR 묶음 인식, PDF 텍스트 레이어/이미지 페이지 분리, 문서별 결과 검증
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from batch_ocr_processor import BatchOCRProcessor
+from utils.ocr_engine_pool import ocr_engine_pool
+
+
+def _write_images(work_dir, sizes):
+    paths = []
+    for i, (height, width) in enumerate(sizes):
+        path = os.path.join(work_dir, f"doc_{i}.png")
+        cv2.imwrite(path, np.full((height, width, 3), 255, np.uint8))
+        paths.append(path)
+    return paths
+
+
+def _with_fake_engine(name, loader, body):
+    original_slot = ocr_engine_pool._slots[name]
+    ocr_engine_pool.register(name, loader, max_concurrency=8)
+    try:
+        return body()
+    finally:
+        ocr_engine_pool._slots[name] = original_slot
+
+
+def test_tesseract_pages_run_in_parallel():
+    """다섯 문서 처리 시간이 가장 느린 문서 하나 수준"""
+    work_dir = tempfile.mkdtemp()
+    paths = _write_images(work_dir, [(100, 100 + i) for i in range(5)])
+    processor = BatchOCRProcessor(engine='tesseract', max_workers=5, result_cache=None)
+
+    def fake_page(image):
+        time.sleep(0.2)
+        return f"width {image.shape[1]}", 0.9
+
+    processor._tesseract_page = fake_page
+    started = time.time()
+    results = _with_fake_engine('tesseract', lambda: {'version': 'fake'},
+                                lambda: processor.process([{'id': f"d{i}", 'path': p} for i, p in enumerate(paths)]))
+    elapsed = time.time() - started
+    shutil.rmtree(work_dir)
+
+    assert elapsed < 0.6
+    assert [results[f"d{i}"]['text'] for i in range(5)] == [f"width {100 + i}" for i in range(5)]
+    assert all(r['engine'] == 'tesseract' and not r['cache_hit'] for r in results.values())
+
+
+def test_easyocr_batches_padded_pages():
+    """EasyOCR 는 크기를 맞춘 페이지 묶음으로 호출하고 결과를 문서별로 분배"""
+    work_dir = tempfile.mkdtemp()
+    paths = _write_images(work_dir, [(120, 80), (100, 90), (110, 60)])
+    calls = []
+
+    class FakeReader:
+        def readtext_batched(self, images, batch_size=1):
+            calls.append([image.shape for image in images])
+            return [[([[0, 0], [1, 0], [1, 1], [0, 1]], f"h{int((img[:, :, 0] < 255).sum())}", 0.8)]
+                    for img in images]
+
+    processor = BatchOCRProcessor(engine='easyocr', batch_size=8, result_cache=None)
+    results = _with_fake_engine('easyocr', FakeReader,
+                                lambda: processor.process([{'id': p, 'path': p} for p in paths]))
+    shutil.rmtree(work_dir)
+
+    assert calls == [[(120, 90, 3)] * 3]
+    assert all(results[p]['text'] == "h0" and results[p]['confidence'] == 0.8 for p in paths)
+
+
+def test_pdf_text_layer_pages_skip_ocr():
+    """텍스트 레이어가 있는 PDF 페이지는 OCR 하지 않고, 이미지 페이지만 OCR"""
+    import fitz
+
+    work_dir = tempfile.mkdtemp()
+    pdf_path = os.path.join(work_dir, "invoice.pdf")
+    with fitz.open() as pdf:
+        pdf.new_page().insert_text((72, 72), "Commercial Invoice")
+        pdf.new_page()
+        pdf.save(pdf_path)
+
+    ocr_calls = []
+    processor = BatchOCRProcessor(engine='tesseract', pdf_dpi=50, result_cache=None)
+    processor._tesseract_page = lambda image: (ocr_calls.append(image.shape) or "scanned page", 0.7)
+    results = _with_fake_engine('tesseract', lambda: {'version': 'fake'},
+                                lambda: processor.process([{'id': 'pdf', 'path': pdf_path},
+                                                           {'id': 'txt', 'path': os.path.join(work_dir, "a.txt")}]))
+    shutil.rmtree(work_dir)
+
+    pages = results['pdf']['pages']
+    assert [p['source'] for p in pages] == ['text_layer', 'ocr']
+    assert "Commercial Invoice" in pages[0]['text'] and pages[1]['text'] == "scanned page"
+    assert len(ocr_calls) == 1
+    assert 'error' in results['txt']
+
+
+def test_pdf_image_pages_rendered_within_worker_window():
+    """이미지 전용 PDF 페이지는 차례로 렌더링하고, OCR 전 메모리에 둔 페이지는 작업 창 크기 이하"""
+    import fitz
+
+    import batch_ocr_processor
+
+    work_dir = tempfile.mkdtemp()
+    pdf_path = os.path.join(work_dir, "scanned.pdf")
+    with fitz.open() as pdf:
+        for _ in range(7):
+            pdf.new_page()
+        pdf.save(pdf_path)
+
+    counts = {'rendered': 0, 'recognized': 0, 'max_in_flight': 0}
+    original_render = batch_ocr_processor.render_page
+
+    def counting_render(pdf_page, dpi):
+        counts['rendered'] += 1
+        counts['max_in_flight'] = max(counts['max_in_flight'], counts['rendered'] - counts['recognized'])
+        return original_render(pdf_page, dpi)
+
+    def fake_page(image):
+        counts['recognized'] += 1
+        return "scanned page", 0.7
+
+    processor = BatchOCRProcessor(engine='tesseract', max_workers=2, pdf_dpi=50, result_cache=None)
+    processor._tesseract_page = fake_page
+    batch_ocr_processor.render_page = counting_render
+    try:
+        results = _with_fake_engine('tesseract', lambda: {'version': 'fake'},
+                                    lambda: processor.process([{'id': 'pdf', 'path': pdf_path}]))
+    finally:
+        batch_ocr_processor.render_page = original_render
+        shutil.rmtree(work_dir)
+
+    assert counts['rendered'] == counts['recognized'] == 7
+    assert counts['max_in_flight'] <= 2
+    assert [p['page'] for p in results['pdf']['pages']] == list(range(1, 8))
+    assert all(p['text'] == "scanned page" for p in results['pdf']['pages'])
+
+
+if __name__ == "__main__":
+    test_tesseract_pages_run_in_parallel()
+    test_easyocr_batches_padded_pages()
+    test_pdf_text_layer_pages_skip_ocr()
+    test_pdf_image_pages_rendered_within_worker_window()
+    print("✅ 일괄 OCR 테스트 통과")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+라벨 × 국가 일괄 준수성 검토 테스트
+일괄 결과가 check_compliance 를 하나씩 호출한 결과와 같은지, 규칙이 한 번만 컴파일되는지 검증
+"""
+
+import random
+
+from label_compliance_checker import LabelComplianceChecker, get_label_compliance_checker
+
+COUNTRIES = ["중국", "미국", "한국", "일본", "EU"]
+
+
+def _labels(count, seed=11):
+    """필드가 빠지거나 품질 문제가 섞인 라벨 묶음"""
+    rng = random.Random(seed)
+    pool = {
+        "product_name": ["한국 라면", "R", "Ramen 12345678", "辣白菜 ★", "Noodle!"],
+        "manufacturer": ["한국식품(주)", "AB", "Maker Co."],
+        "ingredients": ["면, 스프", "밀가루, 소금, 분말스프" * 40, "Wheat flour, salt"],
+        "expiry_date": ["2099-12-31", "2020-01-01", "31/12/2099", "soon"],
+        "weight": ["120g", "1 kg", "heavy"],
+        "storage": ["냉장 보관", "Keep cool*"],
+        "nutrition": [
+            {},
+            {"열량": "400kcal", "단백질": "12g", "지방": "15g", "탄수화물": "60g", "나트륨": "800mg", "당류": "5g"},
+            {"calories": "0kcal", "sodium": "20000mg", "protein": "abc"}
+        ],
+        "allergies": [["밀", "대두"], "우유, 계, 땅콩", ["a"] * 12]
+    }
+    return [{key: rng.choice(values) for key, values in pool.items() if rng.random() < 0.75}
+            for _ in range(count)]
+
+
+def test_bulk_matches_single_checks():
+    checker = LabelComplianceChecker()
+    labels = _labels(80)
+    countries = COUNTRIES + ["화성"]
+    matrix = checker.check_compliance_bulk(labels, countries, include_warnings=True)
+
+    assert len(matrix["scores"]) == len(labels) and len(matrix["scores"][0]) == len(countries)
+    for i, label in enumerate(labels):
+        for j, country in enumerate(countries):
+            single = checker.check_compliance(label, country)
+            assert abs(matrix["scores"][i][j] - single["score"]) < 0.01
+            assert matrix["compliant"][i][j] == single["compliant"]
+            assert matrix["errors"][i][j] == single["errors"]
+            assert matrix["warnings"][i][j] == single["warnings"]
+            assert matrix["error_counts"][i][j] == len(single["errors"])
+
+
+def test_rules_are_compiled_once_and_shared():
+    checker = get_label_compliance_checker()
+    assert checker is get_label_compliance_checker()
+    checker.check_compliance_bulk(_labels(2), ["중국"])
+    compiled = checker._compiled_rules
+    checker.check_compliance_bulk(_labels(3), ["미국", "EU"])
+    assert checker._compiled_rules is compiled
+    assert "warnings" not in checker.check_compliance_bulk(_labels(1), ["한국"])
+
+
+if __name__ == "__main__":
+    test_bulk_matches_single_checks()
+    test_rules_are_compiled_once_and_shared()
+    print("✅ 일괄 준수성 검토 테스트 통과")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+선언형 규제 준수 규칙 엔진 테스트
+카테고리 점수/상태, 상세 이슈 순서와 문구, 표 셀 경계, 컴파일 캐시, 문서 규칙 검증
+"""
+
+from compliance_rule_engine import CATEGORY_WEIGHTS, evaluate_compliance_rules, get_compiled_rules
+
+CHINA = {
+    'nutrition': {'required_nutrients': ['에너지', '지방', '포화지방', '나트륨'], 'unit': '100g당',
+                  'year': '2027', 'regulation': 'GB 28050-2027'},
+    'allergy': {'required_allergens': ['우유', '대두'], 'year': '2027', 'regulation': 'GB 7718-2027'},
+    'ingredients': {'restricted_additives': ['아황산나트륨', 'BHA'], 'max_levels': {'BHA': '0.02%'},
+                    'year': '2027', 'regulation': 'GB 2760-2027'},
+    'labeling': {'required_info': ['제품명', '원산지'], 'language': '중국어 필수', 'year': '2027',
+                 'regulation': 'GB 7718-2027'},
+    'packaging': {'required_info': ['총량'], 'year': '2027', 'regulation': 'GB 7718-2027'}
+}
+
+EXTRACTED = {
+    '영양성분': [
+        {'type': 'text', 'content': '포화지방 3g 에너지 200kcal'},
+        {'type': 'table', 'content': [['나트', '륨'], ['나트륨', '300mg']]}
+    ],
+    '표기사항': [
+        {'type': 'text', 'content': '제품명: 中文 라면, 우유 함유'},
+        {'type': 'text', 'content': '알레르기 유발물질 표시'}
+    ],
+    '원재료': [
+        {'type': 'text', 'content': '성분: BHA'},
+        {'type': 'text', 'content': '밀가루, 아황산나트륨, BHA 소량 첨가'}
+    ]
+}
+
+
+def test_category_checks():
+    checks = evaluate_compliance_rules(EXTRACTED, '중국', '라면', CHINA).detailed_checks
+    assert list(checks) == list(CATEGORY_WEIGHTS)
+
+    # '포화지방' 안의 '지방'도 찾고, 표는 셀마다 따로 검사 ('나트'+'륨' 은 매치되지 않음)
+    nutrition = checks['nutrition']
+    assert nutrition['details']['found'] == ['에너지', '지방', '포화지방', '나트륨']
+    assert (nutrition['status'], nutrition['score'], nutrition['issues']) == ('준수', 100.0, [])
+
+    allergy = checks['allergy']
+    assert (allergy['status'], allergy['score']) == ('미준수', 50.0)
+    assert allergy['issues'] == ['누락된 알레르기 정보: 대두']
+
+    ingredients = checks['ingredients']
+    assert (ingredients['status'], ingredients['score']) == ('미준수', 0.0)
+    assert ingredients['details']['max_levels'] == {'BHA': '0.02%'}
+
+    assert checks['labeling']['details']['missing'] == ['원산지']
+    assert checks['packaging']['issues'] == ['누락된 포장 정보: 총량']
+    # 규제 정보가 없는 카테고리
+    assert checks['manufacturing'] == {'status': '미준수', 'score': 0, 'issues': [], 'details': {
+        'required': [], 'found': [], 'missing': [], 'regulation': '', 'year': ''}}
+
+
+def test_detailed_issues():
+    issues = evaluate_compliance_rules(EXTRACTED, '중국', '라면', CHINA).detailed_issues
+    summary = [(issue['category'], issue['issue_type'], issue['current_content']) for issue in issues]
+    assert summary == [
+        ('영양성분', '단위 오류', '포화지방 3g 에너지 200kcal'),
+        ('알레르기', '누락', '표기 없음'),
+        ('알레르기', '형식 오류', '알레르기 유발물질 표시'),
+        # 제한 성분은 성분별로, 발견된 텍스트마다
+        ('성분/첨가물', '제한 성분', '밀가루, 아황산나트륨, BHA 소량 첨가'),
+        ('성분/첨가물', '제한 성분', '성분: BHA'),
+        ('성분/첨가물', '제한 성분', '밀가루, 아황산나트륨, BHA 소량 첨가'),
+        ('성분/첨가물', '표기 불충분', '성분: BHA'),
+        ('라벨 표기', '누락', '표기 없음'),
+        ('라벨 표기', '언어 오류', '알레르기 유발물질 표시'),
+        ('포장 정보', '누락', '표기 없음')
+    ]
+    unit_error = issues[0]
+    assert unit_error['regulation_reference'] == 'GB 28050-2027 (2027년)'
+    assert unit_error['example_correction'] == '포화지방 3100g당 에너지 200kcal'
+    assert issues[4]['regulation_detail'] == '중국 식품첨가물 규정에 따라 BHA 사용이 제한됩니다. (최대: 0.02%)'
+    assert issues[2]['example_correction'] == '알레르기 정보: 우유, 대두 포함'
+    assert issues[1]['additional_documents'] == ['알레르기 정보서']
+
+
+def test_rules_are_compiled_once_per_regulation_version():
+    compiled = get_compiled_rules('중국', '라면', CHINA)
+    assert get_compiled_rules('중국', '라면', dict(CHINA)) is compiled
+
+    updated = dict(CHINA, packaging={'required_info': ['총량', '개수']})
+    recompiled = get_compiled_rules('중국', '라면', updated)
+    assert recompiled is not compiled
+    assert recompiled.evaluate({}).detailed_checks['packaging']['details']['missing'] == ['총량', '개수']
+
+
+def test_document_rules():
+    regulations = {'라벨필수요소': ['제품명', '원산지'], '금지성분': ['BHA', '색소']}
+    missing, violations = get_compiled_rules('테스트', '라면', regulations).evaluate_documents({
+        '라벨': {'text': '제품명: 라면'},
+        '원료리스트': {'ingredients': ['색소 BHA', '물']},
+        '위생증명서': {'text': ''}
+    })
+    assert missing == ['라벨: 원산지 누락']
+    assert [(v['type'], v['element'], v['severity']) for v in violations] == [
+        ('label_missing', '원산지', 'critical'),
+        ('prohibited_ingredient', 'BHA', 'critical'),
+        ('prohibited_ingredient', '색소', 'critical')
+    ]
+
+
+if __name__ == "__main__":
+    test_category_checks()
+    test_detailed_issues()
+    test_rules_are_compiled_once_per_regulation_version()
+    test_document_rules()
+    print("✅ 규제 준수 규칙 엔진 테스트 통과")
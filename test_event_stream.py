@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+단계별 분석 결과 스트리밍 테스트
+SSE/NDJSON 형식, 긴 단계 중 하트비트, 오류 이벤트, 연결 종료 시 생성기 정리 검증
+"""
+
+import json
+import threading
+import time
+
+from flask import Flask, Response
+
+from utils.event_stream import EVENT_STREAM_MIMETYPES, format_sse, stream_events
+
+
+def _stages(delay=0.0):
+    yield 'stage', {'stage': 'ocr', 'total_documents': 1}
+    time.sleep(delay)
+    yield 'document', {'document_type': '라벨', 'structured_data': {'text': '제품명'}}
+    yield 'result', {'success': True, 'compliance_score': 85}
+
+
+def test_sse_and_ndjson_formats():
+    assert format_sse('result', {'점수': 85}, 3) == 'id: 3\nevent: result\ndata: {"점수": 85}\n\n'
+
+    chunks = list(stream_events(_stages(), 'sse'))
+    assert [chunk.split('\n')[1] for chunk in chunks] == ['event: stage', 'event: document', 'event: result']
+    assert json.loads(chunks[-1].split('\n')[2][len('data: '):]) == {'success': True, 'compliance_score': 85}
+
+    records = [json.loads(line) for line in stream_events(_stages(), 'ndjson')]
+    assert [(record['id'], record['event']) for record in records] == [(0, 'stage'), (1, 'document'), (2, 'result')]
+
+    try:
+        list(stream_events(_stages(), 'xml'))
+        assert False, "지원하지 않는 형식은 거부해야 함"
+    except ValueError:
+        pass
+
+
+def test_heartbeat_during_slow_stage_and_error_event():
+    chunks = list(stream_events(_stages(delay=0.25), 'sse', heartbeat=0.05))
+    assert ': keepalive\n\n' in chunks
+    assert chunks.index(': keepalive\n\n') > 0 and chunks[-1].startswith('id: 2\nevent: result')
+
+    def failing():
+        yield 'stage', {'stage': 'ocr'}
+        raise RuntimeError('OCR 엔진 오류')
+
+    records = [json.loads(line) for line in stream_events(failing(), 'ndjson')]
+    assert records[-1]['event'] == 'error' and records[-1]['data']['error'] == 'OCR 엔진 오류'
+
+
+def test_closing_stream_stops_generator():
+    cleaned = threading.Event()
+
+    def endless():
+        try:
+            while True:
+                yield 'stage', {'stage': 'ocr'}
+                time.sleep(0.01)
+        finally:
+            cleaned.set()
+
+    stream = stream_events(endless(), 'sse')
+    next(stream)
+    stream.close()
+    assert cleaned.wait(2), "연결이 끊기면 생성기의 정리 코드가 실행되어야 함"
+
+
+def test_flask_streaming_response():
+    app = Flask(__name__)
+
+    @app.route('/stream')
+    def stream():
+        return Response(stream_events(_stages(), 'ndjson'), mimetype=EVENT_STREAM_MIMETYPES['ndjson'])
+
+    response = app.test_client().get('/stream')
+    assert response.mimetype == 'application/x-ndjson'
+    events = [json.loads(line)['event'] for line in response.get_data(as_text=True).splitlines()]
+    assert events == ['stage', 'document', 'result']
+
+
+if __name__ == "__main__":
+    test_sse_and_ndjson_formats()
+    test_heartbeat_during_slow_stage_and_error_event()
+    test_closing_stream_stops_generator()
+    test_flask_streaming_response()
+    print("✅ 단계별 결과 스트리밍 테스트 통과")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+단일 패스 필드 추출기 테스트
+패턴별 re.search 루프와 같은 결과, 원문 위치(span), 우선순위 후보 목록 검증
+"""
+
+import re
+
+from label_ocr_extractor import LabelOCRExtractor
+from utils.field_extraction import NUTRITION_TEXT_PATTERNS, FieldExtractor, flatten_patterns, get_field_extractor
+
+LABEL_TEXT = """제품명: 고소한 우리밀 쿠키
+제조원 : (주)한국식품
+원산지: 대한민국
+유통기한: 2026-12-31
+영양정보 총 내용량 120g
+열량 520 kcal
+나트륨 350mg 단백질 7g 지방 24.5g
+탄수화물 68g 당류 21g 식이섬유 2g
+원료: 밀가루, 설탕, 버터
+알레르기 정보: 밀, 우유, 계란, 대두 함유
+Barcode 8801234567890"""
+
+
+def _reference(spec, text):
+    """기준 구현: 필드마다 패턴 순서대로 re.search"""
+    values = {}
+    for field, patterns in flatten_patterns(spec):
+        for pattern in patterns:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                values[field] = (match.group(1) if match.groups() else match.group(0)).strip()
+                break
+    return values
+
+
+def test_matches_per_pattern_search():
+    """라벨/영양정보 패턴 모두 기존 루프와 같은 값을 추출"""
+    label_patterns = LabelOCRExtractor._load_extraction_patterns(None)
+    for spec in (label_patterns, NUTRITION_TEXT_PATTERNS):
+        for text in (LABEL_TEXT, LABEL_TEXT.upper(), "Calories 90\nProtein: 3g contains soy", ""):
+            extracted = {field: match.value for field, match in FieldExtractor(spec).extract(text).items()}
+            assert extracted == _reference(spec, text)
+
+
+def test_spans_point_at_values_in_source():
+    matches = get_field_extractor(NUTRITION_TEXT_PATTERNS).extract(LABEL_TEXT)
+    for match in matches.values():
+        assert LABEL_TEXT[match.start:match.end] == match.value
+    assert matches['sodium'].value == '350'
+    assert matches['product_name'].value == '고소한 우리밀 쿠키'
+
+
+def test_overlapping_fields_are_all_found():
+    """같은 위치에서 시작하는 서로 다른 필드의 패턴도 모두 매치"""
+    extractor = FieldExtractor({'ingredients': [r'contains[:\s]*([^\n]+)'],
+                                'allergies': [r'contains[:\s]*([^\n]+)'],
+                                'weight': [r'(\d+)\s*g']})
+    values, spans = extractor.extract_values("Contains: milk 20g")
+    assert values == {'ingredients': 'milk 20g', 'allergies': 'milk 20g', 'weight': '20'}
+    assert spans['weight'] == [15, 17]
+
+
+def test_extract_all_keeps_candidates_in_priority_order():
+    candidates = FieldExtractor({'allergies': [r'알레르기 정보[:\s]*([^\n]+)', r'함유[:\s]*([^\n]+)']}).extract_all(
+        "대두 함유: 있음\n알레르기 정보: 밀")
+    assert [(m.value, m.pattern_index) for m in candidates['allergies']] == [('밀', 0), ('있음', 1)]
+
+
+def test_extractors_are_compiled_once():
+    assert get_field_extractor(NUTRITION_TEXT_PATTERNS) is get_field_extractor(dict(NUTRITION_TEXT_PATTERNS))
+
+
+if __name__ == "__main__":
+    test_matches_per_pattern_search()
+    test_spans_point_at_values_in_source()
+    test_overlapping_fields_are_all_found()
+    test_extract_all_keeps_candidates_in_priority_order()
+    test_extractors_are_compiled_once()
+    print("✅ 필드 추출기 테스트 통과")
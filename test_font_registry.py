@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+폰트 레지스트리 테스트
+계열별 폰트 한 번만 탐색/로드, 프로젝트 fonts/ 우선, 라벨 생성기 간 글꼴 공유, 그리지 않는 텍스트 측정 검증
+"""
+
+import os
+
+from PIL import Image, ImageDraw
+
+from utils.font_registry import FONT_FAMILIES, FONTS_DIR, FontRegistry, get_font_registry
+
+
+def test_fonts_resolved_and_loaded_once():
+    registry = FontRegistry()
+    # 프로젝트에 포함된 fonts/arial.ttf 가 영어 계열 첫 후보
+    assert registry.resolve('english') == os.path.join(FONTS_DIR, 'arial.ttf')
+    probes = registry.stats['probes']
+
+    font = registry.get_font('english', 20)
+    assert registry.get_font('english', 20) is font
+    assert registry.find_font('english', 20) is font
+    assert registry.get_font('english', 14) is not font
+    assert registry.stats['probes'] == probes
+
+    try:
+        registry.resolve('klingon')
+        assert False, "알 수 없는 계열은 거부해야 함"
+    except ValueError:
+        pass
+
+
+def test_missing_family_falls_back_to_default_font():
+    FONT_FAMILIES['test_missing'] = ['no-such-font-file.ttf']
+    try:
+        registry = FontRegistry()
+        assert registry.find_font('test_missing', 20) is None
+        default = registry.get_font('test_missing', 20)
+        assert default is registry.get_font('test_missing', 20)
+        assert registry.measure('abc', 'test_missing', 20)[0] > 0
+    finally:
+        del FONT_FAMILIES['test_missing']
+
+
+def test_measure_without_drawing():
+    registry = FontRegistry()
+    font = registry.get_font('english', 22)
+    text = 'Nutrition Facts 120g'
+
+    width, height = registry.measure(text, 'english', 22)
+    assert abs(width - font.getlength(text)) <= 2
+    ascent, descent = font.getmetrics()
+    assert height == ascent + descent
+
+    # 여러 줄: 가장 긴 줄 너비, 줄 높이 × 줄 수
+    multi_width, multi_height = registry.measure(f"{text}\nServing", 'english', 22)
+    assert multi_width == width and multi_height == 2 * height
+
+    # 측정 결과가 실제로 그린 텍스트 영역과 일치
+    image = Image.new('L', (width + 20, height + 20), 0)
+    ImageDraw.Draw(image).text((0, 0), text, fill=255, font=font)
+    left, _, right, _ = image.getbbox()
+    assert right <= width + 2
+
+
+def test_label_generators_share_fonts():
+    from advanced_label_generator import AdvancedLabelGenerator
+    from nutrition_label_generator import NutritionLabelGenerator
+
+    registry = get_font_registry()
+    first, second = AdvancedLabelGenerator(), AdvancedLabelGenerator()
+    assert first.title_font is second.title_font
+    assert NutritionLabelGenerator().body_font is NutritionLabelGenerator().body_font
+
+    # 중국어 폰트 탐색은 첫 라벨에서 한 번만, 이후 라벨은 파일 탐색/폰트 파싱 없음
+    product = {'product_name': '라면', 'ingredients': ['밀가루'], 'allergies': []}
+    first.generate_china_2027_label(product)
+    probes, faces = registry.stats['probes'], registry.stats['faces_loaded']
+    second.generate_china_2027_label(product)
+    assert (registry.stats['probes'], registry.stats['faces_loaded']) == (probes, faces)
+
+
+if __name__ == "__main__":
+    test_fonts_resolved_and_loaded_once()
+    test_missing_family_falls_back_to_default_font()
+    test_measure_without_drawing()
+    test_label_generators_share_fonts()
+    print("✅ 폰트 레지스트리 테스트 통과")
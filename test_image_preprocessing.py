@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+버퍼 재사용 전처리 파이프라인 테스트
+컬러 입력 처리, 품질 기반 단계 생략, 같은 크기 반복 시 버퍼 재할당 없음, 입력 배열 불변 검증
+"""
+
+import cv2
+import numpy as np
+
+from utils.image_preprocessing import PreprocessingPipeline
+
+FULL_SETTINGS = {
+    'enhance_resolution': True,
+    'scale_factor': 2.0,
+    'noise_reduction': 'moderate',
+    'contrast_enhancement': 'balanced',
+    'rotation_correction': True,
+    'binarization': 'adaptive',
+    'morphology': 'text_sharpening'
+}
+
+
+def _label(background=255, ink=0):
+    image = np.full((300, 400, 3), background, np.uint8)
+    for i in range(5):
+        cv2.putText(image, "Sodium 800mg", (10, 40 + i * 50), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (ink,) * 3, 2)
+    return image
+
+
+def test_color_input_runs_all_steps_to_binary_gray():
+    """3채널 입력도 대비 향상/이진화까지 적용되고 입력은 수정되지 않음"""
+    pipeline = PreprocessingPipeline(contrast_skip_range=1000)
+    image = _label(background=170, ink=120)
+    original = image.copy()
+
+    processed, info = pipeline.run(image, FULL_SETTINGS)
+    assert processed.ndim == 2 and processed.shape == (600, 800)
+    assert {'resolution_enhancement', 'noise_reduction', 'contrast_enhancement', 'binarization'} <= set(info['processing_steps'])
+    assert set(np.unique(processed)) <= {0, 255} or 'morphology' in info['processing_steps']
+    assert np.array_equal(image, original)
+
+
+def test_quality_based_skips():
+    """고대비/기울기 없는 이미지는 대비 향상/회전 보정 생략, 흐린 이미지는 잡음제거 생략"""
+    pipeline = PreprocessingPipeline()
+    _, info = pipeline.run(_label(), FULL_SETTINGS)
+    assert info['skipped_steps']['contrast_enhancement'] == 'high_contrast'
+    assert info['skipped_steps']['rotation_correction'] == 'no_skew'
+
+    blurry = cv2.GaussianBlur(_label(background=170, ink=120), (15, 15), 5)
+    _, info = pipeline.run(blurry, FULL_SETTINGS)
+    assert info['skipped_steps']['noise_reduction'] == 'low_sharpness'
+
+
+def test_max_pixels_limits_upscaling():
+    pipeline = PreprocessingPipeline(max_pixels=200 * 300)
+    processed, info = pipeline.run(_label(), FULL_SETTINGS)
+    assert info['skipped_steps']['resolution_enhancement'] == 'max_pixels'
+    assert processed.shape == (300, 400)
+
+
+def test_buffers_reused_for_same_size_images():
+    """같은 크기 이미지를 반복 처리하면 작업 버퍼를 다시 할당하지 않고, 결과는 서로 독립"""
+    pipeline = PreprocessingPipeline(contrast_skip_range=1000)
+    first, info = pipeline.run(_label(), FULL_SETTINGS)
+    assert info['buffer_allocations'] > 0
+    second, info = pipeline.run(_label(background=200), FULL_SETTINGS)
+    assert info['buffer_allocations'] == 0
+    assert not np.shares_memory(first, second)
+
+
+def test_label_extractor_uses_shared_pipeline(tmp_path):
+    from label_ocr_extractor import LabelOCRExtractor
+
+    path = str(tmp_path / "label.png")
+    cv2.imwrite(path, _label())
+    processed = LabelOCRExtractor()._preprocess_image(path)
+    assert processed.shape == (300, 400)
+    assert set(np.unique(processed)) <= {0, 255}
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    test_color_input_runs_all_steps_to_binary_gray()
+    test_quality_based_skips()
+    test_max_pixels_limits_upscaling()
+    test_buffers_reused_for_same_size_images()
+    test_label_extractor_uses_shared_pipeline(Path(tempfile.mkdtemp()))
+    print("✅ 전처리 파이프라인 테스트 통과")
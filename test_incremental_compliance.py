@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+증분 준수성 재검토 테스트
+바뀐 문서만 OCR, 바뀐 입력을 읽는 규칙만 재평가, 점수/이슈 형식 유지, 단계 결과 재사용 검증
+"""
+
+import os
+import tempfile
+
+from incremental_compliance import IncrementalComplianceAnalyzer, fingerprint
+
+LABEL = {'text': '제품명: 라면 성분: 밀가루 중량 120g 유통기한 2027-01-01 중국어 표기 영양 정보 제조사: 한국식품'}
+
+
+def _write(directory, name, content):
+    path = os.path.join(directory, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return path
+
+
+def test_only_changed_documents_are_ocred():
+    analyzer = IncrementalComplianceAnalyzer()
+    calls = []
+
+    def ocr_batch(documents):
+        calls.append([key for key, _, _ in documents])
+        results = {}
+        for key, path, _ in documents:
+            with open(path, encoding='utf-8') as f:
+                results[key] = {'text': f.read(), 'tables': []}
+        return results
+
+    def structure(ocr_result, document_type):
+        return {'text': ocr_result['text'], 'type': document_type}
+
+    with tempfile.TemporaryDirectory() as directory:
+        label = _write(directory, 'label.txt', '제품명: 라면')
+        invoice = _write(directory, 'invoice.txt', '상업송장')
+        documents = [('file-0', label, '라벨'), ('file-1', invoice, '기타문서')]
+
+        first = analyzer.analyze_documents(documents, ocr_batch, structure)
+        assert calls == [['file-0', 'file-1']] and not any(doc.reused for doc in first.values())
+
+        # 파일 이름이 달라도 내용이 같으면 재사용, 내용이 바뀐 문서만 다시 OCR
+        renamed = _write(directory, 'label-copy.txt', '제품명: 라면')
+        _write(directory, 'invoice.txt', '상업송장 포장명세서')
+        second = analyzer.analyze_documents([('file-0', renamed, '라벨'), ('file-1', invoice, '기타문서')],
+                                            ocr_batch, structure)
+        assert calls[-1] == ['file-1']
+        assert second['file-0'].reused and second['file-0'].structured_data == first['file-0'].structured_data
+        assert second['file-1'].structured_data['text'] == '상업송장 포장명세서'
+
+        # 실패한 OCR 결과는 보관하지 않아 다음 요청에서 다시 시도
+        broken = _write(directory, 'broken.txt', '???')
+        analyzer.analyze_documents([('x', broken, '라벨')], lambda docs: {'x': {'error': 'fail'}}, structure)
+        analyzer.analyze_documents([('x', broken, '라벨')], ocr_batch, structure)
+        assert calls[-1] == ['x']
+
+
+def test_only_rules_with_changed_inputs_are_reevaluated():
+    analyzer = IncrementalComplianceAnalyzer()
+    first = analyzer.evaluate({'라벨': LABEL}, '중국', '라면')
+    assert first.reused_rules == []
+
+    analysis = first.analysis
+    assert analysis['critical_issues'] == ['필수 서류 누락: 상업송장', '필수 서류 누락: 포장명세서',
+                                           '필수 서류 누락: 원산지증명서']
+    assert analysis['minor_issues'] == ['알레르기 정보 표시 권장'] and analysis['major_issues'] == []
+    # 100 - 15(서류) - 5(알레르기) + 5(문서 1개 보너스)
+    assert (analysis['overall_score'], analysis['compliance_status']) == (85, '부분 준수')
+    assert analysis['analysis_details']['missing_product_info'] == []
+    assert analysis['suggestions'][-4] == '🇨🇳 중국 특별 요건:'
+
+    # 알레르기 표기만 추가 → 알레르기 규칙만 다시 평가
+    edited = dict(LABEL, allergens='알레르기: 밀')
+    second = analyzer.evaluate({'라벨': edited}, '중국', '라면')
+    assert second.evaluated_rules == ['allergy']
+    assert second.analysis['overall_score'] == 90 and second.analysis['minor_issues'] == []
+
+    # 국가만 바뀌면 국가에 따라 달라지는 언어 규칙만 다시 평가
+    third = analyzer.evaluate({'라벨': edited}, '미국', '라면')
+    assert third.evaluated_rules == ['language']
+    assert '영어 라벨 표기 필수' in third.analysis['critical_issues']
+
+
+def test_section_fingerprints_and_stage_memoization():
+    assert fingerprint({'a': 1, 'b': [1, 2]}) == fingerprint({'b': [1, 2], 'a': 1})
+    assert fingerprint({'a': 1}) != fingerprint({'a': 2})
+
+    analyzer = IncrementalComplianceAnalyzer()
+    calls = []
+    compute = lambda: calls.append(1) or {'score': 80, 'issues': ['x']}
+    key = ('중국', '라면', fingerprint({'name': '회사'}), fingerprint({'name': '제품'}))
+    result, reused = analyzer.memoize('dynamic_score', key, compute)
+    again, reused_again = analyzer.memoize('dynamic_score', key, compute)
+    assert (reused, reused_again) == (False, True) and again is result and len(calls) == 1
+    try:
+        again['issues'].append('y')
+        assert False, "공유 결과는 읽기 전용이어야 함"
+    except TypeError:
+        pass
+    # 지문이 없는 입력은 항상 계산
+    analyzer.memoize('dynamic_score', None, compute)
+    assert len(calls) == 2
+
+
+if __name__ == "__main__":
+    test_only_changed_documents_are_ocred()
+    test_only_rules_with_changed_inputs_are_reevaluated()
+    test_section_fingerprints_and_stage_memoization()
+    print("✅ 증분 준수성 재검토 테스트 통과")
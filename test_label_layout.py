@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+컴파일된 라벨 레이아웃 테스트
+정적 레이어 한 번만 컴파일, 직접 그린 결과와 픽셀 단위 동일, 빈 값 대체 문구, 라벨 생성기 적용 검증
+"""
+
+from PIL import Image, ImageChops, ImageDraw
+
+from utils.font_registry import get_font_registry
+from utils.label_layout import (RULE_MARGIN, Advance, Field, LabelLayoutCache, LabelTemplate, Rows, Rule,
+                                Section, Text, get_label_layouts)
+
+FONTS = {'header': get_font_registry().get_font('english', 20), 'body': get_font_registry().get_font('english', 14)}
+PALETTE = {'background': (255, 255, 255), 'text': (0, 0, 0), 'accent': (0, 100, 200)}
+
+TEMPLATE = LabelTemplate(
+    name='test', country='테스트', version=1, placeholder="N/A",
+    ops=(
+        Section(10),
+        Field(10, 'name', 'header', 'accent'), Advance(30), Rule('accent', 2), Advance(10),
+        Text(10, "Nutrition", 'header', 'accent'), Advance(25),
+        Rows('rows', 16, ((10, 'body', 'text'), (150, 'body', 'text'))), Advance(10),
+        Rule('text', 1), Advance(10),
+        Text(10, "Keep refrigerated", 'body', 'accent'), Advance(20),
+        # 긴 목록이면 위 섹션과 겹치는 고정 위치 섹션
+        Section(120),
+        Text(10, "Allergens", 'header', 'accent'), Advance(25),
+        Field(10, 'allergy', 'body', 'text')
+    )
+)
+
+
+def _draw_directly(values, size=(300, 200)):
+    """템플릿 요소를 순서대로 draw.text/draw.line 으로 그린 기준 이미지"""
+    image = Image.new('RGB', size, PALETTE['background'])
+    draw = ImageDraw.Draw(image)
+    y = 0
+
+    def text(x, value, font, color):
+        if isinstance(value, tuple):
+            value, font, color = value
+        value = "" if value is None else str(value)
+        draw.text((x, y), value if value.strip() else "N/A", fill=PALETTE[color], font=FONTS[font])
+
+    for op in TEMPLATE.ops:
+        if isinstance(op, Section) and op.y is not None:
+            y = op.y
+        elif isinstance(op, Advance):
+            y += op.dy
+        elif isinstance(op, Text):
+            text(op.x, op.text, op.font, op.color)
+        elif isinstance(op, Field):
+            text(op.x, values.get(op.key), op.font, op.color)
+        elif isinstance(op, Rule):
+            draw.line([(RULE_MARGIN, y), (size[0] - RULE_MARGIN, y)], fill=PALETTE[op.color], width=op.width)
+        elif isinstance(op, Rows):
+            for row in values[op.key]:
+                for (x, font, color), cell in zip(op.columns, row):
+                    text(x, cell, font, color)
+                y += op.pitch
+    return image
+
+
+def test_static_layer_compiled_once():
+    cache = LabelLayoutCache()
+    first = cache.render(TEMPLATE, (300, 200), FONTS, PALETTE, {'name': 'Ramen', 'rows': [('Fat', '3g')]})
+    second = cache.render(TEMPLATE, (300, 200), FONTS, PALETTE, {'name': 'Kimchi', 'rows': []})
+    assert cache.stats == {'compiled': 1, 'hits': 1}
+    assert first.size == second.size == (300, 200)
+
+    # 크기나 템플릿 버전이 바뀌면 정적 레이어를 새로 컴파일
+    cache.get(TEMPLATE, (400, 200), FONTS, PALETTE)
+    cache.get(LabelTemplate(TEMPLATE.name, TEMPLATE.country, 2, TEMPLATE.ops, TEMPLATE.placeholder),
+              (300, 200), FONTS, PALETTE)
+    assert cache.stats['compiled'] == 3
+
+    # 캐시된 기본 이미지는 라벨을 그려도 바뀌지 않음
+    layout = cache.get(TEMPLATE, (300, 200), FONTS, PALETTE)
+    base = layout.base.tobytes()
+    layout.render({'name': 'Doenjang', 'rows': [('Salt', '1g')] * 3})
+    assert layout.base.tobytes() == base
+
+
+def test_same_pixels_as_drawing_directly():
+    cache = LabelLayoutCache()
+    cases = [
+        {'name': 'Ramen', 'rows': [('Energy', '400 kcal'), ('Protein', '12g')], 'allergy': 'Wheat'},
+        # 빈 값/None 은 "N/A", 값별 글꼴/색상 지정
+        {'name': '', 'rows': [('Fat', None), (('Sugar', 'header', 'accent'), '')], 'allergy': None},
+        # 긴 목록이 고정 위치 섹션과 겹쳐도 그리는 순서 유지
+        {'name': 'Long', 'rows': [(f'Item {i}', f'{i}g') for i in range(8)], 'allergy': 'Soy, Milk'},
+        # 줄바꿈이 있는 값은 draw.text 처럼 모든 줄을 그림
+        {'name': 'Soy\nSauce', 'rows': [('Fat\n(total)', '3g\n')], 'allergy': 'Soy\n\nMilk'}
+    ]
+    for values in cases:
+        for _ in range(2):  # 두 번째는 캐시된 마스크로 그림
+            rendered = cache.render(TEMPLATE, (300, 200), FONTS, PALETTE, values)
+            assert ImageChops.difference(rendered, _draw_directly(values)).getbbox() is None, values
+
+
+def test_label_generators_use_compiled_layouts():
+    from advanced_label_generator import AdvancedLabelGenerator
+    from nutrition_label_generator import NutritionLabelGenerator
+
+    layouts = get_label_layouts()
+    generator = AdvancedLabelGenerator()
+    product = {'product_name': '라면', 'allergies': ['밀'], 'ingredients_english': ['Wheat Flour', 'Salt']}
+    first = generator.generate_us_2025_label(product)
+    compiled = layouts.stats['compiled']
+    second = generator.generate_us_2025_label({**product, 'product_name': '김치'})
+    assert layouts.stats['compiled'] == compiled
+    assert first.size == second.size == (800, 1000)
+
+    # 제품명 영역만 달라짐
+    left, top, right, bottom = ImageChops.difference(first, second).getbbox()
+    assert top >= 20 and bottom <= 60
+
+    # 줄바꿈이 있는 성분은 둘째 줄까지 그림 (첫 줄만 그리면 'Soy' 만 있는 라벨과 같아짐)
+    one_line = generator.generate_us_2025_label({**product, 'ingredients_english': ['Soy']})
+    two_lines = generator.generate_us_2025_label({**product, 'ingredients_english': ['Soy\nSauce']})
+    assert ImageChops.difference(one_line, two_lines).getbbox() is not None
+
+    basic = NutritionLabelGenerator()
+    basic.generate_nutrition_label({'product_name': '라면'})
+    compiled = layouts.stats['compiled']
+    image = basic.generate_nutrition_label({'product_name': '김치', 'nutrition': {'열량': '350 kcal'}})
+    assert layouts.stats['compiled'] == compiled and image.size == (400, 600)
+
+
+if __name__ == "__main__":
+    test_static_layer_compiled_once()
+    test_same_pixels_as_drawing_directly()
+    test_label_generators_use_compiled_layouts()
+    print("✅ 컴파일된 라벨 레이아웃 테스트 통과")
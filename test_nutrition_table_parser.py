@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+OCR 좌표 기반 영양성분표 파서 테스트
+bbox 행 묶기, 헤더 열 배정, 단위 분리, 준수성 검사기 연동 검증
+"""
+
+from advanced_ocr_processor import OCRResult
+from label_compliance_checker import LabelComplianceChecker
+from nutrition_table_parser import NutritionTable, cluster_rows, parse_nutrition_table
+
+
+def _token(text, x, y, w=80, h=16, confidence=0.9):
+    return OCRResult(text=text, confidence=confidence,
+                     bbox=[(x, y), (x + w, y), (x + w, y + h), (x, y + h)], engine='easyocr')
+
+
+def _korean_table():
+    """세 열(100g당, 1회 제공량당, %기준치) 표, 행마다 y 가 조금씩 흔들린 OCR 토큰 (순서도 섞음)"""
+    return [
+        _token("1일 영양성분 기준치에 대한 비율", 420, 12, w=200),
+        _token("100g당", 180, 10), _token("1회 제공량당", 290, 11, w=100),
+        _token("나트륨", 20, 42), _token("350mg", 180, 44), _token("175mg", 300, 41), _token("9%", 480, 43, w=30),
+        _token("열량", 20, 70), _token("520 kcal", 180, 72), _token("260 kcal", 300, 69),
+        _token("포화지방", 20, 100), _token("12g", 180, 101), _token("6g", 300, 99), _token("40%", 480, 102, w=30),
+        _token("지방 24.5g", 20, 130, w=140), _token("12.3g", 300, 131), _token("23%", 480, 129, w=30),
+        _token("단백질", 20, 160), _token("7", 180, 161, w=20), _token("g", 205, 161, w=10),
+        _token("총 내용량 120g", 20, 190, w=160),
+    ]
+
+
+def test_rows_cluster_by_vertical_center():
+    rows = cluster_rows(list(reversed(_korean_table())))
+    assert [row[0][0] for row in rows][:3] == ["100g당", "나트륨", "열량"]
+    assert [item[0] for item in rows[1]] == ["나트륨", "350mg", "175mg", "9%"]
+
+
+def test_values_are_aligned_to_header_columns():
+    table = parse_nutrition_table(_korean_table())
+    assert table.columns == ['per_100g', 'per_serving', 'percent_nrv']
+
+    sodium = table.get('sodium', 'per_100g')
+    assert (sodium.amount, sodium.unit) == (350.0, 'mg')
+    assert table.get('sodium', 'per_serving').amount == 175.0
+    assert table.get('sodium', 'percent_nrv').amount == 9.0
+    assert table.get('calories', 'per_serving').unit == 'kcal'
+
+    # '포화지방' 은 '지방' 으로 잘못 분류되지 않음, 라벨과 값이 한 토큰이어도 분리
+    assert table.get('saturated_fat', 'percent_nrv').amount == 40.0
+    assert table.get('fat', 'per_100g').amount == 24.5
+    assert table.get('fat', 'per_serving').amount == 12.3
+    # 숫자와 단위가 다른 토큰이어도 한 값으로 인식
+    assert table.get('protein', 'per_100g').amount == 7.0
+    assert (table.serving_size.amount, table.serving_size.unit) == (120.0, 'g')
+
+
+def test_table_without_header_uses_units():
+    table = parse_nutrition_table([
+        {'text': 'Sodium 140mg', 'confidence': 0.8, 'bbox': [(0, 0), (100, 0), (100, 12), (0, 12)]},
+        {'text': '6%', 'confidence': 0.8, 'bbox': [(200, 1), (220, 1), (220, 13), (200, 13)]},
+    ])
+    assert table.to_nutrition_info() == {'sodium': '140mg'}
+    assert table.get('sodium', 'percent_nrv').amount == 6.0
+
+
+def test_thousands_separator_and_decimal_comma():
+    table = parse_nutrition_table([
+        {'text': 'Sodium 1,200mg', 'confidence': 0.8, 'bbox': [(0, 0), (120, 0), (120, 12), (0, 12)]},
+        {'text': 'Energy 2,000kcal', 'confidence': 0.8, 'bbox': [(0, 30), (120, 30), (120, 42), (0, 42)]},
+        {'text': 'Fat 3,5g', 'confidence': 0.8, 'bbox': [(0, 60), (120, 60), (120, 72), (0, 72)]},
+        {'text': 'Protein 12,25g', 'confidence': 0.8, 'bbox': [(0, 90), (120, 90), (120, 102), (0, 102)]},
+    ])
+    assert table.get('sodium').amount == 1200.0
+    assert table.get('calories').amount == 2000.0
+    assert table.get('fat').amount == 3.5
+    assert table.get('protein').amount == 12.25
+
+
+def test_compliance_checker_prefers_table_values():
+    table = parse_nutrition_table(_korean_table())
+    label_info = {
+        "nutrition": {"열량": "5kcal", "나트륨": "나트륨", "단백질": "7g", "지방": "24g",
+                      "탄수화물": "60g", "당류": "5g"},
+        "nutrition_table": NutritionTable.from_dict(table.to_dict()).to_dict()
+    }
+    checker = LabelComplianceChecker()
+    errors, warnings, _ = checker._check_nutrition_requirements(label_info, checker.regulations["한국"])
+    assert not errors
+    assert not any("나트륨" in warning for warning in warnings)
+    assert checker._get_nutrition_info(label_info)["sodium"] == "175mg"
+
+
+def test_label_extractor_passes_table_to_compliance_checker():
+    """라벨 OCR 추출 결과(label_info)에 영양성분표가 담겨 준수성 검사기까지 전달"""
+    import os
+    import shutil
+    import tempfile
+
+    import cv2
+    import numpy as np
+
+    import label_ocr_extractor
+    from label_ocr_extractor import LabelOCRExtractor
+    from utils.ocr_engine_pool import ocr_engine_pool
+
+    tokens = [(token.bbox, token.text, token.confidence) for token in _korean_table()]
+
+    class FakeReader:
+        def readtext(self, image):
+            return tokens
+
+    work_dir = tempfile.mkdtemp()
+    image_path = os.path.join(work_dir, "label.png")
+    cv2.imwrite(image_path, np.full((220, 640, 3), 255, np.uint8))
+    original = (label_ocr_extractor.TESSERACT_AVAILABLE, label_ocr_extractor.EASYOCR_AVAILABLE,
+                ocr_engine_pool._slots['easyocr'])
+    label_ocr_extractor.TESSERACT_AVAILABLE, label_ocr_extractor.EASYOCR_AVAILABLE = False, True
+    ocr_engine_pool.register('easyocr', FakeReader)
+    try:
+        result = LabelOCRExtractor()._extract_label_info(image_path, use_ai_apis=False)
+    finally:
+        (label_ocr_extractor.TESSERACT_AVAILABLE, label_ocr_extractor.EASYOCR_AVAILABLE,
+         ocr_engine_pool._slots['easyocr']) = original
+        shutil.rmtree(work_dir)
+
+    label_info = result['extracted_info']
+    assert label_info['nutrition_table']['columns'] == ['per_100g', 'per_serving', 'percent_nrv']
+    assert LabelComplianceChecker()._get_nutrition_info(label_info)['sodium'] == "175mg"
+
+
+if __name__ == "__main__":
+    test_rows_cluster_by_vertical_center()
+    test_values_are_aligned_to_header_columns()
+    test_table_without_header_uses_units()
+    test_thousands_separator_and_decimal_comma()
+    test_compliance_checker_prefers_table_values()
+    test_label_extractor_passes_table_to_compliance_checker()
+    print("✅ 영양성분표 파서 테스트 통과")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+다중 엔진 OCR 캐스케이드 모드 테스트
+깨끗한 라벨은 Tesseract 만 실행, 누락 항목/저신뢰 영역이 있을 때만 다음 엔진 호출 검증
+"""
+
+import shutil
+import tempfile
+
+import numpy as np
+
+from advanced_ocr_processor import MultiEngineOCRProcessor, OCRResult
+from utils.ocr_engine_pool import ocr_engine_pool
+from utils.ocr_result_cache import OCRResultCache
+
+REQUIRED = ['제품명', '성분', '영양성분', '유통기한', '보관방법', '제조사', '원산지', '알레르기', '용량', '가격']
+ENGINES = ['tesseract', 'paddleocr', 'easyocr']
+
+
+def _box(x, y, w=40, h=10):
+    return [(x, y), (x + w, y), (x + w, y + h), (x, y + h)]
+
+
+def _words(items, engine, confidence=0.9):
+    return [OCRResult(text=text, confidence=confidence, bbox=_box(10, 12 * i), engine=engine)
+            for i, text in enumerate(items)]
+
+
+def _run(fake_outputs):
+    """엔진별 가짜 출력으로 캐스케이드 실행, (결과, 엔진별 호출 이미지 크기) 반환"""
+    work_dir = tempfile.mkdtemp()
+    original_slots = {name: ocr_engine_pool._slots[name] for name in ENGINES}
+    for name in ENGINES:
+        ocr_engine_pool.register(name, lambda: {'version': 'fake'})
+
+    calls = {name: [] for name in ENGINES}
+    try:
+        processor = MultiEngineOCRProcessor(result_cache=OCRResultCache(work_dir))
+        processor.engines = list(ENGINES)
+
+        def fake_engine(name):
+            def run(image):
+                calls[name].append(image.shape[:2])
+                return fake_outputs[name](image)
+            return run
+
+        for name in ENGINES:
+            setattr(processor, f"_process_with_{name}", fake_engine(name))
+        result = processor.process_image_parallel(np.full((200, 300, 3), 255, np.uint8),
+                                                  'general_document', mode='cascade')
+    finally:
+        ocr_engine_pool._slots.update(original_slots)
+        shutil.rmtree(work_dir)
+    return result, calls
+
+
+def test_clean_label_runs_only_tesseract():
+    """필수 항목이 모두 고신뢰도면 Tesseract 한 번으로 종료"""
+    result, calls = _run({
+        'tesseract': lambda image: _words(REQUIRED, 'tesseract'),
+        'paddleocr': lambda image: [],
+        'easyocr': lambda image: []
+    })
+    assert result['engines_run'] == ['tesseract']
+    assert calls['easyocr'] == [] and calls['paddleocr'] == []
+    assert result['cascade']['stop_reason'] == 'complete'
+    assert [s['engine'] for s in result['cascade']['skipped_engines']] == ['paddleocr', 'easyocr']
+
+
+def test_missing_items_escalate_until_no_progress():
+    """누락 항목이 있으면 다음 엔진을 실행하고, 더 찾지 못하면 중단"""
+    result, calls = _run({
+        'tesseract': lambda image: _words(REQUIRED[:-2], 'tesseract'),
+        'paddleocr': lambda image: _words(['용량'], 'paddleocr'),
+        'easyocr': lambda image: []
+    })
+    stages = result['cascade']['stages']
+    assert [s['engine'] for s in stages] == ['tesseract', 'paddleocr', 'easyocr']
+    assert stages[1]['reason'] == "누락 항목: 용량, 가격"
+    assert stages[1]['missing_after'] == ['가격']
+    assert result['cascade']['stop_reason'] == 'engines_exhausted'
+
+    result, calls = _run({
+        'tesseract': lambda image: _words(REQUIRED[:-1], 'tesseract'),
+        'paddleocr': lambda image: [],
+        'easyocr': lambda image: []
+    })
+    assert result['engines_run'] == ['tesseract', 'paddleocr']
+    assert calls['easyocr'] == []
+    assert result['cascade']['stop_reason'] == 'missing_items_unresolved'
+
+
+def test_low_confidence_region_rerun_on_crop():
+    """저신뢰 영역만 잘라서 다음 엔진에 전달하고 좌표를 원본 기준으로 복원"""
+    def tesseract(image):
+        words = _words(REQUIRED, 'tesseract')
+        words.append(OCRResult(text="나트름", confidence=0.4, bbox=_box(200, 150), engine='tesseract'))
+        return words
+
+    result, calls = _run({
+        'tesseract': tesseract,
+        'paddleocr': lambda image: [OCRResult(text="나트륨 800mg", confidence=0.95, bbox=_box(8, 8), engine='paddleocr')],
+        'easyocr': lambda image: []
+    })
+    stage = result['cascade']['stages'][1]
+    assert stage['engine'] == 'paddleocr' and stage['scope'] == 'regions' and stage['regions'] == 1
+    assert calls['paddleocr'] == [(26, 56)]
+    assert calls['easyocr'] == []
+
+    texts = {item['text']: item for item in result['text']}
+    assert "나트름" not in texts
+    assert tuple(texts["나트륨 800mg"]['bbox'][0]) == (200, 150)
+
+
+if __name__ == "__main__":
+    test_clean_label_runs_only_tesseract()
+    test_missing_items_escalate_until_no_progress()
+    test_low_confidence_region_rerun_on_crop()
+    print("✅ OCR 캐스케이드 테스트 통과")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+공간 인덱스 기반 OCR 중복 제거 테스트
+겹치는 박스만 IoU/텍스트 유사도로 병합, 떨어진 박스는 유지, 대량 토큰 처리 속도 검증
+"""
+
+import random
+import time
+
+from advanced_ocr_processor import BBoxGridIndex, MultiEngineOCRProcessor, OCRResult, _bbox_rect, _rect_iou
+
+processor = MultiEngineOCRProcessor(result_cache=None)
+
+
+def _result(text, x, y, confidence, engine='tesseract', w=60, h=14):
+    return OCRResult(text=text, confidence=confidence,
+                     bbox=[(x, y), (x + w, y), (x + w, y + h), (x, y + h)], engine=engine)
+
+
+def _brute_force(results, iou_threshold=0.5):
+    """기준 구현: 모든 쌍 비교"""
+    kept = []
+    for i in sorted(range(len(results)), key=lambda k: -results[k].confidence):
+        if not any(_rect_iou(_bbox_rect(results[i].bbox), _bbox_rect(results[j].bbox)) >= iou_threshold
+                   and processor._calculate_text_similarity(results[i].text, results[j].text) > 0.8
+                   for j in kept):
+            kept.append(i)
+    return [results[i] for i in sorted(kept)]
+
+
+def test_overlapping_duplicates_keep_highest_confidence():
+    """같은 위치의 같은 텍스트는 신뢰도 높은 결과 하나만 남김"""
+    results = [
+        _result("나트륨 800mg", 10, 10, 0.7, 'tesseract'),
+        _result("나트륨 800mg", 12, 11, 0.95, 'easyocr'),
+        _result("지방 3g", 10, 40, 0.8, 'tesseract')
+    ]
+    unique = processor._remove_duplicates(results)
+    assert [(r.text, r.engine) for r in unique] == [("나트륨 800mg", 'easyocr'), ("지방 3g", 'tesseract')]
+
+
+def test_distant_boxes_with_shared_characters_are_kept():
+    """문자 구성이 같아도 위치가 다르면 별개 결과"""
+    results = [
+        _result("1,000", 10, 10, 0.9),
+        _result("1,000", 10, 200, 0.8),
+        _result("0,001", 300, 10, 0.85)
+    ]
+    assert len(processor._remove_duplicates(results)) == 3
+
+
+def test_grid_index_query_returns_neighbours_only():
+    index = BBoxGridIndex(32)
+    index.insert(0, (0, 0, 20, 20))
+    index.insert(1, (500, 500, 520, 520))
+    assert index.query((10, 10, 30, 30)) == {0}
+
+
+def test_dense_document_matches_brute_force_and_scales():
+    """수천 토큰에서도 기준 구현과 같은 결과를 빠르게 반환"""
+    rng = random.Random(7)
+    results = []
+    for row in range(60):
+        for col in range(15):
+            text = f"항목{row}-{col}"
+            x, y = col * 70, row * 20
+            results.append(_result(text, x, y, rng.uniform(0.4, 0.9), 'tesseract'))
+            if rng.random() < 0.7:
+                results.append(_result(text, x + rng.randint(-3, 3), y + rng.randint(-2, 2),
+                                       rng.uniform(0.4, 0.99), 'easyocr'))
+
+    small = results[:400]
+    assert processor._remove_duplicates(small) == _brute_force(small)
+
+    started = time.time()
+    unique = processor._remove_duplicates(results)
+    elapsed = time.time() - started
+    assert len(unique) == 60 * 15
+    assert elapsed < 2.0
+
+
+if __name__ == "__main__":
+    test_overlapping_duplicates_keep_highest_confidence()
+    test_distant_boxes_with_shared_characters_are_kept()
+    test_grid_index_query_returns_neighbours_only()
+    test_dense_document_matches_brute_force_and_scales()
+    print("✅ OCR 중복 제거 테스트 통과")
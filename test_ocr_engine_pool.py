@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+OCR 엔진 풀 테스트
+엔진별 1회 지연 로딩, 동시 사용 수 제한, 워밍업 검증
+"""
+
+import threading
+import time
+
+from utils.ocr_engine_pool import OCREnginePool
+
+
+def test_engine_loaded_once_lazily():
+    """첫 사용 시에만 로딩하고 이후에는 같은 인스턴스 공유"""
+    pool = OCREnginePool()
+    loads = []
+    pool.register('fake', lambda: loads.append(1) or object())
+
+    assert loads == []
+    with pool.acquire('fake') as first:
+        pass
+    with pool.acquire('fake') as second:
+        pass
+    assert first is second
+    assert len(loads) == 1
+    assert pool.get_engine_status('fake')['uses'] == 2
+
+
+def test_failed_engine_yields_none():
+    """로딩 실패 엔진은 None 을 돌려주고 다시 로딩하지 않음"""
+    pool = OCREnginePool()
+    attempts = []
+
+    def broken_loader():
+        attempts.append(1)
+        raise RuntimeError("모델 없음")
+
+    pool.register('broken', broken_loader)
+    pool.register('missing', object, module='no_such_ocr_module')
+
+    for _ in range(2):
+        with pool.acquire('broken') as engine:
+            assert engine is None
+    with pool.acquire('missing') as engine:
+        assert engine is None
+
+    assert len(attempts) == 1
+    assert not pool.is_available('broken')
+    assert pool.get_engine_status('broken')['error'] == "모델 없음"
+
+
+def test_bounded_concurrency():
+    """max_concurrency 를 넘는 동시 사용은 대기 또는 TimeoutError"""
+    pool = OCREnginePool()
+    pool.register('single', object, max_concurrency=1)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def worker():
+        with pool.acquire('single'):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max(peak) == 1
+
+    with pool.acquire('single'):
+        try:
+            with pool.acquire('single', timeout=0.01):
+                assert False, "슬롯이 없으면 대기 시간 초과여야 함"
+        except TimeoutError:
+            pass
+
+
+def test_warm_up_loads_in_background():
+    """워밍업은 요청 전에 엔진을 로딩"""
+    pool = OCREnginePool()
+    pool.register('a', object)
+    pool.register('b', object)
+
+    thread = pool.warm_up(['a'], background=True)
+    thread.join(timeout=5)
+    status = pool.get_status()
+    assert status['a']['loaded'] and not status['b']['loaded']
+
+
+if __name__ == "__main__":
+    test_engine_loaded_once_lazily()
+    test_failed_engine_yields_none()
+    test_bounded_concurrency()
+    test_warm_up_loads_in_background()
+    print("✅ OCR 엔진 풀 테스트 통과")
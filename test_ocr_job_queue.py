@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+OCR 작업 큐 및 워커 프로세스 풀 테스트
+작업 등록/진행률/결과 조회, 워커 비정상 종료 시 재등록 검증
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from utils.ocr_job_queue import OCRJobQueue, OCRWorkerPool, job_upload_path, remove_job_upload, run_worker
+
+TEST_HANDLERS = {
+    'echo': 'test_ocr_job_queue:echo_handler',
+    'boom': 'test_ocr_job_queue:failing_handler'
+}
+
+
+def echo_handler(payload, report_progress):
+    report_progress(0.5, "절반 완료")
+    return {'echo': payload['value'], 'score': np.float32(0.5), 'bbox': np.array([[1, 2], [3, 4]])}
+
+
+def failing_handler(payload, report_progress):
+    raise RuntimeError("엔진 오류")
+
+
+def _queue_path():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    return path
+
+
+def test_job_lifecycle_in_process():
+    """등록 -> 처리 -> 결과 조회, 실패 작업은 오류 기록"""
+    path = _queue_path()
+    queue = OCRJobQueue(path)
+    ok_id = queue.enqueue('echo', {'value': '라벨'})
+    fail_id = queue.enqueue('boom', {})
+    assert queue.get_job(ok_id)['status'] == 'queued'
+    assert queue.get_result(ok_id) is None
+
+    assert run_worker(path, TEST_HANDLERS, max_jobs=5) == 2
+
+    job = queue.get_job(ok_id)
+    assert job['status'] == 'done' and job['progress'] == 1.0
+    assert queue.get_result(ok_id) == {'echo': '라벨', 'score': 0.5, 'bbox': [[1, 2], [3, 4]]}
+
+    failed = queue.get_job(fail_id)
+    assert failed['status'] == 'failed' and failed['error'] == "엔진 오류"
+    assert queue.get_stats() == {'queued': 0, 'running': 0, 'done': 1, 'failed': 1}
+    os.remove(path)
+
+
+def test_requeue_jobs_of_dead_worker():
+    """죽은 워커의 작업은 재시도 한도까지 다시 대기 상태가 됨"""
+    path = _queue_path()
+    queue = OCRJobQueue(path, max_attempts=2)
+    job_id = queue.enqueue('echo', {'value': 1})
+
+    assert queue.claim(worker_pid=111)['job_id'] == job_id
+    assert queue.claim(worker_pid=222) is None
+    assert queue.requeue_worker_jobs(111) == 1
+    assert queue.get_job(job_id)['status'] == 'queued'
+
+    queue.claim(worker_pid=333)
+    queue.requeue_worker_jobs(333)
+    assert queue.get_job(job_id)['status'] == 'failed'
+    os.remove(path)
+
+
+def test_requeue_stale_jobs_after_restart():
+    """재시작 전 워커가 남긴 running 작업은 heartbeat 가 끊기면 다시 대기 상태가 됨"""
+    path = _queue_path()
+    queue = OCRJobQueue(path)
+    stale_id = queue.enqueue('echo', {'value': 1})
+    live_id = queue.enqueue('echo', {'value': 2})
+    queue.claim(worker_pid=111)
+    queue.claim(worker_pid=222)
+    queue._update(stale_id, heartbeat_at='2000-01-01T00:00:00')
+
+    assert queue.requeue_stale_jobs(stale_after=60) == 1
+    assert queue.get_job(stale_id)['status'] == 'queued'
+    assert queue.get_job(live_id)['status'] == 'running'
+
+    queue._update(live_id, heartbeat_at='2000-01-01T00:00:00')
+    pool = OCRWorkerPool(path, num_workers=1, poll_interval=0.05, handlers=TEST_HANDLERS)
+    pool.start()
+    try:
+        deadline = time.time() + 60
+        while queue.get_stats()['done'] != 2 and time.time() < deadline:
+            time.sleep(0.1)
+        assert queue.get_result(live_id)['echo'] == 2
+    finally:
+        pool.stop()
+    os.remove(path)
+
+
+def test_job_upload_is_private_and_removed():
+    """작업 업로드 파일은 공개 디렉터리 밖에 저장되고 작업이 끝나면 삭제됨"""
+    path = job_upload_path("label.png")
+    assert not os.path.abspath(path).startswith(os.path.abspath("uploaded_labels"))
+    with open(path, "wb") as f:
+        f.write(b"png")
+    remove_job_upload(path)
+    assert not os.path.exists(path)
+    remove_job_upload(path)
+
+
+def test_worker_process_pool():
+    """별도 프로세스 워커가 작업을 처리하고 웹 쪽은 결과만 조회"""
+    path = _queue_path()
+    pool = OCRWorkerPool(path, num_workers=1, poll_interval=0.05, handlers=TEST_HANDLERS)
+    job_id = pool.submit('echo', {'value': 'process'})
+    assert not pool.running
+    pool.start()
+    try:
+        deadline = time.time() + 60
+        while pool.queue.get_job(job_id)['status'] != 'done' and time.time() < deadline:
+            time.sleep(0.1)
+        assert pool.queue.get_result(job_id)['echo'] == 'process'
+        assert pool.get_status()['workers'][0]['pid'] != os.getpid()
+    finally:
+        pool.stop()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    test_job_lifecycle_in_process()
+    test_requeue_jobs_of_dead_worker()
+    test_requeue_stale_jobs_after_restart()
+    test_job_upload_is_private_and_removed()
+    test_worker_process_pool()
+    print("✅ OCR 작업 큐 테스트 통과")
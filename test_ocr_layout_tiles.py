@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+레이아웃 우선(영역 타일) OCR 테스트
+축소본에서 텍스트 영역 검출, 엔진에는 타일만 전달, 결과 좌표는 원본 페이지 기준으로 복원 검증
+"""
+
+import shutil
+import tempfile
+
+import cv2
+import numpy as np
+
+from advanced_ocr_processor import AdvancedImagePreprocessor, MultiEngineOCRProcessor, OCRResult
+from utils.ocr_engine_pool import ocr_engine_pool
+from utils.ocr_result_cache import OCRResultCache
+
+BLOCKS = [(200, 300), (1800, 2600)]
+
+
+def _page():
+    """큰 흰 페이지에 떨어진 텍스트 블록 두 개"""
+    page = np.full((3000, 2400, 3), 255, np.uint8)
+    for x, y in BLOCKS:
+        for line in range(3):
+            cv2.putText(page, "NATRIUM 800mg", (x, y + line * 60), cv2.FONT_HERSHEY_SIMPLEX,
+                        1.5, (0, 0, 0), 3)
+    return page
+
+
+def _contains(rect, point):
+    return rect[0] <= point[0] <= rect[2] and rect[1] <= point[1] <= rect[3]
+
+
+def test_detects_separate_text_blocks():
+    regions = AdvancedImagePreprocessor().detect_text_regions(_page())
+    assert len(regions) == 2
+    for rect, (x, y) in zip(regions, BLOCKS):
+        assert _contains(rect, (x + 10, y - 10))
+        assert (rect[2] - rect[0]) * (rect[3] - rect[1]) < 3000 * 2400 * 0.1
+
+
+def test_blank_page_has_no_regions():
+    assert AdvancedImagePreprocessor().detect_text_regions(np.full((800, 600, 3), 255, np.uint8)) == []
+
+
+def test_tiles_are_ocred_and_mapped_back_to_page():
+    """엔진은 타일만 받고, 타일 좌표 결과가 페이지 좌표로 복원됨"""
+    work_dir = tempfile.mkdtemp()
+    original_slot = ocr_engine_pool._slots['tesseract']
+    ocr_engine_pool.register('tesseract', lambda: {'version': 'fake'})
+    shapes = []
+    try:
+        processor = MultiEngineOCRProcessor(result_cache=OCRResultCache(work_dir))
+        processor.engines = ['tesseract']
+
+        def fake_tesseract(image):
+            shapes.append(image.shape[:2])
+            return [OCRResult(text=f"블록{len(shapes)}", confidence=0.9,
+                              bbox=[(0, 0), (40, 0), (40, 20), (0, 20)], engine='tesseract')]
+
+        processor._process_with_tesseract = fake_tesseract
+        page = _page()
+        result = processor.process_image_parallel(page, 'general_document', layout_first=True)
+    finally:
+        ocr_engine_pool._slots['tesseract'] = original_slot
+        shutil.rmtree(work_dir)
+
+    info = result['preprocessing_info']
+    assert info['layout_first'] and info['tile_count'] == 2
+    assert len(shapes) == 2
+    assert all(h * w < page.shape[0] * page.shape[1] for h, w in shapes)
+
+    origins = sorted(tuple(item['bbox'][0]) for item in result['text'])
+    assert origins == sorted((rect[0], rect[1]) for rect in info['regions'])
+
+
+if __name__ == "__main__":
+    test_detects_separate_text_blocks()
+    test_blank_page_has_no_regions()
+    test_tiles_are_ocred_and_mapped_back_to_page()
+    print("✅ 레이아웃 우선 타일 OCR 테스트 통과")
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+내용 주소 기반 OCR 결과 캐시 테스트
+같은 이미지 재업로드 시 OCR 생략, 설정 변경 시 재처리, 크기 제한 LRU 정리 검증
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from utils.ocr_engine_pool import ocr_engine_pool
+from utils.ocr_result_cache import OCRResultCache, hash_file
+
+
+def test_key_depends_on_content_and_settings():
+    """파일 이름이 달라도 내용이 같으면 같은 키, 설정이 다르면 다른 키"""
+    work_dir = tempfile.mkdtemp()
+    first, second = os.path.join(work_dir, "a.png"), os.path.join(work_dir, "b.png")
+    for path in (first, second):
+        with open(path, 'wb') as f:
+            f.write(b"same-image-bytes")
+
+    key = OCRResultCache.make_key(hash_file(first), pipeline='label', engines=['tesseract'], lang='kor')
+    assert key == OCRResultCache.make_key(hash_file(second), lang='kor', engines=['tesseract'], pipeline='label')
+    assert key != OCRResultCache.make_key(hash_file(first), pipeline='label', engines=['easyocr'], lang='kor')
+    shutil.rmtree(work_dir)
+
+
+def test_global_cache_created_on_first_use():
+    """모듈 import 만으로는 캐시 디렉터리를 만들지 않고, 처음 사용할 때 설정 경로에 생성"""
+    work_dir = tempfile.mkdtemp()
+    cache_dir = os.path.join(work_dir, "configured_cache")
+    project_dir = os.path.dirname(os.path.abspath(__file__))
+    script = (
+        "import os, sys\n"
+        "import utils.ocr_result_cache as m\n"
+        "assert not os.path.exists(m.OCR_RESULT_CACHE_DIR) and not os.listdir('.')\n"
+        "assert m.get_ocr_result_cache() is m.get_ocr_result_cache()\n"
+        "assert os.path.isdir(m.OCR_RESULT_CACHE_DIR)\n"
+    )
+    env = dict(os.environ, OCR_RESULT_CACHE_DIR=cache_dir, PYTHONPATH=project_dir, PYTHONDONTWRITEBYTECODE='1')
+    subprocess.run([sys.executable, "-c", script], cwd=work_dir, env=env, check=True)
+    shutil.rmtree(work_dir)
+
+
+def test_size_bounded_lru_eviction():
+    """크기 제한을 넘으면 가장 오래 사용하지 않은 결과부터 삭제"""
+    work_dir = tempfile.mkdtemp()
+    cache = OCRResultCache(work_dir, max_size_mb=3 * 1100 / 1024 / 1024, low_watermark=1.0)
+    payload = "x" * 1000
+
+    for name in ("a", "b", "c"):
+        cache.set(name * 64, {'text': payload})
+        time.sleep(0.01)
+    assert cache.get("a" * 64) is not None  # a 를 최근 사용으로 갱신
+    time.sleep(0.01)
+    cache.set("d" * 64, {'text': payload})
+
+    assert cache.get("b" * 64) is None
+    assert cache.get("a" * 64) is not None
+    assert cache.get("d" * 64) is not None
+    assert cache.get_stats()['evictions'] == 1
+    shutil.rmtree(work_dir)
+
+
+def test_label_extractor_reuses_result_for_same_image():
+    """같은 이미지가 다른 이름으로 다시 올라와도 추출을 다시 하지 않음"""
+    from label_ocr_extractor import LabelOCRExtractor
+    import label_ocr_extractor
+
+    work_dir = tempfile.mkdtemp()
+    original_getter = label_ocr_extractor.get_ocr_result_cache
+    cache = OCRResultCache(os.path.join(work_dir, "cache"))
+    label_ocr_extractor.get_ocr_result_cache = lambda: cache
+
+    image = np.full((40, 120, 3), 255, np.uint8)
+    cv2.putText(image, "Ramen 120g", (5, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 1)
+    paths = [os.path.join(work_dir, f"uploaded_label_{i}.png") for i in range(2)]
+    for path in paths:
+        cv2.imwrite(path, image)
+
+    extractor = LabelOCRExtractor()
+    calls = []
+
+    def fake_extract(image_path, *args):
+        calls.append(image_path)
+        return {'extracted_info': {'product_name': 'Ramen'}, 'confidence_scores': {}, 'raw_text': 'Ramen 120g',
+                'image_path': image_path}
+
+    extractor._extract_label_info = fake_extract
+    try:
+        first = extractor.extract_label_info(paths[0], use_ai_apis=False)
+        second = extractor.extract_label_info(paths[1], use_ai_apis=False)
+        third = extractor.extract_label_info(paths[1], translate_to='en', use_ai_apis=False)
+    finally:
+        label_ocr_extractor.get_ocr_result_cache = original_getter
+
+    assert calls == [paths[0], paths[1]]
+    assert not first['cache_hit'] and second['cache_hit'] and not third['cache_hit']
+    assert second['image_path'] == paths[1]
+    assert second['extracted_info'] == first['extracted_info']
+    shutil.rmtree(work_dir)
+
+
+def test_label_extractor_skips_degraded_result_when_ai_requested():
+    """AI API 를 요청했는데 기본 OCR 결과만 나온 경우는 캐시하지 않음"""
+    from label_ocr_extractor import LabelOCRExtractor
+    import label_ocr_extractor
+
+    work_dir = tempfile.mkdtemp()
+    original_getter = label_ocr_extractor.get_ocr_result_cache
+    cache = OCRResultCache(os.path.join(work_dir, "cache"))
+    label_ocr_extractor.get_ocr_result_cache = lambda: cache
+    path = os.path.join(work_dir, "uploaded_label.png")
+    cv2.imwrite(path, np.full((40, 120, 3), 255, np.uint8))
+
+    extractor = LabelOCRExtractor()
+    extractor.use_ai_apis = True
+    responses = [False, True, True]
+    calls = []
+
+    def fake_extract(image_path, *args):
+        calls.append(image_path)
+        return {'extracted_info': {}, 'confidence_scores': {}, 'raw_text': 'Ramen',
+                'ai_enhanced': responses[len(calls) - 1]}
+
+    extractor._extract_label_info = fake_extract
+    try:
+        results = [extractor.extract_label_info(path) for _ in range(3)]
+    finally:
+        label_ocr_extractor.get_ocr_result_cache = original_getter
+
+    assert len(calls) == 2
+    assert [r['cache_hit'] for r in results] == [False, False, True]
+    assert results[2]['ai_enhanced']
+    shutil.rmtree(work_dir)
+
+
+def test_parallel_processor_cache_hit():
+    """다중 엔진 처리 결과를 이미지 내용/전처리 설정/엔진 구성 기준으로 재사용"""
+    from advanced_ocr_processor import MultiEngineOCRProcessor, OCRResult
+
+    work_dir = tempfile.mkdtemp()
+    original_slot = ocr_engine_pool._slots['tesseract']
+    ocr_engine_pool.register('tesseract', lambda: {'version': 'fake'})
+    try:
+        processor = MultiEngineOCRProcessor(result_cache=OCRResultCache(work_dir))
+        processor.engines = ['tesseract']
+        calls = []
+
+        def fake_tesseract(image):
+            calls.append(1)
+            return [OCRResult(text="나트륨 800mg", confidence=0.9,
+                              bbox=[(0, 0), (50, 0), (50, 10), (0, 10)], engine='tesseract')]
+
+        processor._process_with_tesseract = fake_tesseract
+        image = np.full((60, 200, 3), 255, np.uint8)
+
+        first = processor.process_image_parallel(image, 'general_document')
+        second = processor.process_image_parallel(image.copy(), 'general_document')
+        processor.process_image_parallel(image, 'customs_document')
+    finally:
+        ocr_engine_pool._slots['tesseract'] = original_slot
+
+    assert len(calls) == 2
+    assert not first['cache_hit'] and second['cache_hit']
+    assert second['text'][0]['text'] == "나트륨 800mg"
+    shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    test_key_depends_on_content_and_settings()
+    test_global_cache_created_on_first_use()
+    test_size_bounded_lru_eviction()
+    test_label_extractor_reuses_result_for_same_image()
+    test_label_extractor_skips_degraded_result_when_ai_requested()
+    test_parallel_processor_cache_hit()
+    print("✅ OCR 결과 캐시 테스트 통과")
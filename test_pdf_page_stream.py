@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+PDF 페이지 스트리밍 추출 테스트
+텍스트 레이어 페이지는 OCR 생략, 스캔 페이지만 페이지별 DPI 로 병렬 OCR, 페이지 순서/대기 창 유지 검증
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import cv2
+import fitz
+import numpy as np
+
+from utils.pdf_page_stream import choose_page_dpi, iter_pdf_pages
+
+
+def _make_pdf(path, layout):
+    """layout: 'text' / 'scan' / 'empty' 목록"""
+    scan = np.full((1100, 850, 3), 255, np.uint8)  # 8.5인치 폭 기준 100dpi 스캔
+    cv2.putText(scan, "SCANNED", (100, 300), cv2.FONT_HERSHEY_SIMPLEX, 3, (0, 0, 0), 5)
+    scan_png = cv2.imencode('.png', scan)[1].tobytes()
+    with fitz.open() as pdf:
+        for kind in layout:
+            page = pdf.new_page(width=612, height=792)
+            if kind == 'text':
+                page.insert_text((72, 72), "KOTRA market entry strategy report page text")
+            elif kind == 'scan':
+                page.insert_image(page.rect, stream=scan_png)
+        pdf.save(path)
+
+
+def test_text_pages_skip_ocr_and_order_is_kept():
+    work_dir = tempfile.mkdtemp()
+    path = os.path.join(work_dir, "report.pdf")
+    _make_pdf(path, ['scan', 'text', 'scan', 'empty', 'scan', 'text'])
+
+    calls = []
+
+    def fake_ocr(image):
+        calls.append(image.shape)
+        time.sleep(0.1 if len(calls) == 1 else 0)  # 첫 페이지가 가장 늦게 끝나도 순서 유지
+        return f"ocr {image.shape[1]}", 0.8
+
+    pages = list(iter_pdf_pages(path, ocr=fake_ocr, ocr_workers=3))
+    shutil.rmtree(work_dir)
+
+    assert [p.page for p in pages] == [1, 2, 3, 4, 5, 6]
+    assert [p.source for p in pages] == ['ocr', 'text_layer', 'ocr', 'empty', 'ocr', 'text_layer']
+    assert len(calls) == 3
+    # 100dpi 스캔은 최소 DPI(150)로 렌더링
+    assert pages[0].dpi == 150 and calls[0][:2] == (1650, 1275)
+    assert "KOTRA" in pages[1].text and pages[0].text.startswith("ocr")
+
+
+def test_without_ocr_scanned_pages_are_marked():
+    work_dir = tempfile.mkdtemp()
+    path = os.path.join(work_dir, "scan.pdf")
+    _make_pdf(path, ['scan', 'text'])
+    pages = list(iter_pdf_pages(path))
+    shutil.rmtree(work_dir)
+    assert [p.source for p in pages] == ['image_only', 'text_layer']
+
+
+def test_rendered_pages_in_flight_are_bounded():
+    """OCR 이 느려도 렌더링된 페이지는 대기 창 크기 이상 쌓이지 않음"""
+    work_dir = tempfile.mkdtemp()
+    path = os.path.join(work_dir, "long.pdf")
+    _make_pdf(path, ['scan'] * 12)
+
+    lock = threading.Lock()
+    state = {'submitted': 0, 'done': 0, 'max_in_flight': 0}
+    original_render = iter_pdf_pages.__globals__['render_page']
+
+    def counting_render(page, dpi):
+        with lock:
+            state['submitted'] += 1
+            state['max_in_flight'] = max(state['max_in_flight'], state['submitted'] - state['done'])
+        return original_render(page, dpi)
+
+    def slow_ocr(image):
+        time.sleep(0.02)
+        with lock:
+            state['done'] += 1
+        return "page", 0.9
+
+    iter_pdf_pages.__globals__['render_page'] = counting_render
+    try:
+        stream = iter_pdf_pages(path, ocr=slow_ocr, ocr_workers=2)
+        first = next(stream)
+        rest = list(stream)
+    finally:
+        iter_pdf_pages.__globals__['render_page'] = original_render
+        shutil.rmtree(work_dir)
+
+    assert first.page == 1 and len(rest) == 11
+    assert state['max_in_flight'] <= 5
+
+
+def test_dpi_follows_embedded_scan_resolution():
+    work_dir = tempfile.mkdtemp()
+    path = os.path.join(work_dir, "hi.pdf")
+    scan_png = cv2.imencode('.png', np.full((2200, 1700, 3), 255, np.uint8))[1].tobytes()  # 200dpi
+    with fitz.open() as pdf:
+        pdf.new_page(width=612, height=792).insert_image(fitz.Rect(0, 0, 612, 792), stream=scan_png)
+        pdf.save(path)
+    with fitz.open(path) as pdf:
+        assert choose_page_dpi(pdf[0]) == 200
+        assert choose_page_dpi(pdf[0], max_pixels=1_000_000) < 200
+    shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    test_text_pages_skip_ocr_and_order_is_kept()
+    test_without_ocr_scanned_pages_are_marked()
+    test_rendered_pages_in_flight_are_bounded()
+    test_dpi_follows_embedded_scan_resolution()
+    print("✅ PDF 페이지 스트리밍 테스트 통과")
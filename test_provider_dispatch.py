@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+외부 OCR 제공자 동시 호출 테스트 (로컬 스텁 서버 사용, 네트워크 불필요)
+제한 시간, 헤지 요청, 회로 차단, 필드 단위 투표, AIEnhancedOCR 통합 검증
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from utils.provider_dispatch import ProviderDispatcher, vote_fields
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """경로별 동작: /fast, /slow, /error, /flaky (첫 요청만 느림), /json/<지연초>/<본문>"""
+    hits = {}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            count = self.hits.get(self.path, 0) + 1
+            self.hits[self.path] = count
+
+        if self.path == '/slow' or (self.path == '/flaky' and count == 1):
+            time.sleep(1.0)
+        if self.path == '/error':
+            self.send_response(500)
+            self.end_headers()
+            return
+        body = b'{"text": "ok"}'
+        if self.path.startswith('/json/'):
+            _, _, delay, payload = self.path.split('/', 3)
+            time.sleep(float(delay))
+            body = requests.utils.unquote(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_stub():
+    _StubHandler.hits = {}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _http_provider(url):
+    def call(*args):
+        response = requests.get(url, timeout=5)
+        response.raise_for_status()
+        return response.json()
+    return call
+
+
+def test_slow_provider_does_not_stall_request():
+    server, base = _start_stub()
+    dispatcher = ProviderDispatcher()
+    dispatcher.register('fast', _http_provider(f"{base}/fast"), timeout=2)
+    dispatcher.register('slow', _http_provider(f"{base}/slow"), timeout=0.3)
+    try:
+        started = time.time()
+        results = dispatcher.dispatch()
+        elapsed = time.time() - started
+    finally:
+        server.shutdown()
+
+    assert elapsed < 0.8
+    assert results['fast'].ok and results['fast'].value == {'text': 'ok'}
+    assert results['slow'].error == 'timeout'
+
+
+def test_hedged_request_wins_over_stuck_first_attempt():
+    server, base = _start_stub()
+    dispatcher = ProviderDispatcher()
+    dispatcher.register('flaky', _http_provider(f"{base}/flaky"), timeout=2, hedge_after=0.1)
+    try:
+        started = time.time()
+        result = dispatcher.dispatch()['flaky']
+        elapsed = time.time() - started
+    finally:
+        server.shutdown()
+
+    assert result.ok and result.hedged
+    assert elapsed < 0.6
+    assert _StubHandler.hits['/flaky'] == 2
+
+
+def test_circuit_breaker_skips_failing_provider_then_retries():
+    server, base = _start_stub()
+    dispatcher = ProviderDispatcher()
+    dispatcher.register('broken', _http_provider(f"{base}/error"), timeout=2, failure_threshold=2, reset_timeout=0.3)
+    try:
+        for _ in range(2):
+            assert '500' in dispatcher.dispatch()['broken'].error
+        assert dispatcher.dispatch()['broken'].error == 'circuit_open'
+        assert _StubHandler.hits['/error'] == 2
+        assert dispatcher.get_status()['broken']['state'] == 'open'
+
+        time.sleep(0.35)
+        dispatcher.dispatch()  # half_open 시험 호출 1회
+        assert _StubHandler.hits['/error'] == 3
+        assert dispatcher.get_status()['broken']['state'] == 'open'
+    finally:
+        server.shutdown()
+
+
+def test_first_mode_returns_earliest_accepted_result():
+    server, base = _start_stub()
+    dispatcher = ProviderDispatcher()
+    dispatcher.register('empty', lambda: "", timeout=1)
+    dispatcher.register('slow', _http_provider(f"{base}/slow"), timeout=2)
+    dispatcher.register('fast', _http_provider(f"{base}/fast"), timeout=2)
+    try:
+        started = time.time()
+        results = dispatcher.dispatch(mode='first', accept=bool)
+        elapsed = time.time() - started
+    finally:
+        server.shutdown()
+
+    assert elapsed < 0.5
+    assert results['fast'].ok and results['empty'].error == 'rejected'
+    assert results['slow'].error == 'cancelled'
+    assert dispatcher.get_status()['slow']['failures'] == 0
+
+
+def test_cancelled_half_open_trial_releases_circuit():
+    """'first' 모드에서 half_open 시험 호출이 취소되면 다음 요청이 다시 시험 호출"""
+    dispatcher = ProviderDispatcher()
+    behaviour = {'trial': lambda: ""}
+    dispatcher.register('trial', lambda: behaviour['trial'](), timeout=2, failure_threshold=1, reset_timeout=0.1)
+    dispatcher.register('fast', lambda: "ok", timeout=2)
+
+    assert dispatcher.dispatch(names=['trial'], accept=bool)['trial'].error == 'rejected'
+    assert dispatcher.get_status()['trial']['state'] == 'open'
+
+    time.sleep(0.15)
+    behaviour['trial'] = lambda: time.sleep(0.3) or "late"
+    results = dispatcher.dispatch(mode='first', accept=bool)
+    assert results['fast'].ok and results['trial'].error == 'cancelled'
+    assert dispatcher.get_status()['trial']['state'] == 'half_open'
+
+    behaviour['trial'] = lambda: "recovered"
+    result = dispatcher.dispatch(names=['trial'], accept=bool)['trial']
+    assert result.ok and result.value == "recovered"
+    assert dispatcher.get_status()['trial']['state'] == 'closed'
+
+
+def test_field_level_weighted_voting():
+    merged, confidence = vote_fields({
+        'openai': {'product_name': '신라면', 'nutrition': {'sodium': 1790, 'protein': 10}},
+        'azure': {'product_name': '신 라면 ', 'nutrition': {'sodium': '1,790'}, 'allergies': ['밀', '대두']},
+        'google': {'product_name': '진라면', 'nutrition': {'sodium': 1790.0}, 'allergies': ['대두', '밀']}
+    }, {'openai': 1.5, 'azure': 1.0, 'google': 1.0})
+
+    assert merged['product_name'] == '신라면'
+    assert merged['nutrition'] == {'sodium': 1790, 'protein': 10}
+    assert confidence['nutrition.sodium'] == round(2.5 / 3.5, 3)
+    assert confidence['nutrition.protein'] == round(1.5 / 3.5, 3)
+    assert confidence['allergies'] == round(2.0 / 3.5, 3)
+
+    merged, _ = vote_fields({'openai': {'origin': '중국'}, 'azure': {'origin': '한국'}, 'google': {'origin': '한국'}},
+                            {'openai': 1.5, 'azure': 1.0, 'google': 1.0})
+    assert merged['origin'] == '한국'
+
+
+def test_ai_enhanced_ocr_dispatches_concurrently():
+    """AIEnhancedOCR 이 스텁 제공자를 동시에 호출하고 느린 제공자를 제외"""
+    from ai_enhanced_ocr import AIEnhancedOCR
+
+    server, base = _start_stub()
+    ocr = AIEnhancedOCR()
+    ocr.openai_client = ocr.azure_client = ocr.google_client = object()
+    payloads = {
+        'openai': ('0.05', {'product_name': '신라면', 'nutrition': {'sodium': 1790}}),
+        'azure': ('0.05', {'product_name': '신라면', 'ingredients': '소맥분'}),
+        'google': ('2', {'product_name': '진라면'})
+    }
+    for name, (delay, payload) in payloads.items():
+        url = f"{base}/json/{delay}/{requests.utils.quote(json.dumps(payload, ensure_ascii=False))}"
+        ocr.dispatcher.register(name, _http_provider(url), timeout=0.5, weight=1.5 if name == 'openai' else 1.0)
+
+    try:
+        started = time.time()
+        detail = ocr.extract_label_info_detailed("label.png")
+        elapsed = time.time() - started
+    finally:
+        server.shutdown()
+
+    assert elapsed < 1.0
+    assert detail['result'] == {'product_name': '신라면', 'nutrition': {'sodium': 1790}, 'ingredients': '소맥분'}
+    assert detail['providers']['google']['error'] == 'timeout'
+    assert detail['field_confidence']['product_name'] == 1.0
+
+
+if __name__ == "__main__":
+    test_slow_provider_does_not_stall_request()
+    test_hedged_request_wins_over_stuck_first_attempt()
+    test_circuit_breaker_skips_failing_provider_then_retries()
+    test_first_mode_returns_earliest_accepted_result()
+    test_cancelled_half_open_trial_releases_circuit()
+    test_field_level_weighted_voting()
+    test_ai_enhanced_ocr_dispatches_concurrently()
+    print("✅ OCR 제공자 동시 호출 테스트 통과")
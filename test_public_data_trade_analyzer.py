@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+공공데이터 수출입 실적 분석기 일괄 랭킹 테스트
+배치 모드 점수/트렌드/추천사항이 행 단위 메서드와 일치하는지 검증
+"""
+
+from public_data_trade_analyzer import PublicDataTradeAnalyzer
+
+
+def test_batch_ranking_matches_row_methods():
+    """여러 HS CODE 일괄 랭킹이 행 단위 계산과 같은 값을 반환"""
+    analyzer = PublicDataTradeAnalyzer()
+    analyzer.supported_countries = ["중국", "미국", "일본", "베트남", "태국"]
+
+    trade_data = []
+    for hs_code in analyzer.common_hs_codes.values():
+        trade_data.extend(analyzer._generate_sample_data(hs_code))
+
+    rankings = analyzer._calculate_market_ranking_batch(trade_data)
+    assert len(rankings) == len(trade_data)
+
+    for performance, ranking in zip(trade_data, rankings):
+        overall_score = analyzer._calculate_overall_score(performance)
+        assert ranking.hs_code == performance.hs_code
+        assert ranking.country == performance.country
+        assert ranking.overall_score == overall_score
+        assert ranking.market_potential == performance.market_potential_score
+        assert ranking.growth_potential == analyzer._calculate_growth_potential(performance)
+        assert ranking.stability_score == analyzer._calculate_stability_score(performance)
+        assert ranking.risk_score == analyzer._calculate_risk_score(performance)
+        assert ranking.trend_analysis == analyzer._analyze_trend(performance)
+        assert ranking.recommendation == analyzer._generate_recommendation(performance, overall_score)
+
+    # HS CODE별 종합 점수 내림차순 순위
+    for hs_code in analyzer.common_hs_codes.values():
+        group = [r for r in rankings if r.hs_code == hs_code]
+        ordered = sorted(group, key=lambda r: r.ranking)
+        assert [r.ranking for r in ordered] == list(range(1, len(group) + 1))
+        assert all(a.overall_score >= b.overall_score for a, b in zip(ordered, ordered[1:]))
+
+
+def test_get_trade_data_batch():
+    """여러 HS CODE 일괄 조회 결과 구조"""
+    analyzer = PublicDataTradeAnalyzer()
+    analyzer._load_from_cache = lambda key: None
+    analyzer._save_to_cache = lambda key, data: None
+
+    results = analyzer.get_trade_data_batch(["190230", "220210"])
+    assert list(results) == ["190230", "220210"]
+    for hs_code, result in results.items():
+        assert result["hs_code"] == hs_code
+        assert len(result["ranking_data"]) == len(analyzer.supported_countries)
+        assert all(r.hs_code == hs_code for r in result["ranking_data"])
+
+
+def test_single_hs_code_uses_deterministic_ranking():
+    """단일 HS CODE 조회도 종합 점수 내림차순 순위, 샘플 데이터 순위는 잠재력 점수 내림차순"""
+    analyzer = PublicDataTradeAnalyzer()
+    analyzer._load_from_cache = lambda key: None
+    analyzer._save_to_cache = lambda key, data: None
+
+    result = analyzer.get_trade_data("190230")
+    ordered = sorted(result["ranking_data"], key=lambda r: r.ranking)
+    assert [r.ranking for r in ordered] == list(range(1, len(ordered) + 1))
+    assert all(a.overall_score >= b.overall_score for a, b in zip(ordered, ordered[1:]))
+
+    performances = sorted(result["trade_data"], key=lambda p: p.ranking)
+    assert [p.ranking for p in performances] == list(range(1, len(performances) + 1))
+    assert all(a.market_potential_score >= b.market_potential_score
+               for a, b in zip(performances, performances[1:]))
+
+
+if __name__ == "__main__":
+    test_batch_ranking_matches_row_methods()
+    test_get_trade_data_batch()
+    test_single_hs_code_uses_deterministic_ranking()
+    print("✅ 공공데이터 일괄 랭킹 테스트 통과")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+컴파일된 질의 분류기 및 답변 캐시 테스트
+기존 순차 정규식 분류와 결과 일치, 반복 질의 시 검색 생략 검증
+"""
+
+import os
+import re
+import tempfile
+
+from integrated_trade_database import IntegratedTradeDatabase
+from query_classifier import QueryClassifier
+
+
+def _legacy_query_type(query_patterns, query):
+    """기존 _analyze_query_type 구현"""
+    query_lower = query.lower()
+    for query_type, patterns in query_patterns.items():
+        for pattern in patterns:
+            if re.search(pattern, query_lower):
+                return query_type
+    return "general"
+
+
+def _make_db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db = IntegratedTradeDatabase(path, async_query_log=False)
+    db.ai_processor = None
+    return db, path
+
+
+def test_classifier_matches_legacy_rules():
+    """컴파일된 분류기가 기존 규칙과 같은 의도/엔티티를 반환"""
+    db, path = _make_db()
+    queries = [
+        "중국 라면 수출에 필요한 서류는?",
+        "미국 마스크 시장 동향과 성장률",
+        "HS코드 190230 수출 통계 알려줘",
+        "China 전자제품 리스크",
+        "usa 의류 진출 전략 방안",
+        "안녕하세요"
+    ]
+    for query in queries:
+        assert db._analyze_query_type(query) == _legacy_query_type(db.query_patterns, query)
+
+    assert db._extract_entities("중국 라면 수출에 필요한 서류는?") == ("중국", "라면", None)
+    assert db._extract_entities("HS코드 190230 수출 통계") == (None, None, "190230")
+    assert db._extract_entities("USA 화학제품 규제") == ("미국", "화학제품", None)
+    os.remove(path)
+
+
+def test_repeat_query_uses_answer_cache():
+    """동일 의도/엔티티 질의는 검색을 다시 수행하지 않음"""
+    db, path = _make_db()
+    db.insert_regulation_data({
+        "country": "중국", "product": "라면", "category": "식품안전",
+        "title": "GB 7718", "description": "라벨 규정", "requirements": "중국어 라벨",
+        "source": "KOTRA_API", "last_updated": "2025-07-01"
+    })
+
+    calls = []
+    original_search = db._search_data
+
+    def counting_search(*args, **kwargs):
+        calls.append(args)
+        return original_search(*args, **kwargs)
+
+    db._search_data = counting_search
+
+    first = db.natural_language_query("중국 라면 규제")
+    second = db.natural_language_query("중국 라면 규제")
+    assert first.answer == second.answer
+    assert len(calls) == 1
+
+    # 데이터가 바뀌면 데이터 버전이 달라져 다시 검색
+    db.insert_regulation_data({
+        "country": "중국", "product": "라면", "category": "포장",
+        "title": "GB 4806", "description": "포장재", "requirements": "포장재 인증",
+        "source": "KOTRA_API", "last_updated": "2025-07-02"
+    })
+    third = db.natural_language_query("중국 라면 규제")
+    assert len(calls) == 2
+    assert "GB 4806" in third.answer
+    os.remove(path)
+
+
+def test_single_pass_finds_groups_starting_at_same_position():
+    """한 번의 finditer 로 겹치거나 같은 위치에서 시작하는 키워드 그룹도 모두 찾음"""
+    classifier = QueryClassifier(
+        {"trade": ["수출입"], "export": ["수출"], "stats": [r"통계|실적"]},
+        countries={"중국": ["중국", "china"]}, products={"라면": ["라면"]}
+    )
+    result = classifier.classify("CHINA 라면 수출입 실적")
+    assert result.intent == "trade"
+    assert result.matched_intents == frozenset({"trade", "export", "stats"})
+    assert result.entities == ("중국", "라면", None)
+    assert classifier.classify("안녕하세요").intent == "general"
+
+
+if __name__ == "__main__":
+    test_classifier_matches_legacy_rules()
+    test_single_pass_finds_groups_starting_at_same_position()
+    test_repeat_query_uses_answer_cache()
+    print("✅ 질의 분류기 및 답변 캐시 테스트 통과")
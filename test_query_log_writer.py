@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+비동기 질의 로그 기록기 테스트
+배치 저장, 종료 대기 시간 초과, drop-oldest, 월별 파티션 회전 검증
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+from utils.query_log_writer import QueryLogWriter
+
+CREATE_QUERY_LOGS = '''
+    CREATE TABLE IF NOT EXISTS query_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        query_text TEXT NOT NULL,
+        query_type TEXT,
+        answer TEXT,
+        data_sources TEXT,
+        confidence_score REAL,
+        response_time REAL,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+
+def _make_db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    with sqlite3.connect(path) as conn:
+        conn.execute(CREATE_QUERY_LOGS)
+    return path
+
+
+def _count(path, table="query_logs"):
+    with sqlite3.connect(path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_batched_flush_and_close():
+    """배치 flush 및 종료 시 잔여 로그 기록"""
+    path = _make_db()
+    writer = QueryLogWriter(path, batch_size=10, flush_interval=60)
+    for i in range(25):
+        writer.log(f"질의 {i}", "general", "답변", ["KOTRA_API"], 0.8, 0.01)
+
+    assert writer.flush(timeout=5)
+    assert _count(path) == 25
+
+    writer.log("마지막 질의", "general", "답변", [], 0.5, 0.01)
+    writer.close()
+    assert _count(path) == 26
+    assert writer.get_status()['dropped'] == 0
+    os.remove(path)
+
+
+def test_close_timeout_leaves_remaining_rows_to_writer():
+    """종료 대기 시간이 지나도 기록 중인 스레드와 경쟁하지 않고 모든 로그를 한 번씩만 기록"""
+    path = _make_db()
+    writer = QueryLogWriter(path, batch_size=5, flush_interval=60)
+    write_batch = writer._write_batch
+
+    def slow_write_batch(batch):
+        time.sleep(0.2)
+        write_batch(batch)
+
+    writer._write_batch = slow_write_batch
+    for i in range(20):
+        writer.log(f"질의 {i}", "general", "답변", [], 0.5, 0.01)
+
+    writer.close(timeout=0.05)
+    writer._thread.join(5)
+    assert not writer._thread.is_alive()
+    assert _count(path) == 20
+    os.remove(path)
+
+
+def test_drop_oldest_when_full():
+    """큐 포화 시 가장 오래된 로그부터 폐기"""
+    path = _make_db()
+    writer = QueryLogWriter(path, max_queue_size=5, batch_size=1000, flush_interval=60)
+    for i in range(8):
+        writer.log(f"질의 {i}", "general", "답변", [], 0.8, 0.01)
+    writer.close()
+
+    with sqlite3.connect(path) as conn:
+        texts = [row[0] for row in conn.execute("SELECT query_text FROM query_logs ORDER BY id")]
+    assert texts == [f"질의 {i}" for i in range(3, 8)]
+    assert writer.get_status()['dropped'] == 3
+    os.remove(path)
+
+
+def test_rotation_into_monthly_partitions():
+    """오래된 로그의 월별 파티션 이동 및 만료 파티션 삭제"""
+    path = _make_db()
+    with sqlite3.connect(path) as conn:
+        conn.executemany(
+            "INSERT INTO query_logs (query_text, created_at) VALUES (?, ?)",
+            [("old-1", "2025-01-15 10:00:00"), ("old-2", "2025-03-02 10:00:00"),
+             ("new", "2025-07-20 10:00:00")]
+        )
+
+    writer = QueryLogWriter(path, hot_retention_days=30, archive_retention_months=5,
+                            rotation_interval=3600)
+    moved = writer.rotate(now=datetime(2025, 7, 31))
+    writer.close()
+
+    assert moved == 2
+    assert _count(path) == 1
+    with sqlite3.connect(path) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    # 2025-01 파티션은 보관 기간(5개월) 초과로 삭제
+    assert "query_logs_202503" in tables
+    assert "query_logs_202501" not in tables
+    assert _count(path, "query_logs_202503") == 1
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    test_batched_flush_and_close()
+    test_close_timeout_leaves_remaining_rows_to_writer()
+    test_drop_oldest_when_full()
+    test_rotation_into_monthly_partitions()
+    print("✅ 비동기 질의 로그 기록기 테스트 통과")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+규제 스냅샷 서비스 테스트
+한 번만 로드, 읽기 전용 공유, (국가, 제품, 카테고리) 조회, publish 핫 리로드와 사용처 반영 검증
+"""
+
+import copy
+import json
+import pickle
+
+from utils.regulation_snapshot import FrozenDict, RegulationSnapshotService, freeze, regulation_snapshots
+
+SOURCE = {
+    "중국": {"라면": {"제한사항": ["중국어 라벨 필수"], "필요서류": ["위생증명서"]}},
+    "미국": {"라면": {"제한사항": ["FDA 등록"]}}
+}
+
+
+def test_sources_load_once_and_are_read_only():
+    calls = []
+    service = RegulationSnapshotService()
+    service.register('mvp', lambda: calls.append(1) or SOURCE)
+    service.register('label', lambda: {"중국": {"name": "GB 7718"}}, levels=('country', 'category'))
+
+    assert service.source('mvp') is service.source('mvp')
+    assert len(calls) == 1
+
+    regulations = service.source('mvp')
+    for mutate in (lambda: regulations.update(x=1), lambda: regulations["중국"]["라면"]["제한사항"].append("x")):
+        try:
+            mutate()
+            assert False, "읽기 전용이어야 함"
+        except TypeError:
+            pass
+
+    # JSON 응답, 깊은 복사(수정 가능한 복사본), pickle 은 그대로 동작
+    assert json.loads(json.dumps(regulations, ensure_ascii=False)) == SOURCE
+    editable = copy.deepcopy(regulations)
+    editable["중국"]["라면"]["제한사항"].append("x")
+    assert type(pickle.loads(pickle.dumps(regulations))) is FrozenDict
+
+
+def test_lookup_by_country_product_category():
+    service = RegulationSnapshotService()
+    service.register('mvp', lambda: SOURCE)
+    service.register('label', lambda: {"중국": {"name": "GB 7718"}}, levels=('country', 'category'))
+
+    assert service.lookup('mvp', '중국', '라면', '필요서류') == ["위생증명서"]
+    assert service.lookup('mvp', '중국', '라면') == SOURCE["중국"]["라면"]
+    assert service.lookup('mvp', '일본', '라면') is None
+    # 제품 구분이 없는 소스는 product 를 무시
+    assert service.lookup('label', '중국', '라면', 'name') == "GB 7718"
+    assert service.get('mvp', '미국', '라면', '제한사항') == ["FDA 등록"]
+
+
+def test_publish_swaps_snapshot_atomically():
+    service = RegulationSnapshotService()
+    service.register('mvp', lambda: SOURCE)
+    service.register('templates', lambda: {"상업송장": {"filename": "a.txt"}}, levels=('category',))
+    events = []
+    service.subscribe(lambda snapshot, names: events.append((snapshot.version, list(names))))
+
+    before = service.snapshot()
+    templates = service.source('templates')
+    after = service.publish('mvp', {"제한사항": ["신규 규정"]}, path=('중국', '라면'))
+
+    assert after.version == before.version + 1 and events == [(after.version, ['mvp'])]
+    assert service.lookup('mvp', '중국', '라면', '제한사항') == ["신규 규정"]
+    assert service.lookup('mvp', '미국', '라면', '제한사항') == ["FDA 등록"]
+    # 이전 스냅샷은 그대로, 바뀌지 않은 소스는 같은 객체 재사용
+    assert before.lookup('mvp', '중국', '라면', '제한사항') == ["중국어 라벨 필수"]
+    assert service.source('templates') is templates
+    assert after.source_versions['templates'] == before.source_versions['templates']
+
+
+def test_consumers_share_snapshot_and_pick_up_updates():
+    from label_compliance_checker import LabelComplianceChecker
+    from mvp_regulations import get_mvp_regulations
+
+    assert LabelComplianceChecker().regulations is LabelComplianceChecker().regulations
+    assert get_mvp_regulations("중국", "라면") is get_mvp_regulations("중국", "라면")
+
+    original = regulation_snapshots.source('mvp_regulations')
+    try:
+        regulation_snapshots.publish('mvp_regulations', {"제한사항": ["핫 리로드"]}, path=("중국", "라면"))
+        assert get_mvp_regulations("중국", "라면") == {"제한사항": ["핫 리로드"]}
+    finally:
+        regulation_snapshots.publish('mvp_regulations', original)
+    assert freeze(original) is regulation_snapshots.source('mvp_regulations')
+
+
+if __name__ == "__main__":
+    test_sources_load_once_and_are_read_only()
+    test_lookup_by_country_product_category()
+    test_publish_swaps_snapshot_atomically()
+    test_consumers_share_snapshot_and_pick_up_updates()
+    print("✅ 규제 스냅샷 서비스 테스트 통과")
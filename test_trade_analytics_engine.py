@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+무역 통계 컬럼형 분석 엔진 테스트
+벡터화 점수와 행 단위 계산 일치, 그룹별 순위, 파티션 저장/조회 검증
+"""
+
+import shutil
+import tempfile
+
+import numpy as np
+
+from public_data_trade_analyzer import PublicDataTradeAnalyzer
+from trade_analytics_engine import (
+    TradeAnalyticsEngine, TradeColumnStore, columns_from_records,
+    compute_scores, rank_within_groups
+)
+
+
+def test_vectorized_scores_match_row_functions():
+    """배열 연산 점수가 PublicDataTradeAnalyzer 행 단위 계산과 일치"""
+    analyzer = PublicDataTradeAnalyzer()
+    performances = []
+    for hs_code in ["190230", "190531", "220210"]:
+        performances.extend(analyzer._generate_sample_data(hs_code))
+
+    scores = compute_scores(columns_from_records(performances), analyzer.ranking_weights)
+    for i, performance in enumerate(performances):
+        assert round(float(scores["overall_score"][i]), 2) == analyzer._calculate_overall_score(performance)
+        assert round(float(scores["growth_potential"][i]), 2) == analyzer._calculate_growth_potential(performance)
+        assert round(float(scores["stability_score"][i]), 2) == analyzer._calculate_stability_score(performance)
+        assert round(float(scores["risk_score"][i]), 2) == analyzer._calculate_risk_score(performance)
+
+
+def test_rank_within_groups():
+    """HS CODE별 점수 내림차순 순위"""
+    groups = np.array(["190230", "190230", "220210", "190230", "220210"], dtype=object)
+    scores = np.array([50.0, 70.0, 10.0, 60.0, 30.0])
+    assert rank_within_groups(groups, scores).tolist() == [3, 1, 2, 2, 1]
+
+
+def test_column_store_roundtrip_and_ranking():
+    """파티션 저장 후 HS CODE 프루닝 조회 및 최신 기간 기준 랭킹"""
+    base_dir = tempfile.mkdtemp()
+    store = TradeColumnStore(base_dir, use_parquet=False)
+    columns = columns_from_records([
+        {"hs_code": "190230", "country": "중국", "period": "2025-06", "export_amount": 5e6,
+         "import_amount": 1e6, "trade_balance": 4e6, "market_share": 3.0, "growth_rate": 0.1, "volatility": 0.1},
+        {"hs_code": "190230", "country": "중국", "period": "2025-07", "export_amount": 6e6,
+         "import_amount": 1e6, "trade_balance": 5e6, "market_share": 3.5, "growth_rate": 0.2, "volatility": 0.1},
+        {"hs_code": "190230", "country": "미국", "period": "2025-07", "export_amount": 2e6,
+         "import_amount": 3e6, "trade_balance": -1e6, "market_share": 1.0, "growth_rate": -0.1, "volatility": 0.2},
+        {"hs_code": "220210", "country": "미국", "period": "2025-07", "export_amount": 1e6,
+         "import_amount": 1e6, "trade_balance": 0.0, "market_share": 0.5, "growth_rate": 0.0, "volatility": 0.1},
+    ])
+    assert store.write(columns) == 3
+
+    ramen = store.read(hs_codes=["190230"])
+    assert len(ramen["country"]) == 3
+
+    result = TradeAnalyticsEngine(store).rank_markets()
+    assert len(result["country"]) == 3
+    top = {(h, c): r for h, c, r in zip(result["hs_code"], result["country"], result["ranking"])}
+    assert top[("190230", "중국")] == 1
+    assert top[("190230", "미국")] == 2
+    assert top[("220210", "미국")] == 1
+    shutil.rmtree(base_dir)
+
+
+if __name__ == "__main__":
+    test_vectorized_scores_match_row_functions()
+    test_rank_within_groups()
+    test_column_store_roundtrip_and_ranking()
+    print("✅ 무역 통계 컬럼형 분석 엔진 테스트 통과")
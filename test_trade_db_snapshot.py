@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+통합 무역 DB 스냅샷 모드 테스트
+스테이징 쓰기와 스냅샷 읽기 분리, 발행 시 교체, 스냅샷 보관/연결 정리 검증
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+
+from integrated_trade_database import IntegratedTradeDatabase
+from trade_db_snapshot import TradeDBSnapshotManager
+
+
+def _regulation(title):
+    return {
+        "country": "중국", "product": "라면", "category": "식품안전",
+        "title": title, "description": "라벨 규정", "requirements": "중국어 라벨",
+        "source": "KOTRA_API", "last_updated": "2025-07-01"
+    }
+
+
+def test_snapshot_publish_and_swap():
+    """발행 전까지는 이전 스냅샷을 읽고, 발행 후 새 스냅샷으로 교체"""
+    work_dir = tempfile.mkdtemp()
+    staging = os.path.join(work_dir, "integrated_trade.db")
+    snapshot_dir = os.path.join(work_dir, "snapshots")
+
+    db = IntegratedTradeDatabase(staging, async_query_log=False, snapshot_dir=snapshot_dir)
+    db.ai_processor = None
+    db.snapshot_manager.check_interval = 0
+
+    db.insert_regulation_data(_regulation("GB 7718"))
+    first = db.publish_snapshot()
+    assert os.path.exists(first)
+    assert os.stat(first).st_mode & 0o222 == 0
+
+    # 스테이징에만 쓰인 데이터는 다음 발행 전까지 조회되지 않음
+    db.insert_regulation_data(_regulation("GB 4806"))
+    answer = db.natural_language_query("중국 라면 규제").answer
+    assert "GB 7718" in answer and "GB 4806" not in answer
+
+    second = db.publish_snapshot()
+    assert second != first
+    answer = db.natural_language_query("중국 라면 규제").answer
+    assert "GB 4806" in answer
+
+    # 읽기 연결은 불변 스냅샷이므로 쓰기 불가
+    conn = db._read_connection()
+    try:
+        conn.execute("DELETE FROM regulations")
+        assert False, "스냅샷에 쓰기가 허용되면 안 됨"
+    except sqlite3.OperationalError:
+        pass
+    shutil.rmtree(work_dir)
+
+
+def test_prune_keeps_latest_snapshots():
+    """보관 개수를 넘는 스냅샷 삭제"""
+    work_dir = tempfile.mkdtemp()
+    staging = os.path.join(work_dir, "staging.db")
+    with sqlite3.connect(staging) as conn:
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY)")
+
+    manager = TradeDBSnapshotManager(staging, os.path.join(work_dir, "snapshots"), keep_snapshots=2,
+                                     min_retention=0)
+    published = [manager.publish() for _ in range(4)]
+
+    assert manager.list_snapshots() == [os.path.basename(p) for p in published[-2:]]
+    assert manager.current_snapshot() == published[-1]
+    shutil.rmtree(work_dir)
+
+
+def test_prune_keeps_snapshots_in_use_and_recently_replaced():
+    """다른 스레드가 열어 둔 스냅샷, 교체된 지 얼마 안 된 스냅샷은 삭제하지 않고 종료 시 연결 정리"""
+    work_dir = tempfile.mkdtemp()
+    staging = os.path.join(work_dir, "staging.db")
+    with sqlite3.connect(staging) as conn:
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY)")
+
+    manager = TradeDBSnapshotManager(staging, os.path.join(work_dir, "snapshots"), keep_snapshots=1,
+                                     check_interval=0, min_retention=0)
+    first = manager.publish()
+    reader = []
+    thread = threading.Thread(target=lambda: reader.append(manager.connect()))
+    thread.start()
+    thread.join()
+
+    # keep_snapshots=1 이어도 현재/직전 스냅샷은 보관, 다른 스레드 연결이 열린 첫 스냅샷도 보관
+    second = manager.publish()
+    third = manager.publish()
+    assert os.path.exists(first) and os.path.exists(second) and os.path.exists(third)
+    assert reader[0].execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+    # 연결을 닫은 뒤에는 삭제 대상
+    manager.close()
+    try:
+        reader[0].execute("SELECT 1")
+        assert False, "종료 후 연결은 닫혀 있어야 함"
+    except sqlite3.ProgrammingError:
+        pass
+    manager.publish()
+    assert not os.path.exists(first) and not os.path.exists(second)
+
+    # 교체된 지 min_retention 이 지나지 않은 스냅샷은 보관
+    manager.min_retention = 300
+    manager.publish()
+    manager.publish()
+    assert len(manager.list_snapshots()) == 4
+    shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    test_snapshot_publish_and_swap()
+    test_prune_keeps_latest_snapshots()
+    test_prune_keeps_snapshots_in_use_and_recently_replaced()
+    print("✅ 통합 무역 DB 스냅샷 테스트 통과")
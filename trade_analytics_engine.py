@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+무역 통계 컬럼형 분석 엔진
+- HS CODE / 기간 단위 컬럼형 파티션 저장 (Parquet, pyarrow 미설치 시 NumPy npz)
+- 성장 잠재력, 안정성, 리스크, 종합 점수를 NumPy 배열 연산으로 일괄 계산
+- 전체 HS CODE x 국가 랭킹을 행 단위 Python 호출 없이 한 번에 산출
+"""
+
+import os
+import re
+import sqlite3
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+KEY_COLUMNS = ["hs_code", "country", "period"]
+NUMERIC_COLUMNS = ["export_amount", "import_amount", "trade_balance",
+                   "market_share", "growth_rate", "volatility"]
+
+# PublicDataTradeAnalyzer.ranking_weights 와 동일한 기본 가중치
+DEFAULT_RANKING_WEIGHTS = {
+    "market_potential": 0.3,
+    "growth_potential": 0.25,
+    "stability": 0.2,
+    "risk_factor": 0.15,
+    "competitiveness": 0.1
+}
+
+# 성장률 구간별 트렌드 분석 (상한 초과 조건을 위에서부터 검사)
+TREND_RULES = [
+    (0.15, "강한 상승세, 시장 확장 중"),
+    (0.05, "안정적 상승세, 지속적 성장"),
+    (-0.05, "안정적 유지, 시장 안정"),
+    (-0.15, "약간의 하락세, 주의 필요")
+]
+TREND_DEFAULT = "강한 하락세, 시장 위험"
+
+# 종합 점수 구간별 추천사항 (이상 조건을 위에서부터 검사)
+RECOMMENDATION_RULES = [
+    (80, "매우 유망한 시장, 적극적 진출 권장"),
+    (60, "유망한 시장, 단계적 진출 권장"),
+    (40, "보통 수준, 신중한 진출 검토"),
+    (20, "위험 요소 존재, 진출 재검토 필요")
+]
+RECOMMENDATION_DEFAULT = "매우 위험한 시장, 진출 비권장"
+
+
+def columns_from_records(records: Iterable[Any]) -> Dict[str, np.ndarray]:
+    """dataclass 객체 또는 dict 목록을 컬럼 배열로 변환 (TradePerformance 등)"""
+    records = list(records)
+
+    def field(record, name, default=None):
+        if isinstance(record, dict):
+            return record.get(name, default)
+        return getattr(record, name, default)
+
+    columns = {}
+    for name in KEY_COLUMNS:
+        columns[name] = np.array([str(field(r, name, "") or "") for r in records], dtype=object)
+    for name in NUMERIC_COLUMNS + ["market_potential_score"]:
+        values = [field(r, name) for r in records]
+        if name == "market_potential_score" and all(v is None for v in values):
+            continue
+        columns[name] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    return columns
+
+
+def compute_market_potential(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """시장 잠재력 점수 (0-100, 반올림 전)"""
+    export_score = np.minimum(columns["export_amount"] / 10000000, 1.0)
+    market_share_score = np.minimum(columns["market_share"] / 10.0, 1.0)
+    growth_score = np.maximum(np.minimum(columns["growth_rate"] + 0.2, 1.0), 0.0)
+    stability_score = np.maximum(1.0 - columns["volatility"], 0.0)
+
+    potential_score = (
+        export_score * 0.3 +
+        market_share_score * 0.25 +
+        growth_score * 0.25 +
+        stability_score * 0.2
+    )
+    return potential_score * 100
+
+
+def compute_scores(columns: Dict[str, np.ndarray],
+                   weights: Optional[Dict[str, float]] = None) -> Dict[str, np.ndarray]:
+    """종합/성장/안정성/리스크 점수를 배열 연산으로 계산 (반올림 전)
+
+    각 식은 PublicDataTradeAnalyzer 의 행 단위 계산과 같은 연산 순서를 따른다.
+    """
+    weights = weights or DEFAULT_RANKING_WEIGHTS
+    export_amount = columns["export_amount"]
+    market_share = columns["market_share"]
+    growth_rate = columns["growth_rate"]
+    volatility = columns["volatility"]
+    trade_balance = columns["trade_balance"]
+
+    growth_score = np.maximum(np.minimum(growth_rate + 0.2, 1.0), 0.0) * 100
+    volatility_score = np.maximum(1.0 - volatility, 0.0) * 100
+
+    # 종합 점수
+    export_score = np.minimum(export_amount / 10000000, 1.0) * 100
+    market_share_score = np.minimum(market_share / 10.0, 1.0) * 100
+    overall_score = (
+        export_score * weights["market_potential"] +
+        market_share_score * weights["competitiveness"] +
+        growth_score * weights["growth_potential"] +
+        volatility_score * weights["stability"]
+    )
+
+    # 성장 잠재력
+    market_share_potential = np.minimum(market_share / 5.0, 1.0) * 100
+    growth_potential = (growth_score * 0.6 + market_share_potential * 0.4)
+
+    # 안정성
+    growth_consistency = np.maximum(1.0 - np.abs(growth_rate), 0.0) * 100
+    stability_score = (volatility_score * 0.7 + growth_consistency * 0.3)
+
+    # 리스크
+    volatility_risk = volatility * 100
+    growth_risk = np.maximum(0.0, -growth_rate) * 100
+    balance_risk = np.maximum(0.0, -trade_balance / 1000000) * 10
+    risk_score = np.minimum(volatility_risk * 0.4 + growth_risk * 0.4 + balance_risk * 0.2, 100)
+
+    if "market_potential_score" in columns:
+        market_potential = columns["market_potential_score"]
+    else:
+        market_potential = compute_market_potential(columns)
+
+    return {
+        "overall_score": overall_score,
+        "market_potential": market_potential,
+        "growth_potential": growth_potential,
+        "stability_score": stability_score,
+        "risk_score": risk_score
+    }
+
+
+def classify_trend(growth_rate: np.ndarray) -> np.ndarray:
+    """성장률 배열 -> 트렌드 분석 문자열 배열"""
+    conditions = [growth_rate > threshold for threshold, _ in TREND_RULES]
+    return np.select(conditions, [label for _, label in TREND_RULES], default=TREND_DEFAULT).astype(object)
+
+
+def classify_recommendation(overall_score: np.ndarray) -> np.ndarray:
+    """종합 점수 배열 -> 추천사항 문자열 배열"""
+    conditions = [overall_score >= threshold for threshold, _ in RECOMMENDATION_RULES]
+    return np.select(conditions, [label for _, label in RECOMMENDATION_RULES],
+                     default=RECOMMENDATION_DEFAULT).astype(object)
+
+
+def rank_within_groups(group_keys: np.ndarray, scores: np.ndarray) -> np.ndarray:
+    """그룹(HS CODE 등)별 점수 내림차순 순위 (1부터, 동점은 입력 순서 유지)"""
+    n = len(scores)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    _, group_ids = np.unique(group_keys, return_inverse=True)
+    # 마지막 키가 1차 정렬 기준: 그룹 -> 점수 내림차순 -> 입력 순서
+    order = np.lexsort((np.arange(n), -scores, group_ids))
+
+    sorted_groups = group_ids[order]
+    group_start = np.r_[0, np.flatnonzero(np.diff(sorted_groups)) + 1]
+    starts = np.repeat(group_start, np.diff(np.r_[group_start, n]))
+
+    ranks = np.empty(n, dtype=np.int64)
+    ranks[order] = np.arange(n) - starts + 1
+    return ranks
+
+
+def volatility_from_series(columns: Dict[str, np.ndarray], default: float = 0.15) -> np.ndarray:
+    """(HS CODE, 국가)별 기간간 성장률 표준편차를 각 행의 변동성으로 사용
+
+    기간이 하나뿐인 시계열은 default 값을 사용한다.
+    """
+    keys = np.char.add(columns["hs_code"].astype(str), np.char.add("|", columns["country"].astype(str)))
+    _, series_ids, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    growth = np.nan_to_num(columns["growth_rate"])
+
+    sums = np.bincount(series_ids, weights=growth)
+    sq_sums = np.bincount(series_ids, weights=growth * growth)
+    means = sums / counts
+    variances = np.maximum(sq_sums / counts - means * means, 0.0)
+
+    volatility = np.where(counts > 1, np.sqrt(variances), default)
+    return volatility[series_ids]
+
+
+def latest_period_mask(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """(HS CODE, 국가)별 가장 최근 기간 행만 True"""
+    n = len(columns["country"])
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+    keys = np.char.add(columns["hs_code"].astype(str), np.char.add("|", columns["country"].astype(str)))
+    order = np.lexsort((columns["period"].astype(str), keys))
+    sorted_keys = keys[order]
+    is_last = np.r_[sorted_keys[1:] != sorted_keys[:-1], True]
+    mask = np.zeros(n, dtype=bool)
+    mask[order[is_last]] = True
+    return mask
+
+
+def concat_columns(parts: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """컬럼 딕셔너리 목록 연결"""
+    parts = [p for p in parts if p and len(p.get("country", ())) > 0]
+    if not parts:
+        empty = {name: np.array([], dtype=object) for name in KEY_COLUMNS}
+        empty.update({name: np.array([], dtype=np.float64) for name in NUMERIC_COLUMNS})
+        return empty
+    names = [name for name in parts[0] if all(name in p for p in parts)]
+    return {name: np.concatenate([p[name] for p in parts]) for name in names}
+
+
+class TradeColumnStore:
+    """HS CODE / 기간 파티션 단위 컬럼형 저장소
+
+    레이아웃: <base_dir>/hs_code=<HS>/period=<기간>/part.parquet (또는 part.npz)
+    """
+
+    def __init__(self, base_dir: str = "trade_analytics_store", use_parquet: Optional[bool] = None):
+        self.base_dir = base_dir
+        self.use_parquet = PYARROW_AVAILABLE if use_parquet is None else (use_parquet and PYARROW_AVAILABLE)
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    @staticmethod
+    def _safe(value: str) -> str:
+        return re.sub(r'[\\/:*?"<>|\s]+', "_", value) or "_"
+
+    def _partition_dir(self, hs_code: str, period: str) -> str:
+        return os.path.join(self.base_dir, f"hs_code={self._safe(hs_code)}", f"period={self._safe(period)}")
+
+    def write(self, columns: Dict[str, np.ndarray]) -> int:
+        """컬럼 데이터를 (HS CODE, 기간) 파티션으로 나누어 저장 (파티션 단위 덮어쓰기)"""
+        n = len(columns["country"])
+        if n == 0:
+            return 0
+
+        keys = np.char.add(columns["hs_code"].astype(str), np.char.add("\x1f", columns["period"].astype(str)))
+        unique_keys, partition_ids = np.unique(keys, return_inverse=True)
+        order = np.argsort(partition_ids, kind="stable")
+        bounds = np.r_[0, np.flatnonzero(np.diff(partition_ids[order])) + 1, n]
+
+        for i, key in enumerate(unique_keys):
+            rows = order[bounds[i]:bounds[i + 1]]
+            hs_code, period = str(key).split("\x1f", 1)
+            part = {name: values[rows] for name, values in columns.items()}
+            directory = self._partition_dir(hs_code, period)
+            os.makedirs(directory, exist_ok=True)
+
+            if self.use_parquet:
+                table = pa.table({name: (values.astype(str) if values.dtype == object else values)
+                                  for name, values in part.items()})
+                pq.write_table(table, os.path.join(directory, "part.parquet"))
+            else:
+                np.savez_compressed(
+                    os.path.join(directory, "part.npz"),
+                    **{name: (values.astype(str) if values.dtype == object else values)
+                       for name, values in part.items()}
+                )
+
+        logger.info(f"✅ 컬럼형 파티션 저장 완료: {len(unique_keys)}개 파티션, {n}개 행")
+        return len(unique_keys)
+
+    def list_partitions(self) -> List[Dict[str, str]]:
+        """저장된 파티션 목록"""
+        partitions = []
+        if not os.path.isdir(self.base_dir):
+            return partitions
+        for hs_dir in sorted(os.listdir(self.base_dir)):
+            if not hs_dir.startswith("hs_code="):
+                continue
+            for period_dir in sorted(os.listdir(os.path.join(self.base_dir, hs_dir))):
+                if period_dir.startswith("period="):
+                    partitions.append({
+                        "hs_code": hs_dir[len("hs_code="):],
+                        "period": period_dir[len("period="):],
+                        "path": os.path.join(self.base_dir, hs_dir, period_dir)
+                    })
+        return partitions
+
+    def read(self, hs_codes: Optional[Iterable[str]] = None,
+             periods: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """파티션 프루닝 후 필요한 파티션만 읽어 컬럼 딕셔너리로 반환"""
+        hs_filter = {self._safe(str(h)) for h in hs_codes} if hs_codes is not None else None
+        period_filter = {self._safe(str(p)) for p in periods} if periods is not None else None
+
+        parts = []
+        for partition in self.list_partitions():
+            if hs_filter is not None and partition["hs_code"] not in hs_filter:
+                continue
+            if period_filter is not None and partition["period"] not in period_filter:
+                continue
+            parts.append(self._read_partition(partition["path"]))
+        return concat_columns(parts)
+
+    def _read_partition(self, path: str) -> Dict[str, np.ndarray]:
+        parquet_file = os.path.join(path, "part.parquet")
+        npz_file = os.path.join(path, "part.npz")
+        if os.path.exists(parquet_file) and PYARROW_AVAILABLE:
+            table = pq.read_table(parquet_file)
+            data = {name: table.column(name).to_numpy(zero_copy_only=False) for name in table.column_names}
+        elif os.path.exists(npz_file):
+            with np.load(npz_file, allow_pickle=False) as npz:
+                data = {name: npz[name] for name in npz.files}
+        else:
+            return {}
+        return {name: (values.astype(object) if name in KEY_COLUMNS else values.astype(np.float64))
+                for name, values in data.items()}
+
+    def import_from_sqlite(self, db_path: str = "integrated_trade.db", table: str = "kotra_global_trade",
+                           product_column: str = "product_name") -> int:
+        """통합 무역 DB 의 행 기반 통계 테이블을 컬럼형 파티션으로 변환
+
+        DB 의 growth_rate 는 % 단위이므로 비율(0.155)로 변환하고,
+        변동성은 (HS CODE, 국가)별 기간간 성장률 표준편차로 계산한다.
+        """
+        with sqlite3.connect(db_path) as conn:
+            rows = conn.execute(
+                f"SELECT country, hs_code, period, export_amount, import_amount, trade_balance, "
+                f"market_share, growth_rate FROM {table}"
+            ).fetchall()
+
+        if not rows:
+            return 0
+
+        country, hs_code, period, export_amount, import_amount, trade_balance, market_share, growth_rate = zip(*rows)
+        columns = {
+            "country": np.array([c or "" for c in country], dtype=object),
+            "hs_code": np.array([h or "" for h in hs_code], dtype=object),
+            "period": np.array([p or "" for p in period], dtype=object),
+            "export_amount": np.array(export_amount, dtype=np.float64),
+            "import_amount": np.array(import_amount, dtype=np.float64),
+            "trade_balance": np.array(trade_balance, dtype=np.float64),
+            "market_share": np.array(market_share, dtype=np.float64),
+            "growth_rate": np.array(growth_rate, dtype=np.float64) / 100.0
+        }
+        for name in NUMERIC_COLUMNS:
+            if name in columns:
+                columns[name] = np.nan_to_num(columns[name])
+        columns["volatility"] = volatility_from_series(columns)
+        return self.write(columns)
+
+
+class TradeAnalyticsEngine:
+    """컬럼형 저장소 위에서 전체 HS CODE x 국가 시장 유망도 랭킹 계산"""
+
+    def __init__(self, store: Optional[TradeColumnStore] = None,
+                 weights: Optional[Dict[str, float]] = None):
+        self.store = store or TradeColumnStore()
+        self.weights = weights or DEFAULT_RANKING_WEIGHTS
+
+    def rank_markets(self, columns: Optional[Dict[str, np.ndarray]] = None,
+                     hs_codes: Optional[Iterable[str]] = None,
+                     latest_only: bool = True) -> Dict[str, np.ndarray]:
+        """모든 (HS CODE, 국가)에 대한 점수와 HS CODE별 순위를 한 번에 계산"""
+        if columns is None:
+            columns = self.store.read(hs_codes=hs_codes)
+        if latest_only and len(columns["country"]) > 0:
+            mask = latest_period_mask(columns)
+            columns = {name: values[mask] for name, values in columns.items()}
+
+        scores = compute_scores(columns, self.weights)
+        result = dict(columns)
+        result.update(scores)
+        result["ranking"] = rank_within_groups(columns["hs_code"], scores["overall_score"])
+        result["trend_analysis"] = classify_trend(columns["growth_rate"])
+        result["recommendation"] = classify_recommendation(np.round(scores["overall_score"], 2))
+        return result
+
+    @staticmethod
+    def to_records(result: Dict[str, np.ndarray], decimals: int = 2) -> List[Dict[str, Any]]:
+        """랭킹 결과를 (HS CODE, 순위) 순으로 정렬된 dict 목록으로 변환 (API 응답용)"""
+        n = len(result.get("country", ()))
+        if n == 0:
+            return []
+        order = np.lexsort((result["ranking"], result["hs_code"].astype(str)))
+        records = []
+        created_at = datetime.now().isoformat()
+        for i in order.tolist():
+            record = {}
+            for name, values in result.items():
+                value = values[i]
+                if isinstance(value, np.floating):
+                    value = round(float(value), decimals)
+                elif isinstance(value, np.integer):
+                    value = int(value)
+                record[name] = value
+            record["created_at"] = created_at
+            records.append(record)
+        return records
+
+
+# 사용 예시
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    store = TradeColumnStore()
+    store.import_from_sqlite("integrated_trade.db")
+
+    engine = TradeAnalyticsEngine(store)
+    records = engine.to_records(engine.rank_markets())
+    print(f"🏆 전체 시장 유망도 랭킹: {len(records)}개 (HS CODE x 국가)")
+    for record in records[:10]:
+        print(f"  HS {record['hs_code']} {record['country']}: 종합점수 {record['overall_score']:.1f}, "
+              f"{record['ranking']}위, {record['recommendation']}")
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+통합 무역 데이터베이스 스냅샷 관리
+- 수집 스크립트는 스테이징 DB(integrated_trade.db)에만 쓰기
+- publish() 로 읽기 전용 불변 스냅샷을 만들고 CURRENT 포인터를 원자적으로 교체
+- 웹 워커는 immutable=1 + mmap 으로 최신 스냅샷을 열어 쓰기와 경합 없이 읽기
+"""
+
+import argparse
+import atexit
+import logging
+import os
+import sqlite3
+import stat
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+POINTER_FILE = "CURRENT"
+SNAPSHOT_PREFIX = "integrated_trade_"
+
+
+class TradeDBSnapshotManager:
+    """스테이징 DB -> 불변 스냅샷 발행 및 읽기 전용 연결 관리"""
+
+    def __init__(self, staging_path: str, snapshot_dir: str, keep_snapshots: int = 3,
+                 mmap_size: int = 256 * 1024 * 1024, check_interval: float = 2.0,
+                 min_retention: float = 300.0):
+        """
+        Args:
+            staging_path: 수집 스크립트가 쓰는 스테이징 DB 경로
+            snapshot_dir: 스냅샷과 CURRENT 포인터를 저장할 디렉터리
+            keep_snapshots: 보관할 스냅샷 수 (오래된 것부터 삭제, 현재/직전 스냅샷은 항상 보관)
+            mmap_size: 읽기 연결의 PRAGMA mmap_size (바이트)
+            check_interval: CURRENT 포인터 변경 확인 주기 (초)
+            min_retention: 새 스냅샷으로 교체된 뒤 이 시간(초)이 지나야 삭제
+                (다른 워커 프로세스가 아직 이전 스냅샷을 읽고 있을 수 있음)
+        """
+        self.staging_path = staging_path
+        self.snapshot_dir = snapshot_dir
+        self.keep_snapshots = keep_snapshots
+        self.mmap_size = mmap_size
+        self.check_interval = check_interval
+        self.min_retention = min_retention
+
+        self._current: Optional[str] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # 스레드별 읽기 연결 전체 (종료 시 닫기, 열려 있는 스냅샷은 삭제하지 않음)
+        self._connections: Dict[int, Tuple[str, sqlite3.Connection]] = {}
+
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        atexit.register(self.close)
+
+    @property
+    def pointer_path(self) -> str:
+        return os.path.join(self.snapshot_dir, POINTER_FILE)
+
+    def publish(self) -> str:
+        """스테이징 DB 의 일관된 사본을 불변 스냅샷으로 발행하고 경로 반환"""
+        name = f"{SNAPSHOT_PREFIX}{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.db"
+        final_path = os.path.join(self.snapshot_dir, name)
+        tmp_path = final_path + ".tmp"
+
+        # 온라인 백업 API: 쓰기 중인 스테이징 DB 에서도 일관된 사본 생성
+        source = sqlite3.connect(self.staging_path)
+        target = sqlite3.connect(tmp_path)
+        try:
+            source.backup(target)
+            # immutable 로 열리므로 WAL 없이 단일 파일이어야 함
+            target.execute("PRAGMA journal_mode=DELETE")
+            target.execute("ANALYZE")
+            target.commit()
+        finally:
+            target.close()
+            source.close()
+
+        os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.replace(tmp_path, final_path)
+
+        # 포인터 파일 원자적 교체
+        pointer_tmp = self.pointer_path + ".tmp"
+        with open(pointer_tmp, 'w', encoding='utf-8') as f:
+            f.write(name)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(pointer_tmp, self.pointer_path)
+
+        with self._lock:
+            self._current = final_path
+            self._checked_at = time.time()
+
+        logger.info(f"📸 통합 DB 스냅샷 발행: {name}")
+        self._prune()
+        return final_path
+
+    def current_snapshot(self) -> Optional[str]:
+        """현재 발행된 스냅샷 경로 (없으면 None), check_interval 동안 재사용"""
+        now = time.time()
+        with self._lock:
+            if now - self._checked_at < self.check_interval:
+                return self._current
+
+        current = None
+        try:
+            with open(self.pointer_path, 'r', encoding='utf-8') as f:
+                name = f.read().strip()
+            if name and os.path.exists(os.path.join(self.snapshot_dir, name)):
+                current = os.path.join(self.snapshot_dir, name)
+        except FileNotFoundError:
+            pass
+
+        with self._lock:
+            self._current = current
+            self._checked_at = now
+        return current
+
+    def connect(self) -> Optional[sqlite3.Connection]:
+        """현재 스냅샷에 대한 스레드별 읽기 전용 연결 (스냅샷이 바뀌면 교체)"""
+        path = self.current_snapshot()
+        if not path:
+            return None
+
+        cached = getattr(self._local, 'connection', None)
+        if cached and cached[0] == path:
+            return cached[1]
+        if cached:
+            self._close_connection(cached[1])
+
+        # 종료 시 다른 스레드에서 닫을 수 있도록 check_same_thread=False (사용은 만든 스레드에서만)
+        conn = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro&immutable=1", uri=True,
+                               check_same_thread=False)
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        self._local.connection = (path, conn)
+        with self._lock:
+            self._connections[id(conn)] = (path, conn)
+        return conn
+
+    def _close_connection(self, conn: sqlite3.Connection):
+        with self._lock:
+            self._connections.pop(id(conn), None)
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ 스냅샷 연결 종료 실패: {e}")
+
+    def close(self):
+        """모든 스레드의 읽기 연결 종료"""
+        with self._lock:
+            connections, self._connections = list(self._connections.values()), {}
+        for _, conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ 스냅샷 연결 종료 실패: {e}")
+        self._local = threading.local()
+
+    def list_snapshots(self) -> List[str]:
+        """발행된 스냅샷 파일 이름 (오래된 순)"""
+        return sorted(
+            name for name in os.listdir(self.snapshot_dir)
+            if name.startswith(SNAPSHOT_PREFIX) and name.endswith(".db")
+        )
+
+    def _prune(self):
+        """보관 개수를 넘는 오래된 스냅샷 삭제
+
+        현재/직전 스냅샷, 이 프로세스의 연결이 열려 있는 스냅샷, 교체된 지
+        min_retention 초가 지나지 않은 스냅샷(다음 스냅샷의 발행 시각 기준)은 남긴다.
+        """
+        snapshots = self.list_snapshots()
+        keep = max(self.keep_snapshots, 2)
+        with self._lock:
+            in_use = {os.path.basename(path) for path, _ in self._connections.values()}
+        now = time.time()
+        for position, name in enumerate(snapshots[:-keep]):
+            if name in in_use:
+                continue
+            try:
+                superseded_at = os.path.getmtime(os.path.join(self.snapshot_dir, snapshots[position + 1]))
+            except OSError:
+                continue
+            if now - superseded_at < self.min_retention:
+                continue
+            try:
+                os.remove(os.path.join(self.snapshot_dir, name))
+                logger.info(f"🗑️ 오래된 스냅샷 삭제: {name}")
+            except OSError as e:
+                logger.warning(f"⚠️ 스냅샷 삭제 실패: {name} - {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        """스냅샷 상태 반환"""
+        current = self.current_snapshot()
+        return {
+            'staging_path': self.staging_path,
+            'snapshot_dir': self.snapshot_dir,
+            'current_snapshot': os.path.basename(current) if current else None,
+            'snapshots': self.list_snapshots(),
+            'mmap_size': self.mmap_size
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="통합 무역 DB 스냅샷 관리")
+    parser.add_argument("command", choices=["publish", "status"])
+    parser.add_argument("--staging", default="integrated_trade.db", help="스테이징 DB 경로")
+    parser.add_argument("--snapshot-dir", default=os.environ.get("TRADE_DB_SNAPSHOT_DIR", "db_snapshots"),
+                        help="스냅샷 디렉터리")
+    parser.add_argument("--keep", type=int, default=3, help="보관할 스냅샷 수")
+    args = parser.parse_args()
+
+    manager = TradeDBSnapshotManager(args.staging, args.snapshot_dir, keep_snapshots=args.keep)
+    if args.command == "publish":
+        path = manager.publish()
+        print(f"✅ 스냅샷 발행 완료: {path}")
+    else:
+        for key, value in manager.get_status().items():
+            print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
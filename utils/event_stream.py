@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+단계별 분석 결과 스트리밍
+- (이벤트 이름, 데이터) 를 만드는 생성기를 server-sent events 또는 줄 단위 JSON(NDJSON) 으로 변환
+- 생성기는 별도 스레드에서 실행하고, 오래 걸리는 단계(OCR 등) 동안에는 하트비트를 보내
+  프록시 유휴 시간 초과로 연결이 끊기지 않게 함
+- 클라이언트가 연결을 끊으면 다음 단계에서 생성기를 닫아 정리(finally) 코드 실행
+"""
+
+import json
+import logging
+import queue
+import threading
+from typing import Any, Iterator, Optional, Tuple
+
+from utils.ocr_result_cache import json_default
+
+logger = logging.getLogger(__name__)
+
+EVENT_STREAM_MIMETYPES = {
+    'sse': 'text/event-stream',
+    'ndjson': 'application/x-ndjson'
+}
+
+# 프록시 버퍼링/캐시 방지 (nginx 는 X-Accel-Buffering)
+EVENT_STREAM_HEADERS = {
+    'Cache-Control': 'no-cache',
+    'X-Accel-Buffering': 'no'
+}
+
+_DONE = object()
+
+
+def format_sse(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    """server-sent event 한 건 (data 는 한 줄 JSON)"""
+    payload = json.dumps(data, ensure_ascii=False, default=json_default)
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event}", f"data: {payload}"]
+    return "\n".join(lines) + "\n\n"
+
+
+def format_ndjson(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    """NDJSON 한 줄 ({"event", "data"})"""
+    record = {'event': event, 'data': data}
+    if event_id is not None:
+        record['id'] = event_id
+    return json.dumps(record, ensure_ascii=False, default=json_default) + "\n"
+
+
+FORMATTERS = {'sse': format_sse, 'ndjson': format_ndjson}
+HEARTBEATS = {'sse': ": keepalive\n\n", 'ndjson': "\n"}
+
+
+def stream_events(events: Iterator[Tuple[str, Any]], fmt: str = 'sse',
+                  heartbeat: float = 15.0) -> Iterator[str]:
+    """이벤트 생성기를 응답 본문 조각으로 변환
+
+    Args:
+        events: (이벤트 이름, JSON 직렬화 가능한 데이터) 생성기. 요청 컨텍스트 없이 실행되므로
+            요청 데이터는 생성기를 만들기 전에 읽어 둔다.
+        fmt: 'sse' 또는 'ndjson'
+        heartbeat: 이 시간(초) 동안 이벤트가 없으면 하트비트 전송 (0 이하이면 보내지 않음)
+    """
+    if fmt not in FORMATTERS:
+        raise ValueError(f"지원하지 않는 스트림 형식: {fmt}")
+    formatter = FORMATTERS[fmt]
+    buffer: 'queue.Queue' = queue.Queue(maxsize=16)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in events:
+                if not put(item):
+                    break
+        except Exception as e:
+            logger.warning(f"⚠️ 스트리밍 이벤트 생성 실패: {e}")
+            put(('error', {'success': False, 'error': str(e)}))
+        finally:
+            if stop.is_set() and hasattr(events, 'close'):
+                events.close()
+            put(_DONE)
+
+    producer = threading.Thread(target=produce, name='event-stream', daemon=True)
+    producer.start()
+    event_id = 0
+    try:
+        while True:
+            try:
+                item = buffer.get(timeout=heartbeat if heartbeat > 0 else None)
+            except queue.Empty:
+                yield HEARTBEATS[fmt]
+                continue
+            if item is _DONE:
+                break
+            event, data = item
+            yield formatter(event, data, event_id)
+            event_id += 1
+    finally:
+        # 클라이언트 연결 종료 등으로 응답이 닫히면 생성기 중단
+        stop.set()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+라벨 텍스트 필드 추출 엔진
+- {필드: [패턴, ...]} 정의를 한 번 컴파일해 모든 필드를 텍스트 한 번 훑어서 추출
+- 필드마다 패턴 목록 순서가 우선순위 (기존 패턴별 re.search 루프와 같은 결과)
+- 추출 값의 문자 위치(span)를 함께 반환해 원문 하이라이트에 사용
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+# 텍스트 기반 영양정보 추출 패턴 (app.extract_nutrition_from_text, FreeAIServices 공용)
+NUTRITION_TEXT_PATTERNS = {
+    'calories': [
+        r'(\d+)\s*(?:kcal|칼로리|calories?)',
+        r'칼로리[:\s]*(\d+(?:\.\d+)?)',
+        r'calories?[:\s]*(\d+(?:\.\d+)?)',
+        r'(\d+)\s*kcal',
+        r'열량[:\s]*(\d+(?:\.\d+)?)',
+        r'에너지[:\s]*(\d+(?:\.\d+)?)'
+    ],
+    'protein': [
+        r'단백질[:\s]*(\d+(?:\.\d+)?)',
+        r'protein[:\s]*(\d+(?:\.\d+)?)',
+        r'(\d+(?:\.\d+)?)\s*g\s*단백질',
+        r'(\d+(?:\.\d+)?)\s*g\s*protein'
+    ],
+    'fat': [
+        r'지방[:\s]*(\d+(?:\.\d+)?)',
+        r'fat[:\s]*(\d+(?:\.\d+)?)',
+        r'(\d+(?:\.\d+)?)\s*g\s*지방',
+        r'(\d+(?:\.\d+)?)\s*g\s*fat'
+    ],
+    'carbs': [
+        r'탄수화물[:\s]*(\d+(?:\.\d+)?)',
+        r'carbohydrate[:\s]*(\d+(?:\.\d+)?)',
+        r'carbs[:\s]*(\d+(?:\.\d+)?)',
+        r'(\d+(?:\.\d+)?)\s*g\s*탄수화물',
+        r'(\d+(?:\.\d+)?)\s*g\s*carb'
+    ],
+    'sodium': [
+        r'나트륨[:\s]*(\d+(?:\.\d+)?)',
+        r'sodium[:\s]*(\d+(?:\.\d+)?)',
+        r'(\d+(?:\.\d+)?)\s*mg\s*나트륨',
+        r'(\d+(?:\.\d+)?)\s*mg\s*sodium'
+    ],
+    'sugar': [
+        r'당류[:\s]*(\d+(?:\.\d+)?)',
+        r'sugar[:\s]*(\d+(?:\.\d+)?)',
+        r'(\d+(?:\.\d+)?)\s*g\s*당류',
+        r'(\d+(?:\.\d+)?)\s*g\s*sugar'
+    ],
+    'fiber': [
+        r'식이섬유[:\s]*(\d+(?:\.\d+)?)',
+        r'fiber[:\s]*(\d+(?:\.\d+)?)',
+        r'dietary\s*fiber[:\s]*(\d+(?:\.\d+)?)',
+        r'(\d+(?:\.\d+)?)\s*g\s*식이섬유',
+        r'(\d+(?:\.\d+)?)\s*g\s*fiber'
+    ],
+    'serving_size': [
+        r'(?:1회\s*제공량|서빙\s*사이즈|제공량)[:\s]*(\d+(?:\.\d+)?)',
+        r'(?:serving\s*size|portion)[:\s]*(\d+(?:\.\d+)?)',
+        r'(\d+(?:\.\d+)?)\s*g\s*(?:1회\s*제공량|서빙)',
+        r'(\d+(?:\.\d+)?)\s*g\s*serving'
+    ],
+    'product_name': [
+        r'제품명[:\s]*([^\n\r]+)',
+        r'product[:\s]*([^\n\r]+)',
+        r'상품명[:\s]*([^\n\r]+)'
+    ],
+    'allergies': [
+        r'알레르기\s*정보[:\s]*([^\n\r]+)',
+        r'allergy\s*information[:\s]*([^\n\r]+)',
+        r'함유[:\s]*([^\n\r]+)',
+        r'contains[:\s]*([^\n\r]+)',
+        r'우유[,\s]*계란[,\s]*대두',
+        r'milk[,\s]*eggs[,\s]*soybeans'
+    ]
+}
+
+
+@dataclass
+class FieldMatch:
+    """필드 하나의 추출 결과 (start/end 는 원문 기준 값의 위치)"""
+    field: str
+    value: str
+    start: int
+    end: int
+    pattern_index: int
+
+    @property
+    def span(self) -> Tuple[int, int]:
+        return self.start, self.end
+
+
+def flatten_patterns(spec: Dict[str, Any], prefix: str = '') -> List[Tuple[str, List[str]]]:
+    """중첩 패턴 정의를 ('nutrition.calories', [패턴...]) 목록으로 펼침"""
+    flat = []
+    for key, value in spec.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.extend(flatten_patterns(value, f"{path}."))
+        else:
+            flat.append((path, list(value)))
+    return flat
+
+
+def nest_values(flat: Dict[str, Any]) -> Dict[str, Any]:
+    """{'nutrition.calories': v} 를 {'nutrition': {'calories': v}} 로 변환"""
+    nested: Dict[str, Any] = {}
+    for path, value in flat.items():
+        target = nested
+        *parents, leaf = path.split('.')
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = value
+    return nested
+
+
+class FieldExtractor:
+    """컴파일된 단일 패스 필드 추출기
+
+    모든 패턴을 두 개의 정규식으로 컴파일한다.
+    - 후보 탐색용: 전체 패턴의 단일 alternation. 어떤 패턴이든 시작할 수 있는 위치로 바로 이동
+    - 위치별 캡처용: 패턴마다 이름 있는 그룹을 가진 선택적 lookahead 의 연결.
+      후보 위치 하나에서 그 위치에서 시작하는 모든 패턴의 매치를 한 번에 얻음
+    후보 위치를 앞에서부터 한 번만 훑으므로 각 패턴의 첫 매치는 re.search 와 같고,
+    필드 값은 매치된 패턴 중 목록에서 가장 앞선 패턴의 첫 매치다.
+    패턴의 값은 첫 번째 캡처 그룹(없으면 전체 매치)이며, 이름 있는 그룹과 역참조는 쓸 수 없다.
+    """
+
+    def __init__(self, spec: Dict[str, Any], flags: int = re.IGNORECASE):
+        self.flags = flags
+        self._patterns: List[Tuple[str, int, int]] = []  # (필드, 우선순위, 값 그룹 수)
+        self.fields: List[str] = []
+        sources = []
+        for field, patterns in flatten_patterns(spec):
+            self.fields.append(field)
+            for priority, pattern in enumerate(patterns):
+                compiled = re.compile(pattern, flags)
+                if compiled.groupindex or re.search(r'\\[1-9]', pattern):
+                    raise ValueError(f"이름 있는 그룹/역참조는 지원하지 않습니다: {field} {pattern}")
+                self._patterns.append((field, priority, compiled.groups))
+                sources.append(pattern)
+
+        self._gate = re.compile('|'.join(f'(?:{p})' for p in sources), flags) if sources else None
+        self._capture = re.compile(
+            ''.join(f'(?:(?=(?P<p{i}>{p})))?' for i, p in enumerate(sources)), flags
+        ) if sources else None
+        # 패턴별 값 그룹 번호 (첫 번째 캡처 그룹, 없으면 패턴 전체 그룹)
+        self._value_groups = [
+            self._capture.groupindex[f'p{i}'] + (1 if groups else 0)
+            for i, (_, _, groups) in enumerate(self._patterns)
+        ] if sources else []
+
+    def extract_all(self, text: str) -> Dict[str, List[FieldMatch]]:
+        """필드별로 각 패턴의 첫 매치를 우선순위 순으로 반환
+
+        후처리 결과가 비면 다음 패턴 값을 쓰는 호출자(예: 알레르기 목록)용.
+        """
+        found: Dict[int, FieldMatch] = {}
+        if self._gate is None or not text:
+            return {}
+        position = 0
+        while len(found) < len(self._patterns):
+            candidate = self._gate.search(text, position)
+            if candidate is None:
+                break
+            start = candidate.start()
+            match = self._capture.match(text, start)
+            for i, (field, priority, _) in enumerate(self._patterns):
+                if i in found or match.start(f'p{i}') < 0:
+                    continue
+                group = self._value_groups[i]
+                value_start = match.start(group)
+                if value_start < 0:
+                    continue
+                raw = match.group(group)
+                stripped = raw.strip()
+                offset = value_start + (len(raw) - len(raw.lstrip()))
+                found[i] = FieldMatch(field, stripped, offset, offset + len(stripped), priority)
+            position = start + 1
+
+        results: Dict[str, List[FieldMatch]] = {}
+        for i in sorted(found, key=lambda k: (self._patterns[k][0], self._patterns[k][1])):
+            results.setdefault(found[i].field, []).append(found[i])
+        return {field: results[field] for field in self.fields if field in results}
+
+    def extract(self, text: str) -> Dict[str, FieldMatch]:
+        """필드별 최우선 매치 (필드 정의 순서)"""
+        return {field: matches[0] for field, matches in self.extract_all(text).items()}
+
+    def extract_values(self, text: str) -> Tuple[Dict[str, Any], Dict[str, List[int]]]:
+        """(중첩 값 dict, {필드 경로: [start, end]}) 반환"""
+        matches = self.extract(text)
+        values = nest_values({field: match.value for field, match in matches.items()})
+        return values, spans_of(matches)
+
+
+def spans_of(matches: Dict[str, FieldMatch]) -> Dict[str, List[int]]:
+    """JSON 응답용 {필드: [start, end]}"""
+    return {field: [match.start, match.end] for field, match in matches.items()}
+
+
+_extractor_cache: Dict[Tuple, FieldExtractor] = {}
+_extractor_cache_lock = threading.Lock()
+
+
+def get_field_extractor(spec: Dict[str, Any], flags: int = re.IGNORECASE) -> FieldExtractor:
+    """같은 패턴 정의의 추출기는 한 번만 컴파일해 공유"""
+    key = (tuple((field, tuple(patterns)) for field, patterns in flatten_patterns(spec)), flags)
+    with _extractor_cache_lock:
+        extractor = _extractor_cache.get(key)
+        if extractor is None:
+            extractor = FieldExtractor(spec, flags)
+            _extractor_cache[key] = extractor
+        return extractor
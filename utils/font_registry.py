@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+라벨 생성용 폰트 레지스트리
+- 폰트 계열(다국어/중국어/영어/한글)마다 후보 파일을 한 번만 탐색해 사용할 파일 결정
+  (프로젝트 fonts/ 폴더 → 시스템 폰트 폴더 → Pillow 기본 탐색 순)
+- (파일, 크기) 별 글꼴 객체를 한 번만 로드해 프로세스 전체에서 공유
+- 글자별 너비와 줄 높이를 캐시해 그리지 않고 텍스트 크기 측정
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from PIL import ImageFont
+
+logger = logging.getLogger(__name__)
+
+# 프로젝트에 포함된 폰트 폴더 (배포 환경에서 우선 사용)
+FONTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fonts')
+
+# 시스템 폰트 폴더 (로컬 Windows 개발 환경)
+SYSTEM_FONT_DIRS = ['C:/Windows/Fonts']
+
+# 계열별 폰트 파일 우선순위 (파일 이름 순서가 우선, 같은 파일은 FONTS_DIR → 시스템 폴더 → 이름만)
+FONT_FAMILIES = {
+    'multilingual': ['msyh.ttc', 'simsun.ttc', 'simhei.ttf', 'arial.ttf', 'calibri.ttf', 'tahoma.ttf',
+                     'malgun.ttf', 'gulim.ttc'],
+    'chinese': ['msyh.ttc', 'simsun.ttc', 'msyhbd.ttc', 'simhei.ttf', 'malgun.ttf'],
+    'english': ['arial.ttf', 'msyh.ttc', 'malgun.ttf', 'calibri.ttf'],
+    'korean': ['malgun.ttf', 'msyh.ttc', 'gulim.ttc']
+}
+
+# 후보를 모두 찾지 못했을 때 시도할 Linux 시스템 폰트 (절대 경로)
+FAMILY_FALLBACKS = {
+    'chinese': ['/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc',
+                '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+                '/usr/share/fonts/truetype/noto/NotoSansSC-Regular.otf'],
+    'korean': ['/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
+               '/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc']
+}
+
+
+def candidate_paths(family: str) -> List[str]:
+    """계열의 폰트 후보 경로 (탐색 순서대로)"""
+    if family not in FONT_FAMILIES:
+        raise ValueError(f"알 수 없는 폰트 계열: {family}")
+    paths = []
+    for name in FONT_FAMILIES[family]:
+        paths.extend(os.path.join(directory, name) for directory in [FONTS_DIR] + SYSTEM_FONT_DIRS)
+        # 이름만 주면 Pillow 가 운영체제 폰트 폴더에서 찾는다
+        paths.append(name)
+    paths.extend(FAMILY_FALLBACKS.get(family, []))
+    return paths
+
+
+class FontRegistry:
+    """프로세스 전체 폰트 레지스트리 (계열 → 파일 결정, 글꼴 객체/글자 너비 캐시)"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._resolved: Dict[str, Optional[str]] = {}
+        self._faces: Dict[Tuple[Optional[str], int], ImageFont.ImageFont] = {}
+        self._advances: Dict[Tuple[Optional[str], int], Dict[str, float]] = {}
+        self._line_heights: Dict[Tuple[Optional[str], int], int] = {}
+        self.stats = {'probes': 0, 'faces_loaded': 0}
+
+    def resolve(self, family: str) -> Optional[str]:
+        """계열에서 실제로 읽을 수 있는 첫 번째 폰트 경로 (없으면 None, 결과는 캐시)"""
+        if family in self._resolved:
+            return self._resolved[family]
+        with self._lock:
+            if family in self._resolved:
+                return self._resolved[family]
+            path = None
+            for candidate in candidate_paths(family):
+                if os.path.isabs(candidate) and not os.path.exists(candidate):
+                    continue
+                self.stats['probes'] += 1
+                try:
+                    self._faces[(candidate, 12)] = ImageFont.truetype(candidate, 12)
+                except (OSError, ValueError):
+                    continue
+                self.stats['faces_loaded'] += 1
+                path = candidate
+                break
+            if path:
+                logger.info(f"✅ {family} 폰트 결정: {path}")
+            else:
+                logger.warning(f"⚠️ {family} 폰트를 찾을 수 없어 기본 폰트를 사용합니다.")
+            self._resolved[family] = path
+            return path
+
+    def find_font(self, family: str, size: int) -> Optional[ImageFont.FreeTypeFont]:
+        """계열 폰트의 size 크기 글꼴 (계열 폰트가 없으면 None)"""
+        path = self.resolve(family)
+        return self._face(path, size) if path else None
+
+    def get_font(self, family: str, size: int) -> ImageFont.ImageFont:
+        """계열 폰트의 size 크기 글꼴 (없으면 Pillow 기본 폰트)"""
+        return self._face(self.resolve(family), size)
+
+    def _face(self, path: Optional[str], size: int) -> ImageFont.ImageFont:
+        key = (path, size)
+        face = self._faces.get(key)
+        if face is None:
+            with self._lock:
+                face = self._faces.get(key)
+                if face is None:
+                    face = ImageFont.truetype(path, size) if path else ImageFont.load_default()
+                    self._faces[key] = face
+                    self.stats['faces_loaded'] += 1
+        return face
+
+    def measure(self, text: str, family: str = 'multilingual', size: int = 14) -> Tuple[int, int]:
+        """그리지 않고 텍스트 (너비, 높이) 계산 (여러 줄이면 가장 긴 줄 너비, 줄 높이 × 줄 수)
+
+        글자별 너비(advance)를 캐시해 합산하므로 같은 글자가 반복되는 라벨 텍스트는
+        글꼴 렌더링 없이 측정된다. 커닝은 반영하지 않는다.
+        """
+        path = self.resolve(family)
+        face = self._face(path, size)
+        key = (path, size)
+        advances = self._advances.setdefault(key, {})
+        lines = str(text).split('\n')
+        width = 0.0
+        for line in lines:
+            line_width = 0.0
+            for char in line:
+                advance = advances.get(char)
+                if advance is None:
+                    advance = advances[char] = face.getlength(char)
+                line_width += advance
+            width = max(width, line_width)
+        return int(round(width)), self.line_height(family, size) * len(lines)
+
+    def line_height(self, family: str = 'multilingual', size: int = 14) -> int:
+        """한 줄 높이 (ascent + descent)"""
+        path = self.resolve(family)
+        key = (path, size)
+        height = self._line_heights.get(key)
+        if height is None:
+            face = self._face(path, size)
+            if hasattr(face, 'getmetrics'):
+                ascent, descent = face.getmetrics()
+                height = ascent + descent
+            else:
+                left, top, right, bottom = face.getbbox('Ag')
+                height = bottom - top
+            self._line_heights[key] = height
+        return height
+
+    def clear(self):
+        """캐시 초기화 (폰트 파일을 추가/교체한 뒤 다시 탐색)"""
+        with self._lock:
+            self._resolved.clear()
+            self._faces.clear()
+            self._advances.clear()
+            self._line_heights.clear()
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'resolved': dict(self._resolved), 'cached_faces': len(self._faces)}
+
+
+# 전역 폰트 레지스트리
+font_registry = FontRegistry()
+
+
+def get_font_registry() -> FontRegistry:
+    """전역 폰트 레지스트리 반환"""
+    return font_registry
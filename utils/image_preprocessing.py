@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+OCR 이미지 전처리 파이프라인
+- 해상도 향상/잡음제거/대비 향상/회전 보정/이진화/모폴로지를 한 번에 실행
+- 스레드별로 미리 할당한 버퍼를 재사용하고 OpenCV dst= 출력으로 중간 배열 할당 최소화
+- 축소본에서 측정한 품질(선명도, 대비, 기울기)에 따라 불필요한 단계 생략
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 텍스트 선명화 커널 (기존 apply_morphology 의 text_sharpening 과 동일)
+SHARPEN_KERNEL = np.array([[-1, -1, -1], [-1, 9, -1], [-1, -1, -1]], dtype=np.float32)
+
+# 잡음제거 강도별 bilateral filter 파라미터 (지름, sigmaColor, sigmaSpace)
+NOISE_REDUCTION_PARAMS = {
+    'strong': (9, 60, 60),
+    'moderate': (7, 40, 40),
+    'light': (5, 20, 20)
+}
+
+# 대비 향상 강도별 CLAHE clipLimit
+CONTRAST_CLIP_LIMITS = {
+    'aggressive': 3.0,
+    'balanced': 2.0,
+    'conservative': 1.5
+}
+
+
+class _BufferPool(threading.local):
+    """스레드별 재사용 버퍼 (같은 크기 이미지가 반복되면 재할당하지 않음)"""
+
+    def __init__(self):
+        self.buffers: Dict[str, np.ndarray] = {}
+        self.clahe: Dict[float, Any] = {}
+        self.allocations = 0
+
+    def get(self, name: str, shape: Tuple[int, ...], max_pixels: int) -> np.ndarray:
+        buffer = self.buffers.get(name)
+        if buffer is not None and buffer.shape == shape:
+            return buffer
+        self.allocations += 1
+        buffer = np.empty(shape, dtype=np.uint8)
+        # 너무 큰 버퍼는 스레드에 붙잡아 두지 않음 (저메모리 환경)
+        if shape[0] * shape[1] <= max_pixels:
+            self.buffers[name] = buffer
+        else:
+            self.buffers.pop(name, None)
+        return buffer
+
+    def get_clahe(self, clip_limit: float):
+        # CLAHE 객체는 스레드 간 공유하지 않음
+        clahe = self.clahe.get(clip_limit)
+        if clahe is None:
+            clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(8, 8))
+            self.clahe[clip_limit] = clahe
+        return clahe
+
+
+class PreprocessingPipeline:
+    """설정 기반 단일 패스 전처리 파이프라인
+
+    settings 는 AdvancedImagePreprocessor.document_settings 와 같은 형식이다
+    (enhance_resolution, scale_factor, noise_reduction, contrast_enhancement,
+    rotation_correction, binarization, morphology). 결과는 항상 그레이스케일이며
+    호출자가 소유하는 새 배열로 반환한다 (내부 버퍼는 다음 호출에서 재사용).
+    """
+
+    def __init__(self, max_pixels: int = 12_000_000, min_sharpness: float = 100.0,
+                 contrast_skip_range: float = 150.0, min_skew_angle: float = 0.5,
+                 quality_max_side: int = 800, max_cached_pixels: int = 16_000_000):
+        """
+        Args:
+            max_pixels: 해상도 향상 후 최대 픽셀 수 (넘으면 배율을 낮춤)
+            min_sharpness: 선명도(라플라시안 분산)가 이보다 낮으면 잡음제거 생략 (흐린 이미지를 더 뭉개지 않음)
+            contrast_skip_range: 밝기 범위(1~99 백분위 차이)가 이 이상이면 대비 향상 생략
+            min_skew_angle: 추정 기울기가 이보다 작으면 회전 보정 생략 (도)
+            quality_max_side: 품질 측정용 축소본의 긴 변 길이
+            max_cached_pixels: 스레드별로 보관할 버퍼의 최대 픽셀 수
+        """
+        self.max_pixels = max_pixels
+        self.min_sharpness = min_sharpness
+        self.contrast_skip_range = contrast_skip_range
+        self.min_skew_angle = min_skew_angle
+        self.quality_max_side = quality_max_side
+        self.max_cached_pixels = max_cached_pixels
+        self._pool = _BufferPool()
+
+    def measure_quality(self, gray: np.ndarray) -> Dict[str, float]:
+        """축소본에서 선명도, 대비, 기울기 추정"""
+        height, width = gray.shape[:2]
+        ratio = min(1.0, self.quality_max_side / float(max(height, width)))
+        small = cv2.resize(gray, None, fx=ratio, fy=ratio, interpolation=cv2.INTER_AREA) if ratio < 1.0 else gray
+
+        sharpness = float(cv2.Laplacian(small, cv2.CV_64F).var())
+        # 대비: 밝기 히스토그램의 1~99 백분위 차이 (흰 여백이 대부분인 라벨에서도 안정적)
+        cdf = np.cumsum(cv2.calcHist([small], [0], None, [256], [0, 256]).ravel())
+        cdf /= cdf[-1]
+        contrast = float(np.searchsorted(cdf, 0.99) - np.searchsorted(cdf, 0.01))
+        return {
+            'sharpness': round(sharpness, 2),
+            'contrast': contrast,
+            'skew_angle': round(self._estimate_skew(small), 2)
+        }
+
+    def _estimate_skew(self, gray: np.ndarray) -> float:
+        """텍스트 줄 방향으로 기울기 추정 (기존 correct_rotation 과 같은 Hough 방식)"""
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        lines = cv2.HoughLines(binary, 1, np.pi / 180, threshold=100)
+        if lines is None:
+            return 0.0
+        angles = []
+        for rho, theta in lines[:10, 0]:
+            angle = theta * 180 / np.pi
+            if angle < 45:
+                angles.append(angle)
+            elif angle > 135:
+                angles.append(angle - 180)
+        return float(np.median(angles)) if angles else 0.0
+
+    def run(self, image: np.ndarray, settings: Dict[str, Any]) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """전처리 실행, (처리된 그레이스케일 이미지, 처리 정보) 반환"""
+        started = time.perf_counter()
+        pool = self._pool
+        allocations_before = pool.allocations
+        steps = []
+        skipped = {}
+
+        # 0. 그레이스케일 (입력 배열은 수정하지 않음)
+        if image.ndim == 3:
+            gray = pool.get('gray', image.shape[:2], self.max_cached_pixels)
+            code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+            cv2.cvtColor(image, code, dst=gray)
+        else:
+            gray = image
+        quality = self.measure_quality(gray)
+        current = gray
+
+        # 작업 버퍼 두 개를 번갈아 출력으로 사용
+        def target(shape=None):
+            shape = shape or current.shape
+            first = pool.get('work_a', shape, self.max_cached_pixels)
+            return pool.get('work_b', shape, self.max_cached_pixels) if first is current else first
+
+        # 1. 해상도 향상 (최대 픽셀 수 내에서)
+        if settings.get('enhance_resolution'):
+            height, width = current.shape[:2]
+            scale = min(settings.get('scale_factor', 2.0), (self.max_pixels / float(height * width)) ** 0.5)
+            if scale > 1.05:
+                new_size = (int(width * scale), int(height * scale))
+                out = target((new_size[1], new_size[0]))
+                cv2.resize(current, new_size, dst=out, interpolation=cv2.INTER_CUBIC)
+                current = out
+                steps.append('resolution_enhancement')
+            else:
+                skipped['resolution_enhancement'] = 'max_pixels'
+
+        # 2. 잡음제거 (이미 흐린 이미지는 생략)
+        noise = settings.get('noise_reduction', 'none')
+        if noise != 'none':
+            if quality['sharpness'] < self.min_sharpness:
+                skipped['noise_reduction'] = 'low_sharpness'
+            else:
+                diameter, sigma_color, sigma_space = NOISE_REDUCTION_PARAMS.get(noise, NOISE_REDUCTION_PARAMS['light'])
+                out = target()
+                cv2.bilateralFilter(current, diameter, sigma_color, sigma_space, dst=out)
+                current = out
+                steps.append('noise_reduction')
+
+        # 3. 대비 향상 (대비가 충분하면 생략)
+        contrast = settings.get('contrast_enhancement', 'none')
+        if contrast != 'none':
+            if quality['contrast'] >= self.contrast_skip_range:
+                skipped['contrast_enhancement'] = 'high_contrast'
+            else:
+                clahe = pool.get_clahe(CONTRAST_CLIP_LIMITS.get(contrast, 1.5))
+                out = target()
+                clahe.apply(current, dst=out)
+                current = out
+                steps.append('contrast_enhancement')
+
+        # 4. 회전 보정 (기울기가 작으면 생략)
+        rotation_angle = 0.0
+        if settings.get('rotation_correction'):
+            if abs(quality['skew_angle']) < self.min_skew_angle:
+                skipped['rotation_correction'] = 'no_skew'
+            else:
+                rotation_angle = quality['skew_angle']
+                height, width = current.shape[:2]
+                matrix = cv2.getRotationMatrix2D((width // 2, height // 2), rotation_angle, 1.0)
+                out = target()
+                cv2.warpAffine(current, matrix, (width, height), dst=out, borderMode=cv2.BORDER_REPLICATE)
+                current = out
+                steps.append('rotation_correction')
+
+        # 5. 이진화
+        binarization = settings.get('binarization', 'none')
+        if binarization != 'none':
+            out = target()
+            if binarization == 'adaptive':
+                cv2.adaptiveThreshold(current, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2, dst=out)
+            elif binarization == 'otsu':
+                cv2.threshold(current, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=out)
+            else:
+                cv2.threshold(current, 127, 255, cv2.THRESH_BINARY, dst=out)
+            current = out
+            steps.append('binarization')
+
+        # 6. 모폴로지 (1x1 커널 닫힘 연산은 항등 연산이므로 생략)
+        morphology = settings.get('morphology', 'none')
+        if morphology == 'text_sharpening':
+            out = target()
+            cv2.filter2D(current, -1, SHARPEN_KERNEL, dst=out)
+            current = out
+            steps.append('morphology')
+        elif morphology == 'table_enhancement':
+            out = target()
+            cv2.morphologyEx(current, cv2.MORPH_CLOSE, np.ones((2, 2), np.uint8), dst=out)
+            current = out
+            steps.append('morphology')
+        elif morphology != 'none':
+            skipped['morphology'] = 'no_op'
+
+        processed = current.copy()
+        info = {
+            'processing_steps': steps,
+            'skipped_steps': skipped,
+            'quality': quality,
+            'rotation_angle': rotation_angle,
+            'final_size': processed.shape,
+            'buffer_allocations': pool.allocations - allocations_before,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+        }
+        return processed, info
+
+    def release_buffers(self) -> None:
+        """현재 스레드의 재사용 버퍼 해제"""
+        self._pool.buffers.clear()
+
+
+# 전역 전처리 파이프라인 인스턴스
+preprocessing_pipeline = PreprocessingPipeline()
+
+
+def get_preprocessing_pipeline() -> PreprocessingPipeline:
+    """전역 전처리 파이프라인 반환"""
+    return preprocessing_pipeline
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+컴파일된 라벨 레이아웃
+- 라벨 템플릿을 정적 요소(제목, 표 머리글, 항목 이름, 구분선, 경고 문구)와
+  가변 요소(제품명, 영양성분 값, 성분 목록, 날짜, QR코드)의 순서 있는 목록으로 선언
+- (국가, 템플릿 버전, 크기, 글꼴, 색상) 마다 한 번만 컴파일:
+  위치가 고정된 정적 요소는 기본 이미지에 미리 그리고, 가변 길이 목록 뒤에 오는
+  정적 문구는 글자 마스크로 미리 렌더링해 둠
+- 라벨마다 기본 이미지를 복사한 뒤 가변 요소만 그리고 마스크를 붙여 넣음
+  (마스크 붙여넣기는 draw.text 와 같은 픽셀 결과, 반복되는 가변 문구의 마스크도 캐시)
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image, ImageDraw
+
+logger = logging.getLogger(__name__)
+
+# 구분선 좌우 여백
+RULE_MARGIN = 20
+
+
+@dataclass(frozen=True)
+class Section:
+    """섹션 시작 (y 가 있으면 그 위치로 이동, 없으면 앞 섹션에 이어서)"""
+    y: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class Text:
+    """정적 문구 (모든 라벨에서 같음)"""
+    x: int
+    text: str
+    font: str
+    color: str
+
+
+@dataclass(frozen=True)
+class Field:
+    """가변 문구 (값은 문자열 또는 (문자열, 글꼴, 색상) 튜플)"""
+    x: int
+    key: str
+    font: str
+    color: str
+
+
+@dataclass(frozen=True)
+class Rule:
+    """가로 구분선"""
+    color: str
+    width: int = 1
+
+
+@dataclass(frozen=True)
+class Advance:
+    """현재 위치를 아래로 이동"""
+    dy: int
+
+
+@dataclass(frozen=True)
+class Rows:
+    """가변 길이 목록 (행마다 칸 값 튜플, columns 는 칸별 (x, 글꼴, 색상) 기본값)"""
+    key: str
+    pitch: int
+    columns: Tuple[Tuple[int, str, str], ...]
+
+
+@dataclass(frozen=True)
+class Picture:
+    """가변 이미지 (QR코드 등)"""
+    x: int
+    key: str
+
+
+@dataclass(frozen=True)
+class LabelTemplate:
+    """라벨 템플릿 (정적 요소를 바꾸면 version 을 올려 캐시된 정적 레이어를 무효화)"""
+    name: str
+    country: str
+    version: int
+    ops: Tuple[Any, ...]
+    # 빈 값 대신 그릴 문구 (None 이면 값을 그대로 그림)
+    placeholder: Optional[str] = None
+
+
+# 여러 줄 문구 크기 계산용 (multiline_textbbox 는 ImageDraw 메서드)
+_MEASURE = ImageDraw.Draw(Image.new('L', (1, 1)))
+
+
+def _text_mask(text: str, font) -> Tuple[Image.Image, int, int]:
+    """문구의 글자 마스크와 그리기 원점 기준 오프셋
+
+    draw.text 는 줄바꿈이 있으면 여러 줄로 그리므로 마스크도 모든 줄을 담는 크기로 만든다.
+    """
+    if '\n' in text:
+        left, top, right, bottom = _MEASURE.multiline_textbbox((0, 0), text, font=font)
+    else:
+        left, top, right, bottom = font.getbbox(text)
+    mask = Image.new('L', (max(right - left, 1), max(bottom - top, 1)), 0)
+    ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font)
+    return mask, left, top
+
+
+class CompiledLayout:
+    """정적 레이어(기본 이미지 + 미리 렌더링한 마스크)와 가변 요소 그리기 단계"""
+
+    def __init__(self, template: LabelTemplate, size: Tuple[int, int], fonts: Dict[str, Any],
+                 palette: Dict[str, Tuple[int, int, int]], max_masks: int = 2048):
+        self.template = template
+        self.size = size
+        self.fonts = dict(fonts)
+        self.palette = dict(palette)
+        self.base = Image.new('RGB', size, self.palette['background'])
+        self.steps = []
+        self.static_ops = 0
+        # 가변 문구 글자 마스크 캐시 ((글꼴, 문구) → (마스크, 왼쪽, 위쪽))
+        self.max_masks = max_masks
+        self._masks: 'OrderedDict[Tuple[str, str], Tuple[Image.Image, int, int]]' = OrderedDict()
+        self._mask_lock = threading.Lock()
+        self._compile()
+
+    def _compile(self):
+        draw = ImageDraw.Draw(self.base)
+        y = 0
+        # 가변 길이 목록 이후의 정적 요소는 y 가 라벨마다 달라지거나(이어지는 섹션)
+        # 긴 목록과 겹칠 수 있으므로(고정 위치 섹션) 그리는 순서를 지켜 그때 붙여 넣음
+        fixed = True
+        for op in self.template.ops:
+            if isinstance(op, Section):
+                if op.y is not None:
+                    y = op.y
+                    self.steps.append(('goto', op.y))
+            elif isinstance(op, Advance):
+                y += op.dy
+                self.steps.append(('advance', op.dy))
+            elif isinstance(op, Text):
+                font, color = self.fonts[op.font], self.palette[op.color]
+                if fixed:
+                    draw.text((op.x, y), op.text, fill=color, font=font)
+                else:
+                    mask, left, top = _text_mask(op.text, font)
+                    self.steps.append(('stamp', op.x + left, top, mask, color))
+                self.static_ops += 1
+            elif isinstance(op, Rule):
+                color = self.palette[op.color]
+                if fixed:
+                    draw.line([(RULE_MARGIN, y), (self.size[0] - RULE_MARGIN, y)], fill=color, width=op.width)
+                else:
+                    self.steps.append(('rule', color, op.width))
+                self.static_ops += 1
+            elif isinstance(op, Field):
+                self.steps.append(('field', op.x, op.key, op.font, op.color))
+            elif isinstance(op, Rows):
+                self.steps.append(('rows', op.key, op.pitch, op.columns))
+                fixed = False
+            elif isinstance(op, Picture):
+                self.steps.append(('picture', op.x, op.key))
+            else:
+                raise ValueError(f"알 수 없는 레이아웃 요소: {op!r}")
+
+    def render(self, values: Dict[str, Any]) -> Image.Image:
+        """가변 값으로 라벨 이미지 생성 (가변 문구도 같은 값이면 글자 마스크 재사용)"""
+        image = self.base.copy()
+        draw = ImageDraw.Draw(image)
+        y = 0
+        for step in self.steps:
+            kind = step[0]
+            if kind == 'advance':
+                y += step[1]
+            elif kind == 'goto':
+                y = step[1]
+            elif kind == 'field':
+                _, x, key, font, color = step
+                self._draw_value(image, (x, y), values.get(key), font, color)
+            elif kind == 'stamp':
+                _, left, top, mask, color = step
+                image.paste(color, (left, y + top, left + mask.width, y + top + mask.height), mask)
+            elif kind == 'rule':
+                _, color, width = step
+                draw.line([(RULE_MARGIN, y), (self.size[0] - RULE_MARGIN, y)], fill=color, width=width)
+            elif kind == 'rows':
+                _, key, pitch, columns = step
+                for row in values.get(key) or []:
+                    for (x, font, color), cell in zip(columns, row):
+                        self._draw_value(image, (x, y), cell, font, color)
+                    y += pitch
+            elif kind == 'picture':
+                _, x, key = step
+                picture = values.get(key)
+                if picture is not None:
+                    image.paste(picture, (x, y))
+        return image
+
+    def _draw_value(self, image: Image.Image, position: Tuple[int, int], value: Any,
+                    font: str, color: str):
+        if isinstance(value, tuple):
+            value, font, color = value
+        fill = self.palette[color]
+        placeholder = self.template.placeholder
+        if placeholder is None:
+            self._paste_text(image, position, str(value), font, fill)
+            return
+        text = "" if value is None else str(value)
+        if not text.strip():
+            text = placeholder
+        try:
+            self._paste_text(image, position, text, font, fill)
+        except Exception as e:
+            print(f"⚠️ 텍스트 그리기 실패: {text} - {e}")
+            try:
+                self._paste_text(image, position, placeholder, font, fill)
+            except Exception:
+                pass
+
+    def _paste_text(self, image: Image.Image, position: Tuple[int, int], text: str, font: str,
+                    fill: Tuple[int, int, int]):
+        """문구 글자 마스크를 붙여 넣기 (영양성분 이름, 성분, 날짜 등 반복 값은 캐시된 마스크 사용)"""
+        key = (font, text)
+        with self._mask_lock:
+            cached = self._masks.get(key)
+            if cached is not None:
+                self._masks.move_to_end(key)
+        if cached is None:
+            cached = _text_mask(text, self.fonts[font])
+            with self._mask_lock:
+                self._masks[key] = cached
+                while len(self._masks) > self.max_masks:
+                    self._masks.popitem(last=False)
+        mask, left, top = cached
+        x, y = position
+        image.paste(fill, (x + left, y + top, x + left + mask.width, y + top + mask.height), mask)
+
+
+class LabelLayoutCache:
+    """컴파일된 레이아웃 캐시 ((국가, 템플릿, 버전, 크기, 글꼴, 색상) 별 정적 레이어 하나)"""
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._layouts: 'OrderedDict[Tuple, CompiledLayout]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'compiled': 0, 'hits': 0}
+
+    def get(self, template: LabelTemplate, size: Tuple[int, int], fonts: Dict[str, Any],
+            palette: Dict[str, Tuple[int, int, int]]) -> CompiledLayout:
+        """템플릿의 컴파일된 레이아웃 (없으면 컴파일)
+
+        글꼴은 폰트 레지스트리가 공유하는 객체이므로 객체 id 로 구분한다
+        (캐시된 레이아웃이 글꼴 객체를 참조하므로 id 가 재사용되지 않음).
+        """
+        key = (template.country, template.name, template.version, tuple(size),
+               tuple(sorted((role, id(font)) for role, font in fonts.items())),
+               tuple(sorted(palette.items())))
+        with self._lock:
+            layout = self._layouts.get(key)
+            if layout is not None:
+                self._layouts.move_to_end(key)
+                self.stats['hits'] += 1
+                return layout
+        layout = CompiledLayout(template, tuple(size), fonts, palette)
+        with self._lock:
+            self._layouts[key] = layout
+            self._layouts.move_to_end(key)
+            self.stats['compiled'] += 1
+            while len(self._layouts) > self.max_entries:
+                self._layouts.popitem(last=False)
+        logger.info(f"✅ 라벨 레이아웃 컴파일: {template.country} {template.name} v{template.version} "
+                    f"{size[0]}x{size[1]} (정적 요소 {layout.static_ops}개)")
+        return layout
+
+    def render(self, template: LabelTemplate, size: Tuple[int, int], fonts: Dict[str, Any],
+               palette: Dict[str, Tuple[int, int, int]], values: Dict[str, Any]) -> Image.Image:
+        return self.get(template, size, fonts, palette).render(values)
+
+    def clear(self):
+        with self._lock:
+            self._layouts.clear()
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'cached_layouts': len(self._layouts)}
+
+
+# 전역 라벨 레이아웃 캐시
+label_layouts = LabelLayoutCache()
+
+
+def get_label_layouts() -> LabelLayoutCache:
+    """전역 라벨 레이아웃 캐시 반환"""
+    return label_layouts
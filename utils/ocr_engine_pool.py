@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+OCR 엔진 풀
+- 프로세스당 엔진별 1회 지연 로딩 (EasyOCR 모델, Tesseract 확인 등)
+- 엔진별 동시 사용 수 제한 (세마포어)
+- 워커 부팅 시 워밍업 지원 (OCR_WARMUP_ENGINES 환경 변수)
+"""
+
+import importlib.util
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 엔진별 필요 모듈 (설치 여부만 확인하고 실제 import 는 로딩 시점에 수행)
+ENGINE_MODULES = {
+    'tesseract': 'pytesseract',
+    'easyocr': 'easyocr',
+    'paddleocr': 'paddleocr',
+    'google_vision': 'google.cloud.vision',
+    'azure_vision': 'azure.cognitiveservices.vision.computervision',
+}
+
+TESSERACT_WINDOWS_PATHS = [
+    r'C:\Program Files\Tesseract-OCR\tesseract.exe',
+    r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe',
+    r'C:\Users\양지호\AppData\Local\Programs\Tesseract-OCR\tesseract.exe'
+]
+
+
+def _load_tesseract() -> Dict[str, Any]:
+    """Tesseract 실행 파일 확인 (엔진 객체 대신 설정 정보 반환)"""
+    import pytesseract
+
+    if os.name == 'nt':
+        path = next((p for p in TESSERACT_WINDOWS_PATHS if os.path.exists(p)), None)
+        if path is None:
+            raise FileNotFoundError("Tesseract 실행 파일을 찾을 수 없습니다.")
+        pytesseract.pytesseract.tesseract_cmd = path
+
+    version = pytesseract.get_tesseract_version()
+    return {'version': str(version), 'languages': ['kor', 'eng', 'chi_sim']}
+
+
+def _load_easyocr():
+    """EasyOCR Reader 생성 (한국어+영어)
+
+    EasyOCR 은 ch_sim 을 ko 와 한 Reader 에 묶을 수 없다. 중국어는 Tesseract(chi_sim)가 처리한다.
+    """
+    import easyocr
+
+    return easyocr.Reader(['ko', 'en'])
+
+
+def _load_paddleocr():
+    from paddleocr import PaddleOCR
+    return PaddleOCR(use_angle_cls=True, lang='korean')
+
+
+def _load_google_vision():
+    from google.cloud import vision
+    return vision.ImageAnnotatorClient()
+
+
+def _load_azure_vision():
+    from azure.cognitiveservices.vision.computervision import ComputerVisionClient
+    from msrest.authentication import CognitiveServicesCredentials
+
+    endpoint = os.getenv('AZURE_VISION_ENDPOINT')
+    key = os.getenv('AZURE_VISION_KEY')
+    if not (endpoint and key):
+        raise RuntimeError("AZURE_VISION_ENDPOINT / AZURE_VISION_KEY 가 설정되지 않았습니다.")
+    return ComputerVisionClient(endpoint, CognitiveServicesCredentials(key))
+
+
+class _EngineSlot:
+    """엔진 하나의 로딩 상태와 동시 사용 제한"""
+
+    def __init__(self, name: str, loader: Callable[[], Any], max_concurrency: int, module: Optional[str]):
+        self.name = name
+        self.loader = loader
+        self.max_concurrency = max_concurrency
+        self.module = module
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.load_lock = threading.Lock()
+        self.instance: Any = None
+        self.loaded = False
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.in_use = 0
+        self.uses = 0
+
+
+class OCREnginePool:
+    """프로세스 전역 OCR 엔진 풀
+
+    엔진은 처음 acquire 될 때 한 번만 로딩되고, 로딩에 실패한 엔진은
+    reset() 전까지 다시 시도하지 않는다. 엔진마다 세마포어로 동시 사용 수를
+    제한하므로 스레드 안전하지 않은 모델도 여러 요청이 공유할 수 있다.
+    """
+
+    def __init__(self):
+        self._slots: Dict[str, _EngineSlot] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any], max_concurrency: int = 1,
+                 module: Optional[str] = None) -> None:
+        """엔진 등록 (같은 이름이면 교체)
+
+        Args:
+            name: 엔진 이름
+            loader: 엔진 인스턴스를 만드는 함수 (첫 사용 시 1회 호출)
+            max_concurrency: 동시에 엔진을 사용할 수 있는 최대 요청 수
+            module: 설치 여부를 확인할 모듈 이름 (없으면 항상 설치된 것으로 간주)
+        """
+        with self._lock:
+            self._slots[name] = _EngineSlot(name, loader, max(1, int(max_concurrency)), module)
+
+    def _slot(self, name: str) -> _EngineSlot:
+        slot = self._slots.get(name)
+        if slot is None:
+            raise KeyError(f"등록되지 않은 OCR 엔진: {name}")
+        return slot
+
+    def engine_names(self) -> List[str]:
+        """등록된 엔진 이름 (등록 순)"""
+        return list(self._slots.keys())
+
+    def is_installed(self, name: str) -> bool:
+        """엔진 라이브러리 설치 여부 (로딩하지 않음)"""
+        slot = self._slots.get(name)
+        if slot is None:
+            return False
+        if not slot.module:
+            return True
+        try:
+            return importlib.util.find_spec(slot.module) is not None
+        except (ImportError, ValueError):
+            return False
+
+    def is_available(self, name: str) -> bool:
+        """설치되어 있고 로딩에 실패하지 않은 엔진인지 (로딩하지 않음)"""
+        slot = self._slots.get(name)
+        return slot is not None and slot.error is None and self.is_installed(name)
+
+    def get(self, name: str) -> Optional[Any]:
+        """엔진 인스턴스 반환 (필요 시 로딩, 사용 불가면 None)"""
+        slot = self._slot(name)
+        if slot.loaded or slot.error is not None:
+            return slot.instance
+
+        with slot.load_lock:
+            if slot.loaded or slot.error is not None:
+                return slot.instance
+            if not self.is_installed(name):
+                slot.error = f"{slot.module} 모듈이 설치되지 않았습니다."
+                return None
+
+            logger.info(f"🔄 {name} OCR 엔진 로딩 중...")
+            started = time.time()
+            try:
+                slot.instance = slot.loader()
+                slot.loaded = True
+                slot.load_seconds = round(time.time() - started, 3)
+                logger.info(f"✅ {name} OCR 엔진 로딩 완료 ({slot.load_seconds}초)")
+            except Exception as e:
+                slot.error = str(e)
+                logger.warning(f"❌ {name} OCR 엔진 로딩 실패: {e}")
+            return slot.instance
+
+    @contextmanager
+    def acquire(self, name: str, timeout: Optional[float] = None) -> Iterator[Optional[Any]]:
+        """동시 사용 수 제한 안에서 엔진 사용
+
+        엔진을 사용할 수 없으면 None 을 돌려주고, timeout 안에 슬롯을 얻지
+        못하면 TimeoutError 를 발생시킨다.
+
+        사용 예:
+            with ocr_engine_pool.acquire('easyocr') as reader:
+                if reader is not None:
+                    reader.readtext(image)
+        """
+        engine = self.get(name)
+        if engine is None:
+            yield None
+            return
+
+        slot = self._slots[name]
+        if not slot.semaphore.acquire(timeout=timeout):
+            raise TimeoutError(f"{name} OCR 엔진 대기 시간 초과 ({timeout}초)")
+        with self._lock:
+            slot.in_use += 1
+            slot.uses += 1
+        try:
+            yield engine
+        finally:
+            with self._lock:
+                slot.in_use -= 1
+            slot.semaphore.release()
+
+    def warm_up(self, names: Optional[Iterable[str]] = None, background: bool = False) -> Optional[threading.Thread]:
+        """엔진 미리 로딩 (names 가 없으면 설치된 모든 엔진)
+
+        background=True 이면 데몬 스레드에서 로딩하고 스레드를 반환한다.
+        """
+        targets = [n for n in (names if names is not None else self.engine_names()) if n in self._slots]
+
+        def _run():
+            for name in targets:
+                if self.is_installed(name):
+                    self.get(name)
+            loaded = [n for n in targets if self._slots[n].loaded]
+            logger.info(f"✅ OCR 엔진 워밍업 완료: {', '.join(loaded) if loaded else '없음'}")
+
+        if background:
+            thread = threading.Thread(target=_run, name="OCREngineWarmUp", daemon=True)
+            thread.start()
+            return thread
+        _run()
+        return None
+
+    def warm_up_from_env(self, env_var: str = 'OCR_WARMUP_ENGINES', background: bool = True) -> Optional[threading.Thread]:
+        """환경 변수에 지정된 엔진 워밍업 ("easyocr,tesseract" 또는 "all")"""
+        value = os.environ.get(env_var, '').strip()
+        if not value:
+            return None
+        names = None if value.lower() == 'all' else [n.strip() for n in value.split(',') if n.strip()]
+        return self.warm_up(names, background=background)
+
+    def reset(self, name: Optional[str] = None) -> None:
+        """로딩된 엔진/실패 기록 초기화 (다음 사용 시 다시 로딩)"""
+        for slot in ([self._slot(name)] if name else list(self._slots.values())):
+            with slot.load_lock:
+                slot.instance = None
+                slot.loaded = False
+                slot.error = None
+                slot.load_seconds = None
+
+    def get_engine_status(self, name: str) -> Dict[str, Any]:
+        """엔진 하나의 상태"""
+        slot = self._slot(name)
+        status = {
+            'available': self.is_available(name),
+            'loaded': slot.loaded,
+            'max_concurrency': slot.max_concurrency,
+            'in_use': slot.in_use,
+            'uses': slot.uses,
+            'load_seconds': slot.load_seconds
+        }
+        if slot.error is not None:
+            status['error'] = slot.error
+        if isinstance(slot.instance, dict):
+            status.update(slot.instance)
+        return status
+
+    def get_status(self, names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """엔진별 상태"""
+        return {name: self.get_engine_status(name) for name in (names or self.engine_names())}
+
+
+# 전역 OCR 엔진 풀 인스턴스
+ocr_engine_pool = OCREnginePool()
+ocr_engine_pool.register('tesseract', _load_tesseract, max_concurrency=os.cpu_count() or 2,
+                         module=ENGINE_MODULES['tesseract'])
+ocr_engine_pool.register('easyocr', _load_easyocr, max_concurrency=1, module=ENGINE_MODULES['easyocr'])
+ocr_engine_pool.register('paddleocr', _load_paddleocr, max_concurrency=1, module=ENGINE_MODULES['paddleocr'])
+ocr_engine_pool.register('google_vision', _load_google_vision, max_concurrency=4,
+                         module=ENGINE_MODULES['google_vision'])
+ocr_engine_pool.register('azure_vision', _load_azure_vision, max_concurrency=4,
+                         module=ENGINE_MODULES['azure_vision'])
+
+
+def get_ocr_engine_pool() -> OCREnginePool:
+    """전역 OCR 엔진 풀 반환"""
+    return ocr_engine_pool
@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+OCR 작업 큐 및 워커 프로세스 풀
+- 웹 요청은 SQLite 큐에 작업만 등록하고 즉시 job_id 반환
+- 별도 워커 프로세스가 작업을 가져가 OCR 수행 (GIL/웹 워커와 분리)
+- 진행률/결과 조회, 죽은 워커의 작업 재시도
+- 실행 중 작업은 주기적으로 heartbeat 를 남기고, heartbeat 가 끊긴 작업은 다시 대기 상태로
+
+워커 실행: python ocr_worker.py --workers 2 (웹 서버와 별도 프로세스)
+"""
+
+import argparse
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from utils.ocr_result_cache import json_default
+
+logger = logging.getLogger(__name__)
+
+JOB_TABLE = "ocr_jobs"
+
+# 작업 종류 -> "모듈:함수" (워커 프로세스에서 import 되어야 하므로 경로 문자열로 등록)
+DEFAULT_HANDLERS = {
+    'ocr_parallel': 'advanced_ocr_processor:run_ocr_job',
+    'label_extract': 'label_ocr_extractor:run_label_extract_job',
+}
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+# 실행 중 작업의 heartbeat 주기 / 이 시간 동안 heartbeat 가 없으면 워커가 죽은 것으로 간주 (초)
+HEARTBEAT_INTERVAL = 10.0
+STALE_JOB_SECONDS = 120.0
+
+# 작업용 업로드 이미지 보관 디렉터리 (웹에 공개되지 않는 경로, 작업 종료 시 삭제)
+JOB_UPLOAD_DIR = os.environ.get('OCR_JOB_UPLOAD_DIR', os.path.join(tempfile.gettempdir(), 'kati_ocr_jobs'))
+
+
+def job_upload_path(filename: str) -> str:
+    """작업용 업로드 파일을 저장할 비공개 경로"""
+    os.makedirs(JOB_UPLOAD_DIR, mode=0o700, exist_ok=True)
+    return os.path.join(os.path.abspath(JOB_UPLOAD_DIR), f"{uuid.uuid4().hex}_{filename}")
+
+
+def remove_job_upload(path: Optional[str]):
+    """작업이 끝난 업로드 파일 삭제 (이미 없으면 무시)"""
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"⚠️ 작업 업로드 파일 삭제 실패: {path} - {e}")
+
+
+class OCRJobQueue:
+    """SQLite 기반 OCR 작업 큐 (여러 프로세스가 같은 파일 공유)"""
+
+    def __init__(self, db_path: str = "ocr_jobs.db", max_attempts: int = 2):
+        """
+        Args:
+            db_path: 작업 큐 SQLite 파일 경로
+            max_attempts: 워커 비정상 종료 시 재시도를 포함한 최대 실행 횟수
+        """
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f'''
+                CREATE TABLE IF NOT EXISTS {JOB_TABLE} (
+                    job_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress REAL DEFAULT 0,
+                    message TEXT,
+                    result TEXT,
+                    error TEXT,
+                    attempts INTEGER DEFAULT 0,
+                    worker_pid INTEGER,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    heartbeat_at TEXT,
+                    finished_at TEXT
+                )
+            ''')
+            columns = {row['name'] for row in conn.execute(f"PRAGMA table_info({JOB_TABLE})")}
+            if 'heartbeat_at' not in columns:
+                conn.execute(f"ALTER TABLE {JOB_TABLE} ADD COLUMN heartbeat_at TEXT")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{JOB_TABLE}_status ON {JOB_TABLE}(status, created_at)")
+        finally:
+            conn.close()
+
+    def enqueue(self, kind: str, payload: Dict[str, Any]) -> str:
+        """작업 등록 후 job_id 반환"""
+        job_id = uuid.uuid4().hex
+        conn = self._connect()
+        try:
+            conn.execute(
+                f"INSERT INTO {JOB_TABLE} (job_id, kind, payload, status, message, created_at) "
+                f"VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(payload, ensure_ascii=False), STATUS_QUEUED, '대기 중',
+                 datetime.now().isoformat())
+            )
+        finally:
+            conn.close()
+        logger.info(f"📥 OCR 작업 등록: {job_id} ({kind})")
+        return job_id
+
+    def claim(self, worker_pid: int, kinds: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """가장 오래된 대기 작업을 원자적으로 가져옴 (없으면 None)"""
+        kinds = list(kinds) if kinds else None
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            query = f"SELECT job_id FROM {JOB_TABLE} WHERE status = ?"
+            params: List[Any] = [STATUS_QUEUED]
+            if kinds:
+                query += f" AND kind IN ({','.join('?' * len(kinds))})"
+                params.extend(kinds)
+            row = conn.execute(query + " ORDER BY created_at LIMIT 1", params).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            now = datetime.now().isoformat()
+            conn.execute(
+                f"UPDATE {JOB_TABLE} SET status = ?, worker_pid = ?, attempts = attempts + 1, "
+                f"started_at = ?, heartbeat_at = ?, message = ? WHERE job_id = ?",
+                (STATUS_RUNNING, worker_pid, now, now, '처리 중', row['job_id'])
+            )
+            job = conn.execute(f"SELECT * FROM {JOB_TABLE} WHERE job_id = ?", (row['job_id'],)).fetchone()
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        job = dict(job)
+        job['payload'] = json.loads(job['payload'])
+        return job
+
+    def _update(self, job_id: str, **fields):
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        conn = self._connect()
+        try:
+            conn.execute(f"UPDATE {JOB_TABLE} SET {assignments} WHERE job_id = ?", (*fields.values(), job_id))
+        finally:
+            conn.close()
+
+    def update_progress(self, job_id: str, progress: float, message: Optional[str] = None):
+        """진행률 갱신 (0.0 ~ 1.0)"""
+        fields = {'progress': round(min(max(float(progress), 0.0), 1.0), 3),
+                  'heartbeat_at': datetime.now().isoformat()}
+        if message is not None:
+            fields['message'] = message
+        self._update(job_id, **fields)
+
+    def heartbeat(self, job_id: str):
+        """실행 중 작업의 생존 신호 갱신"""
+        self._update(job_id, heartbeat_at=datetime.now().isoformat())
+
+    def complete(self, job_id: str, result: Any):
+        """작업 완료 및 결과 저장"""
+        self._update(job_id, status=STATUS_DONE, progress=1.0, message='완료',
+                     result=json.dumps(result, ensure_ascii=False, default=json_default),
+                     finished_at=datetime.now().isoformat())
+
+    def fail(self, job_id: str, error: str):
+        """작업 실패 기록"""
+        self._update(job_id, status=STATUS_FAILED, message='실패', error=error,
+                     finished_at=datetime.now().isoformat())
+
+    def _requeue_running(self, condition: str, params: List[Any]) -> int:
+        """조건에 맞는 실행 중 작업을 다시 대기 상태로 (재시도 한도 초과 시 실패 처리)"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                f"UPDATE {JOB_TABLE} SET status = ?, error = ?, message = ?, finished_at = ? "
+                f"WHERE status = ? AND {condition} AND attempts >= ?",
+                (STATUS_FAILED, '워커 프로세스가 비정상 종료되었습니다.', '실패', datetime.now().isoformat(),
+                 STATUS_RUNNING, *params, self.max_attempts)
+            )
+            requeued = conn.execute(
+                f"UPDATE {JOB_TABLE} SET status = ?, worker_pid = NULL, progress = 0, message = ? "
+                f"WHERE status = ? AND {condition}",
+                (STATUS_QUEUED, '재시도 대기 중', STATUS_RUNNING, *params)
+            ).rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return requeued
+
+    def requeue_worker_jobs(self, worker_pid: int) -> int:
+        """죽은 워커가 잡고 있던 작업을 다시 대기 상태로 (재시도 한도 초과 시 실패 처리)"""
+        requeued = self._requeue_running("worker_pid = ?", [worker_pid])
+        if requeued:
+            logger.warning(f"⚠️ 종료된 워커({worker_pid})의 작업 {requeued}개 재등록")
+        return requeued
+
+    def requeue_stale_jobs(self, stale_after: float = STALE_JOB_SECONDS) -> int:
+        """heartbeat 가 stale_after 초 넘게 끊긴 실행 중 작업을 다시 대기 상태로
+
+        서버 재시작 등으로 어느 워커도 처리하지 않는 채 running 으로 남은 작업을 되살린다.
+        """
+        cutoff = datetime.fromtimestamp(time.time() - stale_after).isoformat()
+        requeued = self._requeue_running("COALESCE(heartbeat_at, started_at) < ?", [cutoff])
+        if requeued:
+            logger.warning(f"⚠️ heartbeat 가 끊긴 작업 {requeued}개 재등록")
+        return requeued
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 상태 (결과 본문 제외)"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                f"SELECT job_id, kind, status, progress, message, error, attempts, "
+                f"created_at, started_at, heartbeat_at, finished_at FROM {JOB_TABLE} WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return dict(row) if row else None
+
+    def get_result(self, job_id: str) -> Optional[Any]:
+        """완료된 작업 결과 (완료 전이거나 없으면 None)"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                f"SELECT result FROM {JOB_TABLE} WHERE job_id = ? AND status = ?", (job_id, STATUS_DONE)
+            ).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row['result']) if row and row['result'] is not None else None
+
+    def cleanup(self, max_age_hours: float = 24.0) -> int:
+        """완료/실패 후 오래된 작업 삭제"""
+        cutoff = datetime.fromtimestamp(time.time() - max_age_hours * 3600).isoformat()
+        conn = self._connect()
+        try:
+            deleted = conn.execute(
+                f"DELETE FROM {JOB_TABLE} WHERE status IN (?, ?) AND finished_at < ?",
+                (STATUS_DONE, STATUS_FAILED, cutoff)
+            ).rowcount
+        finally:
+            conn.close()
+        return deleted
+
+    def get_stats(self) -> Dict[str, int]:
+        """상태별 작업 수"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(f"SELECT status, COUNT(*) FROM {JOB_TABLE} GROUP BY status").fetchall()
+        finally:
+            conn.close()
+        stats = {STATUS_QUEUED: 0, STATUS_RUNNING: 0, STATUS_DONE: 0, STATUS_FAILED: 0}
+        stats.update({row[0]: row[1] for row in rows})
+        return stats
+
+
+def _resolve_handler(path: str) -> Callable:
+    module_name, func_name = path.split(':', 1)
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def _heartbeat_loop(queue: OCRJobQueue, job_id: str, done: threading.Event, interval: float):
+    while not done.wait(interval):
+        try:
+            queue.heartbeat(job_id)
+        except Exception as e:
+            logger.warning(f"⚠️ OCR 작업 heartbeat 실패: {job_id} - {e}")
+
+
+def run_worker(db_path: str, handlers: Dict[str, str], poll_interval: float = 0.5,
+               stop_event=None, warm_up_engines: Optional[List[str]] = None,
+               max_jobs: Optional[int] = None, heartbeat_interval: float = HEARTBEAT_INTERVAL) -> int:
+    """워커 루프: 작업을 가져와 처리 (프로세스 진입점), 처리한 작업 수 반환
+
+    handler(payload, report_progress) 는 JSON 직렬화 가능한 결과를 반환한다.
+    처리 중에는 heartbeat_interval 초마다 작업의 heartbeat 를 갱신한다.
+    """
+    queue = OCRJobQueue(db_path)
+    pid = os.getpid()
+    resolved: Dict[str, Callable] = {}
+
+    if warm_up_engines:
+        from utils.ocr_engine_pool import ocr_engine_pool
+        ocr_engine_pool.warm_up(warm_up_engines)
+
+    processed = 0
+    while not (stop_event is not None and stop_event.is_set()):
+        if max_jobs is not None and processed >= max_jobs:
+            break
+        job = queue.claim(pid, kinds=handlers.keys())
+        if job is None:
+            if max_jobs is not None:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        job_id = job['job_id']
+        done = threading.Event()
+        threading.Thread(target=_heartbeat_loop, args=(queue, job_id, done, heartbeat_interval),
+                         name="OCRJobHeartbeat", daemon=True).start()
+        try:
+            if job['kind'] not in resolved:
+                resolved[job['kind']] = _resolve_handler(handlers[job['kind']])
+
+            def report_progress(progress: float, message: Optional[str] = None, _job_id=job_id):
+                queue.update_progress(_job_id, progress, message)
+
+            result = resolved[job['kind']](job['payload'], report_progress)
+            queue.complete(job_id, result)
+            logger.info(f"✅ OCR 작업 완료: {job_id}")
+        except Exception as e:
+            queue.fail(job_id, str(e))
+            logger.error(f"❌ OCR 작업 실패: {job_id} - {e}")
+        finally:
+            done.set()
+        processed += 1
+    return processed
+
+
+class OCRWorkerPool:
+    """OCR 전용 워커 프로세스 풀
+
+    spawn 방식으로 프로세스를 띄우므로 웹 워커의 스레드/모델 상태를 물려받지 않는다.
+    감시 스레드가 죽은 워커를 다시 띄우고 그 워커가 처리하던 작업을 재등록한다.
+    heartbeat 가 끊긴 작업(재시작 전 워커, 다른 호스트의 워커)도 시작 시와 감시 주기마다 재등록한다.
+    """
+
+    def __init__(self, db_path: str = "ocr_jobs.db", num_workers: int = 2, poll_interval: float = 0.5,
+                 handlers: Optional[Dict[str, str]] = None, warm_up_engines: Optional[List[str]] = None,
+                 supervise_interval: float = 5.0, stale_job_seconds: float = STALE_JOB_SECONDS):
+        self.queue = OCRJobQueue(db_path)
+        self.db_path = db_path
+        self.num_workers = max(1, num_workers)
+        self.poll_interval = poll_interval
+        self.handlers = dict(handlers or DEFAULT_HANDLERS)
+        self.warm_up_engines = warm_up_engines
+        self.supervise_interval = supervise_interval
+        self.stale_job_seconds = stale_job_seconds
+
+        self._ctx = multiprocessing.get_context('spawn')
+        self._stop_event = self._ctx.Event()
+        self._processes: List[Any] = []
+        self._lock = threading.Lock()
+        self._supervisor: Optional[threading.Thread] = None
+        self.stats = {'restarts': 0}
+
+    def _spawn(self):
+        process = self._ctx.Process(
+            target=run_worker,
+            args=(self.db_path, self.handlers, self.poll_interval, self._stop_event, self.warm_up_engines),
+            name="OCRWorker",
+            daemon=True
+        )
+        process.start()
+        return process
+
+    def start(self):
+        """워커 프로세스 및 감시 스레드 시작 (이미 시작되었으면 무시)"""
+        with self._lock:
+            if self._processes:
+                return
+            self.queue.requeue_stale_jobs(self.stale_job_seconds)
+            self._stop_event.clear()
+            self._processes = [self._spawn() for _ in range(self.num_workers)]
+            self._supervisor = threading.Thread(target=self._supervise, name="OCRWorkerSupervisor", daemon=True)
+            self._supervisor.start()
+        logger.info(f"🚀 OCR 워커 프로세스 {self.num_workers}개 시작")
+
+    def _supervise(self):
+        while not self._stop_event.wait(self.supervise_interval):
+            self.queue.requeue_stale_jobs(self.stale_job_seconds)
+            with self._lock:
+                for index, process in enumerate(self._processes):
+                    if process.is_alive():
+                        continue
+                    self.queue.requeue_worker_jobs(process.pid)
+                    self._processes[index] = self._spawn()
+                    self.stats['restarts'] += 1
+                    logger.warning(f"⚠️ OCR 워커 재시작 (종료 코드: {process.exitcode})")
+
+    def stop(self, timeout: float = 10.0):
+        """워커 종료 (처리 중인 작업은 마무리 후 종료)"""
+        self._stop_event.set()
+        with self._lock:
+            processes, self._processes = self._processes, []
+        for process in processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                self.queue.requeue_worker_jobs(process.pid)
+        logger.info("🛑 OCR 워커 프로세스 종료")
+
+    @property
+    def running(self) -> bool:
+        return bool(self._processes)
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> str:
+        """작업 등록 (워커는 start() 또는 별도 워커 프로세스가 처리)"""
+        if kind not in self.handlers:
+            raise ValueError(f"지원하지 않는 OCR 작업 종류: {kind}")
+        return self.queue.enqueue(kind, payload)
+
+    def get_status(self) -> Dict[str, Any]:
+        """워커/큐 상태"""
+        return {
+            'db_path': self.db_path,
+            'workers': [{'pid': p.pid, 'alive': p.is_alive()} for p in self._processes],
+            'job_kinds': list(self.handlers.keys()),
+            'jobs': self.queue.get_stats(),
+            'restarts': self.stats['restarts']
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR 작업 워커")
+    parser.add_argument("--db", default=os.environ.get("OCR_JOB_DB", "ocr_jobs.db"), help="작업 큐 DB 경로")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("OCR_WORKERS", 2)), help="워커 프로세스 수")
+    parser.add_argument("--warm-up", default=os.environ.get("OCR_WARMUP_ENGINES", ""),
+                        help="워커 시작 시 미리 로딩할 엔진 (쉼표 구분)")
+    args = parser.parse_args()
+
+    warm_up = [n.strip() for n in args.warm_up.split(',') if n.strip()] or None
+    pool = OCRWorkerPool(args.db, num_workers=args.workers, warm_up_engines=warm_up)
+    pool.start()
+    print(f"✅ OCR 워커 {args.workers}개 실행 중 (큐: {args.db}), 종료하려면 Ctrl+C")
+    try:
+        while True:
+            time.sleep(60)
+            pool.queue.cleanup()
+    except KeyboardInterrupt:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
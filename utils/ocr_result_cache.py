@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+내용 주소 기반 OCR 결과 캐시
+- 이미지 바이트 해시 + 전처리 설정 + 엔진 구성으로 키 생성
+- 결과를 디스크(JSON)에 저장, 프로세스/워커 간 공유
+- 전체 크기 제한을 넘으면 가장 오래 사용하지 않은 결과부터 삭제 (LRU)
+- 전역 캐시는 get_ocr_result_cache() 로 처음 사용할 때 생성 (import 시 디렉터리를 만들지 않음)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 전역 캐시 디렉터리 (기본: 실행 위치와 무관하게 프로젝트 루트의 ocr_result_cache)
+OCR_RESULT_CACHE_DIR = os.environ.get(
+    'OCR_RESULT_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ocr_result_cache')
+)
+OCR_RESULT_CACHE_MAX_MB = float(os.environ.get('OCR_RESULT_CACHE_MAX_MB', 256))
+
+
+def json_default(value: Any) -> Any:
+    """numpy 값/bytes 등 JSON 기본 타입이 아닌 값 변환"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if hasattr(value, 'item'):
+        return value.item()
+    if isinstance(value, bytes):
+        return None
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """파일 내용 해시 (파일 이름/업로드 시각과 무관)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_image(image) -> str:
+    """디코딩된 이미지 배열 해시 (형상/자료형 포함)"""
+    digest = hashlib.sha256()
+    digest.update(f"{image.shape}|{image.dtype}".encode())
+    digest.update(memoryview(image if image.flags['C_CONTIGUOUS'] else image.copy()))
+    return digest.hexdigest()
+
+
+class OCRResultCache:
+    """디스크 기반 크기 제한 LRU OCR 결과 캐시
+
+    파일 하나가 결과 하나이며, 조회 시 mtime 을 갱신해 사용 시각으로 쓴다.
+    여러 프로세스가 같은 디렉터리를 공유해도 되도록 쓰기는 임시 파일 후
+    os.replace 로 교체하고, 정리 시에는 디렉터리를 다시 훑어 실제 크기를 계산한다.
+    """
+
+    def __init__(self, cache_dir: str = "ocr_result_cache", max_size_mb: float = 256,
+                 low_watermark: float = 0.8):
+        """
+        Args:
+            cache_dir: 결과 저장 디렉터리
+            max_size_mb: 전체 캐시 최대 크기 (MB)
+            low_watermark: 정리 시 목표 크기 비율 (최대 크기 대비)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.low_watermark = low_watermark
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._total_bytes = sum(size for _, _, size in self._scan())
+
+    @staticmethod
+    def make_key(content_hash: str, **settings) -> str:
+        """내용 해시와 파이프라인 설정으로 캐시 키 생성 (설정 순서 무관)"""
+        settings_json = json.dumps(settings, sort_keys=True, ensure_ascii=False, default=json_default)
+        return hash_bytes(f"{content_hash}|{settings_json}".encode('utf-8'))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시된 결과 (없으면 None)"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+        except (FileNotFoundError, ValueError):
+            with self._lock:
+                self.stats['misses'] += 1
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.stats['hits'] += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """결과 저장 (크기 제한 초과 시 오래된 결과 정리)"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = json.dumps(value, ensure_ascii=False, default=json_default).encode('utf-8')
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"⚠️ OCR 결과 캐시 저장 실패: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._lock:
+            self.stats['writes'] += 1
+            self._total_bytes += len(data) - previous
+            over_limit = self._total_bytes > self.max_bytes
+        if over_limit:
+            self._evict()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any],
+                       should_cache: Optional[Callable[[Any], bool]] = None) -> Tuple[Any, bool]:
+        """캐시 조회 후 없으면 계산해서 저장, (결과, 캐시 적중 여부) 반환"""
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+        value = compute()
+        if value is not None and (should_cache is None or should_cache(value)):
+            self.set(key, value)
+        return value, False
+
+    def _scan(self):
+        """(mtime, 경로, 크기) 목록"""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, path, st.st_size))
+        return entries
+
+    def _evict(self):
+        """가장 오래 사용하지 않은 결과부터 low_watermark 까지 삭제"""
+        with self._lock:
+            entries = sorted(self._scan())
+            total = sum(size for _, _, size in entries)
+            target = int(self.max_bytes * self.low_watermark)
+            removed = 0
+            for _, path, size in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                    removed += 1
+                except OSError:
+                    continue
+            self._total_bytes = total
+            self.stats['evictions'] += removed
+        if removed:
+            logger.info(f"🧹 OCR 결과 캐시 정리: {removed}개 삭제")
+
+    def clear(self) -> None:
+        """캐시 전체 삭제"""
+        with self._lock:
+            for _, path, _ in self._scan():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        with self._lock:
+            total = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'cache_dir': self.cache_dir,
+                'size_mb': round(self._total_bytes / 1024 / 1024, 2),
+                'max_size_mb': round(self.max_bytes / 1024 / 1024, 2),
+                'hit_rate_percent': round(self.stats['hits'] / total * 100, 2) if total else 0.0
+            }
+
+
+# 전역 OCR 결과 캐시 인스턴스 (처음 사용할 때 생성)
+_ocr_result_cache: Optional[OCRResultCache] = None
+_ocr_result_cache_lock = threading.Lock()
+
+
+def get_ocr_result_cache() -> OCRResultCache:
+    """전역 OCR 결과 캐시 반환 (OCR_RESULT_CACHE_DIR 에 처음 사용할 때 생성)"""
+    global _ocr_result_cache
+    if _ocr_result_cache is None:
+        with _ocr_result_cache_lock:
+            if _ocr_result_cache is None:
+                _ocr_result_cache = OCRResultCache(OCR_RESULT_CACHE_DIR, max_size_mb=OCR_RESULT_CACHE_MAX_MB)
+    return _ocr_result_cache
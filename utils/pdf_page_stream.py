@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+PDF 페이지 스트리밍 추출
+- PyMuPDF 로 페이지를 하나씩 읽어 순서대로 yield (문서 전체를 메모리에 모으지 않음)
+- 텍스트 레이어가 있는 페이지는 그대로 사용
+- 이미지 전용(스캔) 페이지만 페이지별 DPI 로 렌더링해 OCR, 제한된 창 안에서 병렬 실행
+"""
+
+import logging
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# OCR 함수: BGR 이미지 -> (텍스트, 신뢰도 0~1)
+OCRFunction = Callable[[np.ndarray], Tuple[str, float]]
+
+
+@dataclass
+class PDFPage:
+    """스트리밍으로 추출한 PDF 한 페이지"""
+    page: int
+    text: str
+    source: str  # 'text_layer', 'ocr', 'image_only' (OCR 함수 없음), 'empty'
+    confidence: float = 1.0
+    dpi: Optional[int] = None
+    tables: List[List[List[Any]]] = field(default_factory=list)
+    image_count: int = 0
+    error: Optional[str] = None
+
+
+def choose_page_dpi(page, min_dpi: int = 150, max_dpi: int = 300, default_dpi: int = 200,
+                    max_pixels: int = 12_000_000) -> int:
+    """이미지 전용 페이지 렌더링 DPI
+
+    가장 큰 내장 이미지의 원본 해상도에 맞추고(스캔 해상도보다 높게 렌더링해도
+    정보가 늘지 않음), [min_dpi, max_dpi] 범위와 최대 픽셀 수로 제한한다.
+    """
+    dpi = default_dpi
+    try:
+        images = page.get_images(full=True)
+        if images:
+            largest = max(images, key=lambda img: img[2] * img[3])
+            width_inches = page.rect.width / 72.0
+            if width_inches > 0:
+                dpi = int(largest[2] / width_inches)
+    except Exception:
+        pass
+    dpi = max(min_dpi, min(max_dpi, dpi))
+
+    page_pixels = (page.rect.width / 72.0) * (page.rect.height / 72.0)
+    if page_pixels > 0 and page_pixels * dpi * dpi > max_pixels:
+        dpi = max(72, int((max_pixels / page_pixels) ** 0.5))
+    return dpi
+
+
+def render_page(page, dpi: int) -> np.ndarray:
+    """페이지를 BGR 배열로 렌더링"""
+    pixmap = page.get_pixmap(dpi=dpi, alpha=False)
+    rgb = np.frombuffer(pixmap.samples, np.uint8).reshape(pixmap.height, pixmap.width, pixmap.n)
+    # RGB -> BGR (OpenCV/OCR 엔진 입력 형식), 새 배열이므로 pixmap 은 바로 해제됨
+    return np.ascontiguousarray(rgb[:, :, 2::-1])
+
+
+def _extract_tables(page) -> List[List[List[Any]]]:
+    try:
+        return [table.extract() for table in page.find_tables().tables]
+    except Exception:
+        # find_tables 가 없는 PyMuPDF 버전
+        return []
+
+
+def _ocr_page(ocr: OCRFunction, page_number: int, image: np.ndarray, dpi: int, image_count: int) -> PDFPage:
+    try:
+        text, confidence = ocr(image)
+        return PDFPage(page=page_number, text=text or '', source='ocr', confidence=confidence,
+                       dpi=dpi, image_count=image_count)
+    except Exception as e:
+        logger.warning(f"⚠️ PDF {page_number}페이지 OCR 실패: {e}")
+        return PDFPage(page=page_number, text='', source='ocr', confidence=0.0, dpi=dpi,
+                       image_count=image_count, error=str(e))
+
+
+def iter_pdf_pages(path: str, ocr: Optional[OCRFunction] = None, ocr_workers: int = 2,
+                   min_text_chars: int = 20, extract_tables: bool = False,
+                   dpi_range: Tuple[int, int] = (150, 300)) -> Iterator[PDFPage]:
+    """PDF 페이지를 순서대로 하나씩 반환하는 제너레이터
+
+    Args:
+        path: PDF 경로
+        ocr: 이미지 전용 페이지 OCR 함수 (없으면 해당 페이지는 source='image_only')
+        ocr_workers: 동시에 OCR 하는 페이지 수 (렌더링된 페이지는 최대 2배까지만 대기)
+        min_text_chars: 텍스트 레이어를 신뢰할 최소 글자 수 (이보다 짧고 이미지가 있으면 OCR)
+        extract_tables: 텍스트 레이어 페이지의 표 추출 여부
+        dpi_range: 이미지 전용 페이지 렌더링 DPI 범위
+    """
+    if not PYMUPDF_AVAILABLE:
+        raise RuntimeError("PDF 페이지 스트리밍을 위해 PyMuPDF 가 필요합니다.")
+
+    executor = ThreadPoolExecutor(max_workers=max(1, ocr_workers)) if ocr is not None else None
+    window = max(1, ocr_workers) * 2
+    pending = deque()  # 페이지 순서대로 PDFPage 또는 Future
+    try:
+        with fitz.open(path) as pdf:
+            for index in range(pdf.page_count):
+                page = pdf.load_page(index)
+                text = page.get_text()
+                image_count = len(page.get_images())
+
+                if len(text.strip()) >= min_text_chars or (text.strip() and not image_count):
+                    pending.append(PDFPage(page=index + 1, text=text, source='text_layer',
+                                           tables=_extract_tables(page) if extract_tables else [],
+                                           image_count=image_count))
+                elif not image_count:
+                    pending.append(PDFPage(page=index + 1, text='', source='empty', image_count=0))
+                elif executor is None:
+                    pending.append(PDFPage(page=index + 1, text=text, source='image_only',
+                                           confidence=0.0, image_count=image_count))
+                else:
+                    dpi = choose_page_dpi(page, *dpi_range)
+                    image = render_page(page, dpi)
+                    pending.append(executor.submit(_ocr_page, ocr, index + 1, image, dpi, image_count))
+                del page
+
+                # 앞쪽 페이지가 준비되면 바로 내보내고, OCR 대기열이 창을 넘으면 완료까지 대기
+                while pending and (not isinstance(pending[0], Future) or pending[0].done()
+                                   or sum(isinstance(item, Future) for item in pending) > window):
+                    head = pending.popleft()
+                    yield head.result() if isinstance(head, Future) else head
+
+            while pending:
+                head = pending.popleft()
+                yield head.result() if isinstance(head, Future) else head
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_pdf_text(path: str, ocr: Optional[OCRFunction] = None, **kwargs) -> str:
+    """페이지별 텍스트를 이어 붙인 전체 텍스트 (스캔 페이지는 OCR)"""
+    return '\n'.join(page.text.strip() for page in iter_pdf_pages(path, ocr=ocr, **kwargs) if page.text.strip())
+
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+외부 OCR/AI 제공자 동시 호출 계층
+- 여러 제공자를 동시에 호출하고 제공자별 제한 시간 적용 (느린 제공자가 요청 전체를 막지 않음)
+- 응답이 늦으면 같은 제공자에 한 번 더 요청 (hedged request), 먼저 온 응답 사용
+- 연속 실패한 제공자는 일정 시간 호출하지 않음 (circuit breaker)
+- 제공자별 결과를 필드 단위 가중 투표로 통합
+"""
+
+import logging
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """제공자 하나의 회로 차단기
+
+    closed: 정상 호출 / open: reset_timeout 동안 호출 차단 /
+    half_open: 차단 시간이 지나면 시험 호출 하나만 허용, 성공하면 closed 로 복귀
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.time() - self.opened_at >= self.reset_timeout:
+                self.state = 'half_open'
+                self._trial_in_flight = False
+            if self.state == 'half_open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                if self.state != 'open':
+                    logger.warning(f"⚠️ 제공자 차단 (연속 실패 {self.failures}회, {self.reset_timeout}초)")
+                self.state = 'open'
+                self.opened_at = time.time()
+
+    def release(self) -> None:
+        """결과를 기다리지 않고 버린 호출 (취소) 의 시험 호출 자리 반환 (상태는 그대로)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'state': self.state, 'failures': self.failures}
+
+
+@dataclass
+class ProviderResult:
+    """제공자 호출 결과"""
+    provider: str
+    value: Any = None
+    ok: bool = False
+    error: Optional[str] = None  # 'timeout', 'circuit_open', 'rejected', 'cancelled' 또는 예외 메시지
+    elapsed: float = 0.0
+    hedged: bool = False
+
+
+@dataclass
+class _Provider:
+    name: str
+    func: Callable[..., Any]
+    timeout: float
+    hedge_after: Optional[float]
+    weight: float
+    breaker: CircuitBreaker
+
+
+class ProviderDispatcher:
+    """등록된 제공자를 동시에 호출하는 디스패처
+
+    제한 시간이 지난 호출의 스레드는 강제로 중단할 수 없으므로 결과만 버린다.
+    제공자 함수 자체도 네트워크 timeout 을 갖도록 등록하는 것이 좋다.
+    """
+
+    def __init__(self, max_workers: int = 16):
+        self._providers: Dict[str, _Provider] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="provider")
+
+    def register(self, name: str, func: Callable[..., Any], timeout: float = 10.0,
+                 hedge_after: Optional[float] = None, weight: float = 1.0,
+                 failure_threshold: int = 3, reset_timeout: float = 30.0) -> None:
+        """제공자 등록 (같은 이름이면 교체)
+
+        Args:
+            name: 제공자 이름
+            func: 호출 함수 (dispatch 의 args 를 그대로 받음)
+            timeout: 제한 시간 (초)
+            hedge_after: 이 시간 안에 응답이 없으면 한 번 더 요청 (None 이면 사용 안 함)
+            weight: 투표 가중치
+            failure_threshold: 차단까지의 연속 실패 수
+            reset_timeout: 차단 유지 시간 (초)
+        """
+        self._providers[name] = _Provider(name, func, timeout, hedge_after, weight,
+                                          CircuitBreaker(failure_threshold, reset_timeout))
+
+    def provider_names(self) -> List[str]:
+        return list(self._providers.keys())
+
+    def weights(self) -> Dict[str, float]:
+        return {name: provider.weight for name, provider in self._providers.items()}
+
+    def dispatch(self, args: Tuple = (), names: Optional[Iterable[str]] = None, mode: str = 'all',
+                 accept: Optional[Callable[[Any], bool]] = None,
+                 deadline: Optional[float] = None) -> Dict[str, ProviderResult]:
+        """제공자 동시 호출
+
+        Args:
+            args: 제공자 함수 인자
+            names: 호출할 제공자 (기본: 등록된 전체, 등록 순)
+            mode: 'all' 은 모든 제공자 결과(또는 제한 시간)를 기다림,
+                  'first' 는 처음 받아들여진 결과가 오면 바로 반환
+            accept: 결과 채택 조건 (거부된 결과는 실패로 집계, 기본: None 이 아니면 채택)
+            deadline: 전체 제한 시간 (초)
+
+        Returns:
+            {제공자 이름: ProviderResult} (names 순서)
+        """
+        accept = accept or (lambda value: value is not None)
+        names = [n for n in (names if names is not None else self._providers) if n in self._providers]
+        started = time.time()
+        results: Dict[str, ProviderResult] = {}
+        events: "queue.Queue" = queue.Queue()
+        pending: Dict[str, Dict[str, Any]] = {}
+
+        def submit(provider: _Provider, attempt: int):
+            def run():
+                attempt_started = time.time()
+                try:
+                    value, error = provider.func(*args), None
+                except Exception as e:
+                    value, error = None, str(e) or e.__class__.__name__
+                events.put((provider.name, attempt, value, error, time.time() - attempt_started))
+            self._executor.submit(run)
+
+        for name in names:
+            provider = self._providers[name]
+            if not provider.breaker.allow():
+                results[name] = ProviderResult(name, error='circuit_open')
+                continue
+            pending[name] = {'started': time.time(), 'attempts': 1, 'failed_attempts': 0}
+            submit(provider, 0)
+
+        done_early = False
+        while pending and not done_early:
+            now = time.time()
+            # 다음 확인 시점: 헤지 시점, 제공자 제한 시간, 전체 제한 시간 중 가장 이른 때
+            checkpoints = []
+            for name, state in pending.items():
+                provider = self._providers[name]
+                checkpoints.append(state['started'] + provider.timeout)
+                if provider.hedge_after is not None and state['attempts'] == 1:
+                    checkpoints.append(state['started'] + provider.hedge_after)
+            if deadline is not None:
+                checkpoints.append(started + deadline)
+            wait = max(0.0, min(checkpoints) - now)
+
+            try:
+                name, attempt, value, error, elapsed = events.get(timeout=wait)
+            except queue.Empty:
+                name = None
+
+            if name is not None and name in pending:
+                provider, state = self._providers[name], pending[name]
+                if error is None and accept(value):
+                    provider.breaker.record_success()
+                    results[name] = ProviderResult(name, value=value, ok=True, elapsed=round(elapsed, 3),
+                                                   hedged=attempt > 0)
+                    del pending[name]
+                    done_early = mode == 'first'
+                else:
+                    state['failed_attempts'] += 1
+                    # 다른 시도가 아직 진행 중이면 그 결과를 기다림
+                    if state['failed_attempts'] >= state['attempts']:
+                        provider.breaker.record_failure()
+                        results[name] = ProviderResult(name, value=value, error=error or 'rejected',
+                                                       elapsed=round(elapsed, 3), hedged=state['attempts'] > 1)
+                        del pending[name]
+
+            now = time.time()
+            for name in list(pending):
+                provider, state = self._providers[name], pending[name]
+                if now - state['started'] >= provider.timeout:
+                    provider.breaker.record_failure()
+                    results[name] = ProviderResult(name, error='timeout', elapsed=round(now - state['started'], 3),
+                                                   hedged=state['attempts'] > 1)
+                    del pending[name]
+                elif (provider.hedge_after is not None and state['attempts'] == 1
+                      and now - state['started'] >= provider.hedge_after):
+                    logger.info(f"🔄 {name} 응답 지연, 헤지 요청 전송")
+                    state['attempts'] = 2
+                    submit(provider, 1)
+            if deadline is not None and now - started >= deadline:
+                for name in list(pending):
+                    results[name] = ProviderResult(name, error='timeout', elapsed=round(now - started, 3))
+                    self._providers[name].breaker.record_failure()
+                    del pending[name]
+
+        # 'first' 모드에서 먼저 끝난 경우 나머지는 취소로 기록 (차단기에는 반영하지 않고,
+        # half_open 시험 호출이었다면 다음 요청이 다시 시험할 수 있도록 자리만 반환)
+        for name in pending:
+            self._providers[name].breaker.release()
+            results[name] = ProviderResult(name, error='cancelled', elapsed=round(time.time() - started, 3))
+        return {name: results[name] for name in names if name in results}
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """제공자별 차단기 상태"""
+        return {name: {**provider.breaker.get_status(), 'timeout': provider.timeout,
+                       'hedge_after': provider.hedge_after, 'weight': provider.weight}
+                for name, provider in self._providers.items()}
+
+
+def _normalize_vote(value: Any) -> Any:
+    """투표 비교용 정규화 (대소문자/공백/숫자 표기 차이 무시)"""
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        return round(float(value), 3)
+    if isinstance(value, (list, tuple)):
+        return tuple(sorted(str(_normalize_vote(item)) for item in value))
+    text = re.sub(r'\s+', ' ', str(value)).strip().lower()
+    try:
+        return round(float(text), 3)
+    except ValueError:
+        return text
+
+
+def _flatten(data: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    flat = {}
+    for key, value in data.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{path}."))
+        elif value not in (None, '', [], ()):
+            flat[path] = value
+    return flat
+
+
+def vote_fields(results: Dict[str, Dict[str, Any]],
+                weights: Optional[Dict[str, float]] = None) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """제공자별 결과를 필드 단위 가중 투표로 통합
+
+    중첩 dict 는 'nutrition.sodium' 처럼 필드별로 투표한다. 같은 값(정규화 기준)을 낸
+    제공자 가중치 합이 가장 큰 값을 채택하고, 동점이면 results 순서상 앞선 제공자의 값을 쓴다.
+    신뢰도는 채택된 값의 가중치 합 / 결과를 낸 전체 제공자 가중치 합이다.
+
+    Returns:
+        (통합 결과, {필드 경로: 신뢰도})
+    """
+    weights = weights or {}
+    total_weight = sum(weights.get(provider, 1.0) for provider in results) or 1.0
+    candidates: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+
+    for provider, result in results.items():
+        weight = weights.get(provider, 1.0)
+        for path, value in _flatten(result or {}).items():
+            options = candidates.setdefault(path, {})
+            key = _normalize_vote(value)
+            if key not in options:
+                options[key] = {'value': value, 'score': 0.0}
+            options[key]['score'] += weight
+
+    merged: Dict[str, Any] = {}
+    confidence: Dict[str, float] = {}
+    for path, options in candidates.items():
+        best = max(options.values(), key=lambda option: option['score'])  # 동점이면 먼저 등장한 값
+        target = merged
+        *parents, leaf = path.split('.')
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = best['value']
+        confidence[path] = round(best['score'] / total_weight, 3)
+    return merged, confidence
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+비동기 질의 로그 기록기
+- 요청 경로에서 INSERT/commit 제거
+- 크기/주기 기반 배치 flush
+- 큐 포화 시 가장 오래된 로그부터 버림 (drop-oldest)
+- 월 단위 파티션 테이블로 오래된 로그 회전
+"""
+
+import atexit
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LOG_TABLE = "query_logs"
+PARTITION_PREFIX = "query_logs_"
+
+_COLUMNS = "query_text, query_type, answer, data_sources, confidence_score, response_time, created_at"
+
+
+class QueryLogWriter:
+    """백그라운드 스레드에서 query_logs 를 배치로 기록"""
+
+    def __init__(self, db_path: str, max_queue_size: int = 5000, batch_size: int = 100,
+                 flush_interval: float = 2.0, hot_retention_days: int = 30,
+                 archive_retention_months: int = 12, rotation_interval: float = 3600.0):
+        """
+        Args:
+            db_path: SQLite 데이터베이스 경로
+            max_queue_size: 메모리 큐 최대 크기 (초과 시 가장 오래된 항목 폐기)
+            batch_size: 한 번에 기록할 최대 로그 수
+            flush_interval: 배치가 차지 않아도 flush 하는 주기 (초)
+            hot_retention_days: query_logs 에 남겨둘 기간 (일), 이후 월별 파티션으로 이동
+            archive_retention_months: 월별 파티션 보관 개월 수 (0 이면 삭제하지 않음)
+            rotation_interval: 회전 작업 실행 주기 (초)
+        """
+        self.db_path = db_path
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.hot_retention_days = hot_retention_days
+        self.archive_retention_months = archive_retention_months
+        self.rotation_interval = rotation_interval
+
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._in_flight = 0
+        self._flush_requested = False
+        self._last_rotation = time.time()
+        self.stats = {
+            'enqueued': 0,
+            'written': 0,
+            'dropped': 0,
+            'batches': 0,
+            'errors': 0,
+            'rotated': 0
+        }
+
+        self._thread = threading.Thread(target=self._run, name="QueryLogWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, query: str, query_type: str, answer: str, data_sources: List[str],
+            confidence_score: float, response_time: float) -> None:
+        """로그 항목을 큐에 추가 (블로킹 없음)"""
+        record = (
+            query,
+            query_type,
+            answer,
+            json.dumps(data_sources),
+            confidence_score,
+            response_time,
+            # created_at DEFAULT CURRENT_TIMESTAMP 와 같은 UTC 형식
+            time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+        )
+
+        with self._cond:
+            if self._closed:
+                return
+            if len(self._queue) >= self.max_queue_size:
+                # 백프레셔: 요청 스레드를 막지 않고 가장 오래된 로그를 버림
+                self._queue.popleft()
+                self.stats['dropped'] += 1
+            self._queue.append(record)
+            self.stats['enqueued'] += 1
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """큐에 쌓인 로그를 모두 기록할 때까지 대기"""
+        deadline = time.time() + timeout
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify()
+            while (self._queue or self._in_flight) and self._thread.is_alive():
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(min(remaining, 0.05))
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """남은 로그를 기록하고 기록 스레드 종료"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            # 기록 스레드가 아직 배치를 쓰는 중이면 종료 신호를 받은 스레드가 남은 로그까지 기록하도록 둠
+            # (여기서 큐를 비우면 같은 로그를 두 번 쓰거나 잃을 수 있음)
+            logger.warning(f"⚠️ 질의 로그 기록 스레드가 {timeout}초 안에 끝나지 않아 남은 로그는 백그라운드에서 기록합니다.")
+            return
+        with self._cond:
+            batch = self._drain(len(self._queue))
+        if batch:
+            # 기록 스레드가 비정상 종료된 경우에만 남은 로그를 직접 기록
+            self._write_batch(batch)
+
+    def _drain(self, limit: int) -> List[Tuple]:
+        batch = []
+        while self._queue and len(batch) < limit:
+            batch.append(self._queue.popleft())
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not (self._closed or self._flush_requested) and len(self._queue) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                batch = self._drain(self.batch_size)
+                if not self._queue:
+                    self._flush_requested = False
+                self._in_flight = len(batch)
+                closed = self._closed
+
+            if batch:
+                self._write_batch(batch)
+                with self._cond:
+                    self._in_flight = 0
+                    self._cond.notify_all()
+
+            if time.time() - self._last_rotation >= self.rotation_interval:
+                self.rotate()
+
+            if closed and not self._queue:
+                return
+
+    def _write_batch(self, batch: List[Tuple]) -> None:
+        try:
+            with sqlite3.connect(self.db_path, timeout=10) as conn:
+                conn.executemany(
+                    f"INSERT INTO {LOG_TABLE} ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    batch
+                )
+            self.stats['written'] += len(batch)
+            self.stats['batches'] += 1
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"❌ 질의 로그 배치 저장 실패 ({len(batch)}건): {e}")
+
+    def rotate(self, now: Optional[datetime] = None) -> int:
+        """오래된 로그를 월별 파티션(query_logs_YYYYMM)으로 옮기고 보관 기간이 지난 파티션 삭제"""
+        now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+        self._last_rotation = time.time()
+        cutoff = (now - timedelta(days=self.hot_retention_days)).strftime('%Y-%m-%d %H:%M:%S')
+        moved = 0
+
+        try:
+            with sqlite3.connect(self.db_path, timeout=10) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"SELECT DISTINCT substr(created_at, 1, 7) FROM {LOG_TABLE} WHERE created_at < ?",
+                    (cutoff,)
+                )
+                months = [row[0] for row in cursor.fetchall() if row[0]]
+
+                for month in months:
+                    partition = self._partition_name(month)
+                    cursor.execute(
+                        f"CREATE TABLE IF NOT EXISTS {partition} AS SELECT * FROM {LOG_TABLE} WHERE 0"
+                    )
+                    cursor.execute(
+                        f"INSERT INTO {partition} SELECT * FROM {LOG_TABLE} "
+                        f"WHERE created_at < ? AND substr(created_at, 1, 7) = ?",
+                        (cutoff, month)
+                    )
+                    moved += cursor.rowcount
+                    cursor.execute(
+                        f"DELETE FROM {LOG_TABLE} WHERE created_at < ? AND substr(created_at, 1, 7) = ?",
+                        (cutoff, month)
+                    )
+
+                if self.archive_retention_months > 0:
+                    oldest_kept = self._month_key(now, self.archive_retention_months)
+                    for partition in self._list_partitions(cursor):
+                        if partition[len(PARTITION_PREFIX):] < oldest_kept:
+                            cursor.execute(f"DROP TABLE IF EXISTS {partition}")
+                            logger.info(f"🗑️ 만료된 질의 로그 파티션 삭제: {partition}")
+
+                conn.commit()
+
+            if moved:
+                self.stats['rotated'] += moved
+                logger.info(f"📦 질의 로그 {moved}건 월별 파티션으로 이동")
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"❌ 질의 로그 회전 실패: {e}")
+
+        return moved
+
+    @staticmethod
+    def _partition_name(month: str) -> str:
+        """'2025-07' -> 'query_logs_202507'"""
+        return f"{PARTITION_PREFIX}{month.replace('-', '')}"
+
+    @staticmethod
+    def _month_key(now: datetime, months_back: int) -> str:
+        """now 기준 months_back 개월 전의 YYYYMM"""
+        index = now.year * 12 + (now.month - 1) - months_back
+        return f"{index // 12:04d}{index % 12 + 1:02d}"
+
+    @staticmethod
+    def _list_partitions(cursor) -> List[str]:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB ?",
+            (PARTITION_PREFIX + "[0-9][0-9][0-9][0-9][0-9][0-9]",)
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def get_status(self) -> Dict[str, Any]:
+        """기록기 상태 반환"""
+        with self._cond:
+            queue_size = len(self._queue)
+        return {
+            **self.stats,
+            'queue_size': queue_size,
+            'max_queue_size': self.max_queue_size,
+            'batch_size': self.batch_size,
+            'flush_interval': self.flush_interval,
+            'running': self._thread.is_alive(),
+            'closed': self._closed
+        }
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+규제 정보 스냅샷 서비스
+- 규제 데이터 출처(소스)마다 로더를 등록해 두고 처음 조회할 때 한 번만 로드
+- 로드한 데이터는 읽기 전용(FrozenDict/FrozenList)으로 바꿔 모든 사용처가 같은 객체를 공유
+- (소스, 국가, 제품, 카테고리) 경로를 미리 색인해 O(1) 조회
+- 크롤러가 새 규제를 publish 하면 새 버전 스냅샷으로 원자적으로 교체 (재시작 없이 반영)
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 소스 계층 이름 (register 의 levels 에 사용)
+LEVEL_NAMES = ('country', 'product', 'category')
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} 는 읽기 전용입니다 (규제 스냅샷은 publish 로만 변경)")
+
+
+class FrozenDict(dict):
+    """변경할 수 없는 dict (dict 하위 클래스라 JSON 직렬화, isinstance 검사는 그대로 동작)"""
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _readonly
+
+    def __copy__(self) -> Dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo) -> Dict:
+        return thaw(self)
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+class FrozenList(list):
+    """변경할 수 없는 list"""
+
+    __setitem__ = __delitem__ = append = extend = insert = remove = pop = clear = sort = reverse = _readonly
+    __iadd__ = __imul__ = _readonly
+
+    def __copy__(self) -> List:
+        return list(self)
+
+    def __deepcopy__(self, memo) -> List:
+        return thaw(self)
+
+    def __reduce__(self):
+        return FrozenList, (list(self),)
+
+
+EMPTY = FrozenDict()
+
+
+def freeze(value: Any) -> Any:
+    """dict/list 를 재귀적으로 읽기 전용 복사본으로 변환 (이미 읽기 전용이면 그대로)"""
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """읽기 전용 구조를 수정 가능한 dict/list 로 깊은 복사"""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
+def _index_paths(name: str, data: Any, depth: int, index: Dict[Tuple, Any]):
+    """(소스, 키1, 키2, ...) -> 값 색인 (levels 깊이까지)"""
+    stack = [((name,), data)]
+    while stack:
+        path, value = stack.pop()
+        index[path] = value
+        if len(path) - 1 < depth and isinstance(value, dict):
+            stack.extend((path + (key,), item) for key, item in value.items())
+
+
+@dataclass(frozen=True)
+class RegulationSnapshot:
+    """특정 시점의 전체 규제 데이터 (읽기 전용)"""
+    version: int
+    created_at: str
+    sources: FrozenDict
+    levels: FrozenDict
+    source_versions: FrozenDict
+    _index: Dict[Tuple, Any] = field(default_factory=dict, repr=False, compare=False)
+
+    def source(self, name: str, default: Any = EMPTY) -> Any:
+        return self.sources.get(name, default)
+
+    def get(self, name: str, *keys: str, default: Any = None) -> Any:
+        """(소스, 키...) 경로 값 O(1) 조회"""
+        return self._index.get((name,) + keys, default)
+
+    def lookup(self, name: str, country: Optional[str] = None, product: Optional[str] = None,
+               category: Optional[str] = None, default: Any = None) -> Any:
+        """(국가, 제품, 카테고리) 조회. 소스 계층에 없는 단계(예: 제품 구분 없는 소스의 product)는 무시"""
+        named = {'country': country, 'product': product, 'category': category}
+        keys = []
+        for level in self.levels.get(name, ()):
+            if named[level] is None:
+                break
+            keys.append(named[level])
+        return self._index.get((name,) + tuple(keys), default)
+
+
+class RegulationSnapshotService:
+    """규제 소스 등록, 스냅샷 생성/교체, 변경 알림"""
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Dict]] = {}
+        self._levels: Dict[str, Tuple[str, ...]] = {}
+        self._snapshot: Optional[RegulationSnapshot] = None
+        self._version = 0
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[RegulationSnapshot, Iterable[str]], None]] = []
+
+    def register(self, name: str, loader: Callable[[], Dict], levels: Tuple[str, ...] = LEVEL_NAMES):
+        """규제 소스 등록 (로더는 첫 조회 때 한 번만 호출). 이미 등록된 이름이면 무시"""
+        unknown = [level for level in levels if level not in LEVEL_NAMES]
+        if unknown:
+            raise ValueError(f"알 수 없는 규제 계층: {unknown}")
+        with self._lock:
+            if name in self._loaders:
+                return
+            self._loaders[name] = loader
+            self._levels[name] = tuple(levels)
+            if self._snapshot is not None:
+                self._swap({name: self._load(name)})
+
+    @property
+    def version(self) -> int:
+        return self.snapshot().version
+
+    def snapshot(self) -> RegulationSnapshot:
+        """현재 스냅샷 (없으면 등록된 모든 소스를 로드)"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._swap({name: self._load(name) for name in self._loaders})
+                snapshot = self._snapshot
+        return snapshot
+
+    def source(self, name: str, default: Any = EMPTY) -> Any:
+        return self.snapshot().source(name, default)
+
+    def get(self, name: str, *keys: str, default: Any = None) -> Any:
+        return self.snapshot().get(name, *keys, default=default)
+
+    def lookup(self, name: str, country: Optional[str] = None, product: Optional[str] = None,
+               category: Optional[str] = None, default: Any = None) -> Any:
+        return self.snapshot().lookup(name, country, product, category, default)
+
+    def publish(self, name: str, data: Any, path: Tuple[str, ...] = (),
+                levels: Tuple[str, ...] = LEVEL_NAMES) -> RegulationSnapshot:
+        """소스 전체(path 없음) 또는 일부 경로의 값을 교체해 새 버전 스냅샷 발행
+
+        예: publish('realtime_regulations', regulations, path=('중국', '라면'))
+        등록되지 않은 소스는 levels 계층으로 새로 만든다.
+        """
+        with self._lock:
+            current = self.snapshot()
+            if name not in self._levels:
+                self._levels[name] = tuple(levels)
+            if not path:
+                updated = data
+            else:
+                updated = thaw(current.source(name))
+                target = updated
+                for key in path[:-1]:
+                    target = target.setdefault(key, {})
+                target[path[-1]] = data
+            snapshot = self._swap({name: updated})
+        logger.info(f"🔄 규제 스냅샷 v{snapshot.version} 발행: {name} {'/'.join(path)}")
+        return snapshot
+
+    def reload(self, names: Optional[Iterable[str]] = None) -> RegulationSnapshot:
+        """등록된 로더를 다시 호출해 새 버전 스냅샷 생성 (names 가 없으면 전체)"""
+        with self._lock:
+            names = list(self._loaders) if names is None else [name for name in names if name in self._loaders]
+            self.snapshot()
+            return self._swap({name: self._load(name) for name in names})
+
+    def subscribe(self, listener: Callable[[RegulationSnapshot, Iterable[str]], None]):
+        """새 스냅샷이 발행될 때(최초 로드 제외) listener(snapshot, 변경된 소스 이름들) 호출"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _load(self, name: str) -> Any:
+        try:
+            return self._loaders[name]()
+        except Exception as e:
+            logger.warning(f"⚠️ 규제 소스 로드 실패: {name} ({e})")
+            return {}
+
+    def _swap(self, changes: Dict[str, Any]) -> RegulationSnapshot:
+        """변경된 소스만 다시 고정/색인하고 나머지는 이전 스냅샷 객체를 재사용 (호출자가 _lock 보유)"""
+        previous = self._snapshot
+        self._version += 1
+        sources = dict(previous.sources) if previous else {}
+        source_versions = dict(previous.source_versions) if previous else {}
+        for name, data in changes.items():
+            sources[name] = freeze(data)
+            source_versions[name] = self._version
+
+        index = {} if previous is None else {key: value for key, value in previous._index.items()
+                                             if key[0] not in changes}
+        for name in changes:
+            _index_paths(name, sources[name], len(self._levels.get(name, LEVEL_NAMES)), index)
+
+        snapshot = RegulationSnapshot(
+            version=self._version,
+            created_at=datetime.now().isoformat(),
+            sources=FrozenDict(sources),
+            levels=FrozenDict(self._levels),
+            source_versions=FrozenDict(source_versions),
+            _index=index
+        )
+        self._snapshot = snapshot
+        for listener in (list(self._listeners) if previous is not None else []):
+            try:
+                listener(snapshot, list(changes))
+            except Exception as e:
+                logger.warning(f"⚠️ 규제 스냅샷 알림 실패: {e}")
+        return snapshot
+
+
+# 전역 규제 스냅샷 서비스
+regulation_snapshots = RegulationSnapshotService()
+
+
+def get_regulation_snapshots() -> RegulationSnapshotService:
+    """전역 규제 스냅샷 서비스 반환"""
+    return regulation_snapshots